@@ -0,0 +1,152 @@
+import os
+import struct
+from typing import BinaryIO, Optional
+
+class AnimationHeader:
+    """컨테이너 헤더만 읽어 알아낸 애니메이션 정보"""
+
+    def __init__(self, is_animated: bool, frame_count: Optional[int] = None,
+                 frame_duration_ms: Optional[float] = None):
+        self.is_animated = is_animated
+        self.frame_count = frame_count  # 헤더에서 알 수 없으면 None
+        self.frame_duration_ms = frame_duration_ms  # 첫 프레임 재생 시간 (알 수 없으면 None)
+
+def read_animation_header(file_path: str) -> Optional[AnimationHeader]:
+    """
+    파일 헤더(수 KB)만 읽어 애니메이션 여부를 판단합니다. 프레임을 디코딩하지 않습니다.
+      - WebP: VP8X 청크의 애니메이션 플래그와 두 번째 ANMF 청크까지
+      - APNG/PNG: 첫 IDAT 앞의 acTL 청크
+      - GIF: 두 번째 이미지 서술자(0x2C)까지 (LZW 데이터는 디코딩하지 않고 서브 블록 길이만큼 건너뜀)
+
+    반환값:
+        AnimationHeader 또는 헤더로 판단할 수 없으면 None (Pillow로 확인 필요)
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            signature = f.read(12)
+            if signature[:4] == b'RIFF' and signature[8:12] == b'WEBP':
+                return _read_webp_header(f)
+            if signature[:8] == b'\x89PNG\r\n\x1a\n':
+                f.seek(8)
+                return _read_png_header(f)
+            if signature[:6] in (b'GIF87a', b'GIF89a'):
+                f.seek(6)
+                return _read_gif_header(f)
+    except (OSError, struct.error) as e:
+        print(f"애니메이션 헤더 읽기 오류: {os.path.basename(file_path)} - {e}")
+    return None
+
+def _read_webp_header(f: BinaryIO) -> Optional[AnimationHeader]:
+    """RIFF 청크를 따라가며 VP8X 플래그, ANIM, ANMF 청크를 확인합니다 (두 번째 ANMF에서 멈추고 정확한 프레임 수는 디코더에 맡김)"""
+    is_animated = False
+    frame_count = 0
+    first_duration = None
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            break
+        fourcc = chunk_header[:4]
+        size = struct.unpack('<I', chunk_header[4:])[0]
+        padded_size = size + (size & 1)
+        if fourcc == b'VP8X':
+            flags = f.read(1)
+            if not flags:
+                return None
+            # 애니메이션 플래그가 없으면 정적 이미지로 확정
+            if not flags[0] & 0x02:
+                return AnimationHeader(False, 1)
+            is_animated = True
+            f.seek(padded_size - 1, os.SEEK_CUR)
+        elif fourcc in (b'VP8 ', b'VP8L') and not is_animated:
+            # 확장 헤더 없는 단순 WebP는 항상 정적 이미지
+            return AnimationHeader(False, 1)
+        elif fourcc == b'ANMF':
+            frame_count += 1
+            if frame_count == 2:
+                # 두 번째 프레임이 있으면 애니메이션으로 확정 (나머지 청크는 읽지 않음)
+                return AnimationHeader(True, None, first_duration or None)
+            if first_duration is None:
+                payload = f.read(16)
+                if len(payload) == 16:
+                    first_duration = int.from_bytes(payload[12:15], 'little')
+                f.seek(padded_size - len(payload), os.SEEK_CUR)
+            else:
+                f.seek(padded_size, os.SEEK_CUR)
+        else:
+            f.seek(padded_size, os.SEEK_CUR)
+    if not is_animated:
+        return None
+    return AnimationHeader(False, frame_count or None)
+
+def _read_png_header(f: BinaryIO) -> Optional[AnimationHeader]:
+    """첫 IDAT 청크 전까지 acTL(애니메이션 제어) 청크를 찾습니다."""
+    frame_count = None
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            return None
+        length = struct.unpack('>I', chunk_header[:4])[0]
+        chunk_type = chunk_header[4:]
+        if chunk_type == b'acTL':
+            frame_count = struct.unpack('>I', f.read(4))[0]
+            f.seek(length - 4 + 4, os.SEEK_CUR)  # 나머지 데이터 + CRC
+        elif chunk_type == b'fcTL' and frame_count is not None:
+            data = f.read(length)
+            delay_num, delay_den = struct.unpack('>HH', data[20:24])
+            duration = 1000.0 * delay_num / (delay_den or 100)
+            return AnimationHeader(frame_count > 1, frame_count, duration or None)
+        elif chunk_type == b'IDAT' or chunk_type == b'IEND':
+            if frame_count is None:
+                return AnimationHeader(False, 1)
+            return AnimationHeader(frame_count > 1, frame_count)
+        else:
+            f.seek(length + 4, os.SEEK_CUR)
+
+def _skip_gif_sub_blocks(f: BinaryIO):
+    """GIF 데이터 서브 블록(길이 바이트 + 데이터)을 종료 블록(0)까지 건너뜁니다."""
+    while True:
+        size_byte = f.read(1)
+        if not size_byte or size_byte[0] == 0:
+            return
+        f.seek(size_byte[0], os.SEEK_CUR)
+
+def _read_gif_header(f: BinaryIO) -> Optional[AnimationHeader]:
+    """이미지 서술자(0x2C)가 두 개 나오면 바로 애니메이션으로 판단합니다 (정확한 프레임 수는 디코더에서 n_frames로 계산)."""
+    screen_descriptor = f.read(7)
+    if len(screen_descriptor) < 7:
+        return None
+    packed = screen_descriptor[4]
+    if packed & 0x80:
+        f.seek(3 * (2 ** ((packed & 0x07) + 1)), os.SEEK_CUR)  # 전역 색상표
+
+    image_count = 0
+    first_duration = None
+    while True:
+        block = f.read(1)
+        if not block or block not in (b'\x2c', b'\x21', b'\x3b'):
+            # 트레일러 없이 끝나거나 손상된 파일: Pillow로 확인
+            return None
+        if block == b'\x2c':  # 이미지 서술자
+            image_count += 1
+            if image_count == 2:
+                # 두 번째 이미지가 있으면 애니메이션으로 확정 (나머지 블록은 읽지 않음)
+                return AnimationHeader(True, None, first_duration)
+            descriptor = f.read(9)
+            if len(descriptor) < 9:
+                return None
+            if descriptor[8] & 0x80:
+                f.seek(3 * (2 ** ((descriptor[8] & 0x07) + 1)), os.SEEK_CUR)  # 지역 색상표
+            f.seek(1, os.SEEK_CUR)  # LZW 최소 코드 크기
+            _skip_gif_sub_blocks(f)
+        elif block == b'\x21':  # 확장 블록
+            label = f.read(1)
+            if label == b'\xf9' and first_duration is None:  # 그래픽 제어 확장 (프레임 지연 시간)
+                data = f.read(5)
+                if len(data) == 5:
+                    first_duration = struct.unpack('<H', data[2:4])[0] * 10 or None
+                    f.seek(-5, os.SEEK_CUR)
+            _skip_gif_sub_blocks(f)
+        else:  # 트레일러
+            if image_count == 0:
+                return None
+            return AnimationHeader(False, 1)
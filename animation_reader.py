@@ -0,0 +1,112 @@
+import os
+import numpy as np
+from PIL import Image
+from typing import Callable, Dict, List, Optional
+from animation_header import AnimationHeader
+
+class AnimationInfo:
+    """애니메이션 파일(WebP/GIF/APNG 등)을 한 번 열어 얻은 정보와 샘플 프레임"""
+
+    def __init__(self, file_path: str, frame_count: int, frame_duration_ms: float,
+                 frames: Optional[List[np.ndarray]] = None, static_result=None):
+        self.file_path = file_path
+        self.frame_count = frame_count
+        self.frame_duration_ms = frame_duration_ms  # 프레임당 평균 재생 시간 (ms)
+        self.frames = frames  # 요청한 위치에서 샘플링한 그레이스케일 프레임 목록 (애니메이션인 경우)
+        self.static_result = static_result  # 정적 이미지일 때 static_image_handler의 반환값
+
+    @property
+    def is_animated(self) -> bool:
+        return self.frame_count > 1
+
+    @property
+    def duration(self) -> float:
+        """전체 재생 시간(초)"""
+        return self.frame_count * self.frame_duration_ms / 1000.0
+
+class AnimationReader:
+    """
+    애니메이션 파일을 한 번만 열어 프레임 수/재생 시간 확인과 프레임 샘플링을 함께 처리하는 클래스.
+    결과(AnimationInfo)를 파일 분류 단계에서 시그니처 추출 단계로 넘겨주면 파일을 다시 열 필요가 없습니다.
+    """
+
+    # 프레임 재생 시간 정보가 없을 때 사용할 기본값 (ms)
+    DEFAULT_FRAME_DURATION_MS = 100
+    # 시그니처 비교에 필요한 최소 프레임 수
+    MIN_FRAMES = 3
+
+    def read(self, file_path: str, positions_percent: Optional[List[float]] = None,
+             output_size=(16, 16),
+             static_image_handler: Optional[Callable[[Image.Image], object]] = None,
+             header: Optional[AnimationHeader] = None) -> Optional[AnimationInfo]:
+        """
+        파일을 한 번 열어 프레임 수와 재생 시간을 확인하고, 애니메이션이면 요청한 위치의 프레임을 샘플링합니다.
+
+        매개변수:
+            positions_percent: 프레임을 샘플링할 위치 백분율 목록 (None이면 샘플링하지 않음)
+            output_size: 샘플 프레임 크기
+            static_image_handler: 단일 프레임 이미지일 때 열려 있는 이미지로 호출할 함수
+                                  (예: 해시 계산 - 같은 파일을 다시 열지 않기 위함)
+            header: read_animation_header로 미리 읽은 헤더 (프레임 수를 알면 n_frames 계산을 건너뜀)
+
+        반환값:
+            AnimationInfo 또는 파일을 읽을 수 없으면 None
+        """
+        try:
+            with Image.open(file_path) as img:
+                if header is not None and header.frame_count:
+                    # 헤더에서 읽은 프레임 수 사용 (GIF 등에서 n_frames가 파일 전체를 훑는 것을 방지)
+                    frame_count = header.frame_count
+                else:
+                    frame_count = getattr(img, 'n_frames', 1) or 1
+                first_duration = img.info.get('duration') or self.DEFAULT_FRAME_DURATION_MS
+
+                if frame_count <= 1:
+                    static_result = static_image_handler(img) if static_image_handler else None
+                    return AnimationInfo(file_path, 1, first_duration, static_result=static_result)
+
+                print(f"다중 프레임 애니메이션 감지됨: {os.path.basename(file_path)} ({frame_count}프레임)")
+                frames = None
+                durations = [first_duration]
+                if positions_percent:
+                    frames = self._sample_frames(img, frame_count, positions_percent, output_size, durations)
+                frame_duration_ms = sum(durations) / len(durations)
+                return AnimationInfo(file_path, frame_count, frame_duration_ms, frames)
+        except Exception as e:
+            print(f"애니메이션 읽기 오류: {file_path} - {e}")
+            return None
+
+    def _sample_frames(self, img: Image.Image, frame_count: int, positions_percent: List[float],
+                       output_size, durations: List[float]) -> Optional[List[np.ndarray]]:
+        """열려 있는 이미지에서 위치 순서대로(앞으로만 이동하며) 프레임을 샘플링합니다."""
+        frame_indices = []
+        for pos in positions_percent:
+            index = min(int(pos * frame_count / 100), frame_count - 1)
+            if index not in frame_indices:
+                frame_indices.append(index)
+
+        # 프레임이 부족하면 균등 간격 위치를 추가 (짧은 애니메이션)
+        if len(frame_indices) < self.MIN_FRAMES:
+            for index in range(0, frame_count, max(1, frame_count // 5)):
+                if len(frame_indices) >= self.MIN_FRAMES:
+                    break
+                if index not in frame_indices:
+                    frame_indices.append(index)
+
+        # GIF 등은 뒤로 이동하면 처음부터 다시 디코딩하므로 인덱스를 오름차순으로 방문
+        sampled: Dict[int, np.ndarray] = {}
+        for index in sorted(frame_indices):
+            try:
+                img.seek(index)
+                duration = img.info.get('duration')
+                if duration:
+                    durations.append(duration)
+                sampled[index] = np.array(img.convert('L').resize(output_size))
+            except Exception as e:
+                print(f"애니메이션 프레임 {index} 추출 오류: {e}")
+
+        frames = [sampled[index] for index in frame_indices if index in sampled]
+        # 여전히 프레임이 부족하면 첫 프레임을 복제
+        while frames and len(frames) < self.MIN_FRAMES:
+            frames.append(frames[0].copy())
+        return frames if frames else None
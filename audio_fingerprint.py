@@ -0,0 +1,174 @@
+import os
+import numpy as np
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Tuple
+
+# 분석 샘플링 속도 (Hz) - 4kHz 이하 대역만 사용하므로 8kHz 모노로 충분
+AUDIO_SAMPLE_RATE = 8000
+# 오디오를 디코딩할 구간 위치(비디오 길이의 백분율)와 구간 길이(초)
+AUDIO_WINDOW_POSITIONS = [20, 50, 80]
+AUDIO_WINDOW_SECONDS = 5.0
+# 스펙트로그램 프레임 크기와 간격 (8kHz에서 64ms 창, 32ms 간격)
+FFT_SIZE = 512
+HOP_SIZE = 256
+# 피크를 찾을 주파수 대역 (FFT 빈 번호, 한 빈 = 15.6Hz)
+PEAK_BANDS = [(2, 10), (10, 20), (20, 40), (40, 80), (80, 160), (160, 256)]
+# 기준 피크 하나와 짝지을 뒤쪽 피크 수, 짝지을 최대 시간 간격(스펙트로그램 프레임 수)
+FAN_OUT = 3
+MAX_PAIR_FRAMES = 31
+# 이보다 적은 해시가 나오면 (무음 등) 오디오 지문을 만들지 않음
+MIN_HASHES = 30
+
+class AudioFingerprint:
+    """오디오 구간들의 스펙트럼 피크 쌍(랜드마크) 해시 집합"""
+
+    def __init__(self, hashes: np.ndarray):
+        self.hashes = hashes  # 정렬된 고유 uint32 해시 배열
+
+    def similarity(self, other: 'AudioFingerprint') -> float:
+        """두 지문이 공유하는 해시 비율 (작은 쪽 기준, 0-100%)"""
+        smaller = min(len(self.hashes), len(other.hashes))
+        if smaller == 0:
+            return 0.0
+        shared = len(np.intersect1d(self.hashes, other.hashes, assume_unique=True))
+        return 100.0 * shared / smaller
+
+def compute_landmark_hashes(samples: np.ndarray) -> np.ndarray:
+    """
+    모노 샘플(AUDIO_SAMPLE_RATE)에서 스펙트로그램 피크를 찾고, 가까운 피크 쌍을
+    (기준 주파수, 대상 주파수, 시간 간격)으로 묶은 32비트 해시 배열을 반환합니다.
+    시간 간격만 사용하므로 구간 시작 위치가 조금 달라도 같은 해시가 나옵니다.
+    """
+    if len(samples) < FFT_SIZE * 2:
+        return np.zeros(0, dtype=np.uint32)
+    frame_count = 1 + (len(samples) - FFT_SIZE) // HOP_SIZE
+    indices = np.arange(FFT_SIZE)[None, :] + HOP_SIZE * np.arange(frame_count)[:, None]
+    spectrum = np.abs(np.fft.rfft(samples[indices] * np.hanning(FFT_SIZE), axis=1))
+    log_spectrum = np.log1p(spectrum)
+
+    # 프레임마다 대역별 최대 빈을 찾고, 그 프레임 대역 피크들의 평균보다 강한 것만 피크로 사용
+    peaks: List[Tuple[int, int]] = []
+    floor = float(np.percentile(log_spectrum, 50)) if log_spectrum.size else 0.0
+    for t in range(frame_count):
+        row = log_spectrum[t]
+        band_peaks = []
+        for low, high in PEAK_BANDS:
+            f = low + int(np.argmax(row[low:high]))
+            band_peaks.append((row[f], f))
+        level = np.mean([value for value, _ in band_peaks])
+        for value, f in band_peaks:
+            if value > level and value > floor:
+                peaks.append((t, f))
+
+    hashes = []
+    for i, (t1, f1) in enumerate(peaks):
+        paired = 0
+        for t2, f2 in peaks[i + 1:]:
+            dt = t2 - t1
+            if dt <= 0:
+                continue
+            if dt > MAX_PAIR_FRAMES or paired >= FAN_OUT:
+                break
+            hashes.append((f1 << 14) | (f2 << 5) | dt)
+            paired += 1
+    return np.unique(np.array(hashes, dtype=np.uint32))
+
+def extract_audio_fingerprint(video_path: str, positions_percent: Optional[List[float]] = None,
+                              window_seconds: float = AUDIO_WINDOW_SECONDS) -> Optional[AudioFingerprint]:
+    """
+    비디오의 오디오 스트림을 한 번 열어 몇 개의 짧은 구간만 8kHz 모노로 디코딩하고 지문을 만듭니다.
+
+    반환값:
+        AudioFingerprint 또는 오디오가 없거나 무음이면 None
+    """
+    positions_percent = positions_percent or AUDIO_WINDOW_POSITIONS
+    try:
+        import av
+        with av.open(video_path) as container:
+            stream = next((s for s in container.streams if s.type == 'audio'), None)
+            if stream is None:
+                return None
+            if stream.duration is not None and stream.time_base is not None:
+                duration = float(stream.duration * stream.time_base)
+            elif container.duration is not None:
+                duration = container.duration / av.time_base
+            else:
+                return None
+
+            all_hashes = []
+            for pos in positions_percent:
+                start = max(0.0, min(duration * pos / 100.0, duration - window_seconds))
+                samples = _decode_window(container, stream, start, window_seconds)
+                if samples is not None:
+                    all_hashes.append(compute_landmark_hashes(samples))
+    except Exception as e:
+        print(f"오디오 지문 추출 오류: {os.path.basename(video_path)} - {e}")
+        return None
+
+    if not all_hashes:
+        return None
+    hashes = np.unique(np.concatenate(all_hashes))
+    if len(hashes) < MIN_HASHES:
+        return None
+    return AudioFingerprint(hashes)
+
+def _decode_window(container, stream, start_seconds: float, window_seconds: float) -> Optional[np.ndarray]:
+    """열려 있는 컨테이너에서 start_seconds부터 window_seconds 동안의 오디오를 8kHz 모노 float로 디코딩합니다."""
+    import av
+    container.seek(int(start_seconds * av.time_base), backward=True)
+    # 구간마다 새 리샘플러 사용 (이전 구간의 남은 샘플이 섞이지 않도록)
+    resampler = av.AudioResampler(format='flt', layout='mono', rate=AUDIO_SAMPLE_RATE)
+    needed = int(window_seconds * AUDIO_SAMPLE_RATE)
+    chunks = []
+    collected = 0
+    for frame in container.decode(stream):
+        if frame.time is not None and frame.time + frame.samples / frame.sample_rate < start_seconds:
+            continue
+        for resampled in resampler.resample(frame):
+            chunk = resampled.to_ndarray().reshape(-1)
+            chunks.append(chunk)
+            collected += len(chunk)
+        if collected >= needed:
+            break
+    if not chunks:
+        return None
+    return np.concatenate(chunks)[:needed].astype(np.float32)
+
+class AudioFingerprintIndex:
+    """해시 -> 비디오 역색인으로 오디오가 비슷한 비디오 쌍을 빠르게 찾는 클래스"""
+
+    # 너무 많은 비디오에 나오는 해시(무음 구간 등)는 후보 검색에서 제외
+    MAX_POSTING = 200
+
+    def __init__(self):
+        self.fingerprints: Dict[Hashable, AudioFingerprint] = {}
+        self.postings: Dict[int, List[Hashable]] = {}
+
+    def add(self, key: Hashable, fingerprint: AudioFingerprint):
+        self.fingerprints[key] = fingerprint
+        for value in fingerprint.hashes.tolist():
+            self.postings.setdefault(value, []).append(key)
+
+    def find_pairs(self, min_similarity: float) -> Dict[frozenset, float]:
+        """
+        공유 해시가 많은 비디오 쌍을 찾아 오디오 유사도가 min_similarity 이상인 쌍만 반환합니다.
+
+        반환값:
+            frozenset({경로1, 경로2}) -> 오디오 유사도(0-100%)
+        """
+        shared_counts: Counter = Counter()
+        for keys in self.postings.values():
+            if len(keys) < 2 or len(keys) > self.MAX_POSTING:
+                continue
+            for i, key1 in enumerate(keys):
+                for key2 in keys[i + 1:]:
+                    shared_counts[frozenset((key1, key2))] += 1
+
+        pairs = {}
+        for pair, shared in shared_counts.items():
+            key1, key2 = tuple(pair)
+            smaller = min(len(self.fingerprints[key1].hashes), len(self.fingerprints[key2].hashes))
+            similarity = 100.0 * shared / smaller
+            if similarity >= min_similarity:
+                pairs[pair] = similarity
+        return pairs
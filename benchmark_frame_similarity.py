@@ -0,0 +1,73 @@
+import sys
+import time
+import argparse
+import statistics
+import numpy as np
+import video_acceleration
+from video_processor import VideoProcessor
+
+# 한 비디오와 비교할 후보 수 (일괄 비교 크기)
+CANDIDATE_COUNTS = [1, 4, 16, 64, 128, 256, 1024, 4096]
+
+def measure(function, repeats):
+    """함수를 여러 번 실행해 중앙값 시간(초)을 반환합니다."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def per_pair(processor, query, candidates):
+    """기존 방식: 프레임 쌍마다 calculate_frame_similarity 호출"""
+    return [[processor.calculate_frame_similarity(query[f], candidate[f]) for f in range(len(query))]
+            for candidate in candidates]
+
+def main():
+    parser = argparse.ArgumentParser(description='프레임 유사도 계산 경로별 벤치마크 (쌍 단위 / NumPy 일괄 / Numba 일괄)')
+    parser.add_argument('--frames', type=int, default=5, help='시그니처당 프레임 수')
+    parser.add_argument('--size', type=int, default=16, help='프레임 한 변 크기')
+    parser.add_argument('--repeats', type=int, default=5, help='반복 측정 횟수 (중앙값 사용)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    shape = (args.frames, args.size, args.size)
+    query = rng.integers(0, 256, shape, dtype=np.uint8)
+    processor = VideoProcessor()
+    processor.use_hw_acceleration = False
+
+    print("===== 프레임 유사도 벤치마크 =====")
+    if not video_acceleration.NUMBA_AVAILABLE:
+        print("Numba를 사용할 수 없어 NumPy 경로만 측정합니다.")
+    else:
+        # 첫 실행은 컴파일, 이후 실행은 디스크 캐시에서 불러오므로 시간이 크게 다름
+        start = time.perf_counter()
+        video_acceleration.warm_up()
+        print(f"Numba 워밍업(컴파일 또는 캐시 로드): {time.perf_counter() - start:.3f}초")
+
+    print(f"\n{'후보 수':>8} {'쌍 단위':>12} {'NumPy 일괄':>12} {'Numba 일괄':>12}  가장 빠른 경로")
+    for count in CANDIDATE_COUNTS:
+        candidates = rng.integers(0, 256, (count,) + shape, dtype=np.uint8)
+        expected = video_acceleration.batch_similarity_numpy(query, candidates)
+        results = {}
+        if count <= 256:
+            results['쌍 단위'] = measure(lambda: per_pair(processor, query, candidates), args.repeats)
+            if not np.array_equal(np.array(per_pair(processor, query, candidates)), expected):
+                print("✗ 쌍 단위 결과가 일괄 계산과 다릅니다.")
+                sys.exit(1)
+        results['NumPy 일괄'] = measure(lambda: video_acceleration.batch_similarity_numpy(query, candidates), args.repeats)
+        if video_acceleration.NUMBA_AVAILABLE:
+            results['Numba 일괄'] = measure(lambda: video_acceleration.batch_similarity_numba(query, candidates), args.repeats)
+            if not np.array_equal(video_acceleration.batch_similarity_numba(query, candidates), expected):
+                print("✗ Numba 결과가 NumPy 결과와 다릅니다.")
+                sys.exit(1)
+
+        columns = [f"{results[name] * 1000:10.3f}ms" if name in results else f"{'-':>12}"
+                   for name in ('쌍 단위', 'NumPy 일괄', 'Numba 일괄')]
+        fastest = min(results, key=results.get)
+        print(f"{count:>8} {' '.join(columns)}  {fastest}")
+
+    print(f"\n현재 Numba 일괄 계산 최소 후보 수: {video_acceleration.NUMBA_BATCH_MIN_CANDIDATES}")
+
+if __name__ == "__main__":
+    main()
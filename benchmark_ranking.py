@@ -0,0 +1,96 @@
+import sys
+import time
+import argparse
+import numpy as np
+from result_ranking import rank_by_similarity
+
+# 측정할 중복 쌍 수 (기존 방식은 --legacy-max 이하에서만 측정)
+PAIR_COUNTS = [10_000, 100_000, 1_000_000]
+
+def make_pairs(pair_count: int, max_group_size: int, rng: np.random.Generator):
+    """
+    합성 중복 쌍 목록을 만듭니다: (대표 경로, 멤버 경로, 유사도%, 그룹 ID).
+    연속 촬영처럼 큰 그룹(최대 max_group_size 멤버)과 작은 그룹을 섞고, 이미지처럼 정수 유사도를 사용해 동점을 많이 만듭니다.
+    """
+    pairs = []
+    group_index = 0
+    while len(pairs) < pair_count:
+        group_size = int(min(pair_count - len(pairs), max_group_size if rng.random() < 0.1 else rng.integers(1, 20)))
+        group_id = f"group-{group_index}"
+        representative = f"/photos/{group_index}/rep.jpg"
+        similarities = rng.integers(80, 101, group_size)
+        pairs.extend((representative, f"/photos/{group_index}/{member}.jpg", int(similarity), group_id)
+                     for member, similarity in enumerate(similarities))
+        group_index += 1
+    return pairs
+
+def legacy_ranks(pairs):
+    """
+    기존 ScanResultProcessor 방식: 정렬 후 쌍마다 그룹 멤버 목록을 처음부터 찾아 Rank 기록, 테이블을 채울 때 다시 찾음.
+    반환값은 입력 순서대로의 쌍별 Rank
+    """
+    group_members = {}
+    pair_infos = []
+    for _, member, similarity, group_id in pairs:
+        member_info = {'path': member, 'percentage': similarity, 'rank': -1}
+        group_members.setdefault(group_id, []).append(member_info)
+        pair_infos.append(member_info)
+    sorted_pairs = sorted(pairs, key=lambda item: item[2], reverse=True)
+    current_rank = 1
+    for _, member, _, group_id in sorted_pairs:
+        for member_info in group_members[group_id]:
+            if member_info['path'] == member:
+                member_info['rank'] = current_rank
+                break
+        current_rank += 1
+    groups_data = {group_id: [(m['path'], m['percentage'], m['rank']) for m in members]
+                   for group_id, members in group_members.items()}
+    table_ranks = []
+    for _, member, _, group_id in sorted_pairs:
+        for path, _, rank in groups_data[group_id]:
+            if path == member:
+                table_ranks.append(rank)
+                break
+    return [member_info['rank'] for member_info in pair_infos]
+
+def vectorized_ranks(pairs):
+    """새 방식: 유사도 배열을 한 번 안정 정렬해 Rank를 부여하고, 테이블은 정렬 순서대로 채움 (반환값은 입력 순서대로의 쌍별 Rank)"""
+    order, ranks = rank_by_similarity([pair[2] for pair in pairs])
+    rank_list = ranks.tolist()
+    group_members = {}
+    for (_, member, similarity, group_id), rank in zip(pairs, rank_list):
+        group_members.setdefault(group_id, []).append((member, similarity, rank))
+    table_ranks = [rank_list[index] for index in order.tolist()]
+    if table_ranks != list(range(1, len(pairs) + 1)):
+        raise ValueError("테이블 순서의 Rank가 1부터 연속되지 않습니다.")
+    return rank_list
+
+def main():
+    parser = argparse.ArgumentParser(description='중복 결과 Rank 계산 벤치마크 (기존 그룹 탐색 방식 / 정렬 한 번)')
+    parser.add_argument('--max-group-size', type=int, default=2000, help='가장 큰 그룹의 멤버 수')
+    parser.add_argument('--legacy-max', type=int, default=100_000, help='기존 방식을 측정할 최대 쌍 수 (그룹 크기에 대해 이차 시간)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print("===== 중복 결과 Rank 계산 벤치마크 =====")
+    print(f"\n{'쌍 수':>10} {'기존 방식':>12} {'정렬 한 번':>12} {'배속':>8}")
+    for count in PAIR_COUNTS:
+        pairs = make_pairs(count, args.max_group_size, rng)
+        start = time.perf_counter()
+        new_ranks = vectorized_ranks(pairs)
+        new_time = time.perf_counter() - start
+
+        legacy_column, speedup_column = f"{'-':>12}", f"{'-':>8}"
+        if count <= args.legacy_max:
+            start = time.perf_counter()
+            old_ranks = legacy_ranks(pairs)
+            legacy_time = time.perf_counter() - start
+            if old_ranks != new_ranks:
+                print("✗ 기존 방식과 Rank가 다릅니다.")
+                sys.exit(1)
+            legacy_column = f"{legacy_time * 1000:10.1f}ms"
+            speedup_column = f"{legacy_time / new_time:7.1f}x"
+        print(f"{count:>10} {legacy_column} {new_time * 1000:10.1f}ms {speedup_column}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import statistics
+
+# 시작 시간 예산 (초) - 초과하면 회귀로 보고 종료 코드 1 반환
+IMPORT_BUDGET_SECONDS = 1.0  # ui.main_window 임포트 시간
+TIME_TO_WINDOW_BUDGET_SECONDS = 2.5  # 프로세스 시작부터 메인 창이 표시될 때까지
+
+# 앱 시작 시 불러오면 안 되는 무거운 모듈 (처음 사용할 때 불러와야 함)
+LAZY_MODULES = ['av', 'numba', 'rawpy', 'video_acceleration']
+
+# 새 파이썬 프로세스에서 실행할 측정 코드 (매번 콜드 스타트로 측정)
+CHILD_SCRIPT = r'''
+import sys, time, json
+start = time.perf_counter()
+sys.path.insert(0, PROJECT_ROOT)
+import ui.main_window
+import_done = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+window = ui.main_window.MainWindow()
+window.show()
+app.processEvents()
+window_done = time.perf_counter()
+print(json.dumps({
+    "import_seconds": import_done - start,
+    "window_seconds": window_done - start,
+    "loaded_lazy_modules": [name for name in LAZY_MODULES if name in sys.modules],
+}))
+'''
+
+def run_once(project_root, offscreen):
+    """새 프로세스에서 앱 시작 과정을 한 번 측정합니다."""
+    env = dict(os.environ)
+    if offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    script = CHILD_SCRIPT.replace('PROJECT_ROOT', repr(project_root)).replace('LAZY_MODULES', repr(LAZY_MODULES))
+    wall_start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', script], cwd=project_root, env=env,
+        capture_output=True, text=True
+    )
+    wall_seconds = time.perf_counter() - wall_start
+    # 앱 모듈의 디버그 출력 중 마지막 JSON 줄만 사용
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith('{'):
+            measurement = json.loads(line)
+            measurement['process_seconds'] = wall_seconds
+            return measurement
+    print(result.stdout)
+    print(result.stderr)
+    raise RuntimeError("측정 프로세스가 결과를 출력하지 않았습니다.")
+
+def main():
+    parser = argparse.ArgumentParser(description='앱 시작 시간 벤치마크 (임포트 시간, 창 표시까지 걸린 시간)')
+    parser.add_argument('--runs', type=int, default=5, help='측정 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--offscreen', action='store_true', help='화면 없이 측정 (QT_QPA_PLATFORM=offscreen)')
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET_SECONDS, help='임포트 시간 예산(초)')
+    parser.add_argument('--window-budget', type=float, default=TIME_TO_WINDOW_BUDGET_SECONDS, help='창 표시 시간 예산(초)')
+    args = parser.parse_args()
+
+    project_root = os.path.dirname(os.path.abspath(__file__))
+    print(f"===== 앱 시작 시간 벤치마크 ({args.runs}회) =====")
+    measurements = []
+    for run in range(args.runs):
+        measurement = run_once(project_root, args.offscreen)
+        measurements.append(measurement)
+        print(f"  {run + 1}회: 임포트 {measurement['import_seconds']:.3f}초, "
+              f"창 표시 {measurement['window_seconds']:.3f}초, 프로세스 전체 {measurement['process_seconds']:.3f}초")
+
+    import_median = statistics.median(m['import_seconds'] for m in measurements)
+    window_median = statistics.median(m['window_seconds'] for m in measurements)
+    loaded_lazy_modules = sorted({name for m in measurements for name in m['loaded_lazy_modules']})
+
+    print(f"\n임포트 시간 중앙값: {import_median:.3f}초 (예산 {args.import_budget:.2f}초)")
+    print(f"창 표시 시간 중앙값: {window_median:.3f}초 (예산 {args.window_budget:.2f}초)")
+
+    failed = False
+    if import_median > args.import_budget:
+        print("✗ 임포트 시간이 예산을 초과했습니다.")
+        failed = True
+    if window_median > args.window_budget:
+        print("✗ 창 표시 시간이 예산을 초과했습니다.")
+        failed = True
+    if loaded_lazy_modules:
+        print(f"✗ 시작 시 불러오면 안 되는 모듈이 로드되었습니다: {', '.join(loaded_lazy_modules)}")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✓ 시작 시간이 예산 안에 있습니다.")
+
+if __name__ == "__main__":
+    main()
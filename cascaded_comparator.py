@@ -0,0 +1,156 @@
+import numpy as np
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+class CascadedComparator:
+    """
+    비디오 시그니처를 단계적으로 비교하다가, 남은 프레임이 모두 100%여도 임계값에 닿을 수 없으면
+    바로 멈추는 비교기. 정보량(밝기 표준편차)이 큰 프레임부터 비교해 불일치를 빨리 발견합니다.
+
+    중복 여부 판정(유사도 >= 임계값)은 모든 프레임을 비교하는 방식과 항상 같습니다.
+    끝까지 비교한 경우 유사도 값도 원래 프레임 순서로 합산하므로 완전히 같습니다.
+    """
+
+    MAX_FRAME_SIMILARITY = 100.0
+    # 부동소수점 합산 순서 차이로 경계값 판정이 바뀌지 않도록 두는 여유
+    EPSILON = 1e-9
+
+    def __init__(self, frame_similarity: Callable[[np.ndarray, np.ndarray], float], similarity_threshold: float):
+        """
+        매개변수:
+            frame_similarity: 두 프레임의 유사도(0-100%)를 계산하는 함수
+            similarity_threshold: 중복으로 간주할 평균 유사도 임계값
+        """
+        self.frame_similarity = frame_similarity
+        self.similarity_threshold = similarity_threshold
+        self.frame_orders: Dict[Hashable, List[int]] = {}  # 비디오 키 -> 프레임 비교 순서
+        self.frames_compared = 0  # 실제로 계산한 프레임 유사도 수
+        self.frames_skipped = 0  # 조기 종료로 건너뛴 프레임 유사도 수
+
+    def reset_counters(self):
+        self.frames_compared = 0
+        self.frames_skipped = 0
+
+    def frame_order(self, frames: List[np.ndarray], key: Optional[Hashable] = None) -> List[int]:
+        """정보량(밝기 표준편차)이 큰 프레임부터의 비교 순서를 반환합니다 (key가 있으면 캐시)"""
+        if key is not None and key in self.frame_orders:
+            return self.frame_orders[key]
+        spreads = [float(np.std(frame)) if frame is not None else -1.0 for frame in frames]
+        order = sorted(range(len(frames)), key=lambda i: spreads[i], reverse=True)
+        if key is not None:
+            self.frame_orders[key] = order
+        return order
+
+    def _cascade(self, sig1, sig2, order: List[int], cutoff: float, strict: bool) -> Tuple[float, bool]:
+        """
+        order 순서로 프레임 유사도를 더하다가 도달 가능한 최대 평균이 cutoff 미만(strict이면 이하)이 되면 멈춥니다.
+
+        반환값:
+            (유사도, 끝까지 비교했는지 여부)
+            끝까지 비교했으면 정확한 평균, 도중에 멈췄으면 비교한 프레임들의 평균(항상 cutoff 미만)
+        """
+        frame_count = min(len(sig1), len(sig2))
+        if frame_count == 0:
+            return 0, True
+        similarities = [0.0] * frame_count
+        total = 0.0
+        evaluated = 0
+        for i in order:
+            if i >= frame_count:
+                continue
+            similarity = self.frame_similarity(sig1[i], sig2[i])
+            similarities[i] = similarity
+            total += similarity
+            evaluated += 1
+            self.frames_compared += 1
+            remaining = frame_count - evaluated
+            if remaining == 0:
+                break
+            best_possible = (total + self.MAX_FRAME_SIMILARITY * remaining) / frame_count
+            if best_possible < cutoff - self.EPSILON or (strict and best_possible <= cutoff - self.EPSILON):
+                self.frames_skipped += remaining
+                return total / evaluated, False
+        # 원래 프레임 순서로 합산하여 전체 비교와 같은 값을 만듦
+        return sum(similarities) / frame_count, True
+
+    def cascade_batch(self, batch_similarity: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                      query: np.ndarray, candidates: np.ndarray, order: List[int],
+                      cutoffs: np.ndarray, strict: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        _cascade를 여러 후보에 한 번에 적용합니다. order 순서로 프레임 하나씩 남은 후보 전체와 일괄 비교하고,
+        도달 가능한 최대 평균이 후보별 cutoff 미만(strict인 후보는 이하)이 된 후보는 다음 프레임부터 제외합니다.
+
+        매개변수:
+            batch_similarity: (k, H, W) 프레임과 (n, k, H, W) 프레임의 (n, k) 유사도를 계산하는 함수
+            query: (F, H, W) 시그니처, candidates: (N, F, H, W) 시그니처
+            cutoffs, strict: 후보별 기준값과 엄격 비교 여부 (길이 N)
+
+        반환값:
+            (후보별 유사도, 끝까지 비교했는지 여부) - 값은 후보마다 _cascade를 호출한 것과 같음
+        """
+        candidate_count, frame_count = candidates.shape[0], candidates.shape[1]
+        frame_similarities = np.zeros((candidate_count, frame_count), dtype=np.float64)
+        totals = np.zeros(candidate_count, dtype=np.float64)
+        results = np.zeros(candidate_count, dtype=np.float64)
+        complete = np.zeros(candidate_count, dtype=bool)
+        alive = np.arange(candidate_count)
+        evaluated = 0
+        for i in order:
+            if i >= frame_count:
+                continue
+            similarity = batch_similarity(query[i:i + 1], candidates[alive, i:i + 1])[:, 0]
+            frame_similarities[alive, i] = similarity
+            totals[alive] += similarity
+            evaluated += 1
+            self.frames_compared += len(alive)
+            remaining = frame_count - evaluated
+            if remaining == 0:
+                break
+            best_possible = (totals[alive] + self.MAX_FRAME_SIMILARITY * remaining) / frame_count
+            limits = cutoffs[alive] - self.EPSILON
+            stop = (best_possible < limits) | (strict[alive] & (best_possible <= limits))
+            if stop.any():
+                stopped = alive[stop]
+                results[stopped] = totals[stopped] / evaluated
+                self.frames_skipped += remaining * len(stopped)
+                alive = alive[~stop]
+                if len(alive) == 0:
+                    break
+        if len(alive):
+            # 원래 프레임 순서로 합산하여 전체 비교와 같은 값을 만듦
+            total = frame_similarities[alive, 0].copy()
+            for f in range(1, frame_count):
+                total += frame_similarities[alive, f]
+            results[alive] = total / frame_count
+            complete[alive] = True
+        return results, complete
+
+    def compare_with_variants(self, sig1, sig2, variants1: Dict[str, list],
+                              key1: Optional[Hashable] = None) -> Tuple[float, Optional[str]]:
+        """
+        정상 방향과 sig1의 회전/반전 변환들을 차례로 단계적으로 비교합니다.
+
+        매개변수:
+            variants1: 변환 이름 -> sig1을 변환한 시그니처 (비교 순서대로)
+
+        반환값:
+            (유사도, 가장 높은 유사도를 낸 변환 이름 또는 원본이면 None)
+            중복으로 판정되는 경우 값은 전체 비교와 같고, 아닌 경우 임계값 미만의 추정치입니다.
+        """
+        if not sig1 or not sig2:
+            return 0, None
+        order = self.frame_order(sig1, key1)
+        threshold = self.similarity_threshold
+        best, best_complete = self._cascade(sig1, sig2, order, threshold, strict=False)
+        best_transform = None
+        for name, variant_sig1 in (variants1 or {}).items():
+            if not variant_sig1:
+                continue
+            if best_complete and best >= threshold:
+                # 이미 중복: 변환 비교는 지금까지의 최고 유사도보다 클 수 있을 때만 끝까지 계산
+                similarity, complete = self._cascade(variant_sig1, sig2, order, best, strict=True)
+            else:
+                # 아직 중복 아님: 변환 비교가 임계값에 닿을 수 있을 때만 끝까지 계산
+                similarity, complete = self._cascade(variant_sig1, sig2, order, threshold, strict=False)
+            if complete and similarity > best:
+                best, best_complete, best_transform = similarity, True, name
+        return best, best_transform
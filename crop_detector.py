@@ -0,0 +1,96 @@
+import numpy as np
+from PIL import Image
+from typing import List, Optional, Tuple
+
+# 검은 띠를 찾을 때 사용하는 저해상도 분석 크기
+CROP_ANALYSIS_SIZE = (64, 64)
+# 행/열의 평균 밝기와 표준편차가 모든 프레임에서 이 값 이하이면 검은 띠로 봄
+BAR_MAX_MEAN = 16.0
+BAR_MAX_STD = 6.0
+# 이보다 얇은 띠는 무시 (인코딩 가장자리 잡음)
+MIN_BAR_FRACTION = 0.03
+# 남은 화면이 이보다 작으면 (거의 검은 화면) 자르지 않음
+MIN_ACTIVE_FRACTION = 0.4
+
+class CropBox:
+    """화면에서 검은 띠를 제외한 실제 영상 영역 (가로/세로 비율 0-1, 해상도와 무관)"""
+
+    def __init__(self, left: float = 0.0, top: float = 0.0, right: float = 1.0, bottom: float = 1.0):
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    @property
+    def is_full(self) -> bool:
+        return self.left == 0.0 and self.top == 0.0 and self.right == 1.0 and self.bottom == 1.0
+
+    def pixel_box(self, width: int, height: int) -> Tuple[int, int, int, int]:
+        """주어진 해상도에서의 (왼쪽, 위, 오른쪽, 아래) 픽셀 좌표"""
+        left = int(round(self.left * width))
+        top = int(round(self.top * height))
+        right = max(left + 1, int(round(self.right * width)))
+        bottom = max(top + 1, int(round(self.bottom * height)))
+        return left, top, right, bottom
+
+    def crop_array(self, frame: np.ndarray) -> np.ndarray:
+        if self.is_full:
+            return frame
+        left, top, right, bottom = self.pixel_box(frame.shape[1], frame.shape[0])
+        return frame[top:bottom, left:right]
+
+    def crop_image(self, img: Image.Image) -> Image.Image:
+        if self.is_full:
+            return img
+        return img.crop(self.pixel_box(img.width, img.height))
+
+    def __repr__(self):
+        return f"CropBox({self.left:.3f}, {self.top:.3f}, {self.right:.3f}, {self.bottom:.3f})"
+
+def _count_bar_lines(means: np.ndarray, stds: np.ndarray) -> int:
+    """앞쪽부터 연속된 검은 띠 행(또는 열)의 수"""
+    count = 0
+    for mean, std in zip(means, stds):
+        if mean > BAR_MAX_MEAN or std > BAR_MAX_STD:
+            break
+        count += 1
+    return count
+
+def detect_crop_box(frames: List[np.ndarray]) -> CropBox:
+    """
+    같은 크기의 저해상도 그레이스케일 프레임들에서 레터박스(위/아래)와 필러박스(좌/우) 검은 띠를 찾습니다.
+    모든 프레임에서 어두운 행/열만 띠로 보므로, 어두운 장면 하나 때문에 화면이 잘리지 않습니다.
+    """
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        return CropBox()
+    stack = np.stack([frame.astype(np.float32) for frame in frames])
+    height, width = stack.shape[1:]
+    # 프레임별 행/열 통계의 최댓값 (한 프레임이라도 밝으면 띠가 아님)
+    row_means = stack.mean(axis=2).max(axis=0)
+    row_stds = stack.std(axis=2).max(axis=0)
+    col_means = stack.mean(axis=1).max(axis=0)
+    col_stds = stack.std(axis=1).max(axis=0)
+
+    top = _count_bar_lines(row_means, row_stds)
+    bottom = _count_bar_lines(row_means[::-1], row_stds[::-1])
+    left = _count_bar_lines(col_means, col_stds)
+    right = _count_bar_lines(col_means[::-1], col_stds[::-1])
+    top, bottom = [n if n >= MIN_BAR_FRACTION * height else 0 for n in (top, bottom)]
+    left, right = [n if n >= MIN_BAR_FRACTION * width else 0 for n in (left, right)]
+
+    if (height - top - bottom) < MIN_ACTIVE_FRACTION * height or (width - left - right) < MIN_ACTIVE_FRACTION * width:
+        return CropBox()
+    return CropBox(left / width, top / height, (width - right) / width, (height - bottom) / height)
+
+def detect_image_crop_box(img: Image.Image) -> CropBox:
+    """이미지 한 장을 저해상도 그레이스케일로 줄여 검은 띠를 찾습니다."""
+    return detect_crop_box([np.array(img.convert('L').resize(CROP_ANALYSIS_SIZE))])
+
+def crop_and_resize(frame: np.ndarray, crop_box: Optional[CropBox], output_size) -> np.ndarray:
+    """분석용 프레임에서 실제 영상 영역만 잘라 시그니처 크기로 줄입니다."""
+    if crop_box is not None:
+        frame = crop_box.crop_array(frame)
+    if frame.shape[1] == output_size[0] and frame.shape[0] == output_size[1]:
+        return frame
+    return np.array(Image.fromarray(frame).resize(output_size))
@@ -0,0 +1,91 @@
+import numpy as np
+from typing import Dict, List
+
+# 정사각형의 8가지 대칭 변환 (회전 4가지 x 좌우 반전 여부)
+IDENTITY = 'identity'
+FLIP_HORIZONTAL = 'flip_horizontal'
+FLIP_VERTICAL = 'flip_vertical'
+ROTATE_90 = 'rotate_90'  # 반시계 방향 90도 (np.rot90)
+ROTATE_180 = 'rotate_180'
+ROTATE_270 = 'rotate_270'
+TRANSPOSE = 'transpose'  # 주대각선 기준 뒤집기
+TRANSVERSE = 'transverse'  # 부대각선 기준 뒤집기
+
+# 비교 순서 (앞쪽 변환이 우선: 동점이면 원본, 다음으로 흔한 좌우 반전)
+DIHEDRAL_TRANSFORMS = [IDENTITY, FLIP_HORIZONTAL, ROTATE_90, ROTATE_270, ROTATE_180,
+                       FLIP_VERTICAL, TRANSPOSE, TRANSVERSE]
+
+# 각 변환을 기본 연산(좌우 반전, 상하 반전, 전치)을 차례로 적용한 것으로 정의
+_PRIMITIVES = {
+    IDENTITY: [],
+    FLIP_HORIZONTAL: ['flip_h'],
+    FLIP_VERTICAL: ['flip_v'],
+    ROTATE_180: ['flip_h', 'flip_v'],
+    TRANSPOSE: ['transpose'],
+    ROTATE_90: ['flip_h', 'transpose'],
+    ROTATE_270: ['transpose', 'flip_h'],
+    TRANSVERSE: ['flip_h', 'flip_v', 'transpose'],
+}
+
+# 역변환 (회전 90/270만 서로 반대이고 나머지는 자기 자신)
+INVERSE_TRANSFORMS = {name: name for name in DIHEDRAL_TRANSFORMS}
+INVERSE_TRANSFORMS[ROTATE_90] = ROTATE_270
+INVERSE_TRANSFORMS[ROTATE_270] = ROTATE_90
+
+# 결과 테이블에 표시할 이름
+TRANSFORM_LABELS = {
+    FLIP_HORIZONTAL: 'Mirrored',
+    FLIP_VERTICAL: 'Flipped vertically',
+    ROTATE_90: 'Rotated 90°',
+    ROTATE_180: 'Rotated 180°',
+    ROTATE_270: 'Rotated 270°',
+    TRANSPOSE: 'Rotated 90°, mirrored',
+    TRANSVERSE: 'Rotated 270°, mirrored',
+}
+
+def transforms_for_shape(shape, rotation_matching: bool = True) -> List[str]:
+    """
+    원본을 제외하고 비교할 변환 목록을 반환합니다.
+    회전/전치는 크기가 바뀌지 않는 정사각형 프레임에서만 사용하고, rotation_matching이 꺼져 있으면 좌우 반전만 사용합니다.
+    """
+    if not rotation_matching or len(shape) < 2 or shape[0] != shape[1]:
+        return [FLIP_HORIZONTAL]
+    return DIHEDRAL_TRANSFORMS[1:]
+
+def apply_transform(array: np.ndarray, name: str) -> np.ndarray:
+    """2차원 배열(프레임/이미지)에 변환을 적용합니다."""
+    for primitive in _PRIMITIVES[name]:
+        if primitive == 'flip_h':
+            array = array[:, ::-1]
+        elif primitive == 'flip_v':
+            array = array[::-1, :]
+        else:
+            array = array.T
+    return np.ascontiguousarray(array)
+
+def transform_dct_coefficients(coefficients: np.ndarray, name: str) -> np.ndarray:
+    """
+    DCT-II 계수 행렬을, 입력 이미지에 같은 변환을 적용했을 때의 계수로 바꿉니다.
+    좌우 반전은 열 주파수 v에 (-1)^v, 상하 반전은 행 주파수 u에 (-1)^u를 곱하는 것과 같고
+    전치는 계수 행렬의 전치와 같으므로, DCT를 다시 계산하지 않아도 됩니다.
+    """
+    rows, cols = coefficients.shape
+    row_signs = np.where(np.arange(rows) % 2, -1.0, 1.0).reshape(-1, 1)
+    col_signs = np.where(np.arange(cols) % 2, -1.0, 1.0).reshape(1, -1)
+    for primitive in _PRIMITIVES[name]:
+        if primitive == 'flip_h':
+            coefficients = coefficients * col_signs
+        elif primitive == 'flip_v':
+            coefficients = coefficients * row_signs
+        else:
+            coefficients = coefficients.T
+            row_signs, col_signs = col_signs.reshape(-1, 1), row_signs.reshape(1, -1)
+    return coefficients
+
+def transform_frames(frames: List[np.ndarray], name: str) -> List[np.ndarray]:
+    """프레임 목록 전체에 변환을 적용합니다 (None 프레임은 그대로 둠)"""
+    return [apply_transform(frame, name) if frame is not None else None for frame in frames]
+
+def variant_frames(frames: List[np.ndarray], names: List[str]) -> Dict[str, List[np.ndarray]]:
+    """변환 이름 -> 변환된 프레임 목록"""
+    return {name: transform_frames(frames, name) for name in names}
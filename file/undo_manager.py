@@ -413,9 +413,10 @@ class UndoManager(QObject):
             self.show_message(warn_msg, 'warning')
             
         # 배치 작업을 Undo 스택에 추가
+        successful_delete_set = set(successful_deletes)
         batch_action = {
             'type': 'batch_delete',
-            'items': [action for action in delete_actions if action.get('deleted_path') in successful_deletes],
+            'items': [action for action in delete_actions if action.get('deleted_path') in successful_delete_set],
             'timestamp': time.time()
         }
         self.actions.append(batch_action)
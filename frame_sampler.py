@@ -0,0 +1,175 @@
+import os
+import numpy as np
+from typing import Callable, List, Optional, Tuple
+from crop_detector import CROP_ANALYSIS_SIZE, CropBox, crop_and_resize, detect_crop_box
+
+class FrameSampler:
+    """
+    비디오 컨테이너를 한 번만 열어 여러 위치의 프레임을 샘플링하는 클래스.
+    목표 위치의 프레임이 어둡거나 단색이면(페이드 인/아웃, 장면 전환 등) 같은 컨테이너 안에서
+    주변 위치를 가까운 순서로 탐색해 처음 나오는 정보가 있는 프레임을 사용합니다.
+    프레임은 저해상도(CROP_ANALYSIS_SIZE)로 먼저 추출하여, 필요하면 검은 띠를 찾아 잘라낸 뒤 시그니처 크기로 줄입니다.
+    """
+
+    # 평균 밝기가 이 값 미만이면 어두운 프레임 (VideoProcessor.is_frame_too_dark와 같은 기준)
+    DARK_THRESHOLD = 20
+    # 밝기 표준편차가 이 값 미만이면 단색에 가까운 프레임
+    MIN_STD = 4.0
+    # 주변 탐색 간격: 비디오 길이의 백분율 (짧은 비디오는 MIN_PROBE_STEP_SECONDS 사용)
+    PROBE_STEP_PERCENT = 1.5
+    MIN_PROBE_STEP_SECONDS = 0.5
+    # 목표 위치 앞뒤로 탐색할 최대 횟수 (앞/뒤 번갈아 가며)
+    MAX_PROBES = 6
+    # 키프레임으로 이동한 뒤 목표 시각까지 디코딩할 최대 프레임 수
+    # (키프레임 간격이 긴 비디오도 목표 시각에 닿도록 x264 기본 GOP 크기 250보다 크게 설정)
+    MAX_DECODE_FRAMES = 300
+    # 파일 하나에서 모든 위치/주변 탐색을 합쳐 디코딩할 최대 프레임 수
+    # 다 쓰면 남은 위치는 목표 시각 앞의 키프레임만 디코딩 (키프레임 간격이 긴 파일이 제한 시간에 걸리지 않도록)
+    MAX_FILE_DECODE_FRAMES = 1200
+
+    def is_informative(self, frame: np.ndarray) -> bool:
+        """프레임이 비교에 쓸 만큼 밝고 내용이 있는지 확인합니다."""
+        return float(np.mean(frame)) >= self.DARK_THRESHOLD and float(np.std(frame)) >= self.MIN_STD
+
+    def sample(self, video_path: str, positions_percent: List[float], output_size=(16, 16),
+               additional_positions: Optional[List[float]] = None, min_frames: int = 3,
+               frame_similarity: Optional[Callable[[np.ndarray, np.ndarray], float]] = None,
+               duplicate_similarity: float = 95.0,
+               auto_crop: bool = False) -> Tuple[Optional[List[np.ndarray]], Optional[CropBox]]:
+        """
+        컨테이너를 한 번 열어 각 위치에서 정보가 있는 프레임을 추출합니다.
+
+        매개변수:
+            positions_percent: 프레임을 추출할 위치 백분율 목록
+            additional_positions: 추출한 프레임이 min_frames보다 적을 때 추가로 시도할 위치
+            frame_similarity: 추가 위치의 프레임이 기존 프레임과 중복인지 판단할 유사도 함수
+            duplicate_similarity: 이 값보다 유사하면 추가 프레임을 중복으로 보고 버림
+            auto_crop: 샘플 프레임들에서 레터박스/필러박스를 찾아 잘라낼지 여부
+
+        반환값:
+            (프레임 목록 (그레이스케일), 실제 영상 영역) - 파일을 열 수 없으면 프레임 목록이 None
+            auto_crop이 꺼져 있으면 영상 영역은 None
+        """
+        self._decode_budget = self.MAX_FILE_DECODE_FRAMES
+        try:
+            import av
+            with av.open(video_path) as container:
+                stream = next((s for s in container.streams if s.type == 'video'), None)
+                if stream is None:
+                    return None, None
+                duration = self._get_duration(container, stream)
+                if duration <= 0:
+                    return None, None
+
+                frames = []
+                for pos in positions_percent:
+                    frame = self._sample_position(container, stream, duration, pos)
+                    if frame is not None:
+                        frames.append(frame)
+
+                if len(frames) < min_frames and additional_positions:
+                    for pos in additional_positions:
+                        if pos in positions_percent:
+                            continue
+                        frame = self._sample_position(container, stream, duration, pos)
+                        if frame is None:
+                            continue
+                        if frame_similarity is not None and any(
+                                frame_similarity(existing, frame) > duplicate_similarity for existing in frames):
+                            continue
+                        frames.append(frame)
+                        if len(frames) >= min_frames:
+                            break
+                if self._decode_budget <= 0:
+                    print(f"디코딩 프레임 한도({self.MAX_FILE_DECODE_FRAMES}) 도달, 일부 위치는 키프레임 사용: {os.path.basename(video_path)}")
+        except Exception as e:
+            print(f"프레임 샘플링 오류: {os.path.basename(video_path)} - {e}")
+            return None, None
+
+        crop_box = None
+        if auto_crop:
+            crop_box = detect_crop_box(frames)
+            if not crop_box.is_full:
+                print(f"검은 띠 제외 영역: {os.path.basename(video_path)} - {crop_box}")
+        return [crop_and_resize(frame, crop_box, output_size) for frame in frames], crop_box
+
+    @staticmethod
+    def _get_duration(container, stream) -> float:
+        """스트림 길이(초), 없으면 컨테이너 길이를 사용합니다."""
+        if stream.duration is not None and stream.time_base is not None:
+            return float(stream.duration * stream.time_base)
+        if container.duration is not None:
+            import av
+            return container.duration / av.time_base
+        return 0.0
+
+    def _probe_offsets(self, duration: float) -> List[float]:
+        """목표 위치 기준 탐색 오프셋(초)을 가까운 순서로 반환합니다: +1, -1, +2, -2, ..."""
+        step = max(duration * self.PROBE_STEP_PERCENT / 100.0, self.MIN_PROBE_STEP_SECONDS)
+        offsets = []
+        for k in range(1, self.MAX_PROBES // 2 + 1):
+            offsets.extend([k * step, -k * step])
+        return offsets[:self.MAX_PROBES]
+
+    def _sample_position(self, container, stream, duration: float, position_percent: float) -> Optional[np.ndarray]:
+        """
+        목표 위치의 프레임을 추출하고, 정보가 없으면 주변 위치를 탐색합니다.
+        모든 후보가 어두우면 그중 가장 정보가 많은(표준편차가 큰) 프레임을 반환합니다.
+        """
+        # 마지막 프레임 근처는 탐색이 실패하기 쉬우므로 끝에서 약간 앞쪽으로 제한
+        last_position = max(duration - self.MIN_PROBE_STEP_SECONDS, 0.0)
+        target = min(duration * position_percent / 100.0, last_position)
+        best_frame = None
+        best_std = -1.0
+        for offset in [0.0] + self._probe_offsets(duration):
+            position = target + offset
+            if position < 0 or position > last_position:
+                continue
+            frame = self._decode_at(container, stream, position)
+            if frame is None:
+                continue
+            if self.is_informative(frame):
+                if offset:
+                    print(f"어두운 프레임 대신 주변 프레임 사용: {position_percent}% 위치, {offset:+.1f}초")
+                return frame
+            frame_std = float(np.std(frame))
+            if best_frame is None or frame_std > best_std:
+                best_frame, best_std = frame, frame_std
+        return best_frame
+
+    def _decode_at(self, container, stream, position_seconds: float) -> Optional[np.ndarray]:
+        """
+        열려 있는 컨테이너에서 position_seconds 이후 첫 프레임을 분석 크기로 디코딩합니다 (앞쪽 키프레임으로 이동 후 디코딩).
+        파일당 디코딩 한도를 다 쓴 뒤에는 이동한 키프레임만 디코딩해 사용합니다.
+        """
+        # sample()을 거치지 않고 호출된 경우에도 동작하도록 기본값 사용
+        budget = getattr(self, '_decode_budget', self.MAX_FILE_DECODE_FRAMES)
+        max_frames = min(self.MAX_DECODE_FRAMES, budget) if budget > 0 else 1
+        decoded = 0
+        try:
+            timestamp = int(position_seconds / stream.time_base)
+            if stream.start_time is not None:
+                timestamp += stream.start_time
+            container.seek(timestamp, any_frame=False, backward=True, stream=stream)
+            last_frame = None
+            for frame in container.decode(stream):
+                if decoded >= max_frames:
+                    break
+                decoded += 1
+                last_frame = frame
+                if frame.time is not None and frame.time >= position_seconds + self._start_seconds(stream):
+                    break
+            if last_frame is None:
+                return None
+            return np.array(last_frame.to_image().resize(CROP_ANALYSIS_SIZE).convert('L'))
+        except Exception as e:
+            print(f"프레임 디코딩 오류 ({position_seconds:.1f}초): {e}")
+            return None
+        finally:
+            self._decode_budget = budget - decoded
+
+    @staticmethod
+    def _start_seconds(stream) -> float:
+        if stream.start_time is None:
+            return 0.0
+        return float(stream.start_time * stream.time_base)
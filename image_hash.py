@@ -0,0 +1,271 @@
+import numpy as np
+import imagehash
+from PIL import Image
+from typing import Dict, Hashable, List, Optional, Tuple
+from dihedral import IDENTITY, DIHEDRAL_TRANSFORMS, transform_dct_coefficients
+from video_hash_index import HASH_BITS, HammingIndex
+
+def compute_dihedral_phashes(img: Image.Image, hash_size: int = 8, highfreq_factor: int = 4,
+                             transforms: Optional[List[str]] = None) -> Dict[str, imagehash.ImageHash]:
+    """
+    imagehash.phash와 같은 방식으로 이미지의 perceptual hash를 계산하되,
+    32x32 DCT를 한 번만 계산하고 계수의 부호/전치만 바꿔 8가지 회전/반전 변환의 해시를 함께 만듭니다.
+
+    반환값:
+        변환 이름 -> ImageHash (IDENTITY 해시는 imagehash.phash와 같음)
+    """
+    import scipy.fftpack
+    transforms = transforms or DIHEDRAL_TRANSFORMS
+    img_size = hash_size * highfreq_factor
+    pixels = np.asarray(img.convert('L').resize((img_size, img_size), Image.LANCZOS))
+    dct = scipy.fftpack.dct(scipy.fftpack.dct(pixels, axis=0), axis=1)
+    low_freq = dct[:hash_size, :hash_size]
+    hashes = {}
+    for name in transforms:
+        coefficients = transform_dct_coefficients(low_freq, name)
+        hashes[name] = imagehash.ImageHash(coefficients > np.median(coefficients))
+    return hashes
+
+def image_hash_to_int(image_hash: imagehash.ImageHash) -> int:
+    """ImageHash의 비트 배열을 정수로 변환합니다 (해밍 인덱스용)"""
+    return int.from_bytes(np.packbits(image_hash.hash.flatten()).tobytes(), byteorder='big')
+
+class ImageGroupIndex:
+    """
+    그룹 대표 이미지의 해시를 해밍 인덱스에 넣고, 새 이미지의 변환 해시들로 속할 그룹을 찾는 클래스.
+    여러 그룹이 가까우면 가장 먼저 만들어진 그룹을 고르므로, 대표 해시를 순서대로 비교하던 방식과 결과가 같습니다.
+    64비트가 아닌 해시는 인덱스 대신 모든 대표 해시와 비교합니다.
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        self.index = HammingIndex(max_distance)
+        self.group_hashes: Dict[Hashable, imagehash.ImageHash] = {}
+        self.group_order: Dict[Hashable, int] = {}
+
+    def add(self, group_key: Hashable, image_hash: imagehash.ImageHash):
+        self.group_order[group_key] = len(self.group_order)
+        self.group_hashes[group_key] = image_hash
+        if image_hash.hash.size == HASH_BITS:
+            self.index.add(group_key, image_hash_to_int(image_hash))
+
+    def _candidates(self, image_hash: imagehash.ImageHash):
+        if image_hash.hash.size == HASH_BITS:
+            return self.index.query(image_hash_to_int(image_hash))
+        return self.group_hashes.keys()
+
+    def find(self, variant_hashes: Dict[str, imagehash.ImageHash]) -> Optional[Tuple[Hashable, int, str]]:
+        """
+        변환 해시 중 하나라도 대표 해시와 거리가 max_distance 이하인 가장 먼저 만들어진 그룹을 찾습니다.
+
+        반환값:
+            (그룹 키, 해시 거리, 일치한 변환 이름) 또는 없으면 None
+            같은 그룹에 여러 변환이 일치하면 거리가 가장 작은 변환 (동점이면 원본 우선)
+        """
+        best = None
+        for name, image_hash in variant_hashes.items():
+            for group_key in self._candidates(image_hash):
+                distance = image_hash - self.group_hashes[group_key]
+                if distance > self.max_distance:
+                    continue
+                rank = (self.group_order[group_key], distance, name != IDENTITY)
+                if best is None or rank < best[0]:
+                    best = (rank, group_key, distance, name)
+        if best is None:
+            return None
+        _, group_key, distance, name = best
+        return group_key, distance, name
+
+def popcount64(values: np.ndarray) -> np.ndarray:
+    """uint64 배열의 원소별 1비트 수 (NumPy 2의 bitwise_count가 없으면 바이트 단위로 계산)"""
+    values = np.asarray(values, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    bits = np.unpackbits(np.ascontiguousarray(values).view(np.uint8).reshape(values.shape + (8,)), axis=-1)
+    return bits.sum(axis=-1, dtype=np.uint8)
+
+class ImagePairIndex:
+    """
+    스캔한 모든 이미지의 변환 해시를 보관하고, 해시 거리가 max_distance 이하인 이미지 쌍을 기록하는 클래스
+    (임계값을 바꿔 다시 그룹화할 때 파일을 다시 열지 않음).
+    add()는 해시만 저장하고, 쌍은 collect_pairs()(또는 처음 pairs()를 부를 때)에서 새로 추가된 이미지에 대해 한 번에 찾습니다.
+    64비트 해시를 16비트 대역 4개로 나누면 거리가 max_distance 이하인 두 해시는 적어도 한 대역에서
+    max_distance // 4비트 이하만 다르므로, 대역 값별 이미지 목록(정렬된 배열)에서 그만큼 비트를 바꾼 값들의 후보를
+    NumPy로 블록 단위로 펼치고 실제 거리를 계산합니다 (이미지마다 Python으로 후보를 찾으면 스캔이 크게 느려짐).
+    쌍의 거리는 ImageGroupIndex와 같이 앞 이미지의 원본 해시와 뒤 이미지의 변환 해시 중 가장 가까운 거리입니다.
+    """
+    BAND_COUNT = 4
+    BAND_BITS = HASH_BITS // BAND_COUNT
+    # 후보 쌍을 한 번에 펼치는 최대 개수 (메모리 사용량 제한)
+    CANDIDATE_BLOCK = 1 << 21
+    # 한 번에 조회하는 뒤 이미지 수 (작을수록 앞 이미지 후보만 펼쳐 버리는 후보가 줄어듦)
+    QUERY_ROWS = 4096
+    # group()에서 NumPy로 한 번에 결정하는 단계 수 (대부분의 그룹은 몇 단계 안에 결정되고, 남은 사슬만 순서대로 처리)
+    GROUP_ROUNDS = 16
+
+    def __init__(self, max_distance: int, transforms: Optional[List[str]] = None):
+        self.max_distance = max(0, min(max_distance, HASH_BITS - 1))
+        self.transforms = list(transforms or [IDENTITY])  # 해시 열 순서 (원본이 첫 열)
+        self.paths: List[str] = []
+        self._hashes = np.zeros((1024, len(self.transforms)), dtype=np.uint64)
+        band_mask = (1 << self.BAND_BITS) - 1
+        self._bands = [(band * self.BAND_BITS, band_mask) for band in range(self.BAND_COUNT)]
+        # 대역 하나에서 허용하는 차이 비트 패턴 (0 포함)
+        max_band_errors = self.max_distance // self.BAND_COUNT
+        self._flip_masks = np.array([mask for mask in range(1 << self.BAND_BITS) if bin(mask).count('1') <= max_band_errors],
+                                    dtype=np.int64)
+        self._collected = 0  # 쌍을 이미 찾은 이미지 수
+        # 기록한 쌍: (앞 이미지 번호, 뒤 이미지 번호, 거리, 변환 열 번호) 배열 조각 - 뒤 이미지, 앞 이미지 순으로 정렬됨
+        self._pair_chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        self._pairs: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self):
+        return len(self.paths)
+
+    def add(self, path: str, variant_hashes: Dict[str, imagehash.ImageHash]) -> bool:
+        """이미지의 변환 해시를 추가합니다 (64비트가 아닌 해시는 추가하지 않고 False)."""
+        if any(variant_hashes[name].hash.size != HASH_BITS for name in self.transforms if name in variant_hashes):
+            return False
+        identity_value = image_hash_to_int(variant_hashes[IDENTITY])
+        index = len(self.paths)
+        if index == len(self._hashes):
+            self._hashes = np.concatenate([self._hashes, np.zeros_like(self._hashes)])
+        self._hashes[index] = [image_hash_to_int(variant_hashes[name]) if name in variant_hashes else identity_value
+                               for name in self.transforms]
+        self.paths.append(path)
+        return True
+
+    def collect_pairs(self):
+        """마지막 호출 이후 추가된 이미지와 앞선 이미지들의 가까운 쌍을 찾아 기록합니다 (스캔 스레드에서 호출)."""
+        count, first_new = len(self.paths), self._collected
+        if first_new >= count:
+            return
+        hashes = self._hashes[:count]
+        identity = hashes[:, 0]
+        rows_per_block = max(1, min(self.QUERY_ROWS, self.CANDIDATE_BLOCK // len(self._flip_masks)))
+        found = []
+        for start, mask in self._bands:
+            band_values = ((identity >> np.uint64(start)) & np.uint64(mask)).astype(np.int64)
+            # 대역 값별 이미지 목록 (버킷 안은 이미지 번호 순): order[bucket_starts[v]:bucket_starts[v] + 크기]
+            order = np.argsort(band_values, kind='stable')
+            all_sizes = np.bincount(band_values, minlength=mask + 1)
+            bucket_starts = np.cumsum(all_sizes) - all_sizes
+            for row in range(first_new, count, rows_per_block):
+                row_end = min(row + rows_per_block, count)
+                # 이 블록의 뒤 이미지보다 앞에 추가된 이미지만 후보이므로 버킷의 앞부분만 펼침
+                bucket_sizes = np.bincount(band_values[:row_end], minlength=mask + 1)
+                for column in range(hashes.shape[1]):
+                    query_values = ((hashes[row:row_end, column] >> np.uint64(start)) & np.uint64(mask)).astype(np.int64)
+                    keys = (query_values[:, None] ^ self._flip_masks[None, :]).ravel()
+                    sizes = bucket_sizes[keys]
+                    probes = np.flatnonzero(sizes)
+                    if len(probes):
+                        found.extend(self._match_probes(identity, hashes[:, column], column,
+                                                        row + probes // len(self._flip_masks),
+                                                        order, bucket_starts[keys[probes]], sizes[probes]))
+
+        self._collected = count
+        if not found:
+            return
+        earlier, later, distances, columns = (np.concatenate(values) for values in zip(*found))
+        # 여러 대역/변환에서 찾은 같은 쌍 중 거리가 가장 작은 변환 하나만 남김 (동점이면 앞쪽 변환 - 원본 우선, ImageGroupIndex와 같은 규칙)
+        # 가장 가까운 변환의 해시로 조회하면 반드시 그 쌍을 찾으므로 변환별 거리만 계산해도 결과가 같음
+        order = np.lexsort((columns, distances, earlier, later))
+        earlier, later, distances, columns = earlier[order], later[order], distances[order], columns[order]
+        unique = np.ones(len(order), dtype=bool)
+        unique[1:] = (earlier[1:] != earlier[:-1]) | (later[1:] != later[:-1])
+        self._pair_chunks.append((earlier[unique], later[unique], distances[unique], columns[unique]))
+        self._pairs = None
+
+    def _match_probes(self, identity: np.ndarray, query_hashes: np.ndarray, column: int, later: np.ndarray,
+                      order: np.ndarray, starts: np.ndarray, sizes: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """대역 조회 결과(뒤 이미지별 버킷 위치/크기)를 CANDIDATE_BLOCK개씩 후보 쌍으로 펼쳐 column 변환의 거리가 max_distance 이하인 쌍만 반환"""
+        found = []
+        ends = np.cumsum(sizes)
+        split_at = np.searchsorted(ends, np.arange(self.CANDIDATE_BLOCK, int(ends[-1]), self.CANDIDATE_BLOCK), side='right')
+        for block in np.split(np.arange(len(sizes)), split_at):
+            if not len(block):
+                continue
+            block_sizes = sizes[block]
+            block_offsets = np.cumsum(block_sizes) - block_sizes
+            positions = np.repeat(starts[block] - block_offsets, block_sizes) + np.arange(int(block_sizes.sum()))
+            earlier = order[positions]
+            later_images = np.repeat(later[block], block_sizes)
+            earlier_first = earlier < later_images
+            earlier, later_images = earlier[earlier_first], later_images[earlier_first]
+            distances = popcount64(identity[earlier] ^ query_hashes[later_images])
+            close = distances <= self.max_distance
+            if close.any():
+                found.append((earlier[close].astype(np.int32), later_images[close].astype(np.int32),
+                              distances[close].astype(np.uint8), np.full(int(close.sum()), column, dtype=np.uint8)))
+        return found
+
+    def pairs(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """기록한 모든 쌍 (앞 이미지 번호, 뒤 이미지 번호, 거리, 변환 열 번호) 배열"""
+        self.collect_pairs()
+        if self._pairs is None:
+            if self._pair_chunks:
+                self._pairs = tuple(np.concatenate(columns) for columns in zip(*self._pair_chunks))
+                self._pair_chunks = [self._pairs]
+            else:
+                self._pairs = (np.zeros(0, np.int32), np.zeros(0, np.int32), np.zeros(0, np.uint8), np.zeros(0, np.uint8))
+        return self._pairs
+
+    def group(self, threshold: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        거리가 threshold 이하인 쌍만으로 스캔과 같은 규칙(추가 순서대로, 가까운 그룹 중 가장 먼저 만들어진 그룹에 합류)으로 그룹화합니다.
+        threshold가 max_distance 이하이면 같은 임계값으로 스캔한 결과와 같습니다.
+        앞쪽 후보가 모두 결정된 이미지들을 한 번에 결정하는 단계를 NumPy로 몇 번 반복한 뒤 남은 이미지만 순서대로 처리합니다.
+
+        반환값:
+            멤버별 (대표 이미지 번호, 멤버 이미지 번호, 해시 거리, 변환 열 번호) 배열 - 대표 번호(그룹이 만들어진 순서), 멤버 번호 순으로 정렬
+        """
+        first, second, distance, transform = self.pairs()
+        keep = distance <= threshold
+        first, second = first[keep].astype(np.int64), second[keep].astype(np.int64)
+        distance, transform = distance[keep], transform[keep]
+        pair_index = np.arange(len(first))
+        # 이미지 상태: 0 미결정, 1 대표(그룹을 만든 이미지), 2 멤버 - 앞쪽 후보가 없는 이미지는 대표
+        state = np.ones(len(self.paths), dtype=np.uint8)
+        state[second] = 0
+        joined = []  # 결정된 멤버의 쌍 번호 배열 목록
+
+        for _ in range(self.GROUP_ROUNDS):
+            if not len(pair_index):
+                break
+            later = second[pair_index]
+            # 이미지별로 멤버가 아닌 첫 후보 (쌍이 (뒤, 앞) 순으로 정렬되어 있으므로 가장 먼저 만들어진 그룹 후보)
+            open_pairs = pair_index[state[first[pair_index]] != 2]
+            open_later = second[open_pairs]
+            is_head = np.ones(len(open_pairs), dtype=bool)
+            is_head[1:] = open_later[1:] != open_later[:-1]
+            head_pairs = open_pairs[is_head]
+            # 첫 후보가 대표이면 그 그룹에 합류, 모든 후보가 멤버이면 새 그룹의 대표 (첫 후보가 미결정이면 다음 단계로)
+            joining = head_pairs[state[first[head_pairs]] == 1]
+            state[second[joining]] = 2
+            joined.append(joining)
+            leaders = later[state[later] == 0]
+            state[leaders[~np.isin(leaders, open_later)]] = 1
+            pair_index = pair_index[state[later] == 0]
+
+        if len(pair_index):
+            # 연속 촬영처럼 앞 이미지에 차례로 의존하는 사슬이 남으면 남은 쌍만 순서대로 처리
+            remaining_later = second[pair_index]
+            starts = np.flatnonzero(np.r_[True, remaining_later[1:] != remaining_later[:-1]]).tolist()
+            images = remaining_later[starts].tolist()
+            starts.append(len(pair_index))
+            candidates = first[pair_index].tolist()
+            is_member = bytearray(state == 2)
+            tail = []
+            for n, image in enumerate(images):
+                for k in range(starts[n], starts[n + 1]):
+                    # 앞쪽 이미지는 모두 결정되었으므로 멤버가 아니면 대표
+                    if not is_member[candidates[k]]:
+                        is_member[image] = 1
+                        tail.append(k)
+                        break
+            joined.append(pair_index[np.array(tail, dtype=np.int64)])
+
+        members = np.concatenate(joined) if joined else np.zeros(0, dtype=np.int64)
+        members = members[np.lexsort((second[members], first[members]))]
+        return first[members], second[members], distance[members], transform[members]
@@ -1,20 +1,33 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import imagehash
 from typing import List, Dict, Optional, Set, Tuple
 from PyQt5.QtCore import QObject, pyqtSignal
 import numpy as np # NumPy 임포트
-import rawpy # rawpy 임포트
 # 비디오 처리 임포트 추가
-from video_processor import VideoProcessor
+from video_processor import VideoProcessor, start_acceleration_warm_up
 from video_duplicate_finder import VideoDuplicateFinder
+from same_file_finder import SameFileFinder
+from animation_reader import AnimationReader
+from animation_header import read_animation_header
+from crop_detector import detect_image_crop_box
+from image_hash import compute_dihedral_phashes, ImageGroupIndex, ImagePairIndex
+from dihedral import DIHEDRAL_TRANSFORMS, IDENTITY, INVERSE_TRANSFORMS
+from thumbnail_cache import shared_thumbnail_cache
 # 파일 형식 정의 모듈 임포트
 from supported_formats import (
     STATIC_IMAGE_FORMATS, RAW_EXTENSIONS, VIDEO_ANIMATION_EXTENSIONS, 
     ALL_SUPPORTED_FORMATS, HASH_THRESHOLD, VIDEO_SIMILARITY_THRESHOLD,
-    FRAME_CHECK_FORMATS, VIDEO_ONLY_EXTENSIONS
+    FRAME_CHECK_FORMATS, VIDEO_ONLY_EXTENSIONS, IMAGE_AUTO_CROP,
+    IMAGE_ROTATION_MATCHING, THUMBNAIL_CACHE_FROM_SCAN, LIVE_REGROUPING, REGROUP_MAX_HASH_DISTANCE
 )
 
+# 스캔 중 인코딩을 기다리는 썸네일의 최대 수 (넘으면 스캔 스레드가 잠시 기다림)
+SCAN_THUMBNAIL_QUEUE_SIZE = 64
+
 # 기존 중복 정의 제거하고 임포트된 상수 사용
 SUPPORTED_FORMATS = STATIC_IMAGE_FORMATS.union(RAW_EXTENSIONS)
 VIDEO_EXTENSIONS = VIDEO_ONLY_EXTENSIONS
@@ -27,10 +40,10 @@ ALL_SUPPORTED_FORMATS = STATIC_IMAGE_FORMATS.union(RAW_EXTENSIONS).union(VIDEO_O
 # 비디오 유사도 임계값 - 모듈에서 임포트함으로 제거
 # VIDEO_SIMILARITY_THRESHOLD = 85.0
 
-# 새로운 시그널 데이터 타입 정의 (가독성 위해)
+# 새로운 시그널 데이터 타입 정의 (가독성 위해, 재그룹화 모듈과 함께 사용)
 # List[Tuple[str, List[Tuple[str, int]]]]
 # -> 대표 파일 경로, [(멤버 파일 경로, 대표와의 유사도 점수), ...]
-DuplicateGroupWithSimilarity = List[Tuple[str, List[Tuple[str, int]]]]
+from regrouping import DuplicateGroupWithSimilarity, ScanRegrouper, image_duplicate_groups, video_duplicate_groups
 
 class ScanWorker(QObject):
     """별도 스레드에서 이미지와 비디오 스캔 작업을 수행하는 워커"""
@@ -39,6 +52,8 @@ class ScanWorker(QObject):
     # scan_finished 시그널의 세 번째 인자 타입을 list로 유지 (내부 데이터 구조 변경)
     scan_finished = pyqtSignal(int, int, list) # 총 파일 수, 스캔 완료 수, 중복 그룹 정보 전달
     error_occurred = pyqtSignal(str) # 오류 메시지 전달
+    # 스캔 보고서 (같은 파일 그룹 등 중복 그룹 외의 부가 정보), scan_finished 직전에 전달
+    scan_report_ready = pyqtSignal(dict)
 
     def __init__(self, folder_path: str, include_subfolders: bool = False, hash_size: int = 8):
         super().__init__()
@@ -47,7 +62,22 @@ class ScanWorker(QObject):
         self.hash_size = hash_size
         self._is_running = True # 외부에서 중단 요청 가능하도록 플래그 추가 (선택적)
         # 비디오 처리 객체 초기화
-        self.video_finder = VideoDuplicateFinder()
+        # 비디오 시그니처는 작업자 프로세스 풀에서 추출 (파일별 제한 시간 초과 시 강제 종료)
+        self.video_finder = VideoDuplicateFinder(use_process_pool=True)
+        # 하드링크/심볼릭 링크 사전 검사용 객체
+        self.same_file_finder = SameFileFinder()
+        # 스캔 보고서 (scan_report_ready 시그널로 전달)
+        self.scan_report: Dict[str, object] = {}
+        # 애니메이션 파일을 한 번만 열어 분류와 프레임 샘플링을 함께 처리하는 객체
+        self.animation_reader = AnimationReader()
+        # 분류 단계에서 미리 계산한 정적 이미지 해시 (파일 경로 -> 해시, 해시 단계에서 파일 재열기 방지)
+        # (값은 변환 이름 -> ImageHash, 회전/반전된 사본을 찾기 위한 변환 해시 포함)
+        self.precomputed_hashes: Dict[str, Dict[str, imagehash.ImageHash]] = {}
+        # 해시 계산을 위해 연 이미지로 채우는 디스크 썸네일 캐시 (그룹 썸네일 보기에서 다시 디코딩하지 않도록)
+        self.thumbnail_cache = shared_thumbnail_cache() if THUMBNAIL_CACHE_FROM_SCAN else None
+        # 썸네일 인코딩/저장은 작업자 스레드에서 처리해 다음 파일 디코딩과 겹치게 함 (대기 중인 썸네일 수 제한)
+        self._thumbnail_writer: Optional[ThreadPoolExecutor] = None
+        self._thumbnail_slots = threading.BoundedSemaphore(SCAN_THUMBNAIL_QUEUE_SIZE)
         
     def check_animation_frames(self, file_path):
         """
@@ -58,48 +88,136 @@ class ScanWorker(QObject):
             - False: 단일 프레임 이미지
             - None: 확인할 수 없음
         """
-        try:
-            _, ext = os.path.splitext(file_path.lower())
-            
-            # 프레임 검사가 필요한 포맷인 경우
-            if ext in FRAME_CHECK_FORMATS:
-                with Image.open(file_path) as img:
-                    # 여러 프레임이 있는지 확인
-                    try:
-                        # n_frames 속성이 있는 경우
-                        if hasattr(img, 'n_frames') and img.n_frames > 1:
-                            print(f"다중 프레임 애니메이션 감지됨: {os.path.basename(file_path)} ({img.n_frames}프레임)")
-                            return True
-                    except AttributeError:
-                        pass
-                    
-                    # seek 메서드로 확인 시도
-                    try:
-                        img.seek(1)  # 두 번째 프레임 확인
-                        print(f"다중 프레임 애니메이션 감지됨: {os.path.basename(file_path)} (seek 메서드)")
-                        img.seek(0)  # 첫 번째 프레임으로 되돌림
-                        return True
-                    except EOFError:
-                        # 두 번째 프레임이 없으면 단일 프레임 이미지
-                        return False
-            
-            # 프레임 검사가 필요 없는 포맷인 경우
+        _, ext = os.path.splitext(file_path.lower())
+        # 프레임 검사가 필요 없는 포맷인 경우
+        if ext not in FRAME_CHECK_FORMATS:
             return None
-            
+        # 헤더만 읽어 판단하고, 판단할 수 없을 때만 Pillow로 확인
+        header = read_animation_header(file_path)
+        if header is not None:
+            return header.is_animated
+        info = self.animation_reader.read(file_path)
+        if info is None:
+            return None
+        return info.is_animated
+
+    def _hash_opened_image(self, img_pil, file_ext, file_path=None):
+        """열려 있는 Pillow 이미지의 변환별 perceptual hash를 계산합니다 (실패 시 None, file_path가 있으면 썸네일 캐시도 채움)"""
+        try:
+            # WebP 이미지의 경우 RGB 모드로 변환하여 처리
+            if file_ext == '.webp' and img_pil.mode not in ('RGB', 'L'):
+                img_pil = img_pil.convert('RGB')
+            hashes = self._compute_image_hashes(img_pil)
         except Exception as e:
-            print(f"프레임 확인 중 오류: {file_path} - {e}")
+            print(f"해시 생성 중 오류: {img_pil.filename if hasattr(img_pil, 'filename') else ''} - {e}")
             return None
+        if file_path:
+            self._store_scan_thumbnail(file_path, img_pil)
+        return hashes
+
+    def _compute_image_hashes(self, img_pil):
+        """
+        레터박스/필러박스 검은 띠를 잘라낸 뒤(IMAGE_AUTO_CROP) perceptual hash를 계산합니다.
+        IMAGE_ROTATION_MATCHING이 켜져 있으면 8가지 회전/반전 변환의 해시를 DCT 한 번으로 함께 만듭니다.
+        
+        반환값:
+            변환 이름 -> ImageHash
+        """
+        if IMAGE_AUTO_CROP:
+            crop_box = detect_image_crop_box(img_pil)
+            if not crop_box.is_full:
+                print(f"이미지 검은 띠 제외 영역: {os.path.basename(getattr(img_pil, 'filename', '') or '')} - {crop_box}")
+                img_pil = crop_box.crop_image(img_pil)
+        transforms = DIHEDRAL_TRANSFORMS if IMAGE_ROTATION_MATCHING else [IDENTITY]
+        return compute_dihedral_phashes(img_pil, hash_size=self.hash_size, transforms=transforms)
+
+    def _store_scan_thumbnail(self, file_path, img_pil):
+        """
+        해시를 계산한 이미지로 썸네일 캐시를 채웁니다 (이미 캐시에 있으면 건너뜀).
+        이미지가 열려 있는 동안 스캔 스레드에서 썸네일 크기로 줄이고, 인코딩/저장은 작업자 스레드에 넘깁니다.
+        """
+        if self.thumbnail_cache is None:
+            return
+        try:
+            key = self.thumbnail_cache.cache_key(file_path)
+            if key is None or self.thumbnail_cache.contains(file_path):
+                return
+            thumb = self.thumbnail_cache.make_thumbnail(img_pil)
+        except Exception as e:
+            print(f"스캔 썸네일 생성 오류: {file_path} - {e}")
+            return
+        if self._thumbnail_writer is None:
+            self._thumbnail_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scan-thumbnail')
+        self._thumbnail_slots.acquire()
+        future = self._thumbnail_writer.submit(self.thumbnail_cache.put_thumbnail, file_path, thumb, key)
+        future.add_done_callback(lambda _: self._thumbnail_slots.release())
+
+    def _finish_scan_thumbnails(self):
+        """대기 중인 썸네일 저장이 끝날 때까지 기다립니다 (결과 표시 전에 캐시가 채워지도록)"""
+        if self._thumbnail_writer is not None:
+            self._thumbnail_writer.shutdown(wait=True)
+            self._thumbnail_writer = None
+
+    def classify_frame_check_file(self, file_path, file_ext, target_files, video_files):
+        """
+        프레임 검사가 필요한 파일(.webp, .gif 등)을 이미지/비디오로 분류합니다.
+        먼저 컨테이너 헤더(수 KB)만 읽어 판단하므로 폴더 탐색 중에는 프레임을 디코딩하지 않습니다.
+        헤더로 판단할 수 없을 때만 Pillow로 한 번 열어, 애니메이션이면 시그니처용 프레임을 함께 샘플링해
+        비디오 처리기에 넘기고 정적 이미지면 해시를 바로 계산해 두어 파일을 다시 열지 않습니다.
+        """
+        header = read_animation_header(file_path)
+        if header is not None:
+            if header.is_animated:
+                print(f"다중 프레임 애니메이션 감지됨 (헤더): {os.path.basename(file_path)}")
+                video_files.append(file_path)
+                self.video_finder.set_animation_header(file_path, header)
+            else:
+                target_files.append(file_path)
+            return
+        
+        # Pillow 대체 경로
+        info = self.animation_reader.read(
+            file_path,
+            self.video_finder.frame_positions,
+            self.video_finder.output_size,
+            static_image_handler=lambda img: self._hash_opened_image(img, file_ext, file_path)
+        )
+        if info is None:  # 알 수 없음, 확장자 기반으로 판단
+            if file_ext in ['.gif', '.apng']:  # 일반적으로 애니메이션
+                video_files.append(file_path)
+            else:  # 일반적으로 이미지
+                target_files.append(file_path)
+        elif info.is_animated:  # 애니메이션
+            video_files.append(file_path)
+            self.video_finder.set_animation_info(file_path, info)
+        else:  # 정적 이미지
+            target_files.append(file_path)
+            if info.static_result is not None:
+                self.precomputed_hashes[file_path] = info.static_result
 
     def run_scan(self):
         """이미지와 비디오 스캔 작업을 실행하여 중복 그룹 목록과 유사도 점수를 반환합니다."""
         # 해시를 키로, (파일 경로, 대표 해시와의 거리) 튜플 리스트를 값으로 갖는 딕셔너리
         hashes_to_files: Dict[imagehash.ImageHash, List[Tuple[str, int]]] = {}
+        # 그룹 대표 해시의 해밍 인덱스 (새 이미지의 모든 변환 해시로 검색)
+        group_index = ImageGroupIndex(HASH_THRESHOLD)
+        # 임계값을 바꿔 다시 그룹화할 때 쓰는 해시 거리 쌍 기록 (스캔 임계값보다 느슨한 거리까지)
+        image_pairs = None
+        if LIVE_REGROUPING:
+            image_pairs = ImagePairIndex(max(REGROUP_MAX_HASH_DISTANCE, HASH_THRESHOLD),
+                                         DIHEDRAL_TRANSFORMS if IMAGE_ROTATION_MATCHING else [IDENTITY])
+        video_duplicates = None
+        image_transforms: Dict[str, str] = {} # 회전/반전된 사본으로 그룹에 들어간 이미지 -> 대표 이미지 기준 변환
         # 이미 처리된(그룹에 포함된) 파일 경로 집합
         grouped_files: Set[str] = set()
         processed_files_count = 0 # 실제로 처리(해싱)된 파일 수
         total_target_files = 0 # 스캔 대상 확장자를 가진 총 파일 수
         target_files = [] # 스캔 대상 이미지 파일 목록
         video_files = [] # 비디오 파일 목록
+        self.scan_report = {} # 이번 스캔의 보고서 초기화
+        self.precomputed_hashes = {}
+        # 폴더를 훑는 동안 Numba 커널을 백그라운드에서 준비 (준비 전에는 NumPy로 비교)
+        start_acceleration_warm_up()
 
         try:
             # 파일 수집 전 메시지 보내기 - 0은 임시 총 파일 수
@@ -134,17 +252,8 @@ class ScanWorker(QObject):
                             video_files.append(file_path)
                         # 프레임 검사가 필요한 포맷 (.webp, .gif 등)
                         elif file_ext in FRAME_CHECK_FORMATS:
-                            # 프레임 수에 따라 이미지 또는 비디오로 분류
-                            is_animation = self.check_animation_frames(file_path)
-                            if is_animation is True:  # 애니메이션
-                                video_files.append(file_path)
-                            elif is_animation is False:  # 정적 이미지
-                                target_files.append(file_path)
-                            else:  # 알 수 없음, 확장자 기반으로 판단
-                                if file_ext in ['.gif', '.apng']:  # 일반적으로 애니메이션
-                                    video_files.append(file_path)
-                                else:  # 일반적으로 이미지
-                                    target_files.append(file_path)
+                            # 프레임 수에 따라 이미지 또는 비디오로 분류 (한 번 열어서 샘플링/해시까지 처리)
+                            self.classify_frame_check_file(file_path, file_ext, target_files, video_files)
             else:
                 # 현재 폴더의 파일만 수집 (기존 방식)
                 all_files_in_folder = os.listdir(self.folder_path)
@@ -165,18 +274,26 @@ class ScanWorker(QObject):
                         video_files.append(file_path)
                     # 프레임 검사가 필요한 포맷 (.webp, .gif 등)
                     elif file_ext in FRAME_CHECK_FORMATS:
-                        # 프레임 수에 따라 이미지 또는 비디오로 분류
-                        is_animation = self.check_animation_frames(file_path)
-                        if is_animation is True:  # 애니메이션
-                            video_files.append(file_path)
-                        elif is_animation is False:  # 정적 이미지
-                            target_files.append(file_path)
-                        else:  # 알 수 없음, 확장자 기반으로 판단
-                            if file_ext in ['.gif', '.apng']:  # 일반적으로 애니메이션
-                                video_files.append(file_path)
-                            else:  # 일반적으로 이미지
-                                target_files.append(file_path)
+                        # 프레임 수에 따라 이미지 또는 비디오로 분류 (한 번 열어서 샘플링/해시까지 처리)
+                        self.classify_frame_check_file(file_path, file_ext, target_files, video_files)
             
+            # 같은 실제 파일을 가리키는 경로(하드링크/심볼릭 링크)를 한 번의 사전 검사로 묶음
+            # -> 별칭 경로는 해시/시그니처 비교 대상에서 제외하고 '같은 파일' 그룹으로 따로 보고
+            unique_paths, same_file_groups = self.same_file_finder.group_same_files(target_files + video_files)
+            unique_path_set = set(unique_paths)
+            target_files = [path for path in target_files if path in unique_path_set]
+            video_files = [path for path in video_files if path in unique_path_set]
+            # 별칭 경로에 대해 분류 단계에서 미리 계산한 결과는 더 이상 필요 없으므로 정리
+            for alias_path in set(self.precomputed_hashes) - unique_path_set:
+                del self.precomputed_hashes[alias_path]
+            for alias_path in set(self.video_finder.animation_infos) - unique_path_set:
+                del self.video_finder.animation_infos[alias_path]
+            for alias_path in set(self.video_finder.animation_headers) - unique_path_set:
+                del self.video_finder.animation_headers[alias_path]
+            self.scan_report['same_file_groups'] = same_file_groups
+            if same_file_groups:
+                print(f"같은 파일 그룹 수: {len(same_file_groups)}")
+
             # 파일 수집이 완료된 후 최종 카운트 설정
             total_target_files = len(target_files) + len(video_files)
             self.scan_started.emit(total_target_files)
@@ -185,6 +302,7 @@ class ScanWorker(QObject):
             
             # 파일이 0개인 경우 바로 완료 처리
             if total_target_files == 0:
+                self.scan_report_ready.emit(self.scan_report)
                 self.scan_finished.emit(0, 0, [])
                 return
 
@@ -201,10 +319,14 @@ class ScanWorker(QObject):
                 file_ext = os.path.splitext(file_path)[1].lower()
                 img_pil = None 
                 raw_obj = None 
-                current_hash = None
+                # 분류 단계에서 이미 해시를 계산한 파일은 다시 열지 않음
+                current_hashes = self.precomputed_hashes.pop(file_path, None)
                 try:
                     # 파일 확장자에 따라 처리 분기
-                    if file_ext in RAW_EXTENSIONS:
+                    if current_hashes is not None:
+                        pass
+                    elif file_ext in RAW_EXTENSIONS:
+                        import rawpy  # rawpy는 RAW 파일을 처음 만났을 때 불러옴 (앱 시작 시간 단축)
                         try:
                             raw_obj = rawpy.imread(file_path)
                             # postprocess()로 RGB 이미지 데이터(NumPy 배열) 얻기
@@ -240,44 +362,44 @@ class ScanWorker(QObject):
                             except Exception as webp_err:
                                 print(f"WebP 변환 중 오류: {file_path} - {webp_err}")
 
-                    # img_pil 객체가 생성되었으면 해시 계산 진행
-                    if img_pil:
+                    # img_pil 객체가 생성되었거나 해시가 미리 계산되었으면 그룹 비교 진행
+                    if img_pil or current_hashes is not None:
                         processed_files_count += 1
                         
-                        # 모든 이미지 포맷에 대해 동일하게 perceptual hash 사용
-                        try:
-                            current_hash = imagehash.phash(img_pil, hash_size=self.hash_size)
-                        except Exception as hash_err:
-                            print(f"해시 생성 중 오류: {file_path} - {hash_err}")
-                            continue  # 해시 생성 실패 시 다음 파일로
+                        # 모든 이미지 포맷에 대해 동일하게 perceptual hash 사용 (회전/반전 변환 해시 포함)
+                        if current_hashes is None:
+                            try:
+                                current_hashes = self._compute_image_hashes(img_pil)
+                            except Exception as hash_err:
+                                print(f"해시 생성 중 오류: {file_path} - {hash_err}")
+                                continue  # 해시 생성 실패 시 다음 파일로
+                            # 이미 디코딩한 이미지로 썸네일 캐시도 채움
+                            self._store_scan_thumbnail(file_path, img_pil)
 
-                        found_group = False
-                        # 기존 해시 그룹들과 비교
-                        for existing_hash, file_list_with_similarity in hashes_to_files.items():
-                            # 대표 이미지 경로 확인
+                        # 재그룹화용 해시 보관 (쌍은 스캔 끝에 한 번에 찾음, 64비트가 아닌 해시는 기록할 수 없으므로 재그룹화 사용 안 함)
+                        if image_pairs is not None and not image_pairs.add(file_path, current_hashes):
+                            image_pairs = None
+                        # 모든 변환 해시로 대표 해시 인덱스를 검색해 가장 먼저 만들어진 그룹 선택
+                        match = group_index.find(current_hashes)
+                        if match is not None:
+                            existing_hash, similarity, transform = match
+                            file_list_with_similarity = hashes_to_files[existing_hash]
                             rep_path = file_list_with_similarity[0][0]
                             rep_ext = os.path.splitext(rep_path)[1].lower()
-                            
-                            # WebP 이미지 간 비교인 경우에도 일반 해시 거리 사용
-                            similarity = current_hash - existing_hash
-                            
-                            # WebP 파일 비교인 경우 디버깅을 위한 로그 추가
+                            # WebP 파일인 경우 로그 메시지 추가
                             if file_ext == '.webp' and rep_ext == '.webp':
-                                print(f"WebP 비교: {os.path.basename(file_path)} vs {os.path.basename(rep_path)}, 해시 거리: {similarity}")
-                            
-                            # 모든 이미지에 대해 동일한 임계값 적용
-                            if similarity <= HASH_THRESHOLD:
-                                # WebP 파일인 경우 로그 메시지 추가
-                                if file_ext == '.webp' and rep_ext == '.webp':
-                                    print(f"WebP 유사 이미지 추가: {os.path.basename(file_path)}, 유사도: {similarity}")
-                                file_list_with_similarity.append((file_path, similarity))
-                                grouped_files.add(file_path)
-                                found_group = True
-                                break
-
-                        # 유사 그룹 없으면 새로운 그룹 생성 (대표 파일, 유사도 0)
-                        if not found_group:
+                                print(f"WebP 유사 이미지 추가: {os.path.basename(file_path)}, 유사도: {similarity}")
+                            if transform != IDENTITY:
+                                # 이 이미지를 transform하면 대표 이미지가 되므로, 대표 기준으로는 역변환
+                                image_transforms[file_path] = INVERSE_TRANSFORMS[transform]
+                                print(f"회전/반전된 이미지: {os.path.basename(file_path)} ({image_transforms[file_path]}), 해시 거리: {similarity}")
+                            file_list_with_similarity.append((file_path, similarity))
+                            grouped_files.add(file_path)
+                        else:
+                            # 유사 그룹 없으면 새로운 그룹 생성 (대표 파일, 유사도 0)
+                            current_hash = current_hashes[IDENTITY]
                             hashes_to_files[current_hash] = [(file_path, 0)]
+                            group_index.add(current_hash, current_hash)
                 
                 except Exception as e:
                     # 파일 열기/처리 중 오류 발생 시 (처리된 파일 수에 포함 안 됨)
@@ -293,85 +415,71 @@ class ScanWorker(QObject):
                 # 진행률 업데이트 (처리된 파일 수 기준)
                 self.progress_updated.emit(i + 1)
             
+            # 회전/반전된 사본 정보 (이미지, 아래에서 비디오도 추가)
+            self.scan_report['transforms'] = image_transforms
+            scan_image_transforms = dict(image_transforms)
+
             # 비디오 파일 처리
             if video_files and self._is_running:
                 try:
                     # PyAV 라이브러리 확인
                     if VideoProcessor.check_av():
                         print("비디오 파일 처리 중...")
-                        # 비디오 중복 찾기 수행
-                        video_duplicates = self.video_finder.find_duplicates(video_files)
+                        image_file_count = len(target_files)
+                        # 비디오 중복 찾기 수행 (시그니처 추출이 끝날 때마다 진행률 갱신)
+                        video_duplicates = self.video_finder.find_duplicates(
+                            video_files,
+                            progress_callback=lambda done: self.progress_updated.emit(image_file_count + done),
+                            should_stop=lambda: not self._is_running
+                        )
                         
                         # 진행률 업데이트 (비디오 파일도 처리했으므로 전체 파일 수로 업데이트)
                         processed_files_count += len(video_files)
                         self.progress_updated.emit(total_target_files)
                 except Exception as e:
                     print(f"비디오 처리 중 오류 발생: {e}")
+                # 시그니처를 만들지 못한 비디오와 사유를 보고서에 기록
+                failed_files = {path: reason for path, reason in self.video_finder.failed_files.items() if path in video_files}
+                self.scan_report['failed_files'] = failed_files
+                # 시간축 정렬로 찾은 앞/뒤가 잘린 복사본 (오프셋 정보 포함)
+                self.scan_report['temporal_matches'] = list(self.video_finder.temporal_matches)
+                # 긴 비디오에 포함된 짧은 클립 (포함 위치/포함률)
+                self.scan_report['containments'] = list(self.video_finder.containments)
+                # 화면 유사도는 경계에 걸렸지만 오디오가 같아 중복으로 인정된 쌍
+                self.scan_report['audio_matches'] = list(self.video_finder.audio_matches)
+                # 회전/반전된 사본으로 찾은 비디오 -> 대표 비디오 기준 변환
+                image_transforms.update({path: t for path, t in self.video_finder.transforms.items() if path in video_files})
+                if failed_files:
+                    print(f"시그니처 추출 실패 비디오 수: {len(failed_files)}")
             
             # --- 최종 중복 그룹 목록 생성 (새로운 형식) ---
             # DuplicateGroupWithSimilarity = List[Tuple[str, List[Tuple[str, int]]]]
             duplicate_groups_with_similarity: DuplicateGroupWithSimilarity = []
             if self._is_running:
-                # 이미지 중복 그룹 처리
-                for file_list_with_similarity in hashes_to_files.values():
-                    if len(file_list_with_similarity) > 1: # 그룹 크기가 2 이상인 경우만
-                        # 첫 번째 파일을 대표로 설정
-                        representative_path, _ = file_list_with_similarity[0]
-                        rep_ext = os.path.splitext(representative_path)[1].lower()
-                        
-                        # 멤버 목록 생성 (대표 제외, 경로와 유사도 점수 포함)
-                        members_with_similarity = []
-                        # 리스트의 두 번째 요소부터 순회
-                        for path, similarity in file_list_with_similarity[1:]:
-                             # WebP 파일 간 비교의 경우 유사도를 100%에 가깝게 조정
-                             member_ext = os.path.splitext(path)[1].lower()
-                             if rep_ext == '.webp' and member_ext == '.webp':
-                                # WebP 파일인 경우 유사도 점수를 백분율로 변환 (100% 기준)
-                                # 0에 가까울수록 유사함 (최대값 HASH_THRESHOLD)
-                                if similarity == 0:
-                                    # 완전 동일한 경우
-                                    adjusted_similarity = 100
-                                else:
-                                    # 0~HASH_THRESHOLD 범위를 100%~0%로 변환
-                                    adjusted_similarity = max(100 - (similarity * 100 / HASH_THRESHOLD), 0)
-                                print(f"WebP 그룹 추가: {os.path.basename(path)} → 유사도 변환: {similarity} → {adjusted_similarity}%")
-                                members_with_similarity.append((path, adjusted_similarity))
-                             else:
-                                 # 일반 이미지는 기존 유사도 점수 사용
-                                 members_with_similarity.append((path, similarity))
-                        
-                        # 멤버가 있으면 그룹 추가
-                        if members_with_similarity:
-                             duplicate_groups_with_similarity.append(
-                                 (representative_path, members_with_similarity)
-                             )
-                
-                # 비디오 중복 그룹 처리 (video_duplicates가 정의된 경우)
-                if 'video_duplicates' in locals() and video_duplicates:
-                    for rep_path, dupes in video_duplicates:
-                        rep_ext = os.path.splitext(rep_path)[1].lower()
-                        # 유사도 점수 처리 - 원래의 부동 소수점 값 유지
-                        members = []
-                        for dupe_path, similarity in dupes:
-                            member_ext = os.path.splitext(dupe_path)[1].lower()
-                            
-                            # WebP 파일 처리 (애니메이션 WebP인 경우 video_duplicates에 들어올 수 있음)
-                            if rep_ext == '.webp' and member_ext == '.webp':
-                                # similarity는 이미 백분율(%)로 표현되어 있지만, 실수로 정수로 변환
-                                adjusted_similarity = int(similarity)
-                                members.append((dupe_path, adjusted_similarity))
-                                print(f"WebP 애니메이션 중복: {os.path.basename(dupe_path)} (유사도: {adjusted_similarity}%)")
-                            else:
-                                # 일반 비디오/애니메이션은 그대로 사용
-                                members.append((dupe_path, similarity))
-                        
-                        if members:
-                            print(f"비디오 중복 그룹 추가: {os.path.basename(rep_path)}, 멤버 수: {len(members)}")
-                            for mem_path, sim in members:
-                                print(f"  - {os.path.basename(mem_path)}: 유사도 {sim:.1f}%")
-                            duplicate_groups_with_similarity.append((rep_path, members))
+                # 이미지 중복 그룹 처리 (그룹 크기가 2 이상인 경우만, 첫 번째 파일이 대표)
+                image_groups = image_duplicate_groups(hashes_to_files.values(), HASH_THRESHOLD)
+                duplicate_groups_with_similarity.extend(image_groups)
+                # 비디오 중복 그룹 처리
+                duplicate_groups_with_similarity.extend(video_duplicate_groups(video_duplicates))
+                # 임계값을 바꿔 파일을 다시 읽지 않고 다시 그룹화할 수 있도록 스캔 데이터 전달
+                if LIVE_REGROUPING:
+                    if image_pairs is not None:
+                        # 가까운 해시 쌍을 스캔 스레드에서 한 번에 찾음 (슬라이더를 처음 움직일 때 GUI가 멈추지 않도록)
+                        pairs_start = time.perf_counter()
+                        image_pairs.collect_pairs()
+                        print(f"재그룹화용 해시 쌍 수집: 이미지 {len(image_pairs)}개, 쌍 {len(image_pairs.pairs()[0])}개, "
+                              f"{time.perf_counter() - pairs_start:.2f}초")
+                    self.scan_report['regrouper'] = ScanRegrouper(
+                        image_pairs, HASH_THRESHOLD,
+                        self.video_finder if video_duplicates is not None else None,
+                        self.video_finder.similarity_threshold,
+                        fixed_image_groups=image_groups, fixed_image_transforms=scan_image_transforms
+                    )
                 
-                # 최종 처리된 파일 수와 중복 그룹 목록 전달
+                # 스캔 중 만든 썸네일이 모두 저장된 뒤 결과 표시
+                self._finish_scan_thumbnails()
+                # 스캔 보고서를 먼저 전달한 뒤 최종 처리된 파일 수와 중복 그룹 목록 전달
+                self.scan_report_ready.emit(self.scan_report)
                 self.scan_finished.emit(
                     total_target_files,
                     processed_files_count,
@@ -382,6 +490,8 @@ class ScanWorker(QObject):
             error_message = f"Error in scan worker: {global_e}"
             print(error_message)
             self.error_occurred.emit(error_message)
+        finally:
+            self._finish_scan_thumbnails()
             
     def stop(self):
         """현재 실행 중인 스캔 작업을 중지하기 위한 메서드"""
@@ -2,6 +2,7 @@ import sys
 import os
 import ctypes # 추가
 import argparse # 인수 파싱을 위해 추가
+import multiprocessing # 비디오 시그니처 작업자 프로세스용
 # import winshell # 바로 가기 생성 안 하므로 제거
 # import pythoncom # 바로 가기 생성 안 하므로 제거
 # from win32com.client import Dispatch # 바로 가기 생성 안 하므로 제거
@@ -18,10 +19,6 @@ from PyQt5.QtGui import QIcon # QIcon 임포트 추가
 from PyQt5.QtCore import Qt
 from ui.main_window import MainWindow
 
-# 비디오 중복 찾기 테스트를 위한 임포트
-from video_processor import VideoProcessor
-from video_duplicate_finder import VideoDuplicateFinder
-
 # --- 설정 변수 정의 (바로 가기 관련 변수 제거) ---
 # APP_NAME = "DuplicatePhotoFinder" # MYAPPID 에서만 사용
 COMPANY_NAME = "htpaak"
@@ -45,6 +42,10 @@ ICON_PATH = os.path.join(project_root, "assets", "icon.ico")
 # 비디오 중복 찾기 테스트 함수 추가
 def run_video_duplicate_test(test_video_path, test_folder_path=None):
     """비디오 중복 찾기 기능을 테스트합니다."""
+    # 테스트 모드에서만 필요한 모듈이므로 여기서 임포트 (GUI 시작 시간 단축)
+    from video_processor import VideoProcessor
+    from video_duplicate_finder import VideoDuplicateFinder
+    
     if test_folder_path is None:
         test_folder_path = os.path.dirname(test_video_path)
     
@@ -171,8 +172,6 @@ except Exception as e:
     print(f"Error setting AppUserModelID using ctypes: {e}")
 # --- AppUserModelID 설정 끝 ---
 
-setup_logging() # 항상 호출 (내부에서 조건 확인)
-
 # --- 바로 가기 생성 로직 제거됨 ---
 # if SHORTCUT_PATH and os.path.exists(project_root): 
 #    ...
@@ -180,6 +179,11 @@ setup_logging() # 항상 호출 (내부에서 조건 확인)
 
 # 애플리케이션의 메인 로직
 if __name__ == '__main__':
+    # PyInstaller 빌드에서 작업자 프로세스가 앱을 다시 실행하지 않도록 처리
+    multiprocessing.freeze_support()
+    # spawn된 작업자 프로세스가 로그 파일을 다시 열지 않도록 메인 프로세스에서만 호출
+    setup_logging() # 항상 호출 (내부에서 조건 확인)
+    
     # 명령줄 인수 파싱
     args = parse_arguments()
     
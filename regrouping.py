@@ -0,0 +1,163 @@
+import gc
+import os
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+from dihedral import INVERSE_TRANSFORMS
+from image_hash import ImagePairIndex
+
+# 새로운 반환 타입 정의: (대표 파일 경로, [(멤버 파일 경로, 유사도 점수), ...]) 리스트
+DuplicateGroupWithSimilarity = List[Tuple[str, List[Tuple[str, int]]]]
+
+def webp_adjusted_similarity(distance: int, hash_threshold: int):
+    """WebP 파일 간 해시 거리를 백분율로 변환 (0에 가까울수록 유사함, 0~hash_threshold -> 100%~0%)"""
+    if distance == 0:
+        # 완전 동일한 경우
+        return 100
+    return max(100 - (distance * 100 / hash_threshold), 0) if hash_threshold else 0
+
+def image_duplicate_groups(file_groups: Iterable[List[Tuple[str, int]]], hash_threshold: int) -> DuplicateGroupWithSimilarity:
+    """
+    이미지 그룹 목록([(대표 경로, 0), (멤버 경로, 해시 거리), ...])을 최종 중복 그룹 형식으로 바꿉니다 (멤버가 없는 그룹 제외).
+    대표와 멤버가 모두 WebP이면 해시 거리를 0~hash_threshold -> 100%~0% 범위로 바꿔 기록합니다.
+    """
+    duplicate_groups: DuplicateGroupWithSimilarity = []
+    for file_list_with_similarity in file_groups:
+        if len(file_list_with_similarity) < 2:
+            continue
+        # 첫 번째 파일을 대표로 설정
+        representative_path, _ = file_list_with_similarity[0]
+        rep_ext = os.path.splitext(representative_path)[1].lower()
+        members_with_similarity = []
+        for path, similarity in file_list_with_similarity[1:]:
+            member_ext = os.path.splitext(path)[1].lower()
+            if rep_ext == '.webp' and member_ext == '.webp':
+                # WebP 파일 간 비교는 유사도 점수를 백분율로 변환
+                adjusted_similarity = webp_adjusted_similarity(similarity, hash_threshold)
+                print(f"WebP 그룹 추가: {os.path.basename(path)} → 유사도 변환: {similarity} → {adjusted_similarity}%")
+                members_with_similarity.append((path, adjusted_similarity))
+            else:
+                # 일반 이미지는 해시 거리 그대로 사용
+                members_with_similarity.append((path, similarity))
+        duplicate_groups.append((representative_path, members_with_similarity))
+    return duplicate_groups
+
+def video_duplicate_groups(video_duplicates) -> DuplicateGroupWithSimilarity:
+    """VideoDuplicateFinder의 그룹 목록을 최종 중복 그룹 형식으로 바꿉니다 (애니메이션 WebP끼리는 정수 유사도)."""
+    duplicate_groups: DuplicateGroupWithSimilarity = []
+    for rep_path, dupes in video_duplicates or []:
+        rep_ext = os.path.splitext(rep_path)[1].lower()
+        members = []
+        for dupe_path, similarity in dupes:
+            member_ext = os.path.splitext(dupe_path)[1].lower()
+            if rep_ext == '.webp' and member_ext == '.webp':
+                # similarity는 이미 백분율(%)로 표현되어 있지만, 정수로 변환
+                members.append((dupe_path, int(similarity)))
+            else:
+                # 일반 비디오/애니메이션은 원래의 부동 소수점 값 유지
+                members.append((dupe_path, similarity))
+        if members:
+            print(f"비디오 중복 그룹 추가: {os.path.basename(rep_path)}, 멤버 수: {len(members)}")
+            duplicate_groups.append((rep_path, members))
+    return duplicate_groups
+
+class ScanRegrouper:
+    """
+    스캔에서 계산한 이미지 해시 쌍(ImagePairIndex)과 비디오 비교 결과를 보관하고,
+    임계값만 바꿔 파일을 다시 읽거나 해시를 다시 계산하지 않고 중복 그룹을 다시 만드는 클래스.
+    이미지는 0~image_pairs.max_distance 범위에서 같은 임계값으로 스캔한 결과와 같고,
+    비디오는 스캔에서 중복으로 인정된 쌍과, 새로 대표가 되는 파일에 대해 캐시된 시그니처로 추가 비교한 쌍을 사용하며
+    (중복이 아니었던 쌍의 유사도는 보관하지 않으므로) 스캔 임계값 이상(더 엄격한 쪽)으로만 바꿀 수 있습니다.
+    """
+
+    def __init__(self, image_pairs: Optional[ImagePairIndex], hash_threshold: int,
+                 video_finder=None, video_threshold: Optional[float] = None,
+                 fixed_image_groups: Optional[DuplicateGroupWithSimilarity] = None,
+                 fixed_image_transforms: Optional[Dict[str, str]] = None):
+        self.image_pairs = image_pairs
+        self.hash_threshold = hash_threshold  # 마지막으로 그룹화한 이미지 해시 거리 임계값
+        self.video_finder = video_finder if video_finder is not None and video_finder.grouping_order else None
+        self.scan_video_threshold = video_threshold
+        self.video_threshold = video_threshold  # 마지막으로 그룹화한 비디오 유사도 임계값 (%)
+        # 해시 쌍을 기록하지 못한 경우(64비트가 아닌 해시) 스캔 결과의 이미지 그룹을 그대로 사용
+        self.fixed_image_groups = fixed_image_groups or []
+        self.fixed_image_transforms = fixed_image_transforms or {}
+        self._webp_images: Optional[np.ndarray] = None  # 이미지 번호별 WebP 여부 (처음 재그룹화할 때 계산)
+
+    @property
+    def hash_threshold_range(self) -> Optional[Tuple[int, int]]:
+        """이미지 해시 거리 임계값으로 고를 수 있는 범위 (이미지 쌍을 기록하지 않았으면 None)"""
+        if self.image_pairs is None:
+            return None
+        return 0, self.image_pairs.max_distance
+
+    @property
+    def video_threshold_range(self) -> Optional[Tuple[float, float]]:
+        """비디오 유사도 임계값(%)으로 고를 수 있는 범위 (스캔 임계값 이상, 비디오 비교가 없었으면 None)"""
+        if self.video_finder is None:
+            return None
+        return self.scan_video_threshold, 100.0
+
+    def regroup(self, hash_threshold: Optional[int] = None,
+                video_threshold: Optional[float] = None) -> Tuple[DuplicateGroupWithSimilarity, Dict[str, object]]:
+        """
+        새 임계값으로 중복 그룹을 다시 만듭니다 (None이면 마지막 값 유지).
+
+        반환값:
+            (스캔 결과와 같은 형식의 중복 그룹 목록, 스캔 보고서에 덮어쓸 항목
+             {'transforms', 'temporal_matches', 'containments', 'audio_matches'} 중 다시 계산한 것)
+        """
+        if hash_threshold is not None:
+            self.hash_threshold = hash_threshold
+        if video_threshold is not None:
+            self.video_threshold = video_threshold
+        report_updates: Dict[str, object] = {}
+        transforms: Dict[str, str] = {}
+
+        if self.image_pairs is not None:
+            duplicate_groups, image_transforms = self._regroup_images(min(self.hash_threshold, self.image_pairs.max_distance))
+            transforms.update(image_transforms)
+        else:
+            duplicate_groups = list(self.fixed_image_groups)
+            transforms.update(self.fixed_image_transforms)
+
+        if self.video_finder is not None:
+            finder = self.video_finder
+            video_groups = finder.regroup(max(self.video_threshold, self.scan_video_threshold))
+            duplicate_groups.extend(video_duplicate_groups(video_groups))
+            transforms.update(finder.transforms)
+            report_updates['temporal_matches'] = list(finder.temporal_matches)
+            report_updates['containments'] = list(finder.containments)
+            report_updates['audio_matches'] = list(finder.audio_matches)
+        report_updates['transforms'] = transforms
+        print(f"임계값 재그룹화: 이미지 해시 거리 {self.hash_threshold}, 비디오 유사도 {self.video_threshold}% -> {len(duplicate_groups)}개 그룹")
+        return duplicate_groups, report_updates
+
+    def _regroup_images(self, threshold: int) -> Tuple[DuplicateGroupWithSimilarity, Dict[str, str]]:
+        """기록한 이미지 쌍으로 그룹을 만들어 (중복 그룹 목록, 멤버 -> 대표 기준 변환)을 반환합니다 (image_duplicate_groups와 같은 형식)."""
+        paths = self.image_pairs.paths
+        representatives, members, distances, transform_columns = self.image_pairs.group(threshold)
+        if self._webp_images is None or len(self._webp_images) != len(paths):
+            self._webp_images = np.fromiter((path.lower().endswith('.webp') for path in paths), dtype=bool, count=len(paths))
+        similarities = distances.tolist()
+        # 대표와 멤버가 모두 WebP인 멤버만 백분율로 변환 (드물어서 멤버별로 처리)
+        for k in np.flatnonzero(self._webp_images[representatives] & self._webp_images[members]).tolist():
+            similarities[k] = webp_adjusted_similarity(similarities[k], threshold)
+        # 이 이미지를 변환하면 대표 이미지가 되므로, 대표 기준으로는 역변환
+        transforms = {
+            paths[member]: INVERSE_TRANSFORMS[self.image_pairs.transforms[column]]
+            for member, column in zip(members[transform_columns != 0].tolist(), transform_columns[transform_columns != 0].tolist())
+        }
+        # 대표 번호 순(그룹이 만들어진 순서)으로 정렬되어 있으므로 대표가 바뀌는 지점에서 그룹을 나눔
+        starts = np.flatnonzero(np.r_[True, representatives[1:] != representatives[:-1]]).tolist() if len(members) else []
+        ends = starts[1:] + [len(members)]
+        # 수십만 개의 튜플을 만드는 동안 순환 참조 수집이 반복해서 일어나지 않도록 잠시 멈춤
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            member_entries = [(paths[member], similarity) for member, similarity in zip(members.tolist(), similarities)]
+            duplicate_groups = [(paths[representative], member_entries[start:end])
+                                 for representative, start, end in zip(representatives[starts].tolist(), starts, ends)]
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return duplicate_groups, transforms
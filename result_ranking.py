@@ -0,0 +1,17 @@
+import numpy as np
+from typing import Sequence, Tuple
+
+def rank_by_similarity(percentages: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    중복 쌍에 유사도(%) 내림차순으로 1부터 Rank를 부여합니다.
+    쌍 목록은 그룹 순서, 그룹 안에서는 멤버 순서로 모은 것이므로 (유사도, 그룹, 멤버) 순서 정렬과 같고,
+    안정 정렬 한 번으로 끝나므로 O(n log n)입니다 (유사도가 같으면 모은 순서 유지 - list.sort(reverse=True)와 같은 결과).
+
+    반환값:
+        (order, ranks): order는 Rank 순서대로 나열한 쌍 번호, ranks[i]는 i번째 쌍의 Rank
+    """
+    percentages = np.asarray(percentages, dtype=np.float64)
+    order = np.argsort(-percentages, kind='stable')
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(1, len(order) + 1)
+    return order, ranks
@@ -0,0 +1,93 @@
+import os
+import platform
+import ctypes
+from typing import Dict, List, Tuple
+
+# 같은 파일 그룹 데이터 타입: (대표 경로, [같은 파일을 가리키는 다른 경로, ...])
+SameFileGroup = Tuple[str, List[str]]
+
+class SameFileFinder:
+    """하드링크/심볼릭 링크 등으로 같은 실제 파일을 가리키는 경로를 찾는 클래스"""
+
+    def __init__(self):
+        self.current_os = platform.system()
+
+    def get_file_id(self, file_path, stat_info=None):
+        """파일의 고유 ID를 가져옵니다 (하드링크 감지용). stat_info가 있으면 재사용합니다."""
+        try:
+            if stat_info is None:
+                stat_info = os.stat(file_path)
+            if self.current_os == 'Windows' and stat_info.st_ino == 0:
+                # Windows에서 st_ino가 0인 경우 파일 핸들로 추가 확인
+                file_handle = ctypes.windll.kernel32.CreateFileW(
+                    file_path, 0, 0, None, 3, 0, None
+                )
+                if file_handle != -1:
+                    file_info = ctypes.create_string_buffer(32)
+                    result = ctypes.windll.kernel32.GetFileInformationByHandle(
+                        file_handle, file_info
+                    )
+                    ctypes.windll.kernel32.CloseHandle(file_handle)
+                    if result:
+                        # 볼륨 일련번호와 파일 인덱스 조합으로 ID 생성
+                        vol_sn = int.from_bytes(file_info[0:4], byteorder='little')
+                        index_high = int.from_bytes(file_info[8:12], byteorder='little')
+                        index_low = int.from_bytes(file_info[12:16], byteorder='little')
+                        return f"{vol_sn}:{index_high}{index_low}"
+                return None
+            # 장치 ID와 inode 조합 (Windows에서는 볼륨 번호와 파일 인덱스)
+            return f"{stat_info.st_dev}:{stat_info.st_ino}"
+        except Exception as e:
+            print(f"파일 ID 가져오기 오류: {e}")
+            return None
+
+    def get_file_key(self, file_path):
+        """
+        같은 파일 판별용 키를 반환합니다.
+        (st_dev, st_ino) 기반 ID를 우선 사용하고, 얻을 수 없으면 실제 경로(realpath)를 사용합니다.
+        """
+        try:
+            # os.stat은 심볼릭 링크를 따라가므로 링크와 원본은 같은 ID를 가짐
+            stat_info = os.stat(file_path)
+            file_id = self.get_file_id(file_path, stat_info)
+            if file_id:
+                return ('id', file_id)
+        except OSError:
+            pass
+        try:
+            return ('path', os.path.normcase(os.path.realpath(file_path)))
+        except Exception:
+            return ('path', os.path.normcase(os.path.abspath(file_path)))
+
+    def group_same_files(self, file_paths: List[str]) -> Tuple[List[str], List[SameFileGroup]]:
+        """
+        경로 목록을 한 번만 훑어 같은 파일을 가리키는 경로들을 묶습니다.
+
+        반환값:
+            (고유 경로 목록, 같은 파일 그룹 목록)
+            고유 경로 목록은 입력 순서를 유지하며 각 실제 파일의 첫 번째 경로만 포함합니다.
+        """
+        first_path_by_key: Dict[tuple, str] = {}
+        aliases_by_path: Dict[str, List[str]] = {}
+        unique_paths: List[str] = []
+
+        for path in file_paths:
+            key = self.get_file_key(path)
+            canonical_path = first_path_by_key.get(key)
+            if canonical_path is None:
+                first_path_by_key[key] = path
+                unique_paths.append(path)
+            elif path != canonical_path:
+                aliases_by_path.setdefault(canonical_path, []).append(path)
+
+        same_file_groups = [(path, aliases) for path, aliases in aliases_by_path.items()]
+        for canonical_path, aliases in same_file_groups:
+            print(f"같은 파일 감지: {os.path.basename(canonical_path)} <-> {', '.join(os.path.basename(p) for p in aliases)}")
+
+        return unique_paths, same_file_groups
+
+    def is_same_file(self, path1, path2):
+        """두 경로가 동일한 파일(하드링크/심볼릭 링크)인지 확인합니다"""
+        if path1 == path2:
+            return True
+        return self.get_file_key(path1) == self.get_file_key(path2)
@@ -51,4 +51,88 @@ ALL_SUPPORTED_FORMATS_LIST = list(ALL_SUPPORTED_FORMATS)
 # 해시 유사도 임계값
 HASH_THRESHOLD = 5
 # 비디오 유사도 임계값 (상향 조정 - 더 엄격하게)
-VIDEO_SIMILARITY_THRESHOLD = 92.0 
\ No newline at end of file
+VIDEO_SIMILARITY_THRESHOLD = 92.0
+
+# 비디오 시그니처 추출 작업자 프로세스 수 (0이면 CPU 수에 맞춰 자동 결정)
+VIDEO_EXTRACT_WORKERS = 0
+# 비디오 파일 하나당 시그니처 추출 제한 시간(초) - 초과 시 작업자 프로세스를 강제 종료
+VIDEO_EXTRACT_TIMEOUT = 30.0
+
+# 비디오 시그니처 형식: 'frames'(16x16 프레임, 모든 쌍 비교) 또는 'hash'(64비트 프레임 해시 + 해밍 인덱스 후보 검색)
+VIDEO_SIGNATURE_FORMAT = 'frames'
+# 해시 형식에서 중복 후보로 볼 시퀀스 해시의 최대 해밍 거리 (64비트 중)
+VIDEO_HASH_MAX_DISTANCE = 12
+
+# 초 단위 시간축 지문으로 앞/뒤가 잘린 비디오 복사본도 찾을지 여부 (비디오 전체를 한 번 디코딩하므로 느려짐)
+VIDEO_TEMPORAL_MATCHING = False
+# 시간축 지문 샘플 간격(초)
+VIDEO_TEMPORAL_INTERVAL = 1.0
+# 비디오 하나당 최대 시간축 지문 샘플 수 (긴 비디오는 앞부분만 사용)
+VIDEO_TEMPORAL_MAX_SAMPLES = 3600
+# 시그니처 추출 후 시간축/오디오 지문 추출에 허용하는 시간(초) - 시그니처와 따로 세며, 초과 시 지문만 빠지고 시그니처는 유지
+VIDEO_FINGERPRINT_TIMEOUT = 60.0
+# 긴 비디오의 일부 구간을 잘라낸 짧은 클립도 찾을지 여부 (시간축 지문 사용)
+VIDEO_CONTAINMENT_MATCHING = False
+# 비디오 쌍 비교 시 남은 프레임이 모두 일치해도 임계값에 닿을 수 없으면 비교를 멈출지 여부 (중복 판정 결과는 같음)
+VIDEO_EARLY_EXIT_COMPARISON = True
+# 크기가 같은 비디오 시그니처를 배열로 묶어 한 비디오를 나머지 비디오들과 한 번에 비교할지 여부 (Numba/NumPy 일괄 계산)
+# 조기 종료가 켜져 있으면 일괄 비교도 정보량이 큰 프레임부터 한 프레임씩 비교하며 임계값에 닿을 수 없는 후보를 제외함
+VIDEO_BATCH_COMPARISON = True
+
+# 오디오 지문(몇 구간의 스펙트럼 피크 해시)을 보조 신호로 사용할지 여부
+# 해상도 변경/레터박스 등으로 화면은 조금 달라도 오디오가 같은 재인코딩 복사본을 찾는 데 사용
+VIDEO_AUDIO_MATCHING = False
+# 오디오가 같다고 볼 오디오 지문 유사도(공유 해시 비율, %) 기준
+VIDEO_AUDIO_MATCH_THRESHOLD = 50.0
+# 오디오가 같으면 화면 유사도가 (비디오 유사도 임계값 - 이 값) 이상일 때도 중복으로 인정
+VIDEO_AUDIO_BORDERLINE_MARGIN = 15.0
+
+# 레터박스/필러박스(검은 띠)를 찾아 실제 영상 영역으로 시그니처를 만들지 여부
+VIDEO_AUTO_CROP = True
+# 이미지는 한 장만 보고 판단하므로 실제 내용인 어두운 테두리도 잘릴 수 있고, 켜면 모든 이미지 해시가 바뀜 (기본 꺼짐)
+IMAGE_AUTO_CROP = False
+
+# 수평 반전 외에 회전(90/180/270도)과 상하/대각선 반전된 사본도 찾을지 여부 (세로/가로로 돌려 저장된 휴대폰 사진/비디오 등)
+# 변환 해시/시그니처는 파일당 한 번만 계산하며, 끄면 비디오는 수평 반전만, 이미지는 원본만 비교
+VIDEO_ROTATION_MATCHING = True
+IMAGE_ROTATION_MATCHING = True
+
+# 결과 테이블 미리보기: 백그라운드 디코딩 스레드 수, 디코딩된 미리보기 캐시 크기(MB)
+PREVIEW_LOADER_THREADS = 2
+PREVIEW_CACHE_MAX_MB = 256
+# 미리보기 이미지의 최대 가로/세로 크기 (큰 사진/RAW는 이 크기로 줄여 캐시 메모리 절약)
+PREVIEW_MAX_DIMENSION = 2048
+# 선택한 행의 앞/뒤로 미리 디코딩해 둘 행 수 (방향키로 넘길 때 바로 표시)
+PREVIEW_PREFETCH_ROWS = 2
+# RAW 미리보기는 내장 JPEG 썸네일을 사용하되, 썸네일의 긴 변이 (미리보기 최대 크기 x 이 비율)보다 작으면 절반 크기 디모자이크로 대체
+RAW_THUMB_MIN_FRACTION = 0.25
+# 미리보기 디코딩 크기 단위: 표시 영역의 긴 변을 이 값 단위로 올려 디코딩 (창 크기를 조금씩 바꿀 때마다 다시 디코딩하지 않도록)
+PREVIEW_SIZE_STEP = 512
+# 창 크기 조절용 해상도 피라미드의 가장 작은 단계 (긴 변 픽셀)
+PREVIEW_PYRAMID_MIN_SIZE = 256
+
+# 디스크 썸네일 캐시 (그룹 썸네일 보기용, 키: 경로/수정 시각/크기): 폴더(빈 문자열이면 사용자 캐시 폴더), 최대 크기(MB)
+THUMBNAIL_CACHE_DIR = ''
+THUMBNAIL_CACHE_MAX_MB = 512
+# 썸네일 긴 변 크기(픽셀)와 인코딩 품질
+THUMBNAIL_SIZE = 256
+THUMBNAIL_JPEG_QUALITY = 85
+# 썸네일 저장 형식: 'JPEG'(인코딩이 빠름) 또는 'WEBP'(파일이 약 1/3 크기, 같은 캐시 용량에 더 많은 썸네일)
+THUMBNAIL_FORMAT = 'JPEG'
+# 썸네일을 디코딩/저장하는 백그라운드 스레드 수
+THUMBNAIL_LOADER_THREADS = 2
+# 스캔 중 해시 계산을 위해 연 이미지로 썸네일 캐시도 채울지 여부 (그룹 썸네일 보기에서 다시 디코딩하지 않음)
+# 축소는 스캔 스레드에서, 인코딩/저장은 별도 작업자 스레드에서 수행하므로 파일을 다시 디코딩하지 않음
+THUMBNAIL_CACHE_FROM_SCAN = True
+# 결과 테이블의 멤버 열에 캐시된 썸네일 아이콘 표시, 미리보기 디코딩이 끝날 때까지 캐시된 썸네일을 먼저 표시
+THUMBNAIL_TABLE_ICONS = True
+THUMBNAIL_PREVIEW_PLACEHOLDER = True
+
+# 임계값 재그룹화: 스캔 중 이미지 해시 쌍과 비디오 비교 결과를 보관해, 결과 화면의 슬라이더로 임계값을 바꾸면 다시 스캔하지 않고 그룹을 다시 만듦
+# 스캔 끝에 가까운 해시 쌍을 찾는 시간이 이미지 수의 제곱에 가깝게 늘어나므로 기본값은 끔
+# (무작위 해시 8만 장, 회전/반전 8가지 기준: 최대 거리 7이면 약 4~5초, 11이면 약 25초)
+LIVE_REGROUPING = False
+# 재그룹화 슬라이더로 고를 수 있는 최대 이미지 해시 거리 (클수록 쌍 수집 시간이 늘어남, 4의 배수 - 1까지가 같은 검색 비용)
+REGROUP_MAX_HASH_DISTANCE = 7
+# 슬라이더를 움직인 뒤 다시 그룹화할 때까지 기다리는 시간 (밀리초, 끌고 있는 동안 매번 다시 만들지 않도록)
+REGROUP_DEBOUNCE_MS = 150
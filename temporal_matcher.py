@@ -0,0 +1,239 @@
+import os
+import numpy as np
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Tuple
+from video_hash_index import compute_frame_hash
+
+# 밝기 변화가 거의 없는 프레임(검은 화면 등)은 해시가 불안정하므로 정렬에 사용하지 않음
+FLAT_FRAME_STD = 4.0
+
+def compute_temporal_hashes(frames: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    시간축 지문 프레임 목록을 64비트 해시 배열로 변환합니다.
+
+    반환값:
+        (uint64 해시 배열, 정렬에 사용할 수 있는 프레임인지 나타내는 bool 배열)
+    """
+    hashes = np.zeros(len(frames), dtype=np.uint64)
+    valid = np.zeros(len(frames), dtype=bool)
+    for i, frame in enumerate(frames):
+        if frame is None:
+            continue
+        hashes[i] = compute_frame_hash(frame)
+        valid[i] = float(np.std(frame)) >= FLAT_FRAME_STD
+    return hashes, valid
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    """uint64 배열 각 원소의 1 비트 수를 반환합니다."""
+    return np.unpackbits(values.astype(np.uint64).view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+class TemporalMatch:
+    """
+    두 비디오의 시간축 정렬 결과.
+    offset은 path2의 0초가 path1의 몇 초 지점에 해당하는지를 나타냅니다 (t1 = t2 + offset).
+    """
+
+    def __init__(self, path1, path2, offset, matched, overlap, coverage1, coverage2):
+        self.path1 = path1
+        self.path2 = path2
+        self.offset = offset
+        self.matched = matched  # 해시가 일치한 샘플 수
+        self.overlap = overlap  # 두 비디오가 겹치는 구간의 (유효) 샘플 수
+        self.coverage1 = coverage1  # path1 중 일치한 비율 (0-1)
+        self.coverage2 = coverage2  # path2 중 일치한 비율 (0-1)
+
+    @property
+    def similarity(self):
+        """겹치는 구간에서 해시가 일치한 비율 (0-100%)"""
+        return 100.0 * self.matched / self.overlap if self.overlap else 0.0
+
+    def to_dict(self):
+        return {
+            'path1': self.path1,
+            'path2': self.path2,
+            'offset': self.offset,
+            'coverage1': self.coverage1,
+            'coverage2': self.coverage2,
+            'similarity': self.similarity,
+        }
+
+    def to_containment_dict(self):
+        """
+        포함 관계 형식으로 변환합니다.
+        일치 비율이 더 높은 쪽을 짧은 클립으로 보고, 클립의 0초가 긴 비디오의 몇 초 지점인지(offset)를 기록합니다.
+        """
+        if self.coverage2 >= self.coverage1:
+            container, clip, offset, coverage = self.path1, self.path2, self.offset, self.coverage2
+        else:
+            container, clip, offset, coverage = self.path2, self.path1, -self.offset, self.coverage1
+        return {
+            'container': container,
+            'clip': clip,
+            'offset': offset,
+            'coverage': coverage,
+            'similarity': self.similarity,
+        }
+
+class TemporalMatcher:
+    """
+    초 단위 프레임 해시 시퀀스를 정렬하여 앞/뒤가 잘린 복사본과 긴 비디오에 포함된 짧은 클립을 찾는 클래스.
+
+    모든 비디오의 샘플 해시를 대역(band) 역색인에 넣고, 대역 값이 같은 샘플 쌍마다
+    (상대 비디오, 시간 차이)에 투표합니다. 표를 가장 많이 받은 시간 차이를 정렬 위치로 보고
+    그 대각선을 따라 실제 해밍 거리로 다시 검증하므로, 비교량은 전체 비디오 길이에 거의 비례합니다.
+    """
+
+    # 일치 종류
+    MATCH_TRIMMED = 'trimmed'  # 두 비디오 대부분이 겹침 (앞/뒤만 잘린 복사본)
+    MATCH_CONTAINED = 'contained'  # 짧은 비디오 전체가 긴 비디오의 일부 구간과 일치
+
+    def __init__(self, interval=1.0, max_distance=10, band_count=4, min_matched=5,
+                 min_match_ratio=0.6, min_coverage=0.8, min_longer_coverage=0.5, max_posting=200):
+        """
+        매개변수:
+            interval: 샘플 간격(초)
+            max_distance: 같은 장면으로 볼 프레임 해시의 최대 해밍 거리
+            band_count: 역색인에 사용할 해시 대역 수 (64비트를 band_count개로 분할)
+            min_matched: 일치로 인정할 최소 일치 샘플 수
+            min_match_ratio: 겹치는 구간 중 해시가 일치해야 하는 최소 비율
+            min_coverage: 짧은 쪽 비디오에서 일치한 구간이 차지해야 하는 최소 비율
+            min_longer_coverage: 긴 쪽 비디오에서 일치한 구간이 차지해야 하는 최소 비율
+            max_posting: 너무 흔한 대역 값(단색 화면 등)은 이 개수를 넘으면 투표에서 제외
+        """
+        self.interval = interval
+        self.max_distance = max_distance
+        self.band_count = band_count
+        self.band_width = 64 // band_count
+        self.min_matched = min_matched
+        self.min_match_ratio = min_match_ratio
+        self.min_coverage = min_coverage
+        self.min_longer_coverage = min_longer_coverage
+        self.max_posting = max_posting
+        self.keys: List[Hashable] = []
+        self.hashes: Dict[Hashable, np.ndarray] = {}
+        self.valid: Dict[Hashable, np.ndarray] = {}
+        # (대역 번호, 대역 값) -> [(비디오 순번, 샘플 번호), ...]
+        self.postings: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+
+    def _band_values(self, hash_value: int):
+        mask = (1 << self.band_width) - 1
+        return [(band, (hash_value >> (band * self.band_width)) & mask) for band in range(self.band_count)]
+
+    def add(self, key: Hashable, hashes: np.ndarray, valid: Optional[np.ndarray] = None):
+        """비디오의 시간축 해시 시퀀스를 역색인에 추가합니다."""
+        if valid is None:
+            valid = np.ones(len(hashes), dtype=bool)
+        video_index = len(self.keys)
+        self.keys.append(key)
+        self.hashes[key] = hashes
+        self.valid[key] = valid
+        for t in np.flatnonzero(valid):
+            for band_key in self._band_values(int(hashes[t])):
+                self.postings.setdefault(band_key, []).append((video_index, int(t)))
+
+    def _vote_offsets(self, video_index: int) -> Dict[int, Counter]:
+        """video_index 비디오와 뒤쪽 비디오들 사이의 (상대 비디오 -> 시간 차이 투표)를 계산합니다."""
+        key = self.keys[video_index]
+        hashes = self.hashes[key]
+        votes: Dict[int, Counter] = {}
+        for t1 in np.flatnonzero(self.valid[key]):
+            hash1 = int(hashes[t1])
+            seen = set()
+            for band_key in self._band_values(hash1):
+                posting = self.postings.get(band_key, ())
+                if len(posting) > self.max_posting:
+                    continue
+                for other_index, t2 in posting:
+                    if other_index <= video_index or (other_index, t2) in seen:
+                        continue
+                    seen.add((other_index, t2))
+                    if bin(hash1 ^ int(self.hashes[self.keys[other_index]][t2])).count('1') <= self.max_distance:
+                        votes.setdefault(other_index, Counter())[int(t1) - t2] += 1
+        return votes
+
+    def align(self, key1: Hashable, key2: Hashable, offset: int) -> Optional[TemporalMatch]:
+        """
+        주어진 시간 차이(샘플 단위)를 기준으로 두 시퀀스를 정렬하여 일치 정도를 계산합니다.
+        샘플링 위상 차이를 고려해 앞뒤 한 샘플까지 일치로 인정합니다.
+        """
+        hashes1, valid1 = self.hashes[key1], self.valid[key1]
+        hashes2, valid2 = self.hashes[key2], self.valid[key2]
+        start2 = max(0, -offset)
+        end2 = min(len(hashes2), len(hashes1) - offset)
+        if end2 <= start2:
+            return None
+        t2 = np.arange(start2, end2)
+        t1 = t2 + offset
+        overlap_mask = valid1[t1] & valid2[t2]
+        overlap = int(overlap_mask.sum())
+        if overlap == 0:
+            return None
+        matched_mask = np.zeros(len(t2), dtype=bool)
+        for shift in (-1, 0, 1):
+            shifted = np.clip(t1 + shift, 0, len(hashes1) - 1)
+            matched_mask |= _popcount64(hashes1[shifted] ^ hashes2[t2]) <= self.max_distance
+        matched = int((matched_mask & overlap_mask).sum())
+        return TemporalMatch(
+            key1, key2, offset * self.interval, matched, overlap,
+            matched / max(1, int(valid1.sum())), matched / max(1, int(valid2.sum()))
+        )
+
+    def classify(self, match: TemporalMatch) -> Optional[str]:
+        """
+        정렬 결과의 일치 종류를 판별합니다.
+
+        반환값:
+            MATCH_TRIMMED, MATCH_CONTAINED 또는 일치가 아니면 None
+        """
+        if match.matched < self.min_matched or match.matched < self.min_match_ratio * match.overlap:
+            return None
+        # 짧은 쪽 비디오 대부분이 긴 쪽과 일치해야 함
+        if max(match.coverage1, match.coverage2) < self.min_coverage:
+            return None
+        if min(match.coverage1, match.coverage2) >= self.min_longer_coverage:
+            return self.MATCH_TRIMMED
+        return self.MATCH_CONTAINED
+
+    def is_trimmed_copy(self, match: TemporalMatch) -> bool:
+        """두 비디오 대부분이 서로 겹치는지 (앞/뒤만 잘린 복사본인지) 확인합니다."""
+        return self.classify(match) == self.MATCH_TRIMMED
+
+    def find_all_matches(self) -> Dict[str, List[TemporalMatch]]:
+        """
+        색인된 모든 비디오 쌍의 정렬 위치를 한 번의 투표로 구하고 일치 종류별로 나눕니다.
+
+        반환값:
+            {MATCH_TRIMMED: [...], MATCH_CONTAINED: [...]}
+        """
+        results = {self.MATCH_TRIMMED: [], self.MATCH_CONTAINED: []}
+        for video_index, key1 in enumerate(self.keys):
+            for other_index, offset_votes in self._vote_offsets(video_index).items():
+                if sum(offset_votes.values()) < self.min_matched:
+                    continue
+                # 인접한 시간 차이의 표를 합쳐 가장 유력한 정렬 위치 선택
+                best_offset = max(
+                    offset_votes,
+                    key=lambda o: offset_votes[o] + offset_votes.get(o - 1, 0) + offset_votes.get(o + 1, 0)
+                )
+                key2 = self.keys[other_index]
+                match = self.align(key1, key2, best_offset)
+                match_type = self.classify(match) if match is not None else None
+                if match_type is None:
+                    continue
+                if match_type == self.MATCH_TRIMMED:
+                    print(f"시간축 정렬 일치: {os.path.basename(str(key1))} <-> {os.path.basename(str(key2))} "
+                          f"(오프셋 {match.offset:+.1f}초, 일치율 {match.similarity:.1f}%)")
+                else:
+                    info = match.to_containment_dict()
+                    print(f"클립 포함 감지: {os.path.basename(str(info['clip']))} -> {os.path.basename(str(info['container']))} "
+                          f"{info['offset']:.1f}초 지점 (포함률 {info['coverage'] * 100:.0f}%)")
+                results[match_type].append(match)
+        return results
+
+    def find_matches(self) -> List[TemporalMatch]:
+        """색인된 비디오 중 앞/뒤가 잘린 복사본 쌍을 찾습니다."""
+        return self.find_all_matches()[self.MATCH_TRIMMED]
+
+    def find_containments(self) -> List[TemporalMatch]:
+        """색인된 비디오 중 다른 비디오의 일부 구간에 포함된 짧은 클립 쌍을 찾습니다."""
+        return self.find_all_matches()[self.MATCH_CONTAINED]
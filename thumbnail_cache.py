@@ -0,0 +1,219 @@
+import os
+import sys
+import hashlib
+import threading
+from io import BytesIO
+from typing import Optional, Tuple
+from PIL import Image
+from supported_formats import (
+    THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_MB, THUMBNAIL_SIZE, THUMBNAIL_JPEG_QUALITY, THUMBNAIL_FORMAT
+)
+
+# 썸네일 형식 -> 캐시 파일 확장자 (형식을 바꿔도 예전 형식의 파일까지 용량 계산/제거 대상)
+THUMBNAIL_EXTENSIONS = {'JPEG': '.jpg', 'WEBP': '.webp'}
+_CACHE_FILE_EXTENSIONS = set(THUMBNAIL_EXTENSIONS.values())
+
+def default_cache_dir() -> str:
+    """썸네일 캐시 기본 폴더 (Windows: %LOCALAPPDATA%, 그 외: $XDG_CACHE_HOME 또는 ~/.cache)"""
+    if THUMBNAIL_CACHE_DIR:
+        return THUMBNAIL_CACHE_DIR
+    if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+        base_dir = os.environ['LOCALAPPDATA']
+    else:
+        base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base_dir, 'DuplicatePhotoFinderPAAK', 'thumbnails')
+
+class ThumbnailCache:
+    """
+    디스크에 보관하는 썸네일 캐시 (키: 절대 경로/수정 시각/크기).
+    원본 파일이 바뀌면 키가 달라지므로 예전 썸네일은 쓰이지 않고 용량 제한에 따라 오래된 순서로 지워집니다.
+    썸네일 파일은 임시 파일에 쓴 뒤 교체하므로 스캔 스레드와 미리보기 작업자 스레드가 함께 사용해도 안전합니다.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_mb: int = THUMBNAIL_CACHE_MAX_MB,
+                 thumbnail_size: int = THUMBNAIL_SIZE, image_format: str = THUMBNAIL_FORMAT):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_mb * 1024 * 1024
+        self.thumbnail_size = thumbnail_size
+        self.image_format = image_format.upper() if image_format.upper() in THUMBNAIL_EXTENSIONS else 'JPEG'
+        self.extension = THUMBNAIL_EXTENSIONS[self.image_format]
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # 처음 저장할 때 폴더를 훑어 계산
+        self._enabled = True
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"썸네일 캐시 폴더를 만들 수 없어 캐시를 사용하지 않습니다: {self.cache_dir} - {e}")
+            self._enabled = False
+
+    @staticmethod
+    def cache_key(file_path: str) -> Optional[Tuple[str, int, int]]:
+        """원본 파일의 (절대 경로, 수정 시각(ns), 크기) (파일이 없으면 None)"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+    def entry_path(self, key: Tuple[str, int, int]) -> str:
+        """캐시 키에 해당하는 썸네일 파일 경로 (폴더 하나에 파일이 몰리지 않도록 해시 앞 두 글자로 나눔)"""
+        digest = hashlib.sha1(f"{key[0]}|{key[1]}|{key[2]}".encode('utf-8', 'surrogatepass')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + self.extension)
+
+    def get(self, file_path: str) -> Optional[str]:
+        """
+        파일의 썸네일이 캐시에 있으면 썸네일 파일 경로를 반환합니다 (없으면 None).
+        사용한 항목은 수정 시각을 갱신해 제거 순서에서 뒤로 보냅니다.
+        """
+        key = self.cache_key(file_path)
+        if key is None or not self._enabled:
+            return None
+        entry = self.entry_path(key)
+        try:
+            os.utime(entry)
+        except OSError:
+            return None
+        return entry
+
+    def contains(self, file_path: str) -> bool:
+        """썸네일이 캐시에 있는지 (사용 시각은 갱신하지 않음)"""
+        key = self.cache_key(file_path)
+        return key is not None and self._enabled and os.path.exists(self.entry_path(key))
+
+    def put_bytes(self, file_path: str, data: bytes, key: Optional[Tuple[str, int, int]] = None) -> Optional[str]:
+        """이미 인코딩된 썸네일(image_format) 바이트를 저장하고 썸네일 파일 경로를 반환합니다 (실패 시 None)."""
+        key = key or self.cache_key(file_path)
+        if key is None or not self._enabled or not data:
+            return None
+        entry = self.entry_path(key)
+        temp_path = f"{entry}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            old_size = os.path.getsize(entry) if os.path.exists(entry) else 0
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, entry)
+        except OSError as e:
+            print(f"썸네일 캐시 저장 오류: {file_path} - {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return None
+        self._add_bytes(len(data) - old_size)
+        return entry
+
+    def make_thumbnail(self, img: Image.Image) -> Image.Image:
+        """
+        이미 디코딩된 Pillow 이미지를 thumbnail_size 이하의 RGB 이미지로 줄입니다 (원본 이미지는 바꾸지 않음).
+        큰 이미지는 reduce로 먼저 줄인 뒤 리샘플링하므로 (reducing_gap) 전체 크기 복사본을 만들지 않습니다.
+        """
+        if max(img.size) <= self.thumbnail_size:
+            thumb = img.copy()
+        else:
+            scale = self.thumbnail_size / max(img.size)
+            size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+            thumb = img.resize(size, Image.BICUBIC, reducing_gap=2.0)
+        if thumb.mode != 'RGB':
+            thumb = thumb.convert('RGB')
+        return thumb
+
+    def put_thumbnail(self, file_path: str, thumb: Image.Image, key: Optional[Tuple[str, int, int]] = None) -> Optional[str]:
+        """make_thumbnail로 만든 썸네일을 image_format으로 인코딩해 저장합니다 (스캐너는 작업자 스레드에서 호출)."""
+        try:
+            buffer = BytesIO()
+            thumb.save(buffer, self.image_format, quality=THUMBNAIL_JPEG_QUALITY)
+        except Exception as e:
+            print(f"썸네일 인코딩 오류: {file_path} - {e}")
+            return None
+        finally:
+            thumb.close()
+        return self.put_bytes(file_path, buffer.getvalue(), key)
+
+    def put_image(self, file_path: str, img: Image.Image, key: Optional[Tuple[str, int, int]] = None) -> Optional[str]:
+        """
+        이미 디코딩된 Pillow 이미지를 썸네일로 줄여 저장합니다.
+        스캐너가 해시를 계산하며 연 이미지를 넘기면 파일을 다시 디코딩하지 않고 캐시를 채울 수 있습니다.
+        """
+        key = key or self.cache_key(file_path)
+        if key is None or not self._enabled:
+            return None
+        try:
+            thumb = self.make_thumbnail(img)
+        except Exception as e:
+            print(f"썸네일 생성 오류: {file_path} - {e}")
+            return None
+        return self.put_thumbnail(file_path, thumb, key)
+
+    def clear(self):
+        """캐시 폴더의 모든 썸네일을 지웁니다."""
+        with self._lock:
+            for entry_path, _, _ in self._scan_entries():
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    pass
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan_entries())
+            return self._total_bytes
+
+    def _scan_entries(self):
+        """캐시 폴더의 (썸네일 경로, 크기, 수정 시각) 목록"""
+        entries = []
+        try:
+            subdirs = list(os.scandir(self.cache_dir))
+        except OSError:
+            return entries
+        for subdir in subdirs:
+            if not subdir.is_dir():
+                continue
+            try:
+                for entry in os.scandir(subdir.path):
+                    if os.path.splitext(entry.name)[1] in _CACHE_FILE_EXTENSIONS:
+                        stat = entry.stat()
+                        entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                continue
+        return entries
+
+    def _add_bytes(self, delta: int):
+        """저장한 바이트 수를 반영하고, 용량을 넘으면 가장 오래 쓰지 않은 썸네일부터 90%까지 지웁니다."""
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan_entries())
+            else:
+                self._total_bytes += delta
+            if self._total_bytes <= self.max_bytes:
+                return
+            # 용량을 넘을 때만 폴더를 훑어 정확한 크기로 다시 계산 (여유를 두어 자주 훑지 않음)
+            entries = sorted(self._scan_entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            removed = 0
+            for entry_path, size, _ in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            self._total_bytes = total
+            print(f"썸네일 캐시 정리: {removed}개 제거, 현재 {total / (1024 * 1024):.1f}MB")
+
+_shared_cache: Optional[ThumbnailCache] = None
+_shared_cache_lock = threading.Lock()
+
+def shared_thumbnail_cache() -> ThumbnailCache:
+    """스캐너와 UI가 함께 쓰는 썸네일 캐시 (용량 계산을 한 곳에서 하도록 하나만 생성)"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ThumbnailCache()
+        return _shared_cache
@@ -0,0 +1,534 @@
+import numpy as np
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+# 열 번호 (0:Select, 1:Rank, 2:Rep, 3:Mem, 4:Sim, 5:GroupID)
+COLUMN_CHECK = 0
+COLUMN_RANK = 1
+COLUMN_REPRESENTATIVE = 2
+COLUMN_MEMBER = 3
+COLUMN_SIMILARITY = 4
+COLUMN_GROUP_ID = 5
+
+HEADER_LABELS = ["Select", "Rank", "Representative", "Group Member", "Similarity", "Group ID"]
+
+# 정렬용 데이터 역할 (기존 QStandardItem 데이터 역할과 같음)
+RANK_ROLE = Qt.UserRole + 6
+SIMILARITY_ROLE = Qt.UserRole + 4
+
+class _StringTable:
+    """문자열을 정수 ID로 바꿔 한 번만 저장하는 테이블 (경로/그룹 ID/유사도 문구를 행마다 중복 저장하지 않음)"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.ids[value] = value_id
+            self.values.append(value)
+        return value_id
+
+    def intern_many(self, values: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.intern(value) for value in values), dtype=np.int32, count=len(values))
+
+    def clear(self):
+        self.values.clear()
+        self.ids.clear()
+
+class DuplicateTableItem:
+    """
+    item(row, column)이 돌려주는 가벼운 셀 객체.
+    QStandardItem처럼 text()/data()/checkState()/setCheckState()를 제공하지만 값은 모델의 열 배열에서 바로 읽고 씁니다.
+    """
+
+    __slots__ = ('_model', '_row', '_column')
+
+    def __init__(self, model: 'DuplicateTableModel', row: int, column: int):
+        self._model = model
+        self._row = row
+        self._column = column
+
+    def row(self) -> int:
+        return self._row
+
+    def column(self) -> int:
+        return self._column
+
+    def index(self) -> QModelIndex:
+        return self._model.index(self._row, self._column)
+
+    def text(self) -> str:
+        value = self._model.data(self.index(), Qt.DisplayRole)
+        return value if value is not None else ""
+
+    def data(self, role: int = Qt.UserRole + 1):
+        return self._model.data(self.index(), role)
+
+    def isCheckable(self) -> bool:
+        return self._column == COLUMN_CHECK
+
+    def checkState(self) -> int:
+        return Qt.Checked if self._model.is_checked(self._row) else Qt.Unchecked
+
+    def setCheckState(self, state: int):
+        self._model.setData(self.index(), state, Qt.CheckStateRole)
+
+class DuplicateTableModel(QAbstractTableModel):
+    """
+    중복 결과 테이블 모델.
+    행마다 QStandardItem 6개를 만드는 대신 Rank/대표/멤버/유사도/그룹/체크 상태를 NumPy 열 배열로 저장하고,
+    data()는 행 번호로 배열을 바로 읽습니다 (O(1)). 스캔 결과는 set_rows()로 한 번에 채웁니다 (모델 리셋 1회).
+    """
+
+    # 행 데이터를 담는 열 배열 속성 이름 (행 삽입/삭제 시 함께 바뀜)
+    _COLUMN_ARRAYS = ('_row_id', '_rank', '_representative', '_member', '_similarity', '_similarity_text', '_group', '_checked')
+
+    # 흩어진 행을 이보다 많은 구간으로 나눠 지워야 하면 구간별 제거 대신 모델 리셋 1회로 처리
+    MAX_REMOVE_RANGES = 64
+
+    # 체크박스 상태가 바뀐 소스 행 (setData로 바뀐 경우에만, 시그널 차단 중에는 발생하지 않음)
+    check_state_changed = pyqtSignal(int)
+    # 여러 행의 체크 상태를 한 번에 바꾼 경우 (전체 선택/해제/반전/규칙 선택, 행별 check_state_changed 대신 1회)
+    check_states_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths = _StringTable()  # 대표/멤버 경로
+        self._group_ids = _StringTable()
+        self._similarity_texts = _StringTable()
+        self._allocate(0)
+        # 행 핸들(row id): 삽입될 때 한 번 부여되고 정렬/삽입/삭제로 행 위치가 바뀌어도 변하지 않음
+        self._next_row_id = 0
+        # 그룹 ID -> 행 핸들 집합, 멤버 경로 -> 행 핸들 집합 (문자열 테이블 ID 기준, 삽입/삭제 시 함께 갱신)
+        self._rows_by_group: Dict[int, Set[int]] = defaultdict(set)
+        self._rows_by_member: Dict[int, Set[int]] = defaultdict(set)
+        # set_rows() 뒤에는 인덱스를 바로 만들지 않고 처음 조회할 때 현재 배열로 한 번에 만듦 (스캔 결과 표시 지연 방지)
+        self._indexed = True
+        # 행 핸들 -> 현재 행 위치 (행 위치가 바뀌면 None으로 비우고 다음 조회 때 다시 만듦)
+        self._row_positions: Optional[np.ndarray] = None
+        # 멤버 열 아이콘을 돌려주는 함수 (경로 -> QIcon 또는 None, 캐시된 썸네일 표시용, None이면 아이콘 없음)
+        self.decoration_provider: Optional[Callable[[str], object]] = None
+        # 마지막 정렬 기준 (set_rows로 다시 채울 때도 같은 순서로 정렬, -1이면 정렬 안 함)
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    def _allocate(self, row_count: int):
+        self._row_id = np.zeros(row_count, dtype=np.int64)
+        self._rank = np.zeros(row_count, dtype=np.int64)
+        self._representative = np.zeros(row_count, dtype=np.int32)
+        self._member = np.zeros(row_count, dtype=np.int32)
+        self._similarity = np.zeros(row_count, dtype=np.float64)
+        self._similarity_text = np.zeros(row_count, dtype=np.int32)
+        self._group = np.zeros(row_count, dtype=np.int32)
+        self._checked = np.zeros(row_count, dtype=bool)
+
+    # --- QAbstractTableModel 구현 ---
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rank)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADER_LABELS)
+
+    def headerData(self, section: int, orientation: int, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(HEADER_LABELS):
+            return HEADER_LABELS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == COLUMN_CHECK:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if row >= len(self._rank):
+            return None
+        if role == Qt.DisplayRole:
+            if column == COLUMN_RANK:
+                return str(int(self._rank[row]))
+            if column == COLUMN_REPRESENTATIVE:
+                return self._paths.values[self._representative[row]]
+            if column == COLUMN_MEMBER:
+                return self._paths.values[self._member[row]]
+            if column == COLUMN_SIMILARITY:
+                return self._similarity_texts.values[self._similarity_text[row]]
+            if column == COLUMN_GROUP_ID:
+                return self._group_ids.values[self._group[row]]
+            return None
+        if role == Qt.DecorationRole and column == COLUMN_MEMBER and self.decoration_provider is not None:
+            return self.decoration_provider(self._paths.values[self._member[row]])
+        if role == Qt.CheckStateRole and column == COLUMN_CHECK:
+            return Qt.Checked if self._checked[row] else Qt.Unchecked
+        if role == RANK_ROLE and column == COLUMN_RANK:
+            return int(self._rank[row])
+        if role == SIMILARITY_ROLE and column == COLUMN_SIMILARITY:
+            return float(self._similarity[row])
+        if role == Qt.TextAlignmentRole and column in (COLUMN_RANK, COLUMN_SIMILARITY):
+            return Qt.AlignCenter
+        return None
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.EditRole) -> bool:
+        if not index.isValid() or index.column() != COLUMN_CHECK or role != Qt.CheckStateRole:
+            return False
+        row = index.row()
+        if row >= len(self._checked):
+            return False
+        checked = value == Qt.Checked
+        if bool(self._checked[row]) == checked:
+            return True
+        self._checked[row] = checked
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.check_state_changed.emit(row)
+        return True
+
+    def removeRows(self, row: int, count: int, parent: QModelIndex = QModelIndex()) -> bool:
+        if parent.isValid() or count <= 0 or row < 0 or row + count > len(self._rank):
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        self._unindex_rows(np.arange(row, row + count))
+        for name in self._COLUMN_ARRAYS:
+            setattr(self, name, np.delete(getattr(self, name), np.s_[row:row + count]))
+        self._row_positions = None
+        self.endRemoveRows()
+        return True
+
+    def remove_rows(self, rows: Iterable[int]):
+        """
+        흩어진 여러 행을 한 번에 제거합니다.
+        연속 구간이 적으면 구간별로 rowsRemoved 신호를 보내고 (선택 유지), 많으면 배열을 한 번에 줄이고 모델을 리셋합니다.
+        """
+        rows = np.unique(np.fromiter(rows, dtype=np.int64))
+        rows = rows[(rows >= 0) & (rows < len(self._rank))]
+        if len(rows) == 0:
+            return
+        range_starts = np.flatnonzero(np.diff(rows, prepend=-2) != 1)
+        if len(range_starts) <= self.MAX_REMOVE_RANGES:
+            range_ends = np.append(range_starts[1:], len(rows)) - 1
+            # 뒤쪽 구간부터 지워야 앞쪽 구간의 행 번호가 바뀌지 않음
+            for start, end in zip(range_starts[::-1], range_ends[::-1]):
+                self.removeRows(int(rows[start]), int(rows[end] - rows[start] + 1))
+            return
+        self.beginResetModel()
+        self._unindex_rows(rows)
+        keep = np.ones(len(self._rank), dtype=bool)
+        keep[rows] = False
+        self._permute(np.flatnonzero(keep))
+        self.endResetModel()
+
+    # --- 데이터 채우기/수정 ---
+    def set_rows(self, ranks: Sequence[int], representatives: Sequence[str], members: Sequence[str],
+                 similarities: Sequence[float], similarity_texts: Sequence[str], group_ids: Sequence[str]):
+        """모든 행을 한 번에 바꿉니다 (각 인자는 행 순서대로 같은 길이의 목록)"""
+        self.beginResetModel()
+        self._paths.clear()
+        self._group_ids.clear()
+        self._similarity_texts.clear()
+        self._allocate(len(ranks))
+        self._rank[:] = np.asarray(ranks, dtype=np.int64)
+        self._representative[:] = self._paths.intern_many(representatives)
+        self._member[:] = self._paths.intern_many(members)
+        self._similarity[:] = np.asarray(similarities, dtype=np.float64)
+        self._similarity_text[:] = self._similarity_texts.intern_many(similarity_texts)
+        self._group[:] = self._group_ids.intern_many(group_ids)
+        self._next_row_id = 0
+        self._rows_by_group.clear()
+        self._rows_by_member.clear()
+        self._indexed = False
+        self._row_id[:] = self._new_row_ids(len(ranks))
+        if self._sort_column >= 0:
+            self._permute(self._sort_permutation(self._sort_column, self._sort_order))
+        self.endResetModel()
+
+    def clear_rows(self):
+        """모든 행을 지웁니다."""
+        self.set_rows([], [], [], [], [], [])
+
+    def insert_pair(self, row: int, rank: int, representative: str, member: str,
+                    similarity: float, similarity_text: str, group_id: str) -> int:
+        """row 위치에 행 하나를 삽입하고 새 행 핸들을 반환합니다 (row가 행 수와 같으면 맨 끝에 추가)"""
+        row = max(0, min(row, len(self._rank)))
+        row_id = int(self._new_row_ids(1)[0])
+        values = {
+            '_row_id': row_id,
+            '_rank': rank,
+            '_representative': self._paths.intern(representative),
+            '_member': self._paths.intern(member),
+            '_similarity': similarity,
+            '_similarity_text': self._similarity_texts.intern(similarity_text),
+            '_group': self._group_ids.intern(group_id),
+            '_checked': False,
+        }
+        self.beginInsertRows(QModelIndex(), row, row)
+        for name in self._COLUMN_ARRAYS:
+            setattr(self, name, np.insert(getattr(self, name), row, values[name]))
+        self._row_positions = None
+        self._index_rows([row])
+        self.endInsertRows()
+        return row_id
+
+    def append_pair(self, rank: int, representative: str, member: str,
+                    similarity: float, similarity_text: str, group_id: str) -> int:
+        return self.insert_pair(len(self._rank), rank, representative, member, similarity, similarity_text, group_id)
+
+    def append_pairs(self, ranks: Sequence[int], representatives: Sequence[str], members: Sequence[str],
+                     similarities: Sequence[float], similarity_texts: Sequence[str], group_ids: Sequence[str]):
+        """여러 행을 맨 끝에 한 번에 추가합니다 (행마다 배열을 다시 만들지 않도록 rowsInserted 신호 1회)"""
+        count = len(ranks)
+        if count == 0:
+            return
+        first_row = len(self._rank)
+        values = {
+            '_row_id': self._new_row_ids(count),
+            '_rank': np.asarray(ranks, dtype=np.int64),
+            '_representative': self._paths.intern_many(representatives),
+            '_member': self._paths.intern_many(members),
+            '_similarity': np.asarray(similarities, dtype=np.float64),
+            '_similarity_text': self._similarity_texts.intern_many(similarity_texts),
+            '_group': self._group_ids.intern_many(group_ids),
+            '_checked': np.zeros(count, dtype=bool),
+        }
+        self.beginInsertRows(QModelIndex(), first_row, first_row + count - 1)
+        for name in self._COLUMN_ARRAYS:
+            setattr(self, name, np.concatenate((getattr(self, name), values[name].astype(getattr(self, name).dtype))))
+        self._row_positions = None
+        self._index_rows(np.arange(first_row, first_row + count))
+        self.endInsertRows()
+
+    def update_pair(self, row: int, rank: int, representative: str, similarity: float):
+        """기존 행의 Rank/대표/유사도를 제자리에서 바꿉니다 (유사도가 바뀌면 표시 문구도 다시 만듦)"""
+        if not 0 <= row < len(self._rank):
+            return
+        representative_id = self._paths.intern(representative)
+        changed = False
+        if self._rank[row] != rank:
+            self._rank[row] = rank
+            changed = True
+        if self._representative[row] != representative_id:
+            self._representative[row] = representative_id
+            changed = True
+        if self._similarity[row] != similarity:
+            self._similarity[row] = similarity
+            self._similarity_text[row] = self._similarity_texts.intern(f"{similarity}%")
+            changed = True
+        if changed:
+            self.dataChanged.emit(self.index(row, COLUMN_RANK), self.index(row, COLUMN_SIMILARITY))
+
+    # --- 행 핸들/경로/그룹 인덱스 ---
+    def _new_row_ids(self, count: int) -> np.ndarray:
+        row_ids = np.arange(self._next_row_id, self._next_row_id + count, dtype=np.int64)
+        self._next_row_id += count
+        return row_ids
+
+    def _ensure_indexes(self):
+        if not self._indexed:
+            self._indexed = True
+            self._index_rows(range(len(self._row_id)))
+
+    def _index_rows(self, rows: Iterable[int]):
+        if not self._indexed:
+            return
+        row_ids, groups, members = self._row_id, self._group, self._member
+        for row in rows:
+            row_id = int(row_ids[row])
+            self._rows_by_group[int(groups[row])].add(row_id)
+            self._rows_by_member[int(members[row])].add(row_id)
+
+    def _unindex_rows(self, rows: Iterable[int]):
+        if not self._indexed:
+            return
+        row_ids, groups, members = self._row_id, self._group, self._member
+        for row in rows:
+            row_id = int(row_ids[row])
+            for index, key in ((self._rows_by_group, int(groups[row])), (self._rows_by_member, int(members[row]))):
+                row_set = index.get(key)
+                if row_set is not None:
+                    row_set.discard(row_id)
+                    if not row_set:
+                        del index[key]
+
+    def _positions(self) -> np.ndarray:
+        if self._row_positions is None:
+            positions = np.full(self._next_row_id, -1, dtype=np.int64)
+            positions[self._row_id] = np.arange(len(self._row_id))
+            self._row_positions = positions
+        return self._row_positions
+
+    def row_id(self, row: int) -> int:
+        """행 위치의 행 핸들 (범위 밖이면 -1)"""
+        return int(self._row_id[row]) if 0 <= row < len(self._row_id) else -1
+
+    def row_for_id(self, row_id: int) -> int:
+        """행 핸들의 현재 행 위치 (이미 제거된 행이면 -1)"""
+        positions = self._positions()
+        return int(positions[row_id]) if 0 <= row_id < len(positions) else -1
+
+    def rows_for_ids(self, row_ids: Iterable[int]) -> List[int]:
+        """남아 있는 행 핸들들의 현재 행 위치 (오름차순)"""
+        return sorted(row for row in (self.row_for_id(row_id) for row_id in row_ids) if row >= 0)
+
+    def rows_for_group(self, group_id: str) -> List[int]:
+        """그룹 ID에 속한 행 위치 목록 (오름차순)"""
+        group_index = self._group_ids.ids.get(group_id)
+        if group_index is None:
+            return []
+        self._ensure_indexes()
+        return self.rows_for_ids(self._rows_by_group.get(group_index, ()))
+
+    def rows_for_member(self, member_path: str) -> List[int]:
+        """멤버 경로가 표시된 행 위치 목록 (오름차순)"""
+        path_id = self._paths.ids.get(member_path)
+        if path_id is None:
+            return []
+        self._ensure_indexes()
+        return self.rows_for_ids(self._rows_by_member.get(path_id, ()))
+
+    def decoration_changed(self, member_path: str):
+        """멤버 경로의 아이콘이 준비되었을 때 해당 행의 멤버 열을 다시 그리게 합니다."""
+        for row in self.rows_for_member(member_path):
+            index = self.index(row, COLUMN_MEMBER)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def contains_member(self, member_path: str) -> bool:
+        path_id = self._paths.ids.get(member_path)
+        if path_id is None:
+            return False
+        self._ensure_indexes()
+        return bool(self._rows_by_member.get(path_id))
+
+    def group_of_member(self, member_path: str) -> Optional[str]:
+        """멤버 경로가 속한 그룹 ID (여러 행이면 가장 앞 행 기준, 없으면 None)"""
+        rows = self.rows_for_member(member_path)
+        return self.group_id(rows[0]) if rows else None
+
+    # --- 행 값 읽기 ---
+    def member_path(self, row: int) -> str:
+        return self._paths.values[self._member[row]]
+
+    def representative_path(self, row: int) -> str:
+        return self._paths.values[self._representative[row]]
+
+    def group_id(self, row: int) -> str:
+        return self._group_ids.values[self._group[row]]
+
+    def rank(self, row: int) -> int:
+        return int(self._rank[row])
+
+    def similarity(self, row: int) -> float:
+        return float(self._similarity[row])
+
+    def item(self, row: int, column: int = 0) -> Optional[DuplicateTableItem]:
+        """QStandardItemModel.item()과 같은 방식으로 셀을 읽기 위한 객체 (범위 밖이면 None)"""
+        if 0 <= row < len(self._rank) and 0 <= column < len(HEADER_LABELS):
+            return DuplicateTableItem(self, row, column)
+        return None
+
+    def is_checked(self, row: int) -> bool:
+        return 0 <= row < len(self._checked) and bool(self._checked[row])
+
+    # --- 체크 상태 (행 위치별 비트맵, 정렬/삽입/삭제 시 다른 열 배열과 함께 옮겨짐) ---
+    def checked_count(self) -> int:
+        """체크된 멤버 경로 수 (같은 경로가 여러 행에서 체크되어도 1개)"""
+        checked_paths = np.zeros(len(self._paths.values), dtype=bool)
+        checked_paths[self._member[self._checked]] = True
+        return int(np.count_nonzero(checked_paths))
+
+    def checked_member_paths(self) -> List[str]:
+        """체크된 행의 멤버 경로 목록 (중복 없이 현재 행 순서)"""
+        member_ids, first_rows = np.unique(self._member[self._checked], return_index=True)
+        return [self._paths.values[member_id] for member_id in member_ids[np.argsort(first_rows)].tolist()]
+
+    def similarity_values(self) -> np.ndarray:
+        """행 순서의 유사도(%) 배열 (규칙 선택용, 읽기 전용으로 사용)"""
+        return self._similarity
+
+    def set_checked_mask(self, mask: np.ndarray) -> int:
+        """
+        모든 행의 체크 상태를 행 순서의 bool 배열로 한 번에 바꿉니다.
+        행마다 신호를 보내지 않고 바뀐 행 구간에 dataChanged 1회와 check_states_changed 1회만 보냅니다. 바뀐 행 수를 반환합니다.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != self._checked.shape:
+            raise ValueError(f"체크 상태 배열 길이가 행 수와 다릅니다: {mask.shape} != {self._checked.shape}")
+        changed_rows = np.flatnonzero(mask != self._checked)
+        if len(changed_rows) == 0:
+            return 0
+        self._checked = mask.copy()
+        self.dataChanged.emit(self.index(int(changed_rows[0]), COLUMN_CHECK),
+                              self.index(int(changed_rows[-1]), COLUMN_CHECK), [Qt.CheckStateRole])
+        self.check_states_changed.emit()
+        return len(changed_rows)
+
+    def set_all_checked(self, checked: bool) -> int:
+        return self.set_checked_mask(np.full(len(self._checked), checked, dtype=bool))
+
+    def invert_checked(self) -> int:
+        return self.set_checked_mask(~self._checked)
+
+    def sort_value(self, row: int, column: int):
+        """프록시 정렬용 값 (Rank 또는 유사도%, 다른 열은 None)"""
+        if not 0 <= row < len(self._rank):
+            return None
+        if column == COLUMN_RANK:
+            return int(self._rank[row])
+        if column == COLUMN_SIMILARITY:
+            return float(self._similarity[row])
+        return None
+
+    def _sort_keys(self, column: int) -> np.ndarray:
+        """열의 정렬 키 배열 (유사도 열은 높은 퍼센트가 먼저 오도록 부호를 바꿈)"""
+        if column == COLUMN_CHECK:
+            return self._checked.astype(np.int8)
+        if column == COLUMN_RANK:
+            return self._rank
+        if column == COLUMN_SIMILARITY:
+            return -self._similarity
+        table, ids = {
+            COLUMN_REPRESENTATIVE: (self._paths, self._representative),
+            COLUMN_MEMBER: (self._paths, self._member),
+            COLUMN_GROUP_ID: (self._group_ids, self._group),
+        }[column]
+        # 문자열 ID -> 문자열 정렬 순위로 바꿔 정수 배열로 비교
+        string_order = np.empty(len(table.values), dtype=np.int64)
+        string_order[sorted(range(len(table.values)), key=table.values.__getitem__)] = np.arange(len(table.values))
+        return string_order[ids]
+
+    def _sort_permutation(self, column: int, order: int) -> np.ndarray:
+        keys = self._sort_keys(column)
+        if order == Qt.DescendingOrder:
+            # 내림차순도 같은 키끼리는 현재 순서를 유지 (QSortFilterProxyModel과 같은 안정 정렬)
+            return np.lexsort((np.arange(len(keys)), -keys.astype(np.float64)))
+        return np.argsort(keys, kind='stable')
+
+    def _permute(self, permutation: np.ndarray):
+        for name in self._COLUMN_ARRAYS:
+            setattr(self, name, getattr(self, name)[permutation])
+        self._row_positions = None
+
+    def sort(self, column: int, order: int = Qt.AscendingOrder):
+        """
+        열 배열을 NumPy로 한 번에 정렬합니다 (비교마다 파이썬 lessThan을 호출하는 프록시 정렬 대신 사용).
+        선택 등 영구 인덱스는 새 행 위치로 옮깁니다.
+        """
+        self._sort_column = column
+        self._sort_order = order
+        if column < 0 or column >= len(HEADER_LABELS) or len(self._rank) < 2:
+            return
+        permutation = self._sort_permutation(column, order)
+        self.layoutAboutToBeChanged.emit([], QAbstractTableModel.VerticalSortHint)
+        new_rows = np.empty(len(permutation), dtype=np.int64)
+        new_rows[permutation] = np.arange(len(permutation))
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(int(new_rows[index.row()]), index.column()) if index.row() < len(new_rows) else QModelIndex()
+                       for index in old_indexes]
+        self._permute(permutation)
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit([], QAbstractTableModel.VerticalSortHint)
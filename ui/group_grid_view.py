@@ -0,0 +1,122 @@
+import os
+from typing import Dict, List, Optional, Tuple
+from PyQt5.QtWidgets import QListWidget, QListWidgetItem, QListView, QAbstractItemView
+from PyQt5.QtGui import QIcon, QPixmap, QImage, QColor
+from PyQt5.QtCore import Qt, QSize, pyqtSignal
+from .thumbnail_loader import ThumbnailLoader
+
+# 그리드에 표시할 썸네일 크기와 항목 칸 크기 (파일명 두 줄 포함)
+GRID_ICON_SIZE = 128
+GRID_CELL_SIZE = QSize(150, 175)
+# 항목 데이터 역할: 파일 경로
+PATH_ROLE = Qt.UserRole
+
+class GroupGridView(QListWidget):
+    """
+    선택한 그룹의 대표 파일과 모든 멤버를 썸네일 격자로 보여주는 뷰.
+    썸네일은 ThumbnailLoader(디스크 캐시 + 스레드 풀)에서 받아오며, 항목을 클릭하면 member_activated 시그널이 발생합니다.
+    """
+    member_activated = pyqtSignal(str)  # 클릭한 멤버 파일 경로 (대표 파일은 제외)
+
+    def __init__(self, parent=None, loader: Optional[ThumbnailLoader] = None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setWrapping(True)
+        self.setUniformItemSizes(True)
+        # 큰 그룹(연속 촬영 수천 장)도 항목을 나눠 배치해 화면이 멈추지 않도록
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        self.setIconSize(QSize(GRID_ICON_SIZE, GRID_ICON_SIZE))
+        self.setGridSize(GRID_CELL_SIZE)
+        self.setWordWrap(True)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+        self.loader = loader or ThumbnailLoader(self)
+        self.loader.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.group_id: Optional[str] = None
+        self._signature: Optional[Tuple] = None  # 마지막으로 표시한 (그룹 ID, 대표, 멤버 목록) - 같으면 다시 만들지 않음
+        self._items: Dict[str, QListWidgetItem] = {}  # 파일 경로 -> 항목
+        self._representative: Optional[str] = None
+        self._placeholder = self._make_placeholder()
+        self.itemClicked.connect(self._on_item_clicked)
+
+    @staticmethod
+    def _make_placeholder() -> QIcon:
+        pixmap = QPixmap(GRID_ICON_SIZE, GRID_ICON_SIZE)
+        pixmap.fill(QColor("#eeeeee"))
+        return QIcon(pixmap)
+
+    def show_group(self, group_id: str, representative: str, members: List[Tuple[str, int, int]],
+                   current_member: Optional[str] = None):
+        """
+        그룹의 대표와 멤버를 표시합니다. members는 (경로, 유사도%, Rank) 목록입니다.
+        이미 같은 그룹/멤버를 표시 중이면 항목을 다시 만들지 않고 현재 멤버 강조만 바꿉니다.
+        """
+        signature = (group_id, representative, tuple(members))
+        if signature != self._signature:
+            self._rebuild(group_id, representative, members)
+            self._signature = signature
+        self.set_current_member(current_member)
+
+    def _rebuild(self, group_id: str, representative: str, members: List[Tuple[str, int, int]]):
+        self.loader.cancel_pending()
+        self.clear()
+        self._items = {}
+        self.group_id = group_id
+        self._representative = representative
+        entries = [(representative, "★ " + os.path.basename(representative))]
+        entries.extend((path, f"{os.path.basename(path)}\n{percent:g}% (#{rank})")
+                       for path, percent, rank in sorted(members, key=lambda member: member[2]))
+        print(f"[GroupGrid] 그룹 {group_id} 썸네일 {len(entries)}개 표시")
+        self.setUpdatesEnabled(False)
+        try:
+            for path, text in entries:
+                if path in self._items:
+                    continue
+                item = QListWidgetItem(self._placeholder, text)
+                item.setData(PATH_ROLE, path)
+                item.setToolTip(path)
+                item.setTextAlignment(Qt.AlignHCenter | Qt.AlignTop)
+                self.addItem(item)
+                self._items[path] = item
+        finally:
+            self.setUpdatesEnabled(True)
+        # 격자 순서(대표 -> Rank 순 멤버)대로 요청, 앞쪽 항목이 먼저 처리됨
+        for path in self._items:
+            self.loader.request(path)
+
+    def set_current_member(self, member_path: Optional[str]):
+        """현재 테이블에서 선택된 멤버를 강조합니다 (itemClicked는 발생하지 않음)"""
+        item = self._items.get(member_path) if member_path else None
+        self.blockSignals(True)
+        try:
+            if item is not None:
+                self.setCurrentItem(item)
+                self.scrollToItem(item)
+            else:
+                self.clearSelection()
+        finally:
+            self.blockSignals(False)
+
+    def clear_group(self):
+        """표시 중인 그룹을 비웁니다."""
+        self.loader.cancel_pending()
+        self.clear()
+        self._items = {}
+        self.group_id = None
+        self._representative = None
+        self._signature = None
+
+    def _on_thumbnail_ready(self, file_path: str, image: Optional[QImage]):
+        item = self._items.get(file_path)
+        if item is None or image is None or image.isNull():
+            return
+        item.setIcon(QIcon(QPixmap.fromImage(image)))
+
+    def _on_item_clicked(self, item: QListWidgetItem):
+        path = item.data(PATH_ROLE)
+        if path and path != self._representative:
+            self.member_activated.emit(path)
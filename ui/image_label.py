@@ -1,16 +1,17 @@
 import os
 from PyQt5.QtWidgets import QLabel
-from PyQt5.QtGui import QPixmap, QResizeEvent, QImage, QPainter, QIcon, QColor, QFont, QPen, QPolygon
-from PyQt5.QtCore import Qt, QSize, QRect, QPoint
-from typing import Optional
-from PIL import Image
-import rawpy
-import numpy as np
-from supported_formats import RAW_EXTENSIONS, VIDEO_ONLY_EXTENSIONS, FRAME_CHECK_FORMATS
-import av  # PyAV 임포트 추가
+from PyQt5.QtGui import QPixmap, QImage, QResizeEvent
+from PyQt5.QtCore import Qt, pyqtSignal
+from typing import List, Optional, Tuple
+from ui.preview_loader import PreviewResult, decode_preview
 
 class ImageLabel(QLabel):
     """동적 크기 조절 및 비율 유지를 지원하는 이미지 레이블"""
+    # 축소 미리보기(RAW 내장 썸네일 등)를 더블클릭하면 전체 해상도 렌더링 요청
+    full_resolution_requested = pyqtSignal()
+    # 레이블이 커져서 지금 디코딩된 미리보기보다 큰 해상도가 필요할 때
+    larger_preview_needed = pyqtSignal()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._original_pixmap: Optional[QPixmap] = None
@@ -18,215 +19,66 @@ class ImageLabel(QLabel):
         self.setMinimumSize(100, 100) # 최소 크기 설정 (예시)
         self.setObjectName("ImageLabel") # 스타일시트 적용 위한 객체 이름
         self.is_video = False # 비디오 파일인지 여부
+        self.requested_path: Optional[str] = None # 표시하려고 요청한 파일 경로 (늦게 도착한 이전 미리보기 무시용)
+        self.requested_full_resolution = False # 전체 해상도 미리보기를 요청했는지 여부
+        self.is_reduced = False # 현재 표시 중인 미리보기가 축소 디코딩(RAW 썸네일/절반 크기)인지 여부
+        self._levels: List[QPixmap] = [] # 해상도 피라미드 (첫 항목이 가장 큼, _original_pixmap과 같음)
+        self._is_downscaled = False # 디코딩 시 원본보다 작게 읽었는지 여부 (레이블이 커지면 다시 요청)
+        self._scaled_key: Optional[Tuple[int, int, int]] = None # 마지막으로 스케일링한 (너비, 높이, 피라미드 단계)
 
     def load_path(self, file_path: str) -> bool:
         """파일 경로를 로드하고 결과를 반환합니다. 편의 메서드입니다."""
         return self.setPixmapFromFile(file_path)
 
     def setPixmapFromFile(self, file_path: str) -> bool:
-        """파일 경로로부터 Pixmap을 로드하고 원본을 저장합니다. RAW, TGA 및 비디오 파일 지원."""
-        if not file_path or not os.path.exists(file_path):
+        """파일 경로로부터 Pixmap을 동기적으로 로드합니다. RAW, TGA 및 비디오 파일 지원 (GUI 스레드에서 디코딩)."""
+        return self.setPreviewResult(decode_preview(file_path))
+
+    def setPreviewResult(self, result: PreviewResult) -> bool:
+        """PreviewLoader가 디코딩한 결과를 표시합니다. QPixmap 변환은 GUI 스레드인 여기서만 수행합니다."""
+        self.is_video = result.is_video
+        self.is_reduced = result.is_reduced
+        self.setToolTip("Double-click to render at full resolution" if result.is_reduced else "")
+        self._levels = []
+        self._scaled_key = None
+        if result.image is None:
             self._original_pixmap = None
-            self.setText("File Not Found")
+            super().clear()
+            self.setText(result.error_text or f"Load Error\n{os.path.basename(result.file_path)}")
             return False
-
-        pixmap = None
-        file_ext = os.path.splitext(file_path)[1].lower()
-        # 비디오/애니메이션 파일 확인 (두 집합 모두 확인)
-        self.is_video = file_ext in VIDEO_ONLY_EXTENSIONS or file_ext in FRAME_CHECK_FORMATS
-
-        try:
-            # 비디오 파일 처리
-            if self.is_video:
-                # WebP 애니메이션 특별 처리
-                webp_processed = False
-                if file_ext == '.webp':
-                    try:
-                        # Pillow로 WebP 애니메이션 첫 프레임 추출
-                        with Image.open(file_path) as img:
-                            # 첫 프레임 사용
-                            img.seek(0)
-                            # PIL Image를 QPixmap으로 변환
-                            if img.mode == "RGBA":
-                                img_data = img.tobytes("raw", "RGBA")
-                                qimg = QImage(img_data, img.width, img.height, img.width * 4, QImage.Format_RGBA8888)
-                            else:
-                                rgb_img = img.convert("RGB")
-                                img_data = rgb_img.tobytes("raw", "RGB")
-                                qimg = QImage(img_data, rgb_img.width, rgb_img.height, rgb_img.width * 3, QImage.Format_RGB888)
-                                if rgb_img != img:
-                                    rgb_img.close()
-                            
-                            if not qimg.isNull():
-                                pixmap = QPixmap.fromImage(qimg)
-                                if not pixmap.isNull():
-                                    # "Animation" 텍스트 추가
-                                    painter = QPainter(pixmap)
-                                    painter.setRenderHint(QPainter.Antialiasing)
-                                    painter.setPen(QPen(QColor(255, 255, 255, 200)))
-                                    painter.setFont(QFont("Arial", 12, QFont.Bold))
-                                    
-                                    # 반투명 배경 추가
-                                    bg_rect = QRect(0, 0, pixmap.width(), 30)
-                                    painter.fillRect(bg_rect, QColor(0, 0, 0, 150))
-                                    
-                                    # "WebP Animation" 텍스트 추가
-                                    painter.drawText(bg_rect, Qt.AlignCenter, "WebP Animation")
-                                    painter.end()
-                                    webp_processed = True  # 성공적으로 처리됨
-                    except Exception as webp_err:
-                        print(f"WebP 애니메이션 처리 오류, 일반 비디오 처리로 전환: {webp_err}")
-                        # 오류 발생 시 일반 비디오 처리로 계속 진행
-                
-                # 일반 비디오 처리 (WebP가 성공적으로 처리되지 않은 경우)
-                if not webp_processed:
-                    # PyAV를 사용하여 첫 프레임 추출 시도
-                    try:
-                        # 첫 프레임 추출 시도
-                        frame_extracted = False
-                        container = av.open(file_path)
-                        video_stream = next((s for s in container.streams if s.type == 'video'), None)
-                        
-                        if video_stream:
-                            # 첫 번째 키프레임을 찾아 추출
-                            container.seek(0)
-                            for frame in container.decode(video_stream):
-                                # 프레임을 PIL 이미지로 변환
-                                pil_img = frame.to_image()
-                                # PIL 이미지를 QPixmap으로 변환
-                                img_bytes = pil_img.tobytes('raw', 'RGB')
-                                qimg = QImage(img_bytes, pil_img.width, pil_img.height, 
-                                            pil_img.width * 3, QImage.Format_RGB888)
-                                pixmap = QPixmap.fromImage(qimg)
-                                frame_extracted = True
-                                break  # 첫 프레임만 사용
-                        
-                        container.close()
-                        
-                        # 프레임 추출 실패 시 기본 비디오 아이콘 사용
-                        if not frame_extracted:
-                            raise Exception("첫 프레임 추출 실패")
-                            
-                    except Exception as e:
-                        print(f"비디오 프레임 추출 오류: {e}")
-                        # 추출 실패 시 기본 비디오 아이콘 사용
-                        video_icon = QPixmap(300, 300)
-                        video_icon.fill(Qt.black)  # 배경을 검은색으로 변경
-                        
-                        # 비디오 아이콘 그리기
-                        painter = QPainter(video_icon)
-                        painter.setRenderHint(QPainter.Antialiasing)
-                        
-                        # 비디오 아이콘 중앙에 텍스트 그리기
-                        painter.setPen(QPen(QColor(255, 255, 255)))  # 흰색 텍스트
-                        font = QFont("Arial", 20, QFont.Bold)
-                        painter.setFont(font)
-                        
-                        # 파일명 표시 (너무 길면 줄임)
-                        basename = os.path.basename(file_path)
-                        if len(basename) > 20:
-                            basename = basename[:17] + "..."
-                            
-                        # 비디오 표시 추가
-                        rect = QRect(10, 10, 280, 280)
-                        painter.drawText(rect, Qt.AlignCenter, f"VIDEO\n{basename}")
-                        
-                        # 프레임 그리기 (화면 비율 표현)
-                        painter.setPen(QPen(QColor(255, 255, 255), 3))
-                        frame_rect = QRect(50, 80, 200, 140)  # 화면 비율을 16:9로 표현
-                        painter.drawRect(frame_rect)
-                        
-                        # 재생 버튼 그리기
-                        painter.setBrush(QColor(255, 255, 255))
-                        # QPolygon 생성하여 점 좌표 추가
-                        play_triangle = QPolygon()
-                        play_triangle.append(QPoint(frame_rect.center().x() - 15, frame_rect.center().y() - 25))
-                        play_triangle.append(QPoint(frame_rect.center().x() - 15, frame_rect.center().y() + 25))
-                        play_triangle.append(QPoint(frame_rect.center().x() + 30, frame_rect.center().y()))
-                        painter.drawPolygon(play_triangle)
-                        
-                        painter.end()
-                        pixmap = video_icon
-                    
-            # RAW 또는 TGA 파일 처리
-            elif file_ext in RAW_EXTENSIONS or file_ext == '.tga':
-                img_pil = None
-                raw_obj = None
-                qimage = None # QImage 객체 초기화
-                try:
-                    if file_ext in RAW_EXTENSIONS:
-                        raw_obj = rawpy.imread(file_path)
-                        rgb_array = raw_obj.postprocess(use_camera_wb=True)
-                        img_pil = Image.fromarray(rgb_array)
-                    elif file_ext == '.tga':
-                        img_pil = Image.open(file_path)
-
-                    if img_pil:
-                        # PIL Image -> QImage 직접 변환
-                        img_pil.draft(None, None) # Ensure image data is loaded
-                        if img_pil.mode == "RGBA":
-                            bytes_per_line = img_pil.width * 4
-                            qimage = QImage(img_pil.tobytes("raw", "RGBA"), img_pil.width, img_pil.height, bytes_per_line, QImage.Format_RGBA8888)
-                        elif img_pil.mode == "RGB":
-                            bytes_per_line = img_pil.width * 3
-                            qimage = QImage(img_pil.tobytes("raw", "RGB"), img_pil.width, img_pil.height, bytes_per_line, QImage.Format_RGB888)
-                        else:
-                            # 다른 모드는 RGB로 변환 시도
-                            try:
-                                rgb_img = img_pil.convert("RGB")
-                                bytes_per_line = rgb_img.width * 3
-                                qimage = QImage(rgb_img.tobytes("raw", "RGB"), rgb_img.width, rgb_img.height, bytes_per_line, QImage.Format_RGB888)
-                                rgb_img.close() # 변환된 이미지 닫기
-                            except Exception as convert_err:
-                                print(f"Could not convert PIL image mode {img_pil.mode} to RGB for {file_path}: {convert_err}")
-                                self.setText(f"Unsupported Image Mode\n{os.path.basename(file_path)}")
-                                return False
-
-                        if qimage and not qimage.isNull():
-                            pixmap = QPixmap.fromImage(qimage)
-                        else:
-                             print(f"Failed to create QImage from PIL data for {file_path}")
-                             self.setText(f"QImage Creation Failed\n{os.path.basename(file_path)}")
-                             return False
-
-                except rawpy.LibRawIOError as e:
-                    print(f"rawpy I/O error for {file_path}: {e}")
-                    self.setText(f"RAW Load Error (I/O)\n{os.path.basename(file_path)}")
-                    return False
-                except Exception as e:
-                    print(f"Error processing {file_ext} file {file_path}: {e}")
-                    self.setText(f"Cannot Load Image\n{os.path.basename(file_path)}")
-                    return False
-                finally:
-                    if raw_obj:
-                        raw_obj.close()
-                    if img_pil and hasattr(img_pil, 'close'):
-                         try:
-                             img_pil.close()
-                         except Exception as close_err:
-                              print(f"Error closing PIL image {file_path}: {close_err}")
-
-            # 기타 지원 형식 (Qt/Pillow 기본 로더 사용)
-            else:
-                pixmap = QPixmap(file_path)
-
-            # Pixmap 유효성 검사 및 저장
-            if pixmap and not pixmap.isNull():
-                self._original_pixmap = pixmap
-                self.updatePixmap()
-                return True
-            else:
-                self._original_pixmap = None
-                # pixmap 생성 실패 메시지는 위에서 처리됨
-                if not (file_ext in RAW_EXTENSIONS or file_ext == '.tga' or self.is_video): # 일반 파일 로드 실패 시 메시지 설정
-                     self.setText(f"Invalid Image File\n{os.path.basename(file_path)}")
-                return False
-
-        except Exception as e:
-            print(f"Unexpected error in setPixmapFromFile for {file_path}: {e}")
+        levels = [QPixmap.fromImage(level) for level in result.levels]
+        if not levels or levels[0].isNull():
             self._original_pixmap = None
-            self.setText(f"Load Error\n{os.path.basename(file_path)}")
+            super().clear()
+            self.setText(f"Invalid Image File\n{os.path.basename(result.file_path)}")
             return False
+        self._levels = levels
+        self._original_pixmap = levels[0]
+        self._is_downscaled = result.is_downscaled
+        self.updatePixmap()
+        return True
+
+    def decode_dimension(self) -> int:
+        """미리보기를 디코딩할 크기 (레이블의 긴 변, 고해상도 화면 배율 반영)"""
+        return int(max(self.width(), self.height()) * self.devicePixelRatioF())
+
+    def showThumbnail(self, image: QImage):
+        """미리보기 디코딩이 끝날 때까지 캐시된 작은 썸네일을 늘려서 표시합니다 (더 큰 해상도 요청은 하지 않음)"""
+        self.is_reduced = False
+        self.setToolTip("")
+        self._scaled_key = None
+        self._original_pixmap = QPixmap.fromImage(image)
+        self._levels = [self._original_pixmap]
+        self._is_downscaled = False
+        self.updatePixmap()
+
+    def showLoading(self, file_path: str):
+        """백그라운드 디코딩이 끝날 때까지 표시할 안내 문구"""
+        self._original_pixmap = None
+        self._levels = []
+        self._scaled_key = None
+        super().clear()
+        self.setText(f"Loading...\n{os.path.basename(file_path)}")
 
     def updatePixmap(self):
         """원본 Pixmap을 현재 레이블 크기에 맞게 스케일링하여 표시합니다."""
@@ -243,18 +95,47 @@ class ImageLabel(QLabel):
              super().setPixmap(self._original_pixmap)
              return
 
+        # 표시 크기 이상인 가장 작은 피라미드 단계에서 스케일링 (큰 원본을 매번 줄이지 않도록)
+        levels = self._levels if self._levels and self._levels[0] is self._original_pixmap else [self._original_pixmap]
+        fitted = self._original_pixmap.size().scaled(label_size, Qt.KeepAspectRatio)
+        level_index = 0
+        for i, level in enumerate(levels):
+            if level.width() >= fitted.width() and level.height() >= fitted.height():
+                level_index = i
+        scaled_key = (label_size.width(), label_size.height(), level_index)
+        if scaled_key == self._scaled_key:
+            return # 크기가 같으면 이전 스케일링 결과 유지
+        self._scaled_key = scaled_key
+
         # 원본 비율 유지하며 스케일링
-        scaled_pixmap = self._original_pixmap.scaled(label_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        scaled_pixmap = levels[level_index].scaled(label_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
         super().setPixmap(scaled_pixmap) # QLabel의 setPixmap 직접 호출
 
+    def mouseDoubleClickEvent(self, event):
+        """축소 미리보기를 더블클릭하면 전체 해상도 렌더링을 요청합니다."""
+        if self.is_reduced and self.requested_path:
+            self.full_resolution_requested.emit()
+        super().mouseDoubleClickEvent(event)
+
     def resizeEvent(self, event: QResizeEvent):
         """위젯 크기가 변경될 때 호출됩니다."""
         self.updatePixmap() # 크기 변경 시 이미지 업데이트
         super().resizeEvent(event)
+        # 디코딩한 미리보기보다 레이블이 커지면 더 큰 해상도를 요청
+        if (self._original_pixmap is not None and self._is_downscaled and self.requested_path
+                and self.decode_dimension() > max(self._original_pixmap.width(), self._original_pixmap.height())):
+            self.larger_preview_needed.emit()
 
     def clear(self):
         """이미지와 원본 Pixmap을 초기화합니다."""
         self._original_pixmap = None
+        self._levels = []
+        self._scaled_key = None
+        self._is_downscaled = False
         self.is_video = False
+        self.requested_path = None
+        self.requested_full_resolution = False
+        self.is_reduced = False
+        self.setToolTip("")
         super().clear()
         self.setText("Image Area") # 초기 텍스트 설정 
\ No newline at end of file
@@ -7,7 +7,7 @@ import traceback
 import math
 import re
 import copy # 딥 카피를 위한 모듈 추가
-from typing import Optional, List, Dict, Tuple, Any, Set, Union
+from typing import Callable, Optional, List, Dict, Tuple, Any, Set, Union
 import webbrowser # 웹 브라우저 모듈 임포트
 
 # 프로젝트 루트 경로를 sys.path에 추가
@@ -16,23 +16,28 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 import shutil # shutil 임포트
+import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QFrame, QListView, QSplitter, QTableView,
     QHeaderView, QFileDialog, QMessageBox, QDesktopWidget # QStyle 제거
 )
 # QPixmap, QStandardItem, QResizeEvent 제거. QIcon 은 __main__ 에서만 사용
-from PyQt5.QtGui import QStandardItemModel, QIcon, QStandardItem
+from PyQt5.QtGui import QIcon
 # QSize 제거
-from PyQt5.QtCore import Qt, QModelIndex, QThread, pyqtSlot
+from PyQt5.QtCore import Qt, QModelIndex, QThread, QTimer, pyqtSlot
 from image_processor import ScanWorker, RAW_EXTENSIONS, DuplicateGroupWithSimilarity
 from file.undo_manager import UndoManager, WINSHELL_AVAILABLE
 from log_setup import setup_logging # 로깅 설정 임포트
+from supported_formats import PREVIEW_PREFETCH_ROWS, THUMBNAIL_TABLE_ICONS, THUMBNAIL_PREVIEW_PLACEHOLDER, REGROUP_DEBOUNCE_MS
 # import uuid # 그룹 ID 생성을 위해 uuid 임포트 제거
 
 # --- 새로 분리된 클래스 및 UI 설정 함수 임포트 --- 
 from ui.image_label import ImageLabel
+from ui.preview_loader import PreviewLoader, PreviewResult
+from ui.thumbnail_loader import ThumbnailIconCache, read_cached_thumbnail
 from ui.similarity_sort_proxy_model import SimilaritySortProxyModel
+from ui.duplicate_table_model import DuplicateTableModel
 from ui.main_window_ui import setup_ui # setup_ui 함수 임포트
 from ui.file_action_handler import FileActionHandler # 파일 액션 핸들러 임포트
 from ui.scan_result_processor import ScanResultProcessor # 스캔 결과 처리기 임포트
@@ -57,15 +62,18 @@ class MainWindow(QMainWindow):
         self.previous_selection_index: Optional[int] = None # 프록시 행 인덱스 저장용
         self.last_acted_representative_path: Optional[str] = None
         self.last_acted_member_path: Optional[str] = None
-        # 선택된 항목 관리를 위한 변수 추가
-        self.selected_items: List[str] = [] # 선택된 멤버 파일 경로 목록
         # 삭제된 항목 추적을 위한 변수 추가
         self.last_deleted_items: List[Dict] = [] # 마지막으로 삭제된 항목 정보 목록
+        # 마지막 스캔 보고서 (같은 파일 그룹 등)
+        self.scan_report: Dict[str, Any] = {}
 
         # --- 파일 액션 핸들러 인스턴스 생성 --- 
         self.file_action_handler = FileActionHandler(self)
         # --- 스캔 결과 처리기 인스턴스 생성 --- 
         self.scan_result_processor = ScanResultProcessor(self)
+        # --- 미리보기 백그라운드 로더 (디코딩 캐시 + 이웃 행 미리 읽기) ---
+        self.preview_loader = PreviewLoader(self)
+        self.preview_loader.preview_ready.connect(self._on_preview_ready)
         # --- 핸들러/처리기 생성 끝 ---
 
         self.setWindowTitle("DuplicatePhotoFinderPAAK")
@@ -75,9 +83,31 @@ class MainWindow(QMainWindow):
         setup_ui(self) # setup_ui 함수를 호출하여 UI 구성
         # --- UI 설정 끝 ---
 
+        # --- 결과 테이블 멤버 열에 캐시된 썸네일 아이콘 표시 (스캔 중 저장된 썸네일, 원본은 디코딩하지 않음) ---
+        # 아이콘은 작업자 스레드에서 읽고, 준비되면 해당 행만 다시 그림
+        self.thumbnail_icons: Optional[ThumbnailIconCache] = None
+        if THUMBNAIL_TABLE_ICONS:
+            self.thumbnail_icons = ThumbnailIconCache(self.duplicate_table_view.iconSize().height(),
+                                                      self.group_grid_view.loader.cache, parent=self)
+            self.duplicate_table_model.decoration_provider = self.thumbnail_icons.icon
+            self.thumbnail_icons.icon_ready.connect(self.duplicate_table_model.decoration_changed)
+            # 그룹 썸네일 보기가 새로 만든 썸네일은 테이블 아이콘에도 반영
+            self.group_grid_view.loader.thumbnail_ready.connect(self.thumbnail_icons.forget_missing)
+
         # --- 시그널 연결 (액션 버튼 핸들러 연결로 수정) --- 
         self.scan_folder_button.clicked.connect(self.scan_folder)
-        self.duplicate_table_view.clicked.connect(self.on_table_item_clicked)
+        # 클릭/방향키 등으로 현재 행이 바뀌면 미리보기 갱신 (클릭도 현재 행을 바꾸므로 clicked는 따로 연결하지 않음, 한 번 클릭에 한 번만 갱신)
+        self.duplicate_table_view.selectionModel().currentRowChanged.connect(self._on_current_row_changed)
+        # 축소된 RAW 미리보기를 더블클릭하면 전체 해상도로 다시 렌더링
+        self.left_image_label.full_resolution_requested.connect(
+            lambda: self._load_full_resolution(self.left_image_label, self.left_info_label))
+        self.right_image_label.full_resolution_requested.connect(
+            lambda: self._load_full_resolution(self.right_image_label, self.right_info_label))
+        # 창을 키우면 표시 크기에 맞는 더 큰 미리보기를 다시 디코딩
+        self.left_image_label.larger_preview_needed.connect(
+            lambda: self._load_larger_preview(self.left_image_label, self.left_info_label))
+        self.right_image_label.larger_preview_needed.connect(
+            lambda: self._load_larger_preview(self.right_image_label, self.right_info_label))
         self.left_delete_button.clicked.connect(lambda: self.file_action_handler.delete_selected_image('original'))
         self.right_delete_button.clicked.connect(lambda: self.file_action_handler.delete_selected_image('duplicate'))
         self.left_move_button.clicked.connect(lambda: self.file_action_handler.move_selected_image('original'))
@@ -95,13 +125,29 @@ class MainWindow(QMainWindow):
         self.right_open_folder_button.clicked.connect(lambda: self.open_parent_folder('duplicate'))
         
         # 체크박스 클릭 이벤트를 처리하기 위한 시그널 연결
-        self.duplicate_table_model.itemChanged.connect(self.on_checkbox_changed)
+        self.duplicate_table_model.check_state_changed.connect(self.on_checkbox_changed)
+        self.duplicate_table_model.check_states_changed.connect(self.on_check_states_changed)
+        # 그룹 썸네일 격자에서 멤버를 클릭하면 테이블의 해당 행 선택
+        self.group_grid_view.member_activated.connect(self._select_group_member)
         
         # 일괄 작업 버튼 시그널 연결
         self.select_all_button.clicked.connect(self.select_all_items)
         self.select_none_button.clicked.connect(self.clear_selection)
+        self.invert_selection_button.clicked.connect(self.invert_selection)
+        self.select_exact_button.clicked.connect(self.select_exact_duplicates)
         self.batch_delete_button.clicked.connect(self.delete_selected_items)
         self.batch_move_button.clicked.connect(self.move_selected_items)
+
+        # 임계값 슬라이더: 값을 바꾸면 잠시 기다렸다가 마지막 스캔 결과를 다시 그룹화 (끄는 동안 매번 다시 만들지 않음)
+        self.regroup_timer = QTimer(self)
+        self.regroup_timer.setSingleShot(True)
+        self.regroup_timer.setInterval(REGROUP_DEBOUNCE_MS)
+        self.regroup_timer.timeout.connect(self.regroup_results)
+        # 재그룹화 결과에 새로 나타난 파일의 존재 확인 결과 (슬라이더를 움직일 때마다 다시 확인하지 않도록, 파일 작업/실행 취소 후에는 비움)
+        self.regroup_path_exists: Dict[str, bool] = {}
+        self.undo_manager.undo_status_changed.connect(lambda _: self.regroup_path_exists.clear())
+        self.hash_threshold_slider.valueChanged.connect(self._on_threshold_slider_changed)
+        self.video_threshold_slider.valueChanged.connect(self._on_threshold_slider_changed)
         # --- 시그널 연결 끝 ---
 
         self._center_window() # 창 중앙 정렬 메서드 호출
@@ -119,14 +165,64 @@ class MainWindow(QMainWindow):
             print(f"Could not center window: {e}")
 
     def _update_image_info(self, image_label, info_label, file_path):
-        """이미지 라벨과 정보 라벨을 업데이트합니다."""
+        """
+        이미지 라벨과 정보 라벨을 업데이트합니다.
+        캐시에 있는 미리보기는 바로 표시하고, 없으면 백그라운드 로더에 맡긴 뒤 완료 시 _on_preview_ready에서 표시합니다.
+        """
         if not os.path.exists(file_path):
             image_label.clear()
             info_label.setText("File not found")
             return
 
-        # 이미지 로드 시도
-        loaded = image_label.load_path(file_path)
+        image_label.requested_path = file_path
+        image_label.requested_full_resolution = False
+        result = self.preview_loader.request(file_path, image_label.decode_dimension())
+        if result is not None:
+            self._apply_preview(image_label, info_label, result)
+            return
+        # 디코딩이 끝날 때까지 디스크 캐시의 썸네일(스캔 중 저장)을 먼저 표시
+        thumbnail = read_cached_thumbnail(file_path, self.group_grid_view.loader.cache) if THUMBNAIL_PREVIEW_PLACEHOLDER else None
+        if thumbnail is not None:
+            image_label.showThumbnail(thumbnail)
+        else:
+            image_label.showLoading(file_path)
+        info_label.setText(f"Loading...\n{os.path.basename(file_path)}")
+
+    def _on_preview_ready(self, file_path: str, result: PreviewResult):
+        """백그라운드 디코딩이 끝난 미리보기를 아직 그 파일을 기다리는 패널에만 표시합니다."""
+        for image_label, info_label in ((self.left_image_label, self.left_info_label),
+                                        (self.right_image_label, self.right_info_label)):
+            if image_label.requested_path == file_path and image_label.requested_full_resolution == result.full_resolution:
+                # 같은 파일을 여러 크기로 요청했으면 캐시에 남은 가장 큰 결과를 표시
+                best = self.preview_loader.get_cached(file_path, result.full_resolution) or result
+                self._apply_preview(image_label, info_label, best)
+
+    def _load_larger_preview(self, image_label, info_label):
+        """레이블이 커졌을 때 표시 크기에 맞는 미리보기를 요청합니다 (완료 전까지 현재 미리보기 유지)."""
+        file_path = image_label.requested_path
+        if not file_path or image_label.requested_full_resolution:
+            return
+        result = self.preview_loader.request(file_path, image_label.decode_dimension())
+        current = image_label._original_pixmap
+        if result is not None and result.levels and (current is None or result.levels[0].width() > current.width()):
+            self._apply_preview(image_label, info_label, result)
+
+    def _load_full_resolution(self, image_label, info_label):
+        """사용자가 요청한 경우에만 RAW를 전체 해상도로 디모자이크해 표시합니다 (백그라운드에서 처리)."""
+        file_path = image_label.requested_path
+        if not file_path or image_label.requested_full_resolution:
+            return
+        image_label.requested_full_resolution = True
+        result = self.preview_loader.request(file_path, full_resolution=True)
+        if result is not None:
+            self._apply_preview(image_label, info_label, result)
+        else:
+            info_label.setText(f"Rendering full resolution...\n{os.path.basename(file_path)}")
+
+    def _apply_preview(self, image_label, info_label, result: PreviewResult):
+        """디코딩된 미리보기를 라벨에 표시하고 파일 정보를 업데이트합니다."""
+        file_path = result.file_path
+        image_label.setPreviewResult(result)
         
         # 파일 정보 업데이트
         try:
@@ -135,25 +231,20 @@ class MainWindow(QMainWindow):
             file_ext = os.path.splitext(file_path)[1].upper()[1:]
             filename = os.path.basename(file_path)
             
-            # 비디오 파일인 경우
-            if image_label.is_video:
-                # 비디오 길이 가져오기 시도
-                from video_processor import VideoProcessor
-                try:
-                    duration = VideoProcessor.get_video_duration(file_path)
-                    duration_text = f", {duration:.1f}초" if duration > 0 else ""
-                except:
-                    duration_text = ""
+            # 비디오 파일인 경우 (재생 시간은 로더가 디코딩할 때 함께 읽음)
+            if result.is_video:
+                duration_text = f", {result.duration:.1f}초" if result.duration > 0 else ""
                 
                 # 비디오 정보 표시
                 info_text = f"VIDEO {file_ext} {file_size_kb:,} KB{duration_text}\n{filename}"
                 info_label.setText(info_text)
             
             # 이미지 파일인 경우
-            elif image_label._original_pixmap:
-                pixmap = image_label._original_pixmap
-                # 원본 이미지 크기를 정보에 표시
-                info_text = f"{file_ext} {pixmap.width()} x {pixmap.height()} {file_size_kb:,} KB\n{filename}"
+            elif result.original_size:
+                # 원본 이미지 크기를 정보에 표시 (미리보기는 축소되었을 수 있음)
+                width, height = result.original_size
+                preview_text = " (preview)" if result.is_reduced else ""
+                info_text = f"{file_ext} {width} x {height} {file_size_kb:,} KB{preview_text}\n{filename}"
                 info_label.setText(info_text)
             
             # 그 외 경우 (pixmap이 없을 때)
@@ -167,6 +258,36 @@ class MainWindow(QMainWindow):
             print(f"Error getting file info: {e}")
             info_label.setText(f"Error getting info\n{os.path.basename(file_path)}")
 
+    def _row_preview_paths(self, proxy_row: int) -> List[str]:
+        """프록시 행의 (대표 파일, 멤버 파일) 경로 목록"""
+        source_row = self.duplicate_table_proxy_model.mapToSource(
+            self.duplicate_table_proxy_model.index(proxy_row, 0)
+        ).row()
+        member_item = self.duplicate_table_model.item(source_row, 3)
+        group_id_item = self.duplicate_table_model.item(source_row, 5)
+        if not (member_item and group_id_item):
+            return []
+        paths = [member_item.text()]
+        representative = self.group_representatives.get(group_id_item.text())
+        if representative:
+            paths.insert(0, representative)
+        return paths
+
+    def _prefetch_neighbour_previews(self, proxy_row: int):
+        """선택한 행의 앞/뒤 행(프록시 순서) 미리보기를 가까운 순서로 미리 디코딩합니다."""
+        row_count = self.duplicate_table_proxy_model.rowCount()
+        decode_dimension = max(self.left_image_label.decode_dimension(), self.right_image_label.decode_dimension())
+        for distance in range(1, PREVIEW_PREFETCH_ROWS + 1):
+            for neighbour_row in (proxy_row + distance, proxy_row - distance):
+                if 0 <= neighbour_row < row_count:
+                    for path in self._row_preview_paths(neighbour_row):
+                        self.preview_loader.request(path, decode_dimension, prefetch=True)
+
+    def _on_current_row_changed(self, current: QModelIndex, previous: QModelIndex):
+        """클릭이나 키보드로 현재 행이 바뀌면 미리보기를 갱신합니다."""
+        if current.isValid():
+            self.on_table_item_clicked(current)
+
     def browse_left_image(self):
         """왼쪽 'Browse' 버튼 클릭 시 파일 대화 상자를 열고 이미지를 로드합니다."""
         file_filter = "Images (*.png *.jpg *.jpeg *.bmp *.gif)"
@@ -194,12 +315,17 @@ class MainWindow(QMainWindow):
             # 하위폴더 포함 체크박스 상태를 ScanWorker에 전달
             include_subfolders = self.include_subfolders_checkbox.isChecked()
             self.scan_worker = ScanWorker(folder_path, include_subfolders)
+            self.scan_report = {} # 이전 스캔 보고서 초기화
+            self.regroup_path_exists.clear() # 재그룹화용 파일 존재 확인 결과도 새 스캔부터 다시 확인
+            self.configure_threshold_sliders() # 스캔 중에는 임계값 슬라이더 비활성화
             self.scan_worker.moveToThread(self.scan_thread)
 
             # 시그널 연결
             self.scan_thread.started.connect(self.scan_worker.run_scan)
             self.scan_worker.scan_started.connect(self.handle_scan_started) # scan_started 시그널 연결
             self.scan_worker.progress_updated.connect(self.update_scan_progress)
+            # 스캔 보고서는 scan_finished 직전에 전달되므로 먼저 연결
+            self.scan_worker.scan_report_ready.connect(self.scan_result_processor.set_scan_report)
             # scan_finished 시그널을 ScanResultProcessor의 메서드에 연결
             self.scan_worker.scan_finished.connect(self.scan_result_processor.process_results)
             self.scan_worker.error_occurred.connect(self.handle_scan_error)
@@ -281,6 +407,100 @@ class MainWindow(QMainWindow):
         self.scan_folder_button.setEnabled(True) # 버튼 활성화 보장
         self.total_files_to_scan = 0 # 스레드 정리 시 총 파일 수 초기화
 
+    def closeEvent(self, event):
+        """창을 닫을 때 대기 중인 미리보기/썸네일 작업을 취소하고, 실행 중인 작업이 끝날 때까지 기다립니다 (삭제된 시그널 객체로 emit 방지)"""
+        loaders = [self.preview_loader, self.group_grid_view.loader]
+        if self.thumbnail_icons is not None:
+            loaders.append(self.thumbnail_icons.loader)
+        for loader in loaders:
+            loader.cancel_pending()
+        for loader in loaders:
+            loader.pool.waitForDone()
+        super().closeEvent(event)
+
+    def configure_threshold_sliders(self):
+        """새 스캔 보고서의 재그룹화 정보로 임계값 슬라이더 범위와 값을 설정합니다 (재그룹화할 수 없으면 비활성화)."""
+        regrouper = self.scan_report.get('regrouper')
+        hash_range = regrouper.hash_threshold_range if regrouper is not None else None
+        video_range = regrouper.video_threshold_range if regrouper is not None else None
+        self.regroup_timer.stop()
+        for slider in (self.hash_threshold_slider, self.video_threshold_slider):
+            slider.blockSignals(True)
+        try:
+            if hash_range is not None:
+                self.hash_threshold_slider.setRange(*hash_range)
+                self.hash_threshold_slider.setValue(regrouper.hash_threshold)
+            if video_range is not None:
+                # 0.1% 단위 정수로 표시
+                self.video_threshold_slider.setRange(round(video_range[0] * 10), round(video_range[1] * 10))
+                self.video_threshold_slider.setValue(round(regrouper.video_threshold * 10))
+        finally:
+            for slider in (self.hash_threshold_slider, self.video_threshold_slider):
+                slider.blockSignals(False)
+        self.hash_threshold_slider.setEnabled(hash_range is not None)
+        self.video_threshold_slider.setEnabled(video_range is not None)
+        self._update_threshold_labels()
+
+    def _update_threshold_labels(self):
+        hash_text = str(self.hash_threshold_slider.value()) if self.hash_threshold_slider.isEnabled() else "-"
+        video_text = f"{self.video_threshold_slider.value() / 10:.1f}%" if self.video_threshold_slider.isEnabled() else "-"
+        self.hash_threshold_label.setText(f"Image distance: {hash_text}")
+        self.video_threshold_label.setText(f"Video similarity: {video_text}")
+
+    def _on_threshold_slider_changed(self, value: int):
+        self._update_threshold_labels()
+        self.regroup_timer.start()  # 마지막 변경 후 REGROUP_DEBOUNCE_MS가 지나면 다시 그룹화
+
+    def regroup_results(self):
+        """슬라이더의 임계값으로 마지막 스캔 결과를 다시 그룹화해 테이블을 채웁니다 (파일을 다시 읽거나 해시를 다시 계산하지 않음)."""
+        regrouper = self.scan_report.get('regrouper')
+        if regrouper is None or (self.scan_thread and self.scan_thread.isRunning()):
+            return
+        start_time = time.perf_counter()
+        hash_threshold = self.hash_threshold_slider.value() if self.hash_threshold_slider.isEnabled() else None
+        video_threshold = self.video_threshold_slider.value() / 10 if self.video_threshold_slider.isEnabled() else None
+        duplicate_groups, report_updates = regrouper.regroup(hash_threshold, video_threshold)
+        self.scan_report.update(report_updates)
+        duplicate_groups = self._drop_missing_files(duplicate_groups)
+        regroup_time = time.perf_counter() - start_time
+        total_files, processed_count = self.scan_result_processor.last_scan_counts
+        self.scan_result_processor.process_results(total_files, processed_count, duplicate_groups)
+        print(f"[Regroup] 그룹 {len(duplicate_groups)}개: 재그룹화 {regroup_time * 1000:.0f}ms, "
+              f"테이블 갱신 포함 {(time.perf_counter() - start_time) * 1000:.0f}ms")
+
+    def _drop_missing_files(self, duplicate_groups: DuplicateGroupWithSimilarity) -> DuplicateGroupWithSimilarity:
+        """
+        재그룹화 결과에서 스캔 이후 삭제/이동된 파일을 뺍니다 (대표가 없으면 첫 멤버가 대표, 파일 삭제 처리와 같은 규칙).
+        현재 결과에 있는 파일은 삭제/이동할 때 그룹 데이터도 함께 갱신되므로, 결과에 새로 나타난 파일만 존재 여부를 확인하고
+        확인 결과는 self.regroup_path_exists에 보관해 다음 재그룹화에서 다시 확인하지 않습니다.
+        """
+        known_paths = set(self.group_representatives.values())
+        for members in self.duplicate_groups_data.values():
+            known_paths.update(path for path, _, _ in members)
+        path_exists = self.regroup_path_exists
+        missing_paths = set()
+        for representative_path, members in duplicate_groups:
+            for path in [representative_path] + [member[0] for member in members]:
+                if path in known_paths:
+                    continue
+                exists = path_exists.get(path)
+                if exists is None:
+                    exists = path_exists[path] = os.path.exists(path)
+                if not exists:
+                    missing_paths.add(path)
+        if not missing_paths:
+            return duplicate_groups
+        print(f"[Regroup] 스캔 이후 삭제/이동된 파일 {len(missing_paths)}개 제외")
+
+        result = []
+        for representative_path, members in duplicate_groups:
+            members = [member for member in members if member[0] not in missing_paths]
+            if representative_path in missing_paths and members:
+                representative_path, members = members[0][0], members[1:]
+            if members:
+                result.append((representative_path, members))
+        return result
+
     def on_table_item_clicked(self, index: QModelIndex):
         """테이블 뷰의 항목 클릭 시 상단 이미지 패널을 업데이트합니다."""
         print(f"[TableClick] Table item clicked: row={index.row()}, column={index.column()}")
@@ -312,8 +532,13 @@ class MainWindow(QMainWindow):
                 print(f"유사도 텍스트: {similarity_text}, 데이터: {similarity_data}")
 
             if current_representative:
+                 # 지나간 행의 대기 중인 디코딩은 취소하고 현재 행부터 처리
+                 self.preview_loader.cancel_pending()
                  self._update_image_info(self.left_image_label, self.left_info_label, current_representative)
                  self._update_image_info(self.right_image_label, self.right_info_label, selected_member)
+                 self._prefetch_neighbour_previews(index.row())
+                 self.group_grid_view.show_group(group_id, current_representative,
+                                                 self.duplicate_groups_data.get(group_id, []), selected_member)
             else:
                  print(f"Error: Representative not found for group {group_id}")
                  self.left_image_label.clear()
@@ -361,219 +586,43 @@ class MainWindow(QMainWindow):
 
     def _update_table_for_group(self, group_id: str):
         """주어진 group_id에 해당하는 테이블 행들을 업데이트합니다 (Rank 및 유사도 포함)."""
-        print(f"[UpdateTable Debug] Updating table for group_id: {group_id}") # 로그 1
-        
-        # 기존 테이블 상태 확인
-        before_source_rows = self.duplicate_table_model.rowCount()
-        before_proxy_rows = self.duplicate_table_proxy_model.rowCount()
-        print(f"[UpdateTable Debug] 기존 테이블 상태: 소스 행 수={before_source_rows}, 프록시 행 수={before_proxy_rows}")
-        
-        # 그룹 데이터 유효성 확인
-        if group_id not in self.duplicate_groups_data or group_id not in self.group_representatives:
-            print(f"[UpdateTable Debug] 그룹 ID {group_id}에 대한 데이터가 없거나 불완전합니다.")
-            return
-            
-        # 대표 파일 존재 확인
-        representative = self.group_representatives.get(group_id)
-        if not representative:
-            print(f"[UpdateTable Debug] 그룹 ID {group_id}에 대한 대표 파일이 없습니다.")
-            return
-            
-        # 멤버 데이터 확인
-        members_data = self.duplicate_groups_data.get(group_id, [])
-        if not members_data:
-            print(f"[UpdateTable Debug] 그룹 ID {group_id}에 대한 멤버 데이터가 없습니다.")
-            return
-        
-        # 1. 해당 group_id의 모든 행 제거 (소스 모델 기준)
-        rows_to_remove = []
-        print(f"[UpdateTable Debug] Searching rows to remove...") # 로그 2
-        for row in range(self.duplicate_table_model.rowCount()):
-            # --- Group ID 열 인덱스 변경 (4 -> 5) : 주의! 이 함수 외부와 일치해야 함 ---
-            # -> 그룹 ID는 이제 5번 인덱스로 변경 (0:Select, 1:Rank, 2:Rep, 3:Mem, 4:Sim, 5:GroupID)
-            item = self.duplicate_table_model.item(row, 5) 
-            if item and item.text() == group_id:
-                rows_to_remove.append(row)
-        print(f"[UpdateTable Debug] Found rows to remove: {rows_to_remove}") # 로그 3
-
-        if rows_to_remove:
-            print(f"[UpdateTable Debug] Removing rows: {rows_to_remove}") # 로그 4
-            # 모든 연결된 시그널 일시 차단
-            self.duplicate_table_model.blockSignals(True)
-            self.duplicate_table_proxy_model.blockSignals(True)
-            
-            for row in sorted(rows_to_remove, reverse=True):
-                self.duplicate_table_model.removeRow(row)
-            
-            # 시그널 복원
-            self.duplicate_table_model.blockSignals(False)
-            self.duplicate_table_proxy_model.blockSignals(False)
-            
-            print(f"[UpdateTable Debug] Finished removing rows.") # 로그 5
-        else:
-            print(f"[UpdateTable Debug] No existing rows found for group {group_id}.")
+        self._update_table_for_groups([group_id])
 
-        # 2. 업데이트된 그룹 정보로 새 행 추가
-        print(f"[UpdateTable Debug] Preparing to add new rows. Rep: {os.path.basename(representative) if representative else 'None'}, Members count: {len(members_data)}") # 로그 6
-
-        # --- 테이블 모델 신호 잠시 차단 ---
-        self.duplicate_table_model.blockSignals(True)
-        self.duplicate_table_proxy_model.blockSignals(True)
-        
-        # --- Rank 순서대로 정렬하여 행 추가 ---
-        # 먼저 Rank 기준으로 정렬
-        sorted_members = sorted(members_data, key=lambda x: x[2])  # Rank(인덱스 2)로 정렬
-        print(f"[UpdateTable Debug] Sorted members by rank: {[(os.path.basename(path), rank) for path, _, rank in sorted_members]}")
-        
-        # Rank 순서대로 테이블에 행 추가 (가장 작은 Rank부터)
-        current_rank_to_row_map = {}  # 현재 테이블의 Rank -> 행 인덱스 매핑
-        
-        # 먼저 현재 테이블에서 Rank 값을 조사
-        for row in range(self.duplicate_table_model.rowCount()):
-            rank_item = self.duplicate_table_model.item(row, 1)  # Rank는 1번 열
-            if rank_item:
-                try:
-                    rank_value = int(rank_item.text())
-                    current_rank_to_row_map[rank_value] = row
-                except ValueError:
-                    pass
-        
-        # 테이블의 현재 행 수 (새 행을 추가할 때의 기본 위치)
-        current_row_count = self.duplicate_table_model.rowCount()
-        
-        # 파일 존재 확인 플래그
-        added_any_row = False
+    def _update_table_for_groups(self, group_ids):
+        """
+        여러 그룹의 테이블 행을 그룹 데이터(대표/멤버/Rank)에 맞춥니다.
+        테이블 모델의 그룹 ID 인덱스로 해당 그룹의 행만 찾아 없어진 멤버 행은 한 번에 제거하고,
+        남은 행은 제자리에서 고치며, 새 멤버 행은 한 번에 추가한 뒤 Rank 순으로 한 번만 정렬합니다.
+        """
+        group_ids = list(group_ids)
         
-        # 각 멤버에 대해 테이블에 행 추가
-        for member_path, similarity, rank in sorted_members:
+        rows_to_remove = []
+        new_rows = ([], [], [], [], [], [])  # Rank, 대표, 멤버, 유사도, 유사도 문구, 그룹 ID
+        for group_id in group_ids:
+            # 그룹이 없어졌거나 대표가 없으면 그룹의 모든 행 제거
+            representative = self.group_representatives.get(group_id)
+            members_data = self.duplicate_groups_data.get(group_id, []) if representative else []
             # 멤버 파일이 대표 파일과 같으면 건너뜀
-            if representative == member_path: 
-                print(f"[UpdateTable Debug] Skipping representative: {os.path.basename(member_path)}")
-                continue
-            
-            # 파일 존재 여부 확인 (선택적)
-            # if not os.path.exists(member_path) or not os.path.exists(representative):
-            #     print(f"[UpdateTable Debug] 파일이 존재하지 않아 건너뜀: 대표={os.path.exists(representative)}, 멤버={os.path.exists(member_path)}")
-            #     continue
-            
-            print(f"[UpdateTable Debug] Adding row for: {os.path.basename(member_path)}, Rank: {rank}")
-            
-            # 체크박스 아이템 생성
-            item_checkbox = QStandardItem()
-            item_checkbox.setCheckable(True)
-            item_checkbox.setCheckState(Qt.Unchecked)
-            
-            # 'Rank' 열 아이템 생성
-            item_rank = QStandardItem(str(rank))
-            item_rank.setTextAlignment(Qt.AlignCenter)
-            item_rank.setData(rank, Qt.UserRole + 6) # Rank 정렬용 데이터 (Role +6)
-            item_rank.setFlags(item_rank.flags() & ~Qt.ItemIsEditable)
-            
-            # 대표 이미지 아이템
-            item_representative = QStandardItem(representative)
-            item_representative.setFlags(item_representative.flags() & ~Qt.ItemIsEditable)
-            
-            # 멤버 이미지 아이템
-            item_member = QStandardItem(member_path)
-            item_member.setFlags(item_member.flags() & ~Qt.ItemIsEditable)
-            
-            # 유사도 아이템
-            similarity_text = f"{similarity}%"
-            item_similarity = QStandardItem(similarity_text)
-            item_similarity.setData(similarity, Qt.UserRole + 4)
-            item_similarity.setTextAlignment(Qt.AlignCenter)
-            item_similarity.setFlags(item_similarity.flags() & ~Qt.ItemIsEditable)
-            
-            # 그룹 ID 아이템
-            item_group_id = QStandardItem(group_id)
-            item_group_id.setFlags(item_group_id.flags() & ~Qt.ItemIsEditable)
-            
-            # 행 아이템 생성
-            row_items = [item_checkbox, item_rank, item_representative, item_member, item_similarity, item_group_id]
-            
-            # 행을 추가할 위치 결정
-            # 현재 Rank보다 큰 Rank 값 중 가장 작은 것을 찾아 그 앞에 삽입
-            insert_position = current_row_count  # 기본값: 테이블의 맨 끝
-            
-            try:
-                # 1. 현재 테이블에서 현재 Rank보다 큰 최소 Rank의 행을 찾아 그 앞에 삽입
-                higher_ranks = [r for r in current_rank_to_row_map.keys() if r > rank]
-                if higher_ranks:
-                    min_higher_rank = min(higher_ranks)
-                    insert_position = current_rank_to_row_map[min_higher_rank]
-                    print(f"[UpdateTable Debug] 행 삽입: Rank {rank}를 Rank {min_higher_rank} 앞에 삽입 (행 인덱스: {insert_position})")
-                else:
-                    # 현재 Rank보다 큰 Rank가 없으면, 유사한 Rank 행 뒤에 삽입
-                    lower_ranks = [r for r in current_rank_to_row_map.keys() if r <= rank]
-                    if lower_ranks:
-                        max_lower_rank = max(lower_ranks)
-                        insert_position = current_rank_to_row_map[max_lower_rank] + 1
-                        print(f"[UpdateTable Debug] 행 삽입: Rank {rank}를 Rank {max_lower_rank} 뒤에 삽입 (행 인덱스: {insert_position})")
-                    else:
-                        print(f"[UpdateTable Debug] 행 삽입: Rank {rank}를 테이블 맨 끝에 삽입 (행 인덱스: {insert_position})")
-                
-                # 행 삽입
-                self.duplicate_table_model.insertRow(insert_position, row_items)
-                added_any_row = True
-                print(f"[UpdateTable Debug] 행 삽입 완료: 위치 {insert_position}, Rank {rank}")
-                
-                # 새 행 정보를 맵에 추가 (후속 삽입을 위해)
-                current_rank_to_row_map[rank] = insert_position
-                
-                # 삽입 위치 이후의 행 인덱스 업데이트
-                for r, row_idx in current_rank_to_row_map.items():
-                    if row_idx >= insert_position and r != rank:
-                        current_rank_to_row_map[r] = row_idx + 1
-                
-                # 현재 행 수 증가
-                current_row_count += 1
-            except Exception as e:
-                print(f"[UpdateTable Error] 행 삽입 중 오류 발생: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        # 행이 추가되었는지 확인
-        if not added_any_row:
-            print(f"[UpdateTable Warning] 그룹 {group_id}에 대해 테이블에 행이 추가되지 않았습니다.")
-            
-            # 간단한 방법으로 행 추가 시도
-            try:
-                for member_path, similarity, rank in sorted_members:
-                    if representative == member_path:
-                        continue
-                        
-                    row_items = [
-                        QStandardItem(),  # 체크박스
-                        QStandardItem(str(rank)),  # Rank
-                        QStandardItem(representative),  # 대표
-                        QStandardItem(member_path),  # 멤버
-                        QStandardItem(f"{similarity}%"),  # 유사도
-                        QStandardItem(group_id)  # 그룹 ID
-                    ]
-                    
-                    # 행 추가
-                    self.duplicate_table_model.appendRow(row_items)
-                    print(f"[UpdateTable Debug] 행 추가 시도 (단순 방법): {os.path.basename(member_path)}")
-            except Exception as e2:
-                print(f"[UpdateTable Error] 단순 행 추가 중 오류 발생: {e2}")
-        
-        # 테이블 모델 신호 차단 해제
-        self.duplicate_table_model.blockSignals(False)
-        self.duplicate_table_proxy_model.blockSignals(False)
-        
-        # 테이블에 추가된 행 수 확인
-        print(f"[UpdateTable Debug] Final rows count: {self.duplicate_table_model.rowCount()}")
-        
-        # 현재 테이블 상태 확인
-        after_source_rows = self.duplicate_table_model.rowCount()
-        after_proxy_rows = self.duplicate_table_proxy_model.rowCount()
-        print(f"[UpdateTable Debug] 현재 테이블 상태: 소스 행 수={after_source_rows}, 프록시 행 수={after_proxy_rows}")
-        print(f"[UpdateTable Debug] 행 수 변화: 소스={after_source_rows-before_source_rows}, 프록시={after_proxy_rows-before_proxy_rows}")
-        
-        print(f"[UpdateTable Debug] Finished updating table for group_id: {group_id}") # 로그 12
-        
-        # 테이블 정렬 강제 적용 (Rank 열 기준으로 정렬)
-        print(f"[UpdateTable Debug] Forcing sort by Rank column")
+            wanted_members = {path: (similarity, rank) for path, similarity, rank in members_data if path != representative}
+            
+            # 1. 해당 group_id의 기존 행: 그룹에 남은 멤버는 제자리에서 갱신, 나머지는 제거 대상
+            for row in self.duplicate_table_model.rows_for_group(group_id):
+                member_path = self.duplicate_table_model.member_path(row)
+                if member_path not in wanted_members:
+                    rows_to_remove.append(row)
+                    continue
+                similarity, rank = wanted_members.pop(member_path)
+                self.duplicate_table_model.update_pair(row, rank, representative, similarity)
+            
+            # 2. 테이블에 아직 없는 멤버는 새 행으로 추가
+            for member_path, (similarity, rank) in wanted_members.items():
+                for column, value in zip(new_rows, (rank, representative, member_path, similarity, f"{similarity}%", group_id)):
+                    column.append(value)
+        
+        self.duplicate_table_model.remove_rows(rows_to_remove)
+        self.duplicate_table_model.append_pairs(*new_rows)
+        
+        # 테이블 정렬 강제 적용 (Rank 열 기준으로 정렬, 새 행도 Rank 위치로 이동)
         self.duplicate_table_proxy_model.sort(1, Qt.AscendingOrder)
         self.duplicate_table_view.horizontalHeader().setSortIndicator(1, Qt.AscendingOrder)
         
@@ -586,6 +635,29 @@ class MainWindow(QMainWindow):
         self.duplicate_table_proxy_model.invalidate()  # 프록시 모델 캐시 무효화
         self.duplicate_table_proxy_model.layoutChanged.emit()  # 레이아웃 변경 신호 강제 발생
 
+    def _first_proxy_row_for_group(self, group_id: str) -> Optional[int]:
+        """그룹의 행 중 프록시(화면) 순서로 가장 위에 있는 행 번호 (없으면 None)"""
+        proxy_rows = [
+            self.duplicate_table_proxy_model.mapFromSource(self.duplicate_table_model.index(row, 0)).row()
+            for row in self.duplicate_table_model.rows_for_group(group_id)
+        ]
+        proxy_rows = [row for row in proxy_rows if row >= 0]
+        return min(proxy_rows) if proxy_rows else None
+
+    def _select_group_member(self, member_path: str):
+        """그룹 썸네일 격자에서 클릭한 멤버의 행(현재 그룹)을 테이블에서 선택합니다."""
+        group_id = self.group_grid_view.group_id
+        rows = self.duplicate_table_model.rows_for_member(member_path)
+        rows = [row for row in rows if self.duplicate_table_model.group_id(row) == group_id] or rows
+        if not rows:
+            print(f"[GroupGrid] 테이블에서 멤버를 찾을 수 없음: {member_path}")
+            return
+        proxy_index = self.duplicate_table_proxy_model.mapFromSource(self.duplicate_table_model.index(rows[0], 0))
+        if proxy_index.isValid():
+            self.duplicate_table_view.selectRow(proxy_index.row())
+            self.duplicate_table_view.scrollTo(proxy_index)
+            self.on_table_item_clicked(proxy_index)
+
     def _update_ui_after_action(self):
         """테이블 및 이미지 패널 상태를 업데이트합니다.
 
@@ -600,6 +672,7 @@ class MainWindow(QMainWindow):
         # 테이블이 비어있거나 더 이상 표시할 항목이 없는 경우
         if new_proxy_row_count == 0:
             print("[UI Update] Table is empty. Clearing image panels.")
+            self.group_grid_view.clear_group()
             self.left_image_label.clear()
             self.left_info_label.setText("Image Area")
             self.right_image_label.clear()
@@ -614,7 +687,7 @@ class MainWindow(QMainWindow):
             self.duplicate_table_view.reset()
             
             # 상태 메시지 업데이트 (선택된 항목 수가 0인 경우)
-            if len(self.selected_items) == 0:
+            if self.duplicate_table_model.checked_count() == 0:
                 self.status_label.setText("선택된 항목: 0개")
             
             self.last_acted_group_id = None
@@ -625,16 +698,10 @@ class MainWindow(QMainWindow):
             return
 
         if self.last_acted_group_id:
-            for proxy_row in range(new_proxy_row_count):
-                # 프록시 인덱스 -> 소스 인덱스
-                source_index_group_id = self.duplicate_table_proxy_model.mapToSource(
-                    self.duplicate_table_proxy_model.index(proxy_row, 5)
-                )
-                # 소스 모델에서 그룹 ID 아이템 가져오기
-                item = self.duplicate_table_model.item(source_index_group_id.row(), 5)
-                if item and item.text() == self.last_acted_group_id:
-                    next_row_to_select = proxy_row # 선택할 행은 프록시 행 인덱스
-                    break
+            # 그룹 ID 인덱스로 그룹의 행을 찾아 가장 위에 보이는 행 선택 (선택할 행은 프록시 행 인덱스)
+            group_proxy_row = self._first_proxy_row_for_group(self.last_acted_group_id)
+            if group_proxy_row is not None:
+                next_row_to_select = group_proxy_row
 
         if next_row_to_select == -1:
             if self.previous_selection_index is not None:
@@ -652,6 +719,7 @@ class MainWindow(QMainWindow):
         else:
             # 유효한 행을 선택할 수 없는 경우에도 UI 초기화
             print("[UI Update] Cannot select a valid row. Clearing image panels.")
+            self.group_grid_view.clear_group()
             self.left_image_label.clear()
             self.left_info_label.setText("Image Area")
             self.right_image_label.clear()
@@ -730,7 +798,6 @@ class MainWindow(QMainWindow):
                         
                         if group_id and snapshot_rep and snapshot_members:
                             # 그룹 데이터 복원
-                            print(f"[Restore Debug] 그룹 {group_id} 데이터 복원: 대표 {os.path.basename(snapshot_rep)}, 멤버 {len(snapshot_members)}개")
                             self.group_representatives[group_id] = snapshot_rep
                             self.duplicate_groups_data[group_id] = snapshot_members
                             restored_groups.add(group_id)
@@ -758,7 +825,6 @@ class MainWindow(QMainWindow):
                         
                         if group_id and snapshot_rep and snapshot_members:
                             # 그룹 데이터 복원
-                            print(f"[Restore Debug] 그룹 {group_id} 데이터 복원: 대표 {os.path.basename(snapshot_rep)}, 멤버 {len(snapshot_members)}개")
                             self.group_representatives[group_id] = snapshot_rep
                             self.duplicate_groups_data[group_id] = snapshot_members
                     
@@ -768,9 +834,8 @@ class MainWindow(QMainWindow):
                     # 복원된 그룹들에 대해 테이블 업데이트
                     restored_groups = set([item.get('group_id') for item in items if item.get('group_id')])
                     
-                    for group_id in restored_groups:
-                        # 테이블에 그룹 데이터 추가
-                        self._update_table_for_group(group_id)
+                    # 테이블에 그룹 데이터 추가
+                    self._update_table_for_groups(restored_groups)
                     
                     # 테이블 모델 시그널 복원
                     self.duplicate_table_model.blockSignals(False)
@@ -835,46 +900,11 @@ class MainWindow(QMainWindow):
                             rank = item_info.get('rank', 0)
                             
                             if not path or not os.path.exists(path) or not item_group_id:
-                                print(f"[Restore Debug] 항목 정보 불완전: {path}")
                                 continue
                             
-                            print(f"[Restore Debug] 행 직접 추가: {os.path.basename(path)}, 그룹 {item_group_id}")
-                            
-                            # 체크박스 아이템 생성
-                            item_checkbox = QStandardItem()
-                            item_checkbox.setCheckable(True)
-                            item_checkbox.setCheckState(Qt.Unchecked)
-                            
-                            # 'Rank' 열 아이템 생성
-                            item_rank = QStandardItem(str(rank))
-                            item_rank.setTextAlignment(Qt.AlignCenter)
-                            item_rank.setData(rank, Qt.UserRole + 6)
-                            item_rank.setFlags(item_rank.flags() & ~Qt.ItemIsEditable)
-                            
-                            # 대표 이미지 아이템
-                            item_representative = QStandardItem(representative)
-                            item_representative.setFlags(item_representative.flags() & ~Qt.ItemIsEditable)
-                            
-                            # 멤버 이미지 아이템
-                            item_member = QStandardItem(path)
-                            item_member.setFlags(item_member.flags() & ~Qt.ItemIsEditable)
-                            
-                            # 유사도 아이템
-                            similarity_text = f"{similarity}%"
-                            item_similarity = QStandardItem(similarity_text)
-                            item_similarity.setData(similarity, Qt.UserRole + 4)
-                            item_similarity.setTextAlignment(Qt.AlignCenter)
-                            item_similarity.setFlags(item_similarity.flags() & ~Qt.ItemIsEditable)
-                            
-                            # 그룹 ID 아이템
-                            item_group_id = QStandardItem(item_group_id)
-                            item_group_id.setFlags(item_group_id.flags() & ~Qt.ItemIsEditable)
-                            
-                            # 행 아이템 생성
-                            row_items = [item_checkbox, item_rank, item_representative, item_member, item_similarity, item_group_id]
-                            
                             # 테이블에 행 추가
-                            self.duplicate_table_model.appendRow(row_items)
+                            self.duplicate_table_model.append_pair(rank, representative, path,
+                                                                   similarity, f"{similarity}%", item_group_id)
                             
                         except Exception as e:
                             print(f"[Restore Error] 행 추가 중 오류: {e}")
@@ -961,23 +991,10 @@ class MainWindow(QMainWindow):
                 print(f"[Restore Debug] 복원할 행 찾는 중 - 대표: {os.path.basename(restore_snapshot_rep)}, 멤버: {os.path.basename(restore_snapshot_members[0][0]) if restore_snapshot_members else 'None'}")
                 next_row_to_select = None
                 
-                # 원본 모델에서 복원된 행 찾기
-                for row in range(self.duplicate_table_model.rowCount()):
-                    # 그룹 ID로 행 확인 (5번 열)
-                    group_id_item = self.duplicate_table_model.item(row, 5)
-                    if group_id_item and group_id_item.text() == group_id:
-                        # 프록시 모델로 매핑
-                        proxy_index = self.duplicate_table_proxy_model.mapFromSource(
-                            self.duplicate_table_model.index(row, 0)
-                        )
-                        
-                        # 프록시 인덱스가 유효한지 확인
-                        if proxy_index.isValid():
-                            next_row_to_select = proxy_index.row()
-                            print(f"[Restore Debug] 복원된 행 찾음 - 소스 인덱스: {row}, 프록시 인덱스: {next_row_to_select}")
-                            break
-                        else:
-                            print(f"[Restore Debug] 경고: 소스 인덱스 {row}에 해당하는 프록시 인덱스가 유효하지 않습니다!")
+                # 원본 모델의 그룹 ID 인덱스로 복원된 행 찾기
+                next_row_to_select = self._first_proxy_row_for_group(group_id)
+                if next_row_to_select is not None:
+                    print(f"[Restore Debug] 복원된 행 찾음 - 프록시 인덱스: {next_row_to_select}")
                 
                 # 행을 선택하지 못한 경우, 프록시 모델을 완전히 재설정하고 다시 시도
                 if next_row_to_select is None:
@@ -990,16 +1007,9 @@ class MainWindow(QMainWindow):
                     QApplication.processEvents()
                     
                     # 다시 시도
-                    for row in range(self.duplicate_table_model.rowCount()):
-                        group_id_item = self.duplicate_table_model.item(row, 5)
-                        if group_id_item and group_id_item.text() == group_id:
-                            proxy_index = self.duplicate_table_proxy_model.mapFromSource(
-                                self.duplicate_table_model.index(row, 0)
-                            )
-                            if proxy_index.isValid():
-                                next_row_to_select = proxy_index.row()
-                                print(f"[Restore Debug] 두 번째 시도에서 행 찾음 - 프록시 인덱스: {next_row_to_select}")
-                                break
+                    next_row_to_select = self._first_proxy_row_for_group(group_id)
+                    if next_row_to_select is not None:
+                        print(f"[Restore Debug] 두 번째 시도에서 행 찾음 - 프록시 인덱스: {next_row_to_select}")
                 
                 # 복원된 행을 선택하거나 기본 선택 실행
                 if next_row_to_select is not None:
@@ -1021,8 +1031,7 @@ class MainWindow(QMainWindow):
                     self.duplicate_table_model.blockSignals(True)
                     
                     # 그룹 내 모든 데이터에 대해 테이블 다시 채우기
-                    for group_id in self.group_representatives.keys():
-                        self._update_table_for_group(group_id)
+                    self._update_table_for_groups(list(self.group_representatives.keys()))
                     
                     self.duplicate_table_model.blockSignals(False)
                     self.duplicate_table_view.reset()
@@ -1120,11 +1129,12 @@ class MainWindow(QMainWindow):
         # 테이블 모델 시그널 차단
         self.duplicate_table_model.blockSignals(True)
         
-        # 각 그룹별로 테이블 업데이트
-        for group_id in all_groups:
-            if group_id in self.group_representatives and group_id in self.duplicate_groups_data:
-                self._update_table_for_group(group_id)
-                print(f"[Batch Undo] 그룹 {group_id} 테이블 업데이트 완료")
+        # 모든 그룹의 테이블 행을 한 번에 업데이트
+        self._update_table_for_groups(
+            group_id for group_id in all_groups
+            if group_id in self.group_representatives and group_id in self.duplicate_groups_data
+        )
+        print(f"[Batch Undo] {len(all_groups)}개 그룹 테이블 업데이트 완료")
         
         # 테이블 모델 시그널 차단 해제
         self.duplicate_table_model.blockSignals(False)
@@ -1246,61 +1256,40 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", f"폴더 열기 중 오류가 발생했습니다: {e}")
     # --- 메서드 추가 끝 ---
 
-    def on_checkbox_changed(self, item):
-        """체크박스 상태 변경을 처리하는 슬롯"""
-        if item.column() == 0:  # 체크박스가 0번 열에 있는지 확인
-            # 원본 모델의 행 인덱스 가져오기
-            row = item.row()
-            
-            # 해당 행의 멤버 파일 경로 가져오기 (3번 열)
-            member_item = self.duplicate_table_model.item(row, 3)
-            if not member_item:
-                print(f"[Checkbox] 경고: 행 {row}의 멤버 항목을 찾을 수 없습니다.")
-                return
-                
-            member_path = member_item.text()
-            
-            # 체크 상태에 따라 선택된 항목 목록 업데이트
-            if item.checkState() == Qt.Checked:
-                # 테이블에 해당 경로가 실제로 존재하는지 확인
-                exists_in_table = False
-                for check_row in range(self.duplicate_table_model.rowCount()):
-                    check_item = self.duplicate_table_model.item(check_row, 3)
-                    if check_item and check_item.text() == member_path:
-                        exists_in_table = True
-                        break
-                        
-                if exists_in_table:
-                    if member_path not in self.selected_items:
-                        self.selected_items.append(member_path)
-                        print(f"[Checkbox] 항목 선택됨: {member_path}")
-                else:
-                    print(f"[Checkbox] 경고: {member_path}가 테이블에 존재하지 않습니다.")
-                    # 체크박스 상태 복원 (시그널 차단)
-                    self.duplicate_table_model.blockSignals(True)
-                    item.setCheckState(Qt.Unchecked)
-                    self.duplicate_table_model.blockSignals(False)
-            else:
-                if member_path in self.selected_items:
-                    self.selected_items.remove(member_path)
-                    print(f"[Checkbox] 항목 선택 해제됨: {member_path}")
-            
-            # 현재 선택된 항목 수 표시
-            self.status_label.setText(f"선택된 항목: {len(self.selected_items)}개")
-            
-            # 디버깅용 로그
-            print(f"[Checkbox] 현재 선택된 항목 수: {len(self.selected_items)}")
-            
-            # 일괄 작업 버튼 활성화/비활성화
-            self._update_batch_buttons_state()
+    @property
+    def selected_items(self) -> List[str]:
+        """체크된 멤버 파일 경로 목록 (체크 상태는 테이블 모델의 행 비트맵에 저장되며, 이 목록은 호출할 때마다 새로 만듦)"""
+        return self.duplicate_table_model.checked_member_paths()
+
+    def on_checkbox_changed(self, row: int):
+        """체크박스 상태 변경을 처리하는 슬롯 (row: 원본 모델의 행 인덱스)"""
+        if 0 <= row < self.duplicate_table_model.rowCount():
+            state = "선택됨" if self.duplicate_table_model.is_checked(row) else "선택 해제됨"
+            print(f"[Checkbox] 항목 {state}: {self.duplicate_table_model.member_path(row)}")
+        self.on_check_states_changed()
+
+    def on_check_states_changed(self):
+        """체크 상태가 바뀐 뒤 선택 항목 수와 일괄 작업 버튼 상태를 갱신합니다 (행 하나 또는 일괄 변경 1회마다 호출)"""
+        selected_count = self.duplicate_table_model.checked_count()
+        self.status_label.setText(f"선택된 항목: {selected_count}개")
+        
+        # 디버깅용 로그
+        print(f"[Checkbox] 현재 선택된 항목 수: {selected_count}")
+        
+        # 일괄 작업 버튼 활성화/비활성화
+        self._update_batch_buttons_state(selected_count)
     
-    def _update_batch_buttons_state(self):
-        """선택된 항목 수에 따라 일괄 작업 버튼 상태 업데이트"""
-        has_selected_items = len(self.selected_items) > 0
+    def _update_batch_buttons_state(self, selected_count: Optional[int] = None):
+        """선택된 항목 수에 따라 일괄 작업 버튼 상태 업데이트 (selected_count가 없으면 테이블 모델에서 계산)"""
+        if selected_count is None:
+            selected_count = self.duplicate_table_model.checked_count()
+        has_selected_items = selected_count > 0
         has_table_items = self.duplicate_table_model.rowCount() > 0
         
         # 선택 버튼은 테이블에 항목이 있을 때만 활성화
         self.select_all_button.setEnabled(has_table_items)
+        self.select_exact_button.setEnabled(has_table_items)
+        self.invert_selection_button.setEnabled(has_table_items)
         self.select_none_button.setEnabled(has_selected_items and has_table_items)
         
         # 일괄 작업 버튼은 선택된 항목이 있을 때만 활성화
@@ -1308,74 +1297,64 @@ class MainWindow(QMainWindow):
         self.batch_move_button.setEnabled(has_selected_items)
         
         # 디버깅용 로그
-        print(f"[Button State] 테이블 항목 수: {self.duplicate_table_model.rowCount()}, 선택된 항목 수: {len(self.selected_items)}")
+        print(f"[Button State] 테이블 항목 수: {self.duplicate_table_model.rowCount()}, 선택된 항목 수: {selected_count}")
         print(f"[Button State] 버튼 상태 - 전체선택: {self.select_all_button.isEnabled()}, 선택해제: {self.select_none_button.isEnabled()}, 삭제: {self.batch_delete_button.isEnabled()}, 이동: {self.batch_move_button.isEnabled()}")
     
     def select_all_items(self):
-        """테이블의 모든 항목 선택"""
-        # 먼저 선택 항목 목록 초기화
-        self.selected_items.clear()
-        
-        # 모든 행을 순회하며 체크박스 체크
-        for row in range(self.duplicate_table_model.rowCount()):
-            # 체크박스 아이템 가져오기 (0번 열)
-            checkbox_item = self.duplicate_table_model.item(row, 0)
-            if checkbox_item:
-                # 멤버 파일 경로 가져오기 (3번 열)
-                member_item = self.duplicate_table_model.item(row, 3)
-                if member_item:
-                    member_path = member_item.text()
-                    # 아이템이 존재하고 현재 선택되지 않았다면 선택 목록에 추가
-                    if member_path not in self.selected_items:
-                        self.selected_items.append(member_path)
-                
-                # itemChanged 시그널이 발생하지 않도록 블로킹
-                self.duplicate_table_model.blockSignals(True)
-                checkbox_item.setCheckState(Qt.Checked)
-                self.duplicate_table_model.blockSignals(False)
-        
-        # 상태 라벨 업데이트
-        self.status_label.setText(f"선택된 항목: {len(self.selected_items)}개")
-        print(f"모든 항목 선택됨: {len(self.selected_items)}개")
-        
-        # 일괄 작업 버튼 활성화/비활성화
-        self._update_batch_buttons_state()
-        
-        # 테이블 뷰 강제 갱신
-        self.duplicate_table_view.update()
-        self.duplicate_table_view.repaint()
-        QApplication.processEvents()  # UI 이벤트 즉시 처리
+        """테이블의 모든 항목 선택 (체크 상태를 한 번에 바꿔 dataChanged 1회)"""
+        changed_count = self.duplicate_table_model.set_all_checked(True)
+        print(f"모든 항목 선택됨: {self.duplicate_table_model.checked_count()}개 (행 {changed_count}개 변경)")
+        # 바뀐 행이 없으면 신호가 없으므로 직접 갱신
+        if changed_count == 0:
+            self.on_check_states_changed()
     
     def clear_selection(self):
         """선택된 모든 항목 선택 해제"""
-        # 선택 항목 목록 초기화
-        self.selected_items.clear()
-        
-        # 모든 행을 순회하며 체크박스 해제
-        for row in range(self.duplicate_table_model.rowCount()):
-            # 체크박스 아이템 가져오기
-            checkbox_item = self.duplicate_table_model.item(row, 0)
-            if checkbox_item:
-                # itemChanged 시그널이 발생하지 않도록 블로킹
-                self.duplicate_table_model.blockSignals(True)
-                checkbox_item.setCheckState(Qt.Unchecked)
-                self.duplicate_table_model.blockSignals(False)
-        
-        # 상태 라벨 업데이트
-        self.status_label.setText("선택된 항목: 0개")
-        print("모든 선택 해제됨")
-        
-        # 일괄 작업 버튼 활성화/비활성화
-        self._update_batch_buttons_state()
-        
-        # 테이블 뷰 강제 갱신
-        self.duplicate_table_view.update()
-        self.duplicate_table_view.repaint()
-        QApplication.processEvents()  # UI 이벤트 즉시 처리
+        changed_count = self.duplicate_table_model.set_all_checked(False)
+        print(f"모든 선택 해제됨 (행 {changed_count}개 변경)")
+        if changed_count == 0:
+            self.on_check_states_changed()
+
+    def invert_selection(self):
+        """모든 행의 체크 상태를 반전"""
+        changed_count = self.duplicate_table_model.invert_checked()
+        print(f"선택 반전됨: {self.duplicate_table_model.checked_count()}개 선택 (행 {changed_count}개 변경)")
+        if changed_count == 0:
+            self.on_check_states_changed()
+
+    def select_items_where(self, rule: Callable[[DuplicateTableModel], np.ndarray]):
+        """
+        규칙에 맞는 행을 선택합니다 (다른 행은 선택 해제).
+        rule은 테이블 모델을 받아 행 순서의 bool 배열을 돌려주는 함수입니다 (예: 유사도 열 배열 비교).
+        """
+        changed_count = self.duplicate_table_model.set_checked_mask(rule(self.duplicate_table_model))
+        print(f"규칙 선택: {self.duplicate_table_model.checked_count()}개 선택 (행 {changed_count}개 변경)")
+        if changed_count == 0:
+            self.on_check_states_changed()
+
+    def select_exact_duplicates(self):
+        """유사도 100%인 멤버(완전히 같은 사본, 같은 파일, 긴 비디오에 전부 포함된 클립)만 선택"""
+        self.select_items_where(lambda model: model.similarity_values() >= 100)
+    
+    def _group_undo_snapshot(self, group_id: str, snapshots: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        일괄 삭제/이동의 실행 취소용 그룹 스냅샷 {'member_paths', 'snapshot_rep', 'snapshot_members'}을 반환합니다.
+        snapshots에 그룹별로 보관해 같은 그룹의 항목이 공유하며, 멤버는 바꿀 수 없는 튜플이므로 목록만 얕게 복사합니다.
+        """
+        snapshot = snapshots.get(group_id)
+        if snapshot is None:
+            members = list(self.duplicate_groups_data.get(group_id, []))
+            snapshot = snapshots[group_id] = {
+                'member_paths': [path for path, _, _ in members],
+                'snapshot_rep': self.group_representatives.get(group_id),
+                'snapshot_members': members,
+            }
+        return snapshot
     
     def delete_selected_items(self):
         """선택된 모든 항목 삭제"""
-        if not self.selected_items:
+        selected_paths_copy = self.selected_items  # 체크 상태에서 새로 만든 목록 (아래 처리 중 체크가 바뀌어도 영향 없음)
+        if not selected_paths_copy:
             QMessageBox.information(self, "알림", "선택된 항목이 없습니다.")
             return
         
@@ -1383,7 +1362,7 @@ class MainWindow(QMainWindow):
         reply = QMessageBox.question(
             self, 
             "삭제 확인", 
-            f"선택한 {len(self.selected_items)}개 항목을 삭제하시겠습니까?\n이 작업은 실행취소할 수 있습니다.",
+            f"선택한 {len(selected_paths_copy)}개 항목을 삭제하시겠습니까?\n이 작업은 실행취소할 수 있습니다.",
             QMessageBox.Yes | QMessageBox.No, 
             QMessageBox.No
         )
@@ -1393,19 +1372,21 @@ class MainWindow(QMainWindow):
         
         # 전체 항목 갯수 저장 (모든 항목이 삭제되었는지 확인용)
         total_items_before = self.duplicate_table_model.rowCount()
-        selected_count = len(self.selected_items)
+        selected_count = len(selected_paths_copy)
         print(f"[Batch Delete] 전체 항목 수: {total_items_before}, 선택된 항목 수: {selected_count}")
         
         # 삭제한 항목들의 정보를 저장할 목록 초기화
         self.last_deleted_items = []
         
-        # 삭제할 항목들의 행 인덱스 수집 (나중에 UI 갱신에 사용)
-        rows_to_remove = []
-        selected_paths_copy = self.selected_items.copy()  # 복사본 사용
+        # 삭제할 항목들의 행 핸들 수집 (그룹 업데이트로 행 위치가 바뀌어도 같은 행을 가리킴)
+        row_ids_to_remove = []
         
         # 선택된 항목들을 그룹별로 분류
         group_items_map = {}  # 그룹 ID별 항목 목록 {group_id: [path1, path2, ...]}
         
+        # 그룹별 실행 취소 스냅샷 (선택 항목마다 그룹 전체를 복사하지 않도록 그룹당 한 번만 만듦)
+        group_snapshots = {}
+        
         # 선택된 항목들에 대한 정보 수집
         items_info = []
         for member_path in selected_paths_copy:
@@ -1413,44 +1394,41 @@ class MainWindow(QMainWindow):
             group_id = None
             representative_path = None
             
-            # 테이블에서 해당 파일 정보 찾기
-            for row in range(self.duplicate_table_model.rowCount()):
-                member_item = self.duplicate_table_model.item(row, 3)
-                if member_item and member_item.text() == member_path:
-                    rep_item = self.duplicate_table_model.item(row, 2)
-                    group_id_item = self.duplicate_table_model.item(row, 5)
-                    sim_item = self.duplicate_table_model.item(row, 4)
-                    rank_item = self.duplicate_table_model.item(row, 1)
+            # 멤버 경로 인덱스로 테이블에서 해당 파일 정보 찾기
+            member_rows = self.duplicate_table_model.rows_for_member(member_path)
+            if member_rows:
+                row = member_rows[0]  # 같은 경로가 여러 행에 있으면 첫 행
+                rep_item = self.duplicate_table_model.item(row, 2)
+                group_id_item = self.duplicate_table_model.item(row, 5)
+                sim_item = self.duplicate_table_model.item(row, 4)
+                rank_item = self.duplicate_table_model.item(row, 1)
+                
+                if rep_item and group_id_item:
+                    representative_path = rep_item.text()
+                    group_id = group_id_item.text()
+                    row_ids_to_remove.append(self.duplicate_table_model.row_id(row))  # 삭제할 행 핸들 저장
+                    
+                    # 그룹별로 항목 분류
+                    if group_id not in group_items_map:
+                        group_items_map[group_id] = []
+                    group_items_map[group_id].append(member_path)
                     
-                    if rep_item and group_id_item:
-                        representative_path = rep_item.text()
-                        group_id = group_id_item.text()
-                        rows_to_remove.append(row)  # 삭제할 행 인덱스 저장
+                    # 삭제한 행의 정보를 저장 (복원에 사용)
+                    try:
+                        similarity = int(sim_item.text().strip('%')) if sim_item else 0
+                        rank = int(rank_item.text()) if rank_item else 0
                         
-                        # 그룹별로 항목 분류
-                        if group_id not in group_items_map:
-                            group_items_map[group_id] = []
-                        group_items_map[group_id].append(member_path)
+                        # 나중에 복원할 수 있도록 행 정보 저장
+                        self.last_deleted_items.append({
+                            'path': member_path,
+                            'group_id': group_id,
+                            'representative': representative_path,
+                            'similarity': similarity,
+                            'rank': rank
+                        })
                         
-                        # 삭제한 행의 정보를 저장 (복원에 사용)
-                        try:
-                            similarity = int(sim_item.text().strip('%')) if sim_item else 0
-                            rank = int(rank_item.text()) if rank_item else 0
-                            
-                            # 나중에 복원할 수 있도록 행 정보 저장
-                            self.last_deleted_items.append({
-                                'path': member_path,
-                                'group_id': group_id,
-                                'representative': representative_path,
-                                'similarity': similarity,
-                                'rank': rank
-                            })
-                            
-                            print(f"[Batch Delete] 행 삭제 정보 저장: 그룹 {group_id}, 경로 {os.path.basename(member_path)}")
-                        except Exception as e:
-                            print(f"[Batch Delete] 행 정보 저장 중 오류: {e}")
-                        
-                        break
+                    except Exception as e:
+                        print(f"[Batch Delete] 행 정보 저장 중 오류: {e}")
             
             if group_id and representative_path:
                 # 각 파일에 대한 필요한 정보를 actions 리스트에 추가
@@ -1458,47 +1436,32 @@ class MainWindow(QMainWindow):
                     'deleted_path': member_path,
                     'group_id': group_id,
                     'representative_path': representative_path,
-                    # Undo 작업을 위한 필요한 정보 추가
-                    'member_paths': [path for path, _, _ in self.duplicate_groups_data.get(group_id, [])],
-                    'snapshot_rep': self.group_representatives.get(group_id),
-                    'snapshot_members': copy.deepcopy(self.duplicate_groups_data.get(group_id, []))
+                    # Undo 작업을 위한 필요한 정보 추가 (같은 그룹의 항목은 그룹 스냅샷 하나를 공유)
+                    **self._group_undo_snapshot(group_id, group_snapshots)
                 })
             else:
                 print(f"경고: {member_path} 파일의 그룹 정보를 찾을 수 없습니다.")
         
         print(f"[Batch Delete] 총 {len(group_items_map)}개 그룹에서 항목 삭제 예정")
-        for group_id, paths in group_items_map.items():
-            print(f"[Batch Delete] 그룹 {group_id}: {len(paths)}개 항목 삭제 예정")
         
         # 배치 삭제 작업 수행 (UndoManager의 batch_delete_files 메서드 사용)
         success, deleted_files = self.undo_manager.batch_delete_files(items_info)
         
         if success and deleted_files:
-            # 삭제된 파일들에 대한 그룹 데이터 업데이트 (그룹별로 처리)
+            deleted_file_set = set(deleted_files)
+            # 삭제된 파일들에 대한 그룹 데이터 업데이트 (그룹별로 한 번에 처리)
             for group_id, paths in group_items_map.items():
-                for path in paths:
-                    if path in deleted_files:
-                        # 해당 그룹의 대표 경로 찾기
-                        rep_path = self.group_representatives.get(group_id, "")
-                        self._update_groups_after_deletion(
-                            path, 
-                            group_id, 
-                            rep_path
-                        )
-                
-                # 각 그룹별로 테이블 업데이트
-                if group_id in self.duplicate_groups_data and self.group_representatives.get(group_id):
-                    print(f"[Batch Delete] 그룹 {group_id}의 테이블 데이터 업데이트")
-                    self._update_table_for_group(group_id)
+                self._update_groups_after_deletion(group_id, deleted_file_set.intersection(paths))
             
-            # 테이블에서 선택된 행들을 직접 제거 (UI 즉시 갱신)
+            # 영향받은 그룹의 테이블 행을 한 번에 업데이트 (비어서 없어진 그룹의 행은 제거)
+            print(f"[Batch Delete] {len(group_items_map)}개 그룹의 테이블 데이터 업데이트")
+            self._update_table_for_groups(group_items_map.keys())
+            
+            # 테이블에 남아 있는 선택된 행들을 직접 제거 (UI 즉시 갱신)
+            rows_to_remove = self.duplicate_table_model.rows_for_ids(row_ids_to_remove)
             print(f"[Batch Delete] 테이블에서 {len(rows_to_remove)}개 행을 직접 제거합니다.")
             self.duplicate_table_model.blockSignals(True)
-            for row in sorted(rows_to_remove, reverse=True):
-                try:
-                    self.duplicate_table_model.removeRow(row)
-                except Exception as e:
-                    print(f"[Batch Delete] 행 제거 중 오류: {e}")
+            self.duplicate_table_model.remove_rows(rows_to_remove)
             self.duplicate_table_model.blockSignals(False)
             
             # 테이블 뷰 강제 갱신
@@ -1521,6 +1484,7 @@ class MainWindow(QMainWindow):
                     print(f"[Batch Delete] 경고: 그룹 데이터가 아직 남아있습니다. 그룹: {len(self.duplicate_groups_data)}, 대표: {len(self.group_representatives)}")
                     
                 # 이미지 패널 초기화
+                self.group_grid_view.clear_group()
                 self.left_image_label.clear()
                 self.left_info_label.setText("Image Area")
                 self.right_image_label.clear()
@@ -1530,15 +1494,15 @@ class MainWindow(QMainWindow):
             print(f"[Batch Delete] 총 {len(self.last_deleted_items)}개 항목 정보 저장 완료")
             
             # UI 업데이트 (제거된 항목이 있는 경우에만)
-            if len(rows_to_remove) > 0:
+            if len(row_ids_to_remove) > 0:
                 print("[Batch Delete] UI 상태 업데이트를 실행합니다.")
                 # 프록시 모델 강제 갱신
                 self.duplicate_table_proxy_model.invalidate()
                 QApplication.processEvents()
                 self._update_ui_after_action()
             
-            # 선택 목록 초기화
-            self.selected_items.clear()
+            # 선택 목록 초기화 (삭제/이동하지 못해 남은 행의 체크도 해제)
+            self.duplicate_table_model.set_all_checked(False)
             self._update_batch_buttons_state()
             
             # 상태 메시지 표시
@@ -1546,48 +1510,31 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.warning(self, "삭제 실패", "선택한 항목 중 삭제할 수 있는 항목이 없습니다.")
     
-    def _update_groups_after_deletion(self, deleted_path, group_id, representative_path):
-        """파일 삭제 후 그룹 데이터 업데이트"""
-        # 내부 그룹 데이터에서 파일 제거
-        if group_id in self.duplicate_groups_data:
-            current_group_tuples = self.duplicate_groups_data[group_id]
-            found_index = -1
-            
-            for i, (path, _, _) in enumerate(current_group_tuples):
-                if path == deleted_path:
-                    found_index = i
-                    break
-                    
-            if found_index >= 0:
-                del current_group_tuples[found_index]
-                print(f"[Delete Update] 그룹 {group_id}에서 {os.path.basename(deleted_path)}를 제거했습니다. 남은 멤버: {len(current_group_tuples)}")
-            
-            # 대표 이미지 처리
-            current_representative = self.group_representatives.get(group_id)
-            if deleted_path == current_representative:
-                if current_group_tuples:
-                    new_representative_path, _, _ = current_group_tuples[0]
-                    self.group_representatives[group_id] = new_representative_path
-                    del current_group_tuples[0]
-                    print(f"[Delete Update] 그룹 {group_id}: 새 대표 파일로 {os.path.basename(new_representative_path)}를 설정했습니다.")
-                else:
-                    print(f"[Delete Update] 그룹 {group_id}가 비었습니다. 그룹 데이터를 제거합니다.")
-                    if group_id in self.duplicate_groups_data: 
-                        del self.duplicate_groups_data[group_id]
-                    if group_id in self.group_representatives: 
-                        del self.group_representatives[group_id]
-            else:
-                # 대표가 아닌데 멤버 목록이 비게 되는 경우 (마지막 멤버가 삭제된 경우)
-                if not current_group_tuples:
-                    print(f"[Delete Update] 그룹 {group_id}에서 마지막 멤버가 삭제되었습니다. 그룹 데이터를 제거합니다.")
-                    if group_id in self.duplicate_groups_data: 
-                        del self.duplicate_groups_data[group_id]
-                    if group_id in self.group_representatives: 
-                        del self.group_representatives[group_id]
+    def _update_groups_after_deletion(self, group_id: str, deleted_paths: Set[str]):
+        """
+        파일 삭제 후 그룹 데이터 업데이트 (그룹의 삭제된 파일을 한 번에 제거).
+        대표가 삭제되면 남은 첫 멤버가 대표가 되고, 그룹이 비면 그룹 데이터를 제거합니다 (파일을 하나씩 삭제한 결과와 같음).
+        """
+        if not deleted_paths or group_id not in self.duplicate_groups_data:
+            return
+        current_group_tuples = self.duplicate_groups_data[group_id]
+        current_group_tuples[:] = [member for member in current_group_tuples if member[0] not in deleted_paths]
+        
+        # 대표 이미지 처리
+        if self.group_representatives.get(group_id) in deleted_paths and current_group_tuples:
+            new_representative_path, _, _ = current_group_tuples[0]
+            self.group_representatives[group_id] = new_representative_path
+            del current_group_tuples[0]
+            print(f"[Delete Update] 그룹 {group_id}: 새 대표 파일로 {os.path.basename(new_representative_path)}를 설정했습니다.")
+        if not current_group_tuples:
+            print(f"[Delete Update] 그룹 {group_id}가 비었습니다. 그룹 데이터를 제거합니다.")
+            self.duplicate_groups_data.pop(group_id, None)
+            self.group_representatives.pop(group_id, None)
     
     def move_selected_items(self):
         """선택된 모든 항목 이동"""
-        if not self.selected_items:
+        selected_paths_copy = self.selected_items  # 체크 상태에서 새로 만든 목록 (아래 처리 중 체크가 바뀌어도 영향 없음)
+        if not selected_paths_copy:
             QMessageBox.information(self, "알림", "선택된 항목이 없습니다.")
             return
         
@@ -1598,16 +1545,18 @@ class MainWindow(QMainWindow):
         
         # 전체 항목 갯수 저장 (모든 항목이 이동되었는지 확인용)
         total_items_before = self.duplicate_table_model.rowCount()
-        selected_count = len(self.selected_items)
+        selected_count = len(selected_paths_copy)
         print(f"[Batch Move] 전체 항목 수: {total_items_before}, 선택된 항목 수: {selected_count}")
         
-        # 이동할 항목들의 행 인덱스 수집 (나중에 UI 갱신에 사용)
-        rows_to_remove = []
-        selected_paths_copy = self.selected_items.copy()  # 복사본 사용
+        # 이동할 항목들의 행 핸들 수집 (그룹 업데이트로 행 위치가 바뀌어도 같은 행을 가리킴)
+        row_ids_to_remove = []
         
         # 선택된 항목들을 그룹별로 분류
         group_items_map = {}  # 그룹 ID별 항목 목록 {group_id: [path1, path2, ...]}
         
+        # 그룹별 실행 취소 스냅샷 (선택 항목마다 그룹 전체를 복사하지 않도록 그룹당 한 번만 만듦)
+        group_snapshots = {}
+        
         # 선택된 항목들에 대한 정보 수집
         items_info = []
         for member_path in selected_paths_copy:
@@ -1615,24 +1564,22 @@ class MainWindow(QMainWindow):
             group_id = None
             representative_path = None
             
-            # 테이블에서 해당 파일 정보 찾기
-            for row in range(self.duplicate_table_model.rowCount()):
-                member_item = self.duplicate_table_model.item(row, 3)
-                if member_item and member_item.text() == member_path:
-                    rep_item = self.duplicate_table_model.item(row, 2)
-                    group_id_item = self.duplicate_table_model.item(row, 5)
+            # 멤버 경로 인덱스로 테이블에서 해당 파일 정보 찾기
+            member_rows = self.duplicate_table_model.rows_for_member(member_path)
+            if member_rows:
+                row = member_rows[0]  # 같은 경로가 여러 행에 있으면 첫 행
+                rep_item = self.duplicate_table_model.item(row, 2)
+                group_id_item = self.duplicate_table_model.item(row, 5)
+                
+                if rep_item and group_id_item:
+                    representative_path = rep_item.text()
+                    group_id = group_id_item.text()
+                    row_ids_to_remove.append(self.duplicate_table_model.row_id(row))  # 이동할 행 핸들 저장
                     
-                    if rep_item and group_id_item:
-                        representative_path = rep_item.text()
-                        group_id = group_id_item.text()
-                        rows_to_remove.append(row)  # 이동할 행 인덱스 저장
-                        
-                        # 그룹별로 항목 분류
-                        if group_id not in group_items_map:
-                            group_items_map[group_id] = []
-                        group_items_map[group_id].append(member_path)
-                        
-                        break
+                    # 그룹별로 항목 분류
+                    if group_id not in group_items_map:
+                        group_items_map[group_id] = []
+                    group_items_map[group_id].append(member_path)
             
             if group_id and representative_path:
                 # 각 파일에 대한 필요한 정보를 actions 리스트에 추가
@@ -1641,52 +1588,42 @@ class MainWindow(QMainWindow):
                     'destination_folder': target_dir,
                     'group_id': group_id,
                     'representative_path': representative_path,
-                    # Undo 작업을 위한 필요한 정보 추가
-                    'member_paths': [path for path, _, _ in self.duplicate_groups_data.get(group_id, [])],
-                    'snapshot_rep': self.group_representatives.get(group_id),
-                    'snapshot_members': copy.deepcopy(self.duplicate_groups_data.get(group_id, []))
+                    # Undo 작업을 위한 필요한 정보 추가 (같은 그룹의 항목은 그룹 스냅샷 하나를 공유)
+                    **self._group_undo_snapshot(group_id, group_snapshots)
                 })
             else:
                 print(f"경고: {member_path} 파일의 그룹 정보를 찾을 수 없습니다.")
         
         print(f"[Batch Move] 총 {len(group_items_map)}개 그룹에서 항목 이동 예정")
-        for group_id, paths in group_items_map.items():
-            print(f"[Batch Move] 그룹 {group_id}: {len(paths)}개 항목 이동 예정")
         
         # 배치 이동 작업 수행 (UndoManager의 batch_move_files 메서드 사용)
         success, moved_files = self.undo_manager.batch_move_files(items_info)
         
         if success and moved_files:
-            # 이동된 파일들에 대한 그룹 데이터 업데이트 (그룹별로 처리)
-            processed_groups = set()  # 업데이트된 그룹 추적
-            
+            # 이동된 파일들에 대한 그룹 데이터 업데이트 (그룹별로 한 번에 처리)
+            # 원본 경로 -> 그룹 ID (이동된 파일마다 items_info를 처음부터 찾지 않도록)
+            group_by_source = {action['moved_from']: action['group_id'] for action in items_info}
+            moves_by_group = {}  # 그룹 ID -> {원본 경로: 이동된 경로}
             for source_path, destination_path in moved_files:
-                # 해당 원본 파일의 그룹 정보 찾기
-                for action in items_info:
-                    if action['moved_from'] == source_path:
-                        group_id = action['group_id']
-                        self._update_groups_after_move(
-                            source_path, 
-                            destination_path, 
-                            group_id
-                        )
-                        processed_groups.add(group_id)
-                        break
-            
-            # 각 그룹별로 테이블 업데이트
-            for group_id in processed_groups:
-                if group_id in self.duplicate_groups_data and self.group_representatives.get(group_id):
-                    print(f"[Batch Move] 그룹 {group_id}의 테이블 데이터 업데이트")
-                    self._update_table_for_group(group_id)
-            
-            # 테이블에서 선택된 행들을 직접 제거 (UI 즉시 갱신)
+                group_id = group_by_source.get(source_path)
+                if group_id is not None:
+                    moves_by_group.setdefault(group_id, {})[source_path] = destination_path
+            for group_id, moves in moves_by_group.items():
+                self._update_groups_after_move(group_id, moves)
+            processed_groups = set(moves_by_group)  # 업데이트된 그룹
+            
+            # 영향받은 그룹의 테이블 행을 한 번에 업데이트
+            print(f"[Batch Move] {len(processed_groups)}개 그룹의 테이블 데이터 업데이트")
+            self._update_table_for_groups(
+                group_id for group_id in processed_groups
+                if group_id in self.duplicate_groups_data and self.group_representatives.get(group_id)
+            )
+            
+            # 테이블에 남아 있는 선택된 행들을 직접 제거 (UI 즉시 갱신)
+            rows_to_remove = self.duplicate_table_model.rows_for_ids(row_ids_to_remove)
             print(f"[Batch Move] 테이블에서 {len(rows_to_remove)}개 행을 직접 제거합니다.")
             self.duplicate_table_model.blockSignals(True)
-            for row in sorted(rows_to_remove, reverse=True):
-                try:
-                    self.duplicate_table_model.removeRow(row)
-                except Exception as e:
-                    print(f"[Batch Move] 행 제거 중 오류: {e}")
+            self.duplicate_table_model.remove_rows(rows_to_remove)
             self.duplicate_table_model.blockSignals(False)
             
             # 테이블 뷰 강제 갱신
@@ -1709,15 +1646,15 @@ class MainWindow(QMainWindow):
                     print(f"[Batch Move] 경고: 그룹 데이터가 아직 남아있습니다. 그룹: {len(self.duplicate_groups_data)}, 대표: {len(self.group_representatives)}")
             
             # UI 업데이트 (제거된 항목이 있는 경우에만)
-            if len(rows_to_remove) > 0:
+            if len(row_ids_to_remove) > 0:
                 print("[Batch Move] UI 상태 업데이트를 실행합니다.")
                 # 프록시 모델 강제 갱신
                 self.duplicate_table_proxy_model.invalidate()
                 QApplication.processEvents()
                 self._update_ui_after_action()
             
-            # 선택 목록 초기화
-            self.selected_items.clear()
+            # 선택 목록 초기화 (삭제/이동하지 못해 남은 행의 체크도 해제)
+            self.duplicate_table_model.set_all_checked(False)
             self._update_batch_buttons_state()
             
             # 상태 메시지 표시
@@ -1725,24 +1662,20 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.warning(self, "이동 실패", "선택한 항목 중 이동할 수 있는 항목이 없습니다.")
     
-    def _update_groups_after_move(self, source_path, destination_path, group_id):
-        """파일 이동 후 그룹 데이터 업데이트"""
-        if group_id in self.duplicate_groups_data:
-            # 내부 그룹 데이터 업데이트
-            current_group_tuples = self.duplicate_groups_data[group_id]
-            for i, (path, similarity, rank) in enumerate(current_group_tuples):
-                if path == source_path:
-                    current_group_tuples[i] = (destination_path, similarity, rank)
-                    print(f"[Move Update] 그룹 데이터 업데이트됨: {os.path.basename(source_path)} -> {os.path.basename(destination_path)}")
-                    break
-            
-            # 대표 이미지 처리
-            if source_path == self.group_representatives.get(group_id):
-                self.group_representatives[group_id] = destination_path
-                print(f"[Move Update] 대표 파일 경로 업데이트됨: {os.path.basename(source_path)} -> {os.path.basename(destination_path)}")
-                
-            return True
-        return False
+    def _update_groups_after_move(self, group_id: str, moves: Dict[str, str]) -> bool:
+        """파일 이동 후 그룹 데이터 업데이트 (moves: 원본 경로 -> 이동된 경로, 그룹당 한 번에 처리)"""
+        if group_id not in self.duplicate_groups_data:
+            return False
+        # 내부 그룹 데이터 업데이트
+        current_group_tuples = self.duplicate_groups_data[group_id]
+        current_group_tuples[:] = [(moves.get(path, path), similarity, rank) for path, similarity, rank in current_group_tuples]
+        
+        # 대표 이미지 처리
+        representative_path = self.group_representatives.get(group_id)
+        if representative_path in moves:
+            self.group_representatives[group_id] = moves[representative_path]
+            print(f"[Move Update] 대표 파일 경로 업데이트됨: {os.path.basename(representative_path)} -> {os.path.basename(moves[representative_path])}")
+        return True
 
 if __name__ == '__main__':
     # DPI 스케일링 활성화 
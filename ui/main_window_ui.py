@@ -8,10 +8,10 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QFrame, QSplitter, QTableView,
-    QHeaderView, QApplication, QCheckBox # 필요한 위젯만 임포트
+    QHeaderView, QApplication, QCheckBox, QSlider # 필요한 위젯만 임포트
 )
-from PyQt5.QtGui import QStandardItemModel, QIcon
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import Qt, QSize
 
 # MainWindow 는 타입 힌트용으로만 사용 (순환 참조 방지)
 from typing import TYPE_CHECKING
@@ -20,6 +20,8 @@ if TYPE_CHECKING:
 
 from .image_label import ImageLabel
 from .similarity_sort_proxy_model import SimilaritySortProxyModel
+from .duplicate_table_model import DuplicateTableModel
+from .group_grid_view import GroupGridView
 
 # ICON_PATH 및 QSS 정의 (main_window.py 에서 복사 및 수정)
 ICON_PATH = os.path.join(project_root, "assets", "icon.ico")
@@ -210,6 +212,16 @@ def setup_ui(window: 'MainWindow'):
     right_panel_layout.addLayout(right_button_layout)
     image_comparison_layout.addLayout(right_panel_layout)
 
+    # --- 그룹 썸네일 격자 영역 (선택한 그룹의 대표와 모든 멤버) ---
+    group_grid_frame = QFrame()
+    group_grid_frame.setFrameShape(QFrame.StyledPanel)
+    group_grid_layout = QVBoxLayout(group_grid_frame)
+    group_grid_layout.setContentsMargins(4, 4, 4, 4)
+    window.group_grid_label = QLabel("Group Members") # window 속성으로 할당
+    group_grid_layout.addWidget(window.group_grid_label)
+    window.group_grid_view = GroupGridView() # window 속성으로 할당
+    group_grid_layout.addWidget(window.group_grid_view, 1)
+
     # --- 하단 중복 목록 영역 ---
     duplicate_list_frame = QFrame()
     duplicate_list_frame.setFrameShape(QFrame.StyledPanel) # 프레임 스타일 추가
@@ -247,12 +259,11 @@ def setup_ui(window: 'MainWindow'):
 
     # 중복 목록 테이블 뷰
     window.duplicate_table_view = QTableView() # window 속성으로 할당
-    window.duplicate_table_model = QStandardItemModel() # 원본 데이터 모델, window 속성으로 할당
+    window.duplicate_table_model = DuplicateTableModel() # 원본 데이터 모델 (열 배열 기반), window 속성으로 할당
     window.duplicate_table_proxy_model = SimilaritySortProxyModel() # 프록시 모델 생성, window 속성으로 할당
     window.duplicate_table_proxy_model.setSourceModel(window.duplicate_table_model) # 소스 모델 연결
 
-    # --- 테이블 헤더 '#' -> 'Rank', 초기 정렬 Rank 기준 ---
-    window.duplicate_table_model.setHorizontalHeaderLabels(["Select", "Rank", "Representative", "Group Member", "Similarity", "Group ID"])
+    # --- 테이블 헤더 '#' -> 'Rank' (DuplicateTableModel.headerData), 초기 정렬 Rank 기준 ---
     
     # 테이블 뷰에는 *프록시* 모델 설정
     window.duplicate_table_view.setModel(window.duplicate_table_proxy_model) 
@@ -260,6 +271,7 @@ def setup_ui(window: 'MainWindow'):
     window.duplicate_table_view.setSelectionBehavior(QTableView.SelectRows)
     window.duplicate_table_view.setSelectionMode(QTableView.SingleSelection)
     window.duplicate_table_view.setSortingEnabled(True) # 테이블 뷰 정렬 활성화
+    window.duplicate_table_view.setIconSize(QSize(24, 24)) # 멤버 열 썸네일 아이콘 크기
 
     # 열 너비 조정 (인덱스 조정)
     header = window.duplicate_table_view.horizontalHeader()
@@ -288,13 +300,38 @@ def setup_ui(window: 'MainWindow'):
     window.select_all_button.setToolTip("모든 항목 선택")
     window.select_none_button = QPushButton("Clear Selection")
     window.select_none_button.setToolTip("선택 항목 모두 해제")
+    window.select_exact_button = QPushButton("Select 100%")
+    window.select_exact_button.setToolTip("유사도 100% 항목만 선택")
+    window.invert_selection_button = QPushButton("Invert Selection")
+    window.invert_selection_button.setToolTip("선택 상태 반전")
     select_buttons_layout.addWidget(window.select_all_button)
+    select_buttons_layout.addWidget(window.select_exact_button)
+    select_buttons_layout.addWidget(window.invert_selection_button)
     select_buttons_layout.addWidget(window.select_none_button)
     batch_action_layout.addLayout(select_buttons_layout)
 
     # 중간 여백
     batch_action_layout.addStretch(1)
 
+    # 임계값 슬라이더 (스캔 후 활성화, 값을 바꾸면 다시 스캔하지 않고 결과를 다시 그룹화)
+    threshold_layout = QHBoxLayout()
+    window.hash_threshold_label = QLabel("Image distance: -")
+    window.hash_threshold_slider = QSlider(Qt.Horizontal)
+    window.hash_threshold_slider.setToolTip("이미지 해시 거리 임계값 (작을수록 엄격)")
+    window.hash_threshold_slider.setFixedWidth(120)
+    window.hash_threshold_slider.setEnabled(False)
+    window.video_threshold_label = QLabel("Video similarity: -")
+    window.video_threshold_slider = QSlider(Qt.Horizontal) # 0.1% 단위
+    window.video_threshold_slider.setToolTip("비디오 유사도 임계값 (스캔 임계값 이상으로만 조정 가능)")
+    window.video_threshold_slider.setFixedWidth(120)
+    window.video_threshold_slider.setEnabled(False)
+    threshold_layout.addWidget(window.hash_threshold_label)
+    threshold_layout.addWidget(window.hash_threshold_slider)
+    threshold_layout.addWidget(window.video_threshold_label)
+    threshold_layout.addWidget(window.video_threshold_slider)
+    batch_action_layout.addLayout(threshold_layout)
+    batch_action_layout.addStretch(1)
+
     # 일괄 작업 버튼 (오른쪽 정렬)
     action_buttons_layout = QHBoxLayout()
     window.batch_delete_button = QPushButton("Delete Selected")
@@ -311,9 +348,10 @@ def setup_ui(window: 'MainWindow'):
     # 스플리터로 영역 나누기
     splitter = QSplitter(Qt.Vertical)
     splitter.addWidget(image_comparison_frame)
+    splitter.addWidget(group_grid_frame)
     splitter.addWidget(duplicate_list_frame)
-    # 초기 크기 비율 재조정 (상단 약 455, 하단 약 195 - 상단 70%)
-    splitter.setSizes([455, 195]) 
+    # 초기 크기 비율 재조정 (상단 비교 영역 약 300, 그룹 썸네일 약 155, 하단 목록 약 195)
+    splitter.setSizes([300, 155, 195]) 
     main_layout.addWidget(splitter)
 
     # 시그널 연결은 MainWindow.__init__ 에서 수행 
\ No newline at end of file
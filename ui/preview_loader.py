@@ -0,0 +1,464 @@
+import os
+import io
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+from PyQt5.QtGui import QImage, QImageReader, QPainter, QColor, QFont, QPen, QPolygon
+from PyQt5.QtCore import Qt, QObject, QRect, QPoint, QRunnable, QThreadPool, pyqtSignal
+from PIL import Image, ImageOps
+from supported_formats import (
+    RAW_EXTENSIONS, VIDEO_ONLY_EXTENSIONS, FRAME_CHECK_FORMATS,
+    PREVIEW_CACHE_MAX_MB, PREVIEW_MAX_DIMENSION, PREVIEW_LOADER_THREADS, RAW_THUMB_MIN_FRACTION,
+    PREVIEW_SIZE_STEP, PREVIEW_PYRAMID_MIN_SIZE
+)
+
+class PreviewResult:
+    """백그라운드에서 디코딩한 미리보기 결과 (QImage는 스레드 간 전달 가능, QPixmap은 GUI 스레드에서만 생성)"""
+
+    def __init__(self, file_path: str, image: Optional[QImage] = None, is_video: bool = False,
+                 error_text: Optional[str] = None, original_size: Optional[Tuple[int, int]] = None,
+                 duration: float = 0.0, is_reduced: bool = False, full_resolution: bool = False,
+                 decode_limit: int = 0):
+        self.file_path = file_path
+        self.image = image  # 미리보기 QImage (decode_limit 이하로 축소됨), 실패 시 None
+        self.is_video = is_video
+        self.error_text = error_text  # 실패 시 레이블에 표시할 문구
+        self.original_size = original_size  # 축소 전 (너비, 높이)
+        self.duration = duration  # 비디오 길이(초)
+        self.is_reduced = is_reduced  # RAW를 내장 썸네일/절반 크기로 디코딩했는지 (전체 해상도는 사용자 요청 시에만)
+        self.full_resolution = full_resolution  # 전체 해상도 요청으로 만든 결과인지
+        self.decode_limit = decode_limit  # 디코딩할 때 사용한 최대 가로/세로 크기 (0이면 제한 없음)
+        # 창 크기 조절 시 사용할 해상도 피라미드 (image부터 절반씩 축소, 작업자 스레드에서 생성)
+        self.levels: List[QImage] = build_pyramid(image) if image is not None else []
+
+    @property
+    def is_downscaled(self) -> bool:
+        """디코딩 시 원본보다 작게 줄였는지 여부"""
+        if self.image is None or not self.original_size:
+            return False
+        return max(self.image.width(), self.image.height()) < max(self.original_size)
+
+    def covers(self, decode_limit: int) -> bool:
+        """decode_limit 크기의 요청을 이 결과로 대신할 수 있는지 (원본 크기이거나 더 크게 디코딩된 경우)"""
+        if not self.is_downscaled or self.decode_limit == 0:
+            return True
+        return decode_limit != 0 and self.decode_limit >= decode_limit
+
+    @property
+    def size_in_bytes(self) -> int:
+        return sum(level.byteCount() for level in self.levels)
+
+def build_pyramid(image: QImage, min_size: int = PREVIEW_PYRAMID_MIN_SIZE) -> List[QImage]:
+    """이미지를 긴 변이 min_size에 닿을 때까지 절반씩 줄인 해상도 목록 (첫 항목은 원래 이미지)"""
+    levels = [image]
+    while max(levels[-1].width(), levels[-1].height()) // 2 >= min_size:
+        last = levels[-1]
+        levels.append(last.scaled(max(1, last.width() // 2), max(1, last.height() // 2),
+                                  Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+    return levels
+
+def _scaled_size(width: int, height: int, max_dimension: int) -> Tuple[int, int]:
+    """비율을 유지하며 긴 변이 max_dimension 이하가 되는 크기 (이미 작으면 그대로)"""
+    if not max_dimension or max(width, height) <= max_dimension:
+        return width, height
+    scale = max_dimension / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def _open_pil_reduced(file_path: str, max_dimension: int) -> Tuple[Image.Image, Tuple[int, int]]:
+    """
+    Pillow로 이미지를 열어 헤더의 원본 크기를 읽고, 큰 이미지는 JPEG draft 또는 reduce로 줄여서 디코딩합니다.
+
+    반환값:
+        (PIL 이미지, 원본 (너비, 높이))
+    """
+    img = Image.open(file_path)
+    original_size = img.size
+    if max_dimension and max(original_size) > max_dimension:
+        # JPEG는 DCT 단계에서 1/2~1/8로 디코딩 (다른 형식은 무시됨)
+        img.draft('RGB', (max_dimension, max_dimension))
+        factor = max(img.size) // max_dimension
+        if factor >= 2:
+            img = img.reduce(factor)
+    return img, original_size
+
+def _pil_to_qimage(img: Image.Image) -> QImage:
+    """PIL 이미지를 데이터를 소유하는 QImage로 변환합니다 (원본 바이트 버퍼와 분리)"""
+    if img.mode == "RGBA":
+        data = img.tobytes("raw", "RGBA")
+        return QImage(data, img.width, img.height, img.width * 4, QImage.Format_RGBA8888).copy()
+    rgb_img = img if img.mode == "RGB" else img.convert("RGB")
+    data = rgb_img.tobytes("raw", "RGB")
+    qimage = QImage(data, rgb_img.width, rgb_img.height, rgb_img.width * 3, QImage.Format_RGB888).copy()
+    if rgb_img is not img:
+        rgb_img.close()
+    return qimage
+
+def _draw_banner(qimage: QImage, text: str) -> QImage:
+    """이미지 위쪽에 반투명 배경과 텍스트를 그립니다 (WebP 애니메이션 표시)"""
+    qimage = qimage.convertToFormat(QImage.Format_ARGB32)
+    painter = QPainter(qimage)
+    painter.setRenderHint(QPainter.Antialiasing)
+    bg_rect = QRect(0, 0, qimage.width(), 30)
+    painter.fillRect(bg_rect, QColor(0, 0, 0, 150))
+    painter.setPen(QPen(QColor(255, 255, 255, 200)))
+    painter.setFont(QFont("Arial", 12, QFont.Bold))
+    painter.drawText(bg_rect, Qt.AlignCenter, text)
+    painter.end()
+    return qimage
+
+def _video_placeholder(file_path: str) -> QImage:
+    """첫 프레임을 추출하지 못한 비디오에 표시할 기본 아이콘"""
+    video_icon = QImage(300, 300, QImage.Format_RGB32)
+    video_icon.fill(Qt.black)
+    painter = QPainter(video_icon)
+    painter.setRenderHint(QPainter.Antialiasing)
+
+    # 파일명 표시 (너무 길면 줄임)
+    painter.setPen(QPen(QColor(255, 255, 255)))
+    painter.setFont(QFont("Arial", 20, QFont.Bold))
+    basename = os.path.basename(file_path)
+    if len(basename) > 20:
+        basename = basename[:17] + "..."
+    painter.drawText(QRect(10, 10, 280, 280), Qt.AlignCenter, f"VIDEO\n{basename}")
+
+    # 화면 비율 프레임과 재생 버튼
+    painter.setPen(QPen(QColor(255, 255, 255), 3))
+    frame_rect = QRect(50, 80, 200, 140)
+    painter.drawRect(frame_rect)
+    painter.setBrush(QColor(255, 255, 255))
+    play_triangle = QPolygon()
+    play_triangle.append(QPoint(frame_rect.center().x() - 15, frame_rect.center().y() - 25))
+    play_triangle.append(QPoint(frame_rect.center().x() - 15, frame_rect.center().y() + 25))
+    play_triangle.append(QPoint(frame_rect.center().x() + 30, frame_rect.center().y()))
+    painter.drawPolygon(play_triangle)
+    painter.end()
+    return video_icon
+
+def _decode_video_frame(file_path: str, max_dimension: int) -> Tuple[Optional[QImage], Optional[Tuple[int, int]]]:
+    """
+    비디오/애니메이션의 첫 프레임을 QImage로 디코딩합니다 (WebP 애니메이션은 Pillow 사용).
+    프레임은 변환 단계(swscale)에서 바로 max_dimension 이하로 줄입니다.
+
+    반환값:
+        (QImage, 원본 프레임 (너비, 높이)) 또는 실패 시 (None, None)
+    """
+    if os.path.splitext(file_path)[1].lower() == '.webp':
+        try:
+            with Image.open(file_path) as img:
+                img.seek(0)
+                original_size = img.size
+                img.thumbnail(_scaled_size(img.width, img.height, max_dimension))
+                qimage = _pil_to_qimage(img)
+            if not qimage.isNull():
+                return _draw_banner(qimage, "WebP Animation"), original_size
+        except Exception as webp_err:
+            print(f"WebP 애니메이션 처리 오류, 일반 비디오 처리로 전환: {webp_err}")
+
+    import av  # PyAV는 비디오 미리보기가 처음 필요할 때 불러옴 (앱 시작 시간 단축)
+    with av.open(file_path) as container:
+        video_stream = next((s for s in container.streams if s.type == 'video'), None)
+        if video_stream is None:
+            return None, None
+        container.seek(0)
+        for frame in container.decode(video_stream):
+            width, height = _scaled_size(frame.width, frame.height, max_dimension)
+            # 첫 프레임만 사용
+            return _pil_to_qimage(frame.to_image(width=width, height=height)), (frame.width, frame.height)
+    return None, None
+
+def _decode_with_qt(file_path: str, max_dimension: int) -> Tuple[QImage, Optional[Tuple[int, int]]]:
+    """
+    QImageReader로 헤더에서 원본 크기를 읽고 setScaledSize로 표시 크기에 맞춰 디코딩합니다.
+    (JPEG는 디코더 단계에서 축소되어 전체 크기 버퍼를 만들지 않음)
+    """
+    reader = QImageReader(file_path)
+    source_size = reader.size()
+    original_size = None
+    if source_size.isValid():
+        original_size = (source_size.width(), source_size.height())
+        scaled_size = _scaled_size(source_size.width(), source_size.height(), max_dimension)
+        if scaled_size != original_size:
+            reader.setScaledSize(source_size.scaled(scaled_size[0], scaled_size[1], Qt.KeepAspectRatio))
+    return reader.read(), original_size
+
+# LibRaw sizes.flip 값 -> 내장 썸네일에 적용할 Pillow 회전 (EXIF 방향 정보가 없는 썸네일용)
+_RAW_FLIP_TRANSPOSE = {3: Image.ROTATE_180, 5: Image.ROTATE_90, 6: Image.ROTATE_270}
+
+def _raw_output_size(raw_obj) -> Tuple[int, int]:
+    """postprocess 결과(회전 적용 후)의 (너비, 높이)"""
+    width, height = raw_obj.sizes.width, raw_obj.sizes.height
+    if raw_obj.sizes.flip in (5, 6):
+        return height, width
+    return width, height
+
+def _decode_raw_thumbnail(raw_obj, max_dimension: int) -> Optional[Image.Image]:
+    """
+    RAW에 내장된 JPEG(또는 비트맵) 썸네일을 디코딩합니다.
+    JPEG는 draft 모드로 max_dimension 근처 크기까지만 디코딩하고, 썸네일 방향을 RAW 회전 정보에 맞춥니다.
+    썸네일이 없거나 지원하지 않는 형식이면 None을 반환합니다.
+    """
+    import rawpy
+    try:
+        thumb = raw_obj.extract_thumb()
+    except (rawpy.LibRawNoThumbnailError, rawpy.LibRawUnsupportedThumbnailError):
+        return None
+    if thumb.format == rawpy.ThumbFormat.JPEG:
+        img = Image.open(io.BytesIO(thumb.data))
+        if max_dimension:
+            img.draft('RGB', (max_dimension, max_dimension))
+        has_orientation = img.getexif().get(0x0112, 1) != 1
+        img = ImageOps.exif_transpose(img) if has_orientation else img
+    elif thumb.format == rawpy.ThumbFormat.BITMAP:
+        img = Image.fromarray(thumb.data)
+        has_orientation = False
+    else:
+        return None
+    transpose = _RAW_FLIP_TRANSPOSE.get(raw_obj.sizes.flip)
+    if transpose is not None and not has_orientation:
+        img = img.transpose(transpose)
+    return img
+
+def _decode_raw(file_path: str, max_dimension: int, full_resolution: bool) -> Tuple[Image.Image, Tuple[int, int], bool]:
+    """
+    RAW 파일을 미리보기용으로 디코딩합니다.
+    기본적으로 내장 썸네일을 사용하고, 썸네일이 너무 작거나 없으면 절반 크기 디모자이크(half_size)로 대체합니다.
+    전체 해상도 디모자이크는 full_resolution(사용자 요청)일 때만 수행합니다.
+
+    반환값:
+        (PIL 이미지, 원본 크기, 축소 디코딩 여부)
+    """
+    import rawpy
+    with rawpy.imread(file_path) as raw_obj:
+        original_size = _raw_output_size(raw_obj)
+        if full_resolution:
+            return Image.fromarray(raw_obj.postprocess(use_camera_wb=True)), original_size, False
+        # 내장 썸네일이 패널에 비해 너무 작으면(카메라마다 160px 썸네일만 있는 경우) 사용하지 않음
+        min_thumb = min(max_dimension or PREVIEW_MAX_DIMENSION, max(original_size)) * RAW_THUMB_MIN_FRACTION
+        try:
+            thumb = _decode_raw_thumbnail(raw_obj, max_dimension)
+        except Exception as thumb_err:
+            print(f"RAW 내장 썸네일 디코딩 오류, 절반 크기 디모자이크로 대체: {file_path} - {thumb_err}")
+            thumb = None
+        if thumb is not None and max(thumb.size) >= min_thumb:
+            return thumb, original_size, True
+        return Image.fromarray(raw_obj.postprocess(use_camera_wb=True, half_size=True)), original_size, True
+
+def decode_preview(file_path: str, max_dimension: int = PREVIEW_MAX_DIMENSION,
+                   full_resolution: bool = False) -> PreviewResult:
+    """
+    파일 하나의 미리보기를 QImage로 디코딩합니다. QPixmap을 만들지 않으므로 작업자 스레드에서 호출해도 안전합니다.
+    RAW는 내장 썸네일(없으면 절반 크기 디모자이크), TGA는 Pillow, 비디오는 PyAV 첫 프레임, 나머지는 QImageReader를 사용하며,
+    모두 디코딩 단계에서 max_dimension(표시 크기) 근처로 줄여서 읽습니다. 원본 크기는 헤더 정보로 기록합니다.
+    full_resolution이면 RAW도 전체 해상도로 디모자이크하고 축소하지 않습니다 (사용자가 직접 요청한 경우).
+    """
+    basename = os.path.basename(file_path)
+    if not file_path or not os.path.exists(file_path):
+        return PreviewResult(file_path, error_text="File Not Found")
+    file_ext = os.path.splitext(file_path)[1].lower()
+    is_video = file_ext in VIDEO_ONLY_EXTENSIONS or file_ext in FRAME_CHECK_FORMATS
+
+    qimage = None
+    duration = 0.0
+    original_size = None
+    is_reduced = False
+    if full_resolution:
+        max_dimension = 0
+    try:
+        if is_video:
+            from video_processor import VideoProcessor
+            try:
+                qimage, original_size = _decode_video_frame(file_path, max_dimension)
+                if qimage is None or qimage.isNull():
+                    raise Exception("첫 프레임 추출 실패")
+            except Exception as e:
+                print(f"비디오 프레임 추출 오류: {e}")
+                qimage = _video_placeholder(file_path)
+            try:
+                duration = VideoProcessor.get_video_duration(file_path)
+            except Exception:
+                duration = 0.0
+
+        elif file_ext in RAW_EXTENSIONS or file_ext == '.tga':
+            import rawpy  # rawpy는 RAW/TGA 미리보기가 처음 필요할 때 불러옴 (앱 시작 시간 단축)
+            try:
+                if file_ext in RAW_EXTENSIONS:
+                    img_pil, original_size, is_reduced = _decode_raw(file_path, max_dimension, full_resolution)
+                else:
+                    img_pil, original_size = _open_pil_reduced(file_path, max_dimension)
+                try:
+                    qimage = _pil_to_qimage(img_pil)
+                finally:
+                    img_pil.close()
+            except rawpy.LibRawIOError as e:
+                print(f"rawpy I/O error for {file_path}: {e}")
+                return PreviewResult(file_path, error_text=f"RAW Load Error (I/O)\n{basename}")
+            except Exception as e:
+                print(f"Error processing {file_ext} file {file_path}: {e}")
+                return PreviewResult(file_path, error_text=f"Cannot Load Image\n{basename}")
+
+        else:
+            qimage, original_size = _decode_with_qt(file_path, max_dimension)
+            if qimage.isNull():
+                # Qt가 읽지 못하는 형식은 Pillow로 다시 시도
+                try:
+                    img_pil, original_size = _open_pil_reduced(file_path, max_dimension)
+                    try:
+                        qimage = _pil_to_qimage(img_pil)
+                    finally:
+                        img_pil.close()
+                except Exception as pil_err:
+                    print(f"Pillow 미리보기 디코딩 오류: {file_path} - {pil_err}")
+
+        if qimage is None or qimage.isNull():
+            return PreviewResult(file_path, is_video=is_video, error_text=f"Invalid Image File\n{basename}")
+
+        if original_size is None:
+            original_size = (qimage.width(), qimage.height())
+        if max_dimension and max(qimage.width(), qimage.height()) > max_dimension:
+            qimage = qimage.scaled(max_dimension, max_dimension, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return PreviewResult(file_path, qimage, is_video, original_size=original_size, duration=duration,
+                             is_reduced=is_reduced, full_resolution=full_resolution, decode_limit=max_dimension)
+
+    except Exception as e:
+        print(f"Unexpected error in decode_preview for {file_path}: {e}")
+        return PreviewResult(file_path, is_video=is_video, error_text=f"Load Error\n{basename}")
+
+class PreviewCache:
+    """디코딩된 미리보기의 LRU 캐시 (키: 경로/수정 시각/크기, 전체 QImage 바이트 수로 제한)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries: "OrderedDict[Hashable, PreviewResult]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[PreviewResult]:
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+        return result
+
+    def put(self, key: Hashable, result: PreviewResult):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old.size_in_bytes
+        self.entries[key] = result
+        self.total_bytes += result.size_in_bytes
+        # 가장 오래 사용하지 않은 항목부터 제거 (방금 넣은 항목은 하나뿐이어도 유지)
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= evicted.size_in_bytes
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+class _PreviewTaskSignals(QObject):
+    finished = pyqtSignal(object, object)  # (캐시 키, PreviewResult)
+
+class _PreviewTask(QRunnable):
+    """스레드 풀에서 미리보기 하나를 디코딩하는 작업"""
+
+    def __init__(self, key: Hashable, file_path: str, signals: _PreviewTaskSignals, started: Set[Hashable],
+                 decode_limit: int, full_resolution: bool = False):
+        super().__init__()
+        self.key = key
+        self.file_path = file_path
+        self.signals = signals
+        self.started = started
+        self.decode_limit = decode_limit
+        self.full_resolution = full_resolution
+
+    def run(self):
+        self.started.add(self.key)
+        result = decode_preview(self.file_path, self.decode_limit, full_resolution=self.full_resolution)
+        result.full_resolution = self.full_resolution
+        self.signals.finished.emit(self.key, result)
+
+class PreviewLoader(QObject):
+    """
+    미리보기를 QThreadPool에서 디코딩하고 LRU 캐시에 보관하는 로더.
+    캐시와 대기 목록은 GUI 스레드에서만 다루며, 작업자 스레드는 QImage만 만들어 시그널로 넘깁니다.
+    """
+    preview_ready = pyqtSignal(str, object)  # (파일 경로, PreviewResult)
+
+    # 작업 우선순위 (화면에 바로 표시할 항목이 이웃 행 미리 읽기보다 먼저)
+    PRIORITY_VISIBLE = 1
+    PRIORITY_PREFETCH = 0
+
+    def __init__(self, parent: Optional[QObject] = None, max_threads: int = PREVIEW_LOADER_THREADS,
+                 max_cache_mb: int = PREVIEW_CACHE_MAX_MB):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, max_threads))
+        self.cache = PreviewCache(max_cache_mb * 1024 * 1024)
+        self.pending: Dict[Hashable, str] = {}  # 캐시 키 -> 파일 경로 (대기 중이거나 디코딩 중인 작업)
+        self.started: Set[Hashable] = set()  # 작업자 스레드가 디코딩을 시작한 캐시 키
+        self.signals = _PreviewTaskSignals(self)
+        self.signals.finished.connect(self._on_task_finished)
+
+    @staticmethod
+    def cache_key(file_path: str, full_resolution: bool = False) -> Optional[Tuple[str, int, int, bool]]:
+        """파일이 바뀌면 다시 디코딩하도록 경로/수정 시각/크기를 캐시 키로 사용합니다 (파일이 없으면 None)"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return file_path, stat.st_mtime_ns, stat.st_size, full_resolution
+
+    @staticmethod
+    def decode_limit(max_dimension: Optional[int]) -> int:
+        """
+        표시 크기를 PREVIEW_SIZE_STEP 단위로 올림한 디코딩 크기 (최대 PREVIEW_MAX_DIMENSION).
+        창 크기가 조금씩 바뀔 때마다 다시 디코딩하지 않도록 단계별로 묶습니다.
+        """
+        if not max_dimension or max_dimension <= 0:
+            return PREVIEW_MAX_DIMENSION
+        steps = -(-int(max_dimension) // PREVIEW_SIZE_STEP)
+        return min(PREVIEW_MAX_DIMENSION, steps * PREVIEW_SIZE_STEP)
+
+    def get_cached(self, file_path: str, full_resolution: bool = False) -> Optional[PreviewResult]:
+        """파일의 캐시된 미리보기 중 가장 크게 디코딩된 것을 반환합니다."""
+        key = self.cache_key(file_path, full_resolution)
+        return self.cache.get(key) if key is not None else None
+
+    def request(self, file_path: str, max_dimension: Optional[int] = None, prefetch: bool = False,
+                full_resolution: bool = False) -> Optional[PreviewResult]:
+        """
+        미리보기를 요청합니다. 캐시된 결과가 요청 크기(max_dimension, 표시 영역의 긴 변)를 채우면 바로 반환하고,
+        아니면 스레드 풀에 디코딩을 맡긴 뒤 None을 반환합니다. 디코딩이 끝나면 preview_ready 시그널이 발생합니다.
+        full_resolution이면 RAW를 전체 해상도로 디코딩합니다 (축소 미리보기와 별도로 캐시).
+        """
+        key = self.cache_key(file_path, full_resolution)
+        if key is None:
+            return None
+        limit = 0 if full_resolution else self.decode_limit(max_dimension)
+        cached = self.cache.get(key)
+        if cached is not None and cached.covers(limit):
+            return cached
+        task_key = key + (limit,)
+        if task_key in self.pending:
+            return None
+        self.pending[task_key] = file_path
+        priority = self.PRIORITY_PREFETCH if prefetch else self.PRIORITY_VISIBLE
+        self.pool.start(_PreviewTask(task_key, file_path, self.signals, self.started, limit, full_resolution), priority)
+        return None
+
+    def cancel_pending(self):
+        """아직 시작하지 않은 작업을 취소합니다 (빠르게 행을 넘길 때 지나간 행의 미리보기를 디코딩하지 않도록)"""
+        self.pool.clear()
+        for key in list(self.pending):
+            if key not in self.started:
+                del self.pending[key]
+
+    def clear_cache(self):
+        self.cache.clear()
+
+    def _on_task_finished(self, task_key, result: PreviewResult):
+        self.pending.pop(task_key, None)
+        self.started.discard(task_key)
+        if result.image is not None:
+            # 파일당 하나만 보관: 이미 더 크게 디코딩된 결과가 있으면 유지
+            key = task_key[:-1]
+            existing = self.cache.entries.get(key)
+            if existing is None or not existing.covers(result.decode_limit):
+                self.cache.put(key, result)
+        self.preview_ready.emit(result.file_path, result)
@@ -1,11 +1,12 @@
 import os
 import uuid
-from PyQt5.QtGui import QStandardItem
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication # processEvents 용
 from typing import TYPE_CHECKING, Dict, List, Tuple
 # 파일 형식 정의 모듈 임포트
 from supported_formats import VIDEO_ANIMATION_EXTENSIONS, VIDEO_ONLY_EXTENSIONS, FRAME_CHECK_FORMATS
+from dihedral import TRANSFORM_LABELS
+from result_ranking import rank_by_similarity
 
 # MainWindow 타입 힌트만 임포트 (순환 참조 방지)
 if TYPE_CHECKING:
@@ -16,6 +17,12 @@ class ScanResultProcessor:
     """스캔 결과를 처리하고 MainWindow의 데이터와 UI를 업데이트하는 클래스"""
     def __init__(self, main_window: 'MainWindow'):
         self.main_window = main_window
+        self.last_scan_counts = (0, 0)  # 마지막 결과의 (총 파일 수, 처리된 파일 수) - 임계값 재그룹화 시 상태 표시에 사용
+
+    def set_scan_report(self, scan_report: dict):
+        """ScanWorker의 스캔 보고서를 저장합니다. (scan_finished 직전에 호출됨)"""
+        self.main_window.scan_report = dict(scan_report) if scan_report else {}
+        self.main_window.configure_threshold_sliders()
         
     def is_video_file(self, file_path):
         """파일이 비디오/애니메이션 형식인지 확인합니다.
@@ -26,19 +33,66 @@ class ScanResultProcessor:
     def process_results(self, total_files: int, processed_count: int, duplicate_groups_with_similarity: 'DuplicateGroupWithSimilarity'):
         """스캔 완료 시그널을 처리하여 결과를 테이블에 업데이트합니다."""
         mw = self.main_window # 편의상 짧은 변수명 사용
+        self.last_scan_counts = (total_files, processed_count)
 
         # 스캔 완료 상태 업데이트
         include_subfolder_msg = " (including subfolders)" if mw.include_subfolders_checkbox.isChecked() else ""
-        mw.status_label.setText(f"Scan complete{include_subfolder_msg}. Found {len(duplicate_groups_with_similarity)} duplicate groups in {processed_count}/{total_files} files.")
+        same_file_groups = mw.scan_report.get('same_file_groups', [])
+        same_file_msg = f", {len(same_file_groups)} same-file groups" if same_file_groups else ""
+        containments = mw.scan_report.get('containments', [])
+        containment_msg = f", {len(containments)} contained clips" if containments else ""
+        failed_files = mw.scan_report.get('failed_files', {})
+        failed_msg = f", {len(failed_files)} files failed" if failed_files else ""
+        mw.status_label.setText(f"Scan complete{include_subfolder_msg}. Found {len(duplicate_groups_with_similarity)} duplicate groups{same_file_msg}{containment_msg} in {processed_count}/{total_files} files{failed_msg}.")
+        # 실패한 파일과 사유는 상태 표시줄 툴팁으로 표시
+        if failed_files:
+            failed_lines = [f"{os.path.basename(path)}: {reason}" for path, reason in sorted(failed_files.items())]
+            mw.status_label.setToolTip("Failed files:\n" + "\n".join(failed_lines))
+        else:
+            mw.status_label.setToolTip("")
 
         # 내부 데이터 초기화
         mw.duplicate_groups_data.clear()
         mw.group_representatives.clear()
-        mw.duplicate_table_model.removeRows(0, mw.duplicate_table_model.rowCount())
+        mw.duplicate_table_model.clear_rows()
+        if mw.thumbnail_icons is not None:
+            mw.thumbnail_icons.clear()  # 이전 스캔 이후 바뀐 파일의 아이콘을 다시 읽도록
 
         # --- 유사도 기반 Rank 계산 로직 --- 
         all_duplicate_pairs = []
         temp_group_data = {}
+        same_file_group_ids = set() # '같은 파일'(하드링크/심볼릭 링크) 범주의 그룹 ID
+        # 시간축 정렬로 그룹에 추가된 잘린 복사본: {멤버 경로: 정렬 정보}
+        temporal_matches = {m['member']: m for m in mw.scan_report.get('temporal_matches', [])}
+        # 오디오로 확인되어 그룹에 포함된 비디오: {멤버 경로: 오디오 일치 정보}
+        audio_matches = {m['member']: m for m in mw.scan_report.get('audio_matches', [])}
+        # 회전/반전된 사본으로 그룹에 포함된 파일: {멤버 경로: 대표 기준 변환 이름}
+        transforms = mw.scan_report.get('transforms', {})
+        # 0. 같은 파일 그룹은 별도 범주로 먼저 추가 (항상 100% 유사도)
+        for representative_path, alias_paths in same_file_groups:
+            if not alias_paths: continue
+            group_id = str(uuid.uuid4())
+            same_file_group_ids.add(group_id)
+            temp_group_data[group_id] = {'rep': representative_path, 'members': []}
+            for alias_path in alias_paths:
+                member_info = {'path': alias_path, 'similarity': 0, 'percentage': 100.0, 'rank': -1}
+                all_duplicate_pairs.append((representative_path, alias_path, 100.0, group_id, member_info))
+                temp_group_data[group_id]['members'].append(member_info)
+        # 0-1. 긴 비디오에 포함된 짧은 클립도 별도 범주로 추가 (긴 비디오별로 묶고 포함률을 유사도로 사용)
+        containment_group_ids = {} # 긴 비디오 경로 -> 그룹 ID
+        containment_info = {} # (그룹 ID, 클립 경로) -> 포함 정보
+        for containment in containments:
+            container_path, clip_path = containment['container'], containment['clip']
+            group_id = containment_group_ids.get(container_path)
+            if group_id is None:
+                group_id = str(uuid.uuid4())
+                containment_group_ids[container_path] = group_id
+                temp_group_data[group_id] = {'rep': container_path, 'members': []}
+            coverage_percent = round(containment['coverage'] * 100, 1)
+            containment_info[(group_id, clip_path)] = containment
+            member_info = {'path': clip_path, 'similarity': coverage_percent, 'percentage': coverage_percent, 'rank': -1}
+            all_duplicate_pairs.append((container_path, clip_path, coverage_percent, group_id, member_info))
+            temp_group_data[group_id]['members'].append(member_info)
         # 1. 모든 중복 쌍과 유사도(%) 수집
         for representative_path, members_with_similarity in duplicate_groups_with_similarity:
             if not members_with_similarity: continue
@@ -53,33 +107,21 @@ class ScanResultProcessor:
                 if is_video:
                     # 비디오 파일은 이미 0-100 범위의 유사도 값을 갖고 있음
                     percentage_similarity = float(similarity)
-                    print(f"비디오 유사도 처리: {os.path.basename(member_path)} -> {percentage_similarity:.1f}%")
                 else:
                     # 이미지 파일은 해시 거리를 백분율로 변환
                     hash_bits = 64
                     percentage_similarity = max(0, round((1 - similarity / hash_bits) * 100))
                 
-                # 대표/멤버 경로, 유사도%, 임시 그룹 ID 저장
-                all_duplicate_pairs.append((representative_path, member_path, percentage_similarity, group_id, similarity))
-                # 임시 그룹 데이터에도 멤버 추가 (나중에 Rank 와 함께 저장하기 위함)
-                temp_group_data[group_id]['members'].append({'path': member_path, 'similarity': similarity, 'percentage': percentage_similarity, 'rank': -1}) # Rank 초기값 -1
+                # 임시 그룹 데이터에 멤버 추가 (Rank는 아래에서 채움, 초기값 -1)
+                member_info = {'path': member_path, 'similarity': similarity, 'percentage': percentage_similarity, 'rank': -1}
+                temp_group_data[group_id]['members'].append(member_info)
+                # 대표/멤버 경로, 유사도%, 임시 그룹 ID, 멤버 정보 저장
+                all_duplicate_pairs.append((representative_path, member_path, percentage_similarity, group_id, member_info))
                 
-        # 2. 유사도(%) 기준 내림차순 정렬
-        all_duplicate_pairs.sort(key=lambda item: item[2], reverse=True)
-        
-        # 3. Rank 부여 및 최종 데이터 구조 생성
-        ranked_group_data = {} # {group_id: [(member_path, similarity, rank), ...]}
-        current_rank = 1
-        for rep_path, mem_path, percent_sim, group_id, original_sim in all_duplicate_pairs:
-            if group_id not in ranked_group_data:
-                ranked_group_data[group_id] = []
-            ranked_group_data[group_id].append((mem_path, original_sim, current_rank))
-            # 임시 그룹 데이터에도 Rank 업데이트 (스냅샷용)
-            for member_info in temp_group_data[group_id]['members']:
-                if member_info['path'] == mem_path:
-                    member_info['rank'] = current_rank
-                    break
-            current_rank += 1
+        # 2-3. 유사도(%) 내림차순으로 한 번 정렬해 Rank 부여 (쌍마다 그룹 멤버를 다시 찾지 않음)
+        pair_order, pair_ranks = rank_by_similarity([pair[2] for pair in all_duplicate_pairs])
+        for (_, _, _, _, member_info), rank in zip(all_duplicate_pairs, pair_ranks.tolist()):
+            member_info['rank'] = rank
             
         # 4. 내부 데이터 구조 업데이트 (대표 경로, 멤버+유사도+Rank)
         mw.group_representatives.clear()
@@ -91,56 +133,52 @@ class ScanResultProcessor:
         # --- Rank 계산 로직 끝 --- 
 
         # --- 테이블 채우기 로직 (Rank 기반) ---
-        # 정렬된 Rank 순서대로 테이블에 추가 (all_duplicate_pairs 사용)
-        for rep_path, mem_path, percent_sim, group_id, original_sim in all_duplicate_pairs:
-             rank = -1
-             # 해당 멤버의 Rank 찾기 (이미 계산됨)
-             for m_path, percent_sim_stored, r in mw.duplicate_groups_data.get(group_id, []):
-                  if m_path == mem_path:
-                       rank = r
-                       break
-             if rank == -1: continue # 오류 방지
+        # 정렬된 Rank 순서대로 열 목록을 만든 뒤 테이블 모델에 한 번에 설정 (행마다 아이템을 만들지 않음)
+        table_ranks, table_reps, table_members, table_similarities, table_texts, table_group_ids = [], [], [], [], [], []
+        video_reps = {} # 대표 경로 -> 비디오 여부 (같은 그룹의 행마다 확장자를 다시 검사하지 않도록)
+        for pair_index in pair_order.tolist():
+             rep_path, mem_path, percent_sim, group_id, member_info = all_duplicate_pairs[pair_index]
+             rank = member_info['rank']
 
-             # 체크박스 아이템 생성
-             item_checkbox = QStandardItem()
-             item_checkbox.setCheckable(True)
-             item_checkbox.setCheckState(Qt.Unchecked)
-             print(f"[TableDebug] Created checkbox item for row {rank}, member={os.path.basename(mem_path)}")
-             
-             # Rank 열 아이템 생성
-             item_rank = QStandardItem(str(rank))
-             item_rank.setTextAlignment(Qt.AlignCenter)
-             item_rank.setData(rank, Qt.UserRole + 6) # Rank 정렬용 데이터 (Role +6)
-             item_rank.setFlags(item_rank.flags() & ~Qt.ItemIsEditable)
-             
-             item_representative = QStandardItem(rep_path)
-             item_member = QStandardItem(mem_path)
-             
              # 파일 타입에 따라 유사도 표시 형식 변경
-             is_video = self.is_video_file(rep_path)
+             is_video = video_reps.get(rep_path)
+             if is_video is None:
+                 is_video = video_reps[rep_path] = self.is_video_file(rep_path)
              
-             if is_video:
+             temporal_match = temporal_matches.get(mem_path)
+             containment = containment_info.get((group_id, mem_path))
+             audio_match = audio_matches.get(mem_path)
+             if group_id in same_file_group_ids:
+                 # 같은 파일(하드링크/심볼릭 링크) 범주 표시
+                 similarity_text = "100% (Same file)"
+             elif containment is not None:
+                 # 긴 비디오에 포함된 클립은 포함 위치와 포함률 표시
+                 similarity_text = f"{percent_sim:.0f}% (Clip at {containment['offset']:.1f}s)"
+             elif temporal_match is not None:
+                 # 앞/뒤가 잘린 복사본은 정렬 오프셋과 함께 표시
+                 similarity_text = f"{percent_sim:.1f}% (Trimmed, offset {temporal_match['member_offset']:+.1f}s)"
+             elif audio_match is not None:
+                 # 화면 유사도가 경계값이지만 오디오가 같아 중복으로 인정된 비디오
+                 similarity_text = f"{percent_sim:.1f}% (Audio match {audio_match['audio_similarity']:.0f}%)"
+             elif is_video:
                  # 비디오 파일의 경우 소수점 한 자리까지 표시
                  similarity_text = f"{percent_sim:.1f}%"
              else:
                  # 이미지 파일은 정수로 표시
                  similarity_text = f"{int(percent_sim)}%"
-                 
-             item_similarity = QStandardItem(similarity_text)
-             item_similarity.setData(percent_sim, Qt.UserRole + 4)
-             item_similarity.setTextAlignment(Qt.AlignCenter)
-             item_group_id = QStandardItem(group_id)
-             
-             item_representative.setFlags(item_representative.flags() & ~Qt.ItemIsEditable)
-             item_member.setFlags(item_member.flags() & ~Qt.ItemIsEditable)
-             item_similarity.setFlags(item_similarity.flags() & ~Qt.ItemIsEditable)
-             item_group_id.setFlags(item_group_id.flags() & ~Qt.ItemIsEditable)
-             
-             # 체크박스 아이템을 맨 앞에 추가
-             row_items = [item_checkbox, item_rank, item_representative, item_member, item_similarity, item_group_id]
-             print(f"[TableDebug] Adding row with {len(row_items)} items: {row_items[0]}, {row_items[1]}, ...")
-             mw.duplicate_table_model.appendRow(row_items)
-             print(f"[TableDebug] Row added to table model. Current row count: {mw.duplicate_table_model.rowCount()}")
+             transform_label = TRANSFORM_LABELS.get(transforms.get(mem_path))
+             if transform_label and group_id not in same_file_group_ids:
+                 # 회전/반전된 사본은 변환 종류를 덧붙여 표시
+                 similarity_text += f" ({transform_label})"
+
+             table_ranks.append(rank)
+             table_reps.append(rep_path)
+             table_members.append(mem_path)
+             table_similarities.append(percent_sim)
+             table_texts.append(similarity_text)
+             table_group_ids.append(group_id)
+        mw.duplicate_table_model.set_rows(table_ranks, table_reps, table_members, table_similarities, table_texts, table_group_ids)
+        mw._update_batch_buttons_state()  # 테이블을 다시 채우면 체크 상태도 모두 해제됨
         # --- 테이블 채우기 로직 수정 끝 ---
 
         if mw.duplicate_table_model.rowCount() > 0:
@@ -149,6 +187,7 @@ class ScanResultProcessor:
             # 첫 행 클릭 이벤트 발생 (MainWindow 메서드 호출)
             mw.on_table_item_clicked(mw.duplicate_table_proxy_model.index(0, 0)) 
         else:
+            mw.group_grid_view.clear_group()
             mw.left_image_label.clear()
             mw.left_info_label.setText("Image Info")
             mw.right_image_label.clear()
@@ -1,35 +1,39 @@
 from PyQt5.QtCore import QModelIndex, Qt, QSortFilterProxyModel
 
 class SimilaritySortProxyModel(QSortFilterProxyModel):
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder):
+        """
+        정렬은 소스 모델(DuplicateTableModel)이 열 배열로 직접 수행하고, 프록시는 소스 순서를 그대로 보여줍니다.
+        행이 많을 때 lessThan()을 비교마다 파이썬으로 호출하지 않기 위함입니다.
+        """
+        source_model = self.sourceModel()
+        if source_model is None or not hasattr(source_model, 'sort_value'):
+            super().sort(column, order)
+            return
+        super().sort(-1)
+        source_model.sort(column, order)
+
     def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
         # --- 'Rank' 열 (인덱스 1) 또는 'Similarity' 열 (인덱스 4) 정렬 처리 --- 
+        # left/right는 소스 모델 인덱스이며, 값은 소스 모델의 열 배열에서 바로 읽음 (비교마다 data() 호출 안 함)
         column = left.column()
         if column == 1: # 'Rank' 열
-            left_rank_index = self.sourceModel().index(self.mapToSource(left).row(), 1)
-            right_rank_index = self.sourceModel().index(self.mapToSource(right).row(), 1)
-            left_data = self.sourceModel().data(left_rank_index, Qt.UserRole + 6) # Rank 데이터는 Role +6
-            right_data = self.sourceModel().data(right_rank_index, Qt.UserRole + 6)
             # 'Rank' 열은 오름차순 (작은 번호 먼저)
             sort_order_multiplier = 1 
         elif column == 4: # 'Similarity' 열
-            left_sim_index = self.sourceModel().index(self.mapToSource(left).row(), 4)
-            right_sim_index = self.sourceModel().index(self.mapToSource(right).row(), 4)
-            left_data = self.sourceModel().data(left_sim_index, Qt.UserRole + 4)
-            right_data = self.sourceModel().data(right_sim_index, Qt.UserRole + 4)
             # 'Similarity' 열은 내림차순 (높은 퍼센트 먼저)
             sort_order_multiplier = -1 
         else:
             # 다른 열은 기본 정렬
             return super().lessThan(left, right)
+        left_data = self.sourceModel().sort_value(left.row(), column)
+        right_data = self.sourceModel().sort_value(right.row(), column)
             
         # 데이터 유효성 검사 및 숫자 비교 (기존 로직 유지)
-        try:
-            if left_data is None and right_data is None: return False
-            if left_data is None: return True 
-            if right_data is None: return False 
-            return sort_order_multiplier * float(left_data) < sort_order_multiplier * float(right_data)
-        except (ValueError, TypeError):
-            return super().lessThan(left, right)
+        if left_data is None and right_data is None: return False
+        if left_data is None: return True 
+        if right_data is None: return False 
+        return sort_order_multiplier * left_data < sort_order_multiplier * right_data
             
     def flags(self, index: QModelIndex) -> Qt.ItemFlags:
         """체크박스 열(첫 번째 열)은 체크 가능하게 설정하고 나머지 열은 읽기 전용으로 설정"""
@@ -0,0 +1,158 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+from PyQt5.QtGui import QImage, QIcon, QPixmap
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QBuffer, QByteArray, QIODevice, pyqtSignal
+from supported_formats import THUMBNAIL_SIZE, THUMBNAIL_JPEG_QUALITY, THUMBNAIL_LOADER_THREADS
+from thumbnail_cache import ThumbnailCache, shared_thumbnail_cache
+from .preview_loader import decode_preview
+
+def read_cached_thumbnail(file_path: str, cache: ThumbnailCache) -> Optional[QImage]:
+    """디스크 캐시에 있는 썸네일만 읽습니다 (원본은 디코딩하지 않으므로 GUI 스레드에서 바로 호출 가능, 없으면 None)"""
+    cached_path = cache.get(file_path)
+    if cached_path is None:
+        return None
+    image = QImage(cached_path)
+    return None if image.isNull() else image
+
+def load_thumbnail(file_path: str, cache: ThumbnailCache, size: int = THUMBNAIL_SIZE) -> Optional[QImage]:
+    """
+    썸네일을 디스크 캐시에서 읽고, 없으면 원본을 size 크기로 디코딩해 캐시에 저장한 뒤 반환합니다 (실패 시 None).
+    QPixmap을 만들지 않으므로 작업자 스레드에서 호출해도 안전합니다.
+    """
+    key = cache.cache_key(file_path)
+    if key is None:
+        return None
+    image = read_cached_thumbnail(file_path, cache)
+    if image is not None:
+        return image
+
+    result = decode_preview(file_path, size)
+    if result.image is None:
+        return None
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    if result.image.save(buffer, cache.image_format, THUMBNAIL_JPEG_QUALITY):
+        cache.put_bytes(file_path, bytes(data), key)
+    buffer.close()
+    return result.image
+
+class _ThumbnailTaskSignals(QObject):
+    finished = pyqtSignal(str, object)  # (파일 경로, QImage 또는 None)
+
+class _ThumbnailTask(QRunnable):
+    """스레드 풀에서 썸네일 하나를 캐시에서 읽거나 새로 만드는 작업"""
+
+    def __init__(self, file_path: str, cache: ThumbnailCache, signals: _ThumbnailTaskSignals, started: Set[str],
+                 cached_only: bool = False, scale_to: Optional[int] = None):
+        super().__init__()
+        self.file_path = file_path
+        self.cache = cache
+        self.signals = signals
+        self.started = started
+        self.cached_only = cached_only
+        self.scale_to = scale_to
+
+    def run(self):
+        self.started.add(self.file_path)
+        try:
+            if self.cached_only:
+                image = read_cached_thumbnail(self.file_path, self.cache)
+            else:
+                image = load_thumbnail(self.file_path, self.cache)
+            if image is not None and self.scale_to:
+                image = image.scaled(self.scale_to, self.scale_to, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        except Exception as e:
+            print(f"썸네일 로드 오류: {self.file_path} - {e}")
+            image = None
+        self.signals.finished.emit(self.file_path, image)
+
+class ThumbnailLoader(QObject):
+    """
+    그룹 썸네일 보기용 로더. 디스크 썸네일 캐시를 QThreadPool에서 읽거나 채우고, 결과 QImage를 시그널로 넘깁니다.
+    cached_only이면 디스크 캐시만 읽고 원본은 디코딩하지 않으며, scale_to가 있으면 작업자 스레드에서 그 크기로 줄입니다.
+    대기 목록은 GUI 스레드에서만 다룹니다.
+    """
+    thumbnail_ready = pyqtSignal(str, object)  # (파일 경로, QImage 또는 실패 시 None)
+
+    def __init__(self, parent: Optional[QObject] = None, cache: Optional[ThumbnailCache] = None,
+                 max_threads: int = THUMBNAIL_LOADER_THREADS, cached_only: bool = False,
+                 scale_to: Optional[int] = None):
+        super().__init__(parent)
+        self.cache = cache or shared_thumbnail_cache()
+        self.cached_only = cached_only
+        self.scale_to = scale_to
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, max_threads))
+        self.pending: Dict[str, bool] = {}  # 대기 중이거나 디코딩 중인 파일 경로
+        self.started: Set[str] = set()  # 작업자 스레드가 시작한 파일 경로
+        self.signals = _ThumbnailTaskSignals(self)
+        self.signals.finished.connect(self._on_task_finished)
+
+    def request(self, file_path: str, priority: int = 0):
+        """썸네일을 요청합니다. 준비되면 thumbnail_ready 시그널이 발생합니다 (이미 대기 중이면 무시)."""
+        if not file_path or file_path in self.pending:
+            return
+        self.pending[file_path] = True
+        self.pool.start(_ThumbnailTask(file_path, self.cache, self.signals, self.started,
+                                       self.cached_only, self.scale_to), priority)
+
+    def cancel_pending(self):
+        """아직 시작하지 않은 작업을 취소합니다 (다른 그룹으로 넘어갈 때)"""
+        self.pool.clear()
+        for file_path in list(self.pending):
+            if file_path not in self.started:
+                del self.pending[file_path]
+
+    def _on_task_finished(self, file_path: str, image: Optional[QImage]):
+        self.pending.pop(file_path, None)
+        self.started.discard(file_path)
+        self.thumbnail_ready.emit(file_path, image)
+
+class ThumbnailIconCache(QObject):
+    """
+    결과 테이블에 표시할 작은 썸네일 아이콘.
+    디스크 캐시에 이미 있는 썸네일(스캔 중 저장된 것 등)만 별도 ThumbnailLoader의 스레드 풀에서 읽고, 원본은 디코딩하지 않습니다.
+    icon()은 GUI 스레드에서 기다리지 않고 아직 없는 아이콘은 요청만 한 뒤 None을 반환하며, 아이콘이 준비되면 icon_ready 시그널이 발생합니다.
+    캐시에 없는 파일도 None으로 기억해 다시 읽지 않습니다 (새 스캔의 clear() 또는 forget_missing()으로 다시 시도).
+    """
+    icon_ready = pyqtSignal(str)  # 아이콘이 준비된 파일 경로
+
+    def __init__(self, icon_size: int, cache: Optional[ThumbnailCache] = None, max_icons: int = 2000,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.icon_size = icon_size
+        self.max_icons = max_icons
+        self.icons: "OrderedDict[str, Optional[QIcon]]" = OrderedDict()  # 파일 경로 -> 아이콘 (캐시에 없으면 None)
+        self.loader = ThumbnailLoader(self, cache, cached_only=True, scale_to=icon_size)
+        self.loader.thumbnail_ready.connect(self._on_thumbnail_ready)
+
+    def icon(self, file_path: str) -> Optional[QIcon]:
+        if file_path in self.icons:
+            self.icons.move_to_end(file_path)
+            return self.icons[file_path]
+        self.loader.request(file_path)
+        return None
+
+    def _on_thumbnail_ready(self, file_path: str, image: Optional[QImage]):
+        icon = QIcon(QPixmap.fromImage(image)) if image is not None else None
+        self.icons[file_path] = icon
+        self.icons.move_to_end(file_path)
+        if len(self.icons) > self.max_icons:
+            self.icons.popitem(last=False)
+        if icon is not None:
+            self.icon_ready.emit(file_path)
+
+    def forget_missing(self, file_path: str, image: Optional[QImage] = None):
+        """캐시에 없다고 기억한 파일의 썸네일이 나중에 저장되었을 때 (그룹 썸네일 보기 등) 다시 읽도록 합니다."""
+        if file_path in self.icons and self.icons[file_path] is None and image is not None:
+            del self.icons[file_path]
+            self.icon_ready.emit(file_path)
+
+    def discard(self, file_path: str):
+        """파일이 이동/삭제되어 아이콘을 더 쓰지 않을 때"""
+        self.icons.pop(file_path, None)
+
+    def clear(self):
+        self.loader.cancel_pending()
+        self.icons.clear()
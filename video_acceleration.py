@@ -0,0 +1,210 @@
+"""
+Numba/CUDA로 최적화된 프레임 계산 함수 모음.
+numba 임포트와 CUDA 장치 확인은 수백 ms가 걸리므로, 이 모듈은 video_processor에서
+처음 프레임 계산이 필요할 때만 불러옵니다.
+
+Numba 커널은 소스 파일이 있으면 cache=True로 컴파일 결과를 디스크(__pycache__)에 저장하므로 두 번째 실행부터는
+컴파일 없이 불러옵니다 (PyInstaller 빌드처럼 .py 없이 .pyc만 있으면 캐시 위치를 찾을 수 없으므로 캐시 없이 컴파일).
+warm_up()은 스캔 시작 시 백그라운드 스레드에서 호출되며,
+워밍업이 끝나기 전이나 Numba를 쓸 수 없을 때는 NumPy 경로를 사용합니다.
+"""
+import os
+import threading
+import time
+import numpy as np
+try:
+    from numba import njit, prange, cuda
+    NUMBA_AVAILABLE = True
+    # CUDA 지원 확인
+    CUDA_AVAILABLE = cuda.is_available()
+    if CUDA_AVAILABLE:
+        print("CUDA 가속을 사용할 수 있습니다.")
+    else:
+        print("CUDA를 사용할 수 없습니다. CPU로 실행됩니다.")
+except ImportError:
+    NUMBA_AVAILABLE = False
+    CUDA_AVAILABLE = False
+    print("Numba 라이브러리를 찾을 수 없습니다. 최적화 없이 실행됩니다.")
+
+# Numba 디스크 캐시는 소스 파일 위치를 기준으로 하므로, 소스가 없으면 (cache=True가 데코레이터에서 RuntimeError) 캐시하지 않음
+NUMBA_CACHE = os.path.isfile(os.path.splitext(__file__)[0] + '.py')
+
+# Numba JIT 컴파일된 최적화 함수
+if NUMBA_AVAILABLE:
+    try:
+        # 16x16 프레임 한 쌍은 스레드 분배 비용이 계산보다 크므로 병렬화하지 않음
+        @njit(cache=NUMBA_CACHE)
+        def calculate_similarity_numba(frame1, frame2):
+            """Numba로 최적화된 프레임 유사도 계산 함수"""
+            height, width = frame1.shape
+            total_diff = 0.0
+        
+            for i in range(height):
+                for j in range(width):
+                    total_diff += abs(float(frame1[i, j]) - float(frame2[i, j]))
+            
+            avg_diff = total_diff / (height * width)
+            return 100.0 * (1.0 - (avg_diff / 255.0))
+
+        @njit(parallel=True, cache=NUMBA_CACHE)
+        def batch_similarity_numba(query, candidates):
+            """
+            시그니처 하나(F, H, W)를 여러 시그니처(N, F, H, W)와 한 번에 비교하는 커널.
+            후보 단위로 병렬 처리하며 (N, F) 프레임별 유사도를 반환합니다.
+            """
+            count, frame_count, height, width = candidates.shape
+            result = np.empty((count, frame_count))
+            for k in prange(count):
+                for f in range(frame_count):
+                    total_diff = 0.0
+                    for i in range(height):
+                        for j in range(width):
+                            total_diff += abs(float(query[f, i, j]) - float(candidates[k, f, i, j]))
+                    avg_diff = total_diff / (height * width)
+                    result[k, f] = 100.0 * (1.0 - (avg_diff / 255.0))
+            return result
+
+        @njit(cache=NUMBA_CACHE)
+        def flip_frame_numba(frame):
+            """Numba로 최적화된 프레임 반전 함수"""
+            height, width = frame.shape
+            flipped = np.empty_like(frame)
+        
+            for i in range(height):
+                for j in range(width):
+                    flipped[i, j] = frame[i, width - j - 1]
+                
+            return flipped
+
+        # CUDA 최적화 함수들 (GPU 사용 가능한 경우)
+        if CUDA_AVAILABLE:
+            @cuda.jit
+            def calculate_diff_cuda(frame1, frame2, result):
+                """CUDA로 최적화된 프레임 차이 계산 커널"""
+                i, j = cuda.grid(2)
+                if i < frame1.shape[0] and j < frame1.shape[1]:
+                    result[i, j] = abs(float(frame1[i, j]) - float(frame2[i, j]))
+                
+            @cuda.jit
+            def flip_frame_cuda(frame, result):
+                """CUDA로 최적화된 프레임 반전 커널"""
+                i, j = cuda.grid(2)
+                if i < frame.shape[0] and j < frame.shape[1]:
+                    result[i, j] = frame[i, frame.shape[1] - j - 1]
+        
+            def calculate_similarity_cuda(frame1, frame2):
+                """CUDA를 사용한 프레임 유사도 계산"""
+                height, width = frame1.shape
+            
+                # GPU 메모리 할당
+                d_frame1 = cuda.to_device(frame1)
+                d_frame2 = cuda.to_device(frame2)
+                d_result = cuda.device_array((height, width), dtype=np.float32)
+            
+                # 그리드 및 블록 크기 계산
+                threads_per_block = (16, 16)
+                blocks_per_grid_x = (height + threads_per_block[0] - 1) // threads_per_block[0]
+                blocks_per_grid_y = (width + threads_per_block[1] - 1) // threads_per_block[1]
+                blocks_per_grid = (blocks_per_grid_x, blocks_per_grid_y)
+            
+                # 커널 실행
+                calculate_diff_cuda[blocks_per_grid, threads_per_block](d_frame1, d_frame2, d_result)
+            
+                # 결과를 호스트로 복사
+                result = d_result.copy_to_host()
+            
+                # 평균 계산
+                avg_diff = np.mean(result)
+                similarity = 100.0 * (1.0 - (avg_diff / 255.0))
+            
+                return similarity
+            
+            def flip_frame_cuda_wrapper(frame):
+                """CUDA를 사용한 프레임 반전"""
+                height, width = frame.shape
+            
+                # GPU 메모리 할당
+                d_frame = cuda.to_device(frame)
+                d_result = cuda.device_array((height, width), dtype=frame.dtype)
+            
+                # 그리드 및 블록 크기 계산
+                threads_per_block = (16, 16)
+                blocks_per_grid_x = (height + threads_per_block[0] - 1) // threads_per_block[0]
+                blocks_per_grid_y = (width + threads_per_block[1] - 1) // threads_per_block[1]
+                blocks_per_grid = (blocks_per_grid_x, blocks_per_grid_y)
+            
+                # 커널 실행
+                flip_frame_cuda[blocks_per_grid, threads_per_block](d_frame, d_result)
+            
+                # 결과를 호스트로 복사
+                result = d_result.copy_to_host()
+            
+                return result
+    except Exception as e:
+        # 커널을 만들 수 없으면 (캐시 위치 오류 등) Numba/CUDA 없이 NumPy로 계산
+        NUMBA_AVAILABLE = False
+        CUDA_AVAILABLE = False
+        print(f"Numba 커널을 만들 수 없습니다. 최적화 없이 실행됩니다: {e}")
+
+# 이 후보 수 미만이면 NumPy 경로가 더 빠름 (병렬 커널 시작 비용, benchmark_frame_similarity.py로 측정)
+NUMBA_BATCH_MIN_CANDIDATES = 128
+
+_warm_up_done = threading.Event()
+_warm_up_lock = threading.Lock()
+_numba_batch_failed = False
+
+def batch_similarity_numpy(query, candidates):
+    """batch_similarity_numba와 같은 결과를 내는 NumPy 구현 (정수 차이 합이므로 값이 정확히 같음)"""
+    height, width = query.shape[-2:]
+    total_diff = np.abs(candidates.astype(np.int16) - query.astype(np.int16)).sum(axis=(2, 3), dtype=np.int64)
+    avg_diff = total_diff / (height * width)
+    return 100.0 * (1.0 - (avg_diff / 255.0))
+
+def warm_up():
+    """Numba 커널을 작은 입력으로 한 번 호출해 컴파일(또는 디스크 캐시 로드)합니다. 여러 번 호출해도 한 번만 수행됩니다."""
+    global _numba_batch_failed
+    with _warm_up_lock:
+        if _warm_up_done.is_set():
+            return
+        if NUMBA_AVAILABLE:
+            start = time.perf_counter()
+            try:
+                frame = np.zeros((4, 4), dtype=np.uint8)
+                calculate_similarity_numba(frame, frame)
+                flip_frame_numba(frame)
+                batch_similarity_numba(np.zeros((2, 4, 4), dtype=np.uint8), np.zeros((2, 2, 4, 4), dtype=np.uint8))
+                print(f"Numba 커널 준비 완료: {time.perf_counter() - start:.2f}초")
+            except Exception as e:
+                _numba_batch_failed = True
+                print(f"Numba 커널 컴파일 실패, NumPy로 계산합니다: {e}")
+        _warm_up_done.set()
+
+def similarity_numpy(frame1, frame2):
+    """calculate_similarity_numba와 같은 결과를 내는 NumPy 구현"""
+    diff = np.abs(frame1.astype(float) - frame2.astype(float)).mean()
+    return 100.0 * (1.0 - (diff / 255.0))
+
+def frame_similarity(frame1, frame2):
+    """
+    프레임 한 쌍의 유사도를 계산합니다 (0-100%).
+    Numba 커널이 준비되었을 때만 Numba를 사용하고 (호출한 스레드에서 컴파일하지 않음), 그 외에는 NumPy로 계산합니다.
+    """
+    if NUMBA_AVAILABLE and not _numba_batch_failed and _warm_up_done.is_set():
+        try:
+            return calculate_similarity_numba(frame1, frame2)
+        except Exception as e:
+            print(f"Numba 유사도 계산 오류, NumPy로 계산합니다: {e}")
+    return similarity_numpy(frame1, frame2)
+
+def batch_frame_similarities(query, candidates):
+    """
+    시그니처 하나를 여러 시그니처와 비교해 (N, F) 프레임별 유사도를 반환합니다.
+    Numba 커널이 준비되었고 후보가 충분히 많을 때만 Numba를 사용하고, 그 외에는 NumPy로 계산합니다.
+    """
+    if (NUMBA_AVAILABLE and not _numba_batch_failed and _warm_up_done.is_set()
+            and len(candidates) >= NUMBA_BATCH_MIN_CANDIDATES):
+        try:
+            return batch_similarity_numba(query, candidates)
+        except Exception as e:
+            print(f"Numba 일괄 유사도 계산 오류, NumPy로 계산합니다: {e}")
+    return batch_similarity_numpy(query, candidates)
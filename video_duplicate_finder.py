@@ -1,15 +1,37 @@
 import os
 import numpy as np
-import platform
-import ctypes
 from video_processor import VideoProcessor
+from same_file_finder import SameFileFinder
+from video_signature_extractor import VideoSignatureExtractor
+from video_hash_index import VideoHashSignature, HammingIndex
+from temporal_matcher import TemporalMatcher, compute_temporal_hashes
+from animation_reader import AnimationReader
+from cascaded_comparator import CascadedComparator
+from audio_fingerprint import AudioFingerprintIndex, extract_audio_fingerprint
+from dihedral import transforms_for_shape, variant_frames
 # 파일 형식 정의 모듈 임포트
-from supported_formats import VIDEO_ANIMATION_EXTENSIONS, VIDEO_SIMILARITY_THRESHOLD, FRAME_CHECK_FORMATS, VIDEO_ONLY_EXTENSIONS
+from supported_formats import (
+    VIDEO_ANIMATION_EXTENSIONS, VIDEO_SIMILARITY_THRESHOLD, FRAME_CHECK_FORMATS, VIDEO_ONLY_EXTENSIONS,
+    VIDEO_EXTRACT_WORKERS, VIDEO_EXTRACT_TIMEOUT, VIDEO_SIGNATURE_FORMAT, VIDEO_HASH_MAX_DISTANCE,
+    VIDEO_TEMPORAL_MATCHING, VIDEO_TEMPORAL_INTERVAL, VIDEO_TEMPORAL_MAX_SAMPLES, VIDEO_CONTAINMENT_MATCHING,
+    VIDEO_FINGERPRINT_TIMEOUT,
+    VIDEO_EARLY_EXIT_COMPARISON, VIDEO_BATCH_COMPARISON,
+    VIDEO_AUDIO_MATCHING, VIDEO_AUDIO_MATCH_THRESHOLD, VIDEO_AUDIO_BORDERLINE_MARGIN, VIDEO_AUTO_CROP,
+    VIDEO_ROTATION_MATCHING
+)
 
 class VideoDuplicateFinder:
     """비디오 중복을 찾기 위한 클래스"""
     
-    def __init__(self, frame_positions=None, similarity_threshold=None, output_size=(16, 16)):
+    # 시그니처 형식
+    SIGNATURE_FRAMES = 'frames'  # 16x16 프레임 원본 (모든 쌍을 픽셀 차이로 비교)
+    SIGNATURE_HASH = 'hash'  # 프레임별 64비트 DCT 해시로 후보 검색 + 16x16 프레임으로 검증 (프레임 형식과 같은 임계값)
+    
+    def __init__(self, frame_positions=None, similarity_threshold=None, output_size=(16, 16),
+                 max_workers=None, extract_timeout=None, use_process_pool=False,
+                 signature_format=None, hash_max_distance=None, temporal_matching=None,
+                 containment_matching=None, early_exit=None, batch_comparison=None,
+                 audio_matching=None, auto_crop=None, rotation_matching=None):
         """
         비디오 중복 찾기 엔진을 초기화합니다.
         
@@ -17,6 +39,18 @@ class VideoDuplicateFinder:
             frame_positions: 비디오의 위치 백분율 목록 (기본값은 5개 지점)
             similarity_threshold: 중복으로 간주할 유사도 임계값 (기본값 85%)
             output_size: 추출할 프레임의 크기 (기본값 16x16)
+            max_workers: 시그니처 추출 작업자 프로세스 수 (기본값 VIDEO_EXTRACT_WORKERS, 0이면 자동)
+            extract_timeout: 파일 하나당 시그니처 추출 제한 시간(초) (기본값 VIDEO_EXTRACT_TIMEOUT)
+            use_process_pool: find_duplicates에서 프로세스 풀로 시그니처를 추출할지 여부
+            signature_format: 시그니처 형식 (SIGNATURE_FRAMES 또는 SIGNATURE_HASH, 기본값 VIDEO_SIGNATURE_FORMAT)
+            hash_max_distance: 해시 형식에서 후보로 볼 시퀀스 해시의 최대 해밍 거리 (기본값 VIDEO_HASH_MAX_DISTANCE)
+            temporal_matching: 초 단위 시간축 지문으로 앞/뒤가 잘린 복사본도 찾을지 여부 (기본값 VIDEO_TEMPORAL_MATCHING)
+            containment_matching: 긴 비디오의 일부 구간에 포함된 짧은 클립도 찾을지 여부 (기본값 VIDEO_CONTAINMENT_MATCHING)
+            early_exit: 임계값에 닿을 수 없는 쌍은 프레임 비교를 도중에 멈출지 여부 (기본값 VIDEO_EARLY_EXIT_COMPARISON)
+            batch_comparison: 크기가 같은 시그니처를 배열로 묶어 한 비디오를 여러 비디오와 한 번에 비교할지 여부 (기본값 VIDEO_BATCH_COMPARISON)
+            audio_matching: 오디오 지문으로 후보 쌍을 찾고 화면 유사도가 경계에 걸린 쌍을 확인할지 여부 (기본값 VIDEO_AUDIO_MATCHING)
+            auto_crop: 레터박스/필러박스 검은 띠를 찾아 실제 영상 영역으로 시그니처를 만들지 여부 (기본값 VIDEO_AUTO_CROP)
+            rotation_matching: 수평 반전 외에 회전(90/180/270도)과 나머지 반전 변환도 비교할지 여부 (기본값 VIDEO_ROTATION_MATCHING)
         """
         self.video_processor = VideoProcessor()
         self.frame_positions = frame_positions or [10, 30, 50, 70, 90]  # 비디오 길이의 퍼센트 위치
@@ -24,7 +58,48 @@ class VideoDuplicateFinder:
         self.similarity_threshold = similarity_threshold or 92.0  # 기본값 상향 조정
         self.output_size = output_size
         self.cache = {}  # 파일 경로 -> 시그니처 캐시
-        self.current_os = platform.system()
+        self.rotation_matching = VIDEO_ROTATION_MATCHING if rotation_matching is None else rotation_matching
+        self.variant_cache = {}  # 파일 경로 -> {변환 이름: 변환된 시그니처} 캐시 (비디오당 한 번만 계산)
+        self.transforms = {}  # 마지막 find_duplicates에서 회전/반전된 사본으로 찾은 파일 경로 -> 대표 비디오 기준 변환
+        self.same_file_finder = SameFileFinder()
+        self.same_file_groups = []  # 마지막 find_duplicates에서 발견된 같은 파일 그룹
+        self.failed_files = {}  # 파일 경로 -> 시그니처 추출 실패 사유
+        self.animation_infos = {}  # 파일 경로 -> 분류 단계에서 미리 샘플링한 AnimationInfo (파일 재열기 방지)
+        self.animation_headers = {}  # 파일 경로 -> 분류 단계에서 헤더만 읽어 애니메이션으로 확인된 AnimationHeader
+        self.use_process_pool = use_process_pool
+        self.max_workers = VIDEO_EXTRACT_WORKERS if max_workers is None else max_workers
+        self.extract_timeout = VIDEO_EXTRACT_TIMEOUT if extract_timeout is None else extract_timeout
+        self.signature_format = signature_format or VIDEO_SIGNATURE_FORMAT
+        self.hash_max_distance = VIDEO_HASH_MAX_DISTANCE if hash_max_distance is None else hash_max_distance
+        self.hash_cache = {}  # 파일 경로 -> VideoHashSignature (해시 형식에서만 사용)
+        self.temporal_matching = VIDEO_TEMPORAL_MATCHING if temporal_matching is None else temporal_matching
+        self.temporal_interval = VIDEO_TEMPORAL_INTERVAL
+        self.temporal_cache = {}  # 파일 경로 -> (초 단위 프레임 해시 배열, 유효 샘플 bool 배열)
+        self.temporal_matches = []  # 마지막 find_duplicates에서 시간축 정렬로 찾은 쌍 (TemporalMatch.to_dict 목록)
+        self.containment_matching = VIDEO_CONTAINMENT_MATCHING if containment_matching is None else containment_matching
+        self.containments = []  # 마지막 find_duplicates에서 찾은 클립 포함 관계 (TemporalMatch.to_containment_dict 목록)
+        self.early_exit = VIDEO_EARLY_EXIT_COMPARISON if early_exit is None else early_exit
+        # 중복 판정은 전체 비교와 같고, 건너뛴 프레임 수는 comparator.frames_skipped에 기록됨
+        self.comparator = CascadedComparator(
+            self.video_processor.calculate_frame_similarity, self.similarity_threshold
+        )
+        self.batch_comparison = VIDEO_BATCH_COMPARISON if batch_comparison is None else batch_comparison
+        self.audio_matching = VIDEO_AUDIO_MATCHING if audio_matching is None else audio_matching
+        self.audio_cache = {}  # 파일 경로 -> AudioFingerprint (오디오가 없거나 무음이면 None)
+        self.audio_pairs = {}  # frozenset({경로1, 경로2}) -> 오디오 유사도 (마지막 find_duplicates에서 오디오가 같은 쌍)
+        self.audio_matches = []  # 마지막 find_duplicates에서 오디오로 확인되어 중복으로 인정된 쌍
+        self.auto_crop = VIDEO_AUTO_CROP if auto_crop is None else auto_crop
+        self.crop_boxes = {}  # 파일 경로 -> 시그니처 추출 시 찾은 실제 영상 영역 CropBox (시간축 지문에도 재사용)
+        # 임계값 재그룹화(regroup)용 마지막 find_duplicates 기록: 그룹화 순서, 중복으로 인정된 쌍의 (유사도, 변환), 시간축 일치
+        self.grouping_order = []
+        self.pair_similarities = {}  # (앞 경로, 뒤 경로) -> (유사도, 변환 이름 또는 None)
+        self.scan_claims = {}  # 그룹에 속한 파일 경로 -> 그 파일을 묶은 대표의 그룹화 순서 번호 (스캔에서 비교하지 않은 쌍 판단용)
+        self.regroup_similarities = {}  # 재그룹화에서 새로 비교한 (앞 경로, 뒤 경로) -> (유사도, 변환 이름 또는 None)
+        self.hash_index = None  # 해시 형식 스캔의 시퀀스 해시 인덱스 (재그룹화 후보 검색에 재사용)
+        self.audio_partners = {}  # 경로 -> 오디오가 같은 경로 집합 (해시 인덱스 후보에 추가)
+        self._regroup_block = None  # 재그룹화 일괄 비교용 시그니처 배열 (처음 필요할 때 생성)
+        self.trimmed_matches = []
+        self.contained_matches = []
         
     def is_video_file(self, file_path):
         """파일이 지원되는 비디오 형식인지 확인합니다"""
@@ -39,92 +114,204 @@ class VideoDuplicateFinder:
         
     def get_file_id(self, file_path):
         """파일의 고유 ID를 가져옵니다 (하드링크 감지용)"""
-        try:
-            if self.current_os == 'Windows':
-                # Windows에서 파일 ID 가져오기
-                file_id = os.stat(file_path).st_ino
-                if file_id == 0:  # Windows에서 st_ino가 0인 경우가 많아 추가 확인
-                    file_handle = ctypes.windll.kernel32.CreateFileW(
-                        file_path, 0, 0, None, 3, 0, None
-                    )
-                    if file_handle != -1:
-                        file_info = ctypes.create_string_buffer(32)
-                        result = ctypes.windll.kernel32.GetFileInformationByHandle(
-                            file_handle, file_info
-                        )
-                        ctypes.windll.kernel32.CloseHandle(file_handle)
-                        if result:
-                            # 볼륨 일련번호와 파일 인덱스 조합으로 ID 생성
-                            vol_sn = int.from_bytes(file_info[0:4], byteorder='little')
-                            index_high = int.from_bytes(file_info[8:12], byteorder='little')
-                            index_low = int.from_bytes(file_info[12:16], byteorder='little')
-                            return f"{vol_sn}:{index_high}{index_low}"
-                return file_id
-            else:
-                # Unix 계열에서는 inode와 장치 ID 조합
-                stat_info = os.stat(file_path)
-                return f"{stat_info.st_dev}:{stat_info.st_ino}"
-        except Exception as e:
-            print(f"파일 ID 가져오기 오류: {e}")
-            return None
+        return self.same_file_finder.get_file_id(file_path)
             
     def is_same_file(self, path1, path2):
         """두 경로가 동일한 파일(하드링크)인지 확인합니다"""
-        if path1 == path2:
-            return True
-            
-        # 파일 실제 경로 비교 (심볼릭 링크 해결)
-        try:
-            real_path1 = os.path.realpath(path1)
-            real_path2 = os.path.realpath(path2)
-            if real_path1 == real_path2:
-                return True
-        except Exception:
-            pass
+        return self.same_file_finder.is_same_file(path1, path2)
+        
+    def set_animation_info(self, video_path, animation_info):
+        """
+        파일 분류 단계에서 AnimationReader로 읽은 결과를 넘겨받습니다.
+        샘플 프레임이 있으면 시그니처 추출 시 파일을 다시 열지 않고 그대로 사용합니다.
+        """
+        if animation_info is not None and animation_info.frames:
+            self.animation_infos[video_path] = animation_info
+        
+    def set_animation_header(self, video_path, animation_header):
+        """
+        파일 분류 단계에서 헤더만 읽어 애니메이션으로 판정된 파일의 헤더 정보를 넘겨받습니다.
+        시그니처 추출 시 Pillow로 한 번만 열어 헤더의 프레임 수로 바로 샘플링합니다.
+        """
+        self.animation_headers[video_path] = animation_header
+        
+    def extract_signature(self, video_path):
+        """
+        캐시를 사용하지 않고 비디오 시그니처를 추출합니다.
+        
+        반환값:
+            (프레임 목록, None) 또는 실패 시 (None, 실패 사유)
+        """
+        if not self.is_video_file(video_path):
+            return None, VideoSignatureExtractor.FAIL_NOT_VIDEO
             
-        # 파일 ID로 비교 (하드링크)
-        id1 = self.get_file_id(path1)
-        id2 = self.get_file_id(path2)
+        # 분류 단계에서 미리 샘플링한 애니메이션 프레임이 있으면 사용 (한 번 사용 후 메모리 해제)
+        animation_info = self.animation_infos.pop(video_path, None)
+        animation_header = self.animation_headers.pop(video_path, None)
+        if animation_info is None and animation_header is not None:
+            animation_info = AnimationReader().read(
+                video_path, self.frame_positions, self.output_size, header=animation_header
+            )
+        if animation_info is not None:
+            frames = animation_info.frames
+        else:
+            # 여러 위치에서 프레임 추출
+            frames, crop_box = self.video_processor.extract_frames_with_crop(
+                video_path, 
+                self.frame_positions,
+                self.output_size,
+                auto_crop=self.auto_crop
+            )
+            if crop_box is not None:
+                self.crop_boxes[video_path] = crop_box
         
-        if id1 and id2 and id1 == id2:
-            print(f"하드링크 감지: {os.path.basename(path1)} <-> {os.path.basename(path2)}")
-            return True
+        # 프레임을 하나도 얻지 못한 경우 비디오 스트림 유무로 사유 구분
+        if not frames:
+            print(f"프레임 추출 실패: {os.path.basename(video_path)}")
+            if self.video_processor.has_video_stream(video_path) is False:
+                return None, VideoSignatureExtractor.FAIL_NO_STREAM
+            return None, VideoSignatureExtractor.FAIL_DECODE_ERROR
+        
+        # 추출된 프레임이 너무 적으면 처리하지 않음
+        if len(frames) < 3:  # 최소 3개 이상의 프레임 필요
+            print(f"프레임이 충분하지 않습니다: {os.path.basename(video_path)}")
+            return None, VideoSignatureExtractor.FAIL_TOO_FEW_FRAMES
             
-        return False
+        # 너무 어두운 프레임 개수 확인
+        dark_frames = sum(1 for frame in frames if self.video_processor.is_frame_too_dark(frame))
+        if dark_frames > len(frames) / 2:  # 절반 이상의 프레임이 어두우면 처리하지 않음
+            print(f"비디오가 너무 어둡습니다: {os.path.basename(video_path)}")
+            return None, VideoSignatureExtractor.FAIL_TOO_DARK
+            
+        return frames, None
+        
+    def uses_temporal_signature(self):
+        """잘린 복사본 또는 클립 포함 검사에 시간축 지문이 필요한지 여부"""
+        return self.temporal_matching or self.containment_matching
+        
+    def extract_temporal_signature(self, video_path):
+        """
+        캐시를 사용하지 않고 시간축 지문(일정 간격마다의 64비트 프레임 해시)을 추출합니다.
+        
+        반환값:
+            (해시 배열, 유효 샘플 bool 배열) 또는 실패 시 None
+        """
+        frames = self.video_processor.extract_temporal_fingerprint(
+            video_path, self.temporal_interval, self.output_size, VIDEO_TEMPORAL_MAX_SAMPLES,
+            crop_box=self.crop_boxes.get(video_path)
+        )
+        if not frames:
+            return None
+        return compute_temporal_hashes(frames)
+        
+    def get_temporal_signature(self, video_path):
+        """캐시된 시간축 지문을 반환합니다. 없으면 추출하여 저장합니다."""
+        if video_path not in self.temporal_cache:
+            self.temporal_cache[video_path] = self.extract_temporal_signature(video_path)
+        return self.temporal_cache[video_path]
+        
+    def extract_audio_fingerprint(self, video_path):
+        """캐시를 사용하지 않고 오디오 지문을 추출합니다 (애니메이션 이미지는 오디오가 없으므로 None)"""
+        if os.path.splitext(video_path.lower())[1] in FRAME_CHECK_FORMATS:
+            return None
+        return extract_audio_fingerprint(video_path)
+        
+    def get_audio_fingerprint(self, video_path):
+        """캐시된 오디오 지문을 반환합니다. 없으면 추출하여 저장합니다."""
+        if video_path not in self.audio_cache:
+            self.audio_cache[video_path] = self.extract_audio_fingerprint(video_path)
+        return self.audio_cache[video_path]
         
     def get_video_signature(self, video_path):
         """
         비디오 파일의 시그니처(대표 프레임의 배열)를 생성합니다.
         캐싱을 통해 이미 처리된 비디오는 다시 처리하지 않습니다.
+        실패한 경우 사유를 self.failed_files에 기록하고 None을 반환합니다.
         """
         # 캐시에 있으면 캐시된 시그니처 반환
         if video_path in self.cache:
             return self.cache[video_path]
             
-        if not self.is_video_file(video_path):
+        frames, reason = self.extract_signature(video_path)
+        if frames is None:
+            self.failed_files[video_path] = reason
             return None
             
-        # 여러 위치에서 프레임 추출
-        frames = self.video_processor.extract_multiple_frames(
-            video_path, 
-            self.frame_positions,
-            self.output_size
-        )
+        self._store_signature(video_path, frames)
+        return frames
         
-        # 추출된 프레임이 없거나 너무 적으면 처리하지 않음
-        if not frames or len(frames) < 3:  # 최소 3개 이상의 프레임 필요
-            print(f"프레임이 충분하지 않습니다: {os.path.basename(video_path)}")
-            return None
-            
-        # 너무 어두운 프레임 개수 확인
-        dark_frames = sum(1 for frame in frames if self.video_processor.is_frame_too_dark(frame))
-        if dark_frames > len(frames) / 2:  # 절반 이상의 프레임이 어두우면 처리하지 않음
-            print(f"비디오가 너무 어둡습니다: {os.path.basename(video_path)}")
-            return None
-            
-        # 시그니처 캐싱
+    def _store_signature(self, video_path, frames):
+        """
+        시그니처를 캐시에 저장합니다. 회전/반전 시그니처도 이 시점에 한 번만 계산하여 함께 저장합니다.
+        해시 형식에서는 해시를 후보 검색에만 쓰고, 검증은 프레임 형식과 같은 원본 프레임으로 합니다
+        (축소한 프레임은 유사도가 높게 나와 같은 임계값을 쓸 수 없음).
+        """
+        if self.signature_format == self.SIGNATURE_HASH:
+            self.hash_cache[video_path] = VideoHashSignature.from_frames(frames, self._variant_names(frames))
         self.cache[video_path] = frames
-        return frames
+        self.variant_cache[video_path] = variant_frames(frames, self._variant_names(frames))
+        self.failed_files.pop(video_path, None)
+        
+    def extract_signatures(self, video_paths, progress_callback=None, should_stop=None):
+        """
+        아직 캐시에 없는 비디오들의 시그니처를 작업자 프로세스 풀에서 병렬로 추출해 캐시에 저장합니다.
+        파일마다 제한 시간이 적용되며, 실패한 파일은 사유와 함께 self.failed_files에 기록됩니다.
+        """
+        # 미리 샘플링된 애니메이션은 파일을 열 필요가 없으므로 작업자 프로세스로 보내지 않고 바로 처리
+        # (헤더만 읽은 애니메이션은 디코딩이 필요하므로 제한 시간이 적용되는 작업자 프로세스로 보냄)
+        for path in video_paths:
+            if path in self.animation_infos and path not in self.cache:
+                self.get_video_signature(path)
+        
+        pending = [path for path in video_paths
+                   if path not in self.failed_files and self.is_video_file(path)
+                   and (path not in self.cache
+                        or (self.uses_temporal_signature() and path not in self.temporal_cache)
+                        or (self.audio_matching and path not in self.audio_cache))]
+        if not pending:
+            return
+        extractor = VideoSignatureExtractor(
+            max_workers=self.max_workers,
+            timeout=self.extract_timeout,
+            frame_positions=self.frame_positions,
+            output_size=self.output_size,
+            temporal_matching=self.uses_temporal_signature(),
+            audio_matching=self.audio_matching,
+            auto_crop=self.auto_crop,
+            extras_timeout=VIDEO_FINGERPRINT_TIMEOUT
+        )
+        print(f"비디오 시그니처 병렬 추출 시작: {len(pending)}개 파일, 작업자 {extractor.max_workers}개, 제한 시간 {extractor.timeout}초")
+        animation_headers = {path: self.animation_headers.pop(path) for path in pending if path in self.animation_headers}
+        signatures, temporal_signatures, audio_fingerprints, crop_boxes, failures = extractor.extract_all(
+            pending, progress_callback, should_stop, animation_headers
+        )
+        self.crop_boxes.update(crop_boxes)
+        for path, frames in signatures.items():
+            self._store_signature(path, frames)
+            if self.uses_temporal_signature():
+                self.temporal_cache[path] = temporal_signatures.get(path)
+            if self.audio_matching:
+                self.audio_cache[path] = audio_fingerprints.get(path)
+        self.failed_files.update(failures)
+
+    def _variant_names(self, frames):
+        """원본과 비교할 변환 목록 (정사각형 프레임이고 rotation_matching이 켜져 있으면 7가지, 아니면 수평 반전만)"""
+        first_frame = next((frame for frame in frames if frame is not None), None)
+        shape = first_frame.shape if first_frame is not None else ()
+        return transforms_for_shape(shape, self.rotation_matching)
+        
+    def get_variant_signatures(self, video_path):
+        """캐시된 회전/반전 시그니처({변환 이름: 프레임 목록})를 반환합니다. 없으면 원본 시그니처에서 한 번 생성해 저장합니다."""
+        variants = self.variant_cache.get(video_path)
+        if variants is None:
+            frames = self.get_video_signature(video_path)
+            if frames is None:
+                return None
+            variants = self.variant_cache.get(video_path)
+            if variants is None:
+                variants = variant_frames(frames, self._variant_names(frames))
+                self.variant_cache[video_path] = variants
+        return variants
         
     def compare_signatures(self, sig1, sig2, path1=None, path2=None):
         """두 비디오 시그니처의 유사도를 비교합니다 (0-100% 범위)"""
@@ -150,75 +337,559 @@ class VideoDuplicateFinder:
         
         return avg_similarity
         
-    def compare_with_flipped(self, sig1, sig2, path1=None, path2=None):
-        """두 비디오 시그니처를 비교하고, 필요시 수평 반전하여 비교합니다"""
-        # 정상 비교
-        normal_similarity = self.compare_signatures(sig1, sig2, path1, path2)
+    def compare_with_variants(self, sig1, sig2, path1=None, path2=None, variants1=None):
+        """
+        두 비디오 시그니처를 비교하고, sig1을 회전/반전한 시그니처들과도 비교합니다.
         
-        # 수평 반전 비교
-        flipped_sig1 = self.video_processor.create_flipped_frames(sig1)
-        flipped_similarity = self.compare_signatures(flipped_sig1, sig2, path1, path2)
+        variants1이 주어지지 않으면 path1의 캐시된 변환 시그니처를 사용하고,
+        캐시에도 없을 때만 변환 프레임을 새로 생성합니다.
         
-        # 더 높은 유사도 선택
-        if flipped_similarity > normal_similarity:
-            print(f"수평 반전 비교가 더 높은 유사도를 보임: {os.path.basename(path1 or '')} vs {os.path.basename(path2 or '')}")
-            return flipped_similarity, True
+        반환값:
+            (가장 높은 유사도, 그 유사도를 낸 변환 이름 또는 원본이면 None)
+        """
+        # 정상 비교
+        best_similarity = self.compare_signatures(sig1, sig2, path1, path2)
+        best_transform = None
+        
+        # 변환 비교 (미리 계산된 변환 시그니처 사용)
+        if variants1 is None and path1 is not None:
+            variants1 = self.variant_cache.get(path1)
+        if variants1 is None:
+            variants1 = variant_frames(sig1, self._variant_names(sig1))
+        for name, variant_sig1 in variants1.items():
+            similarity = self.compare_signatures(variant_sig1, sig2, path1, path2)
+            # 더 높은 유사도 선택 (동점이면 원본/앞쪽 변환 우선)
+            if similarity > best_similarity:
+                best_similarity, best_transform = similarity, name
         
-        return normal_similarity, False
+        if best_transform is not None:
+            print(f"{best_transform} 변환 비교가 더 높은 유사도를 보임: {os.path.basename(path1 or '')} vs {os.path.basename(path2 or '')}")
+        return best_similarity, best_transform
         
-    def find_duplicates(self, video_paths):
+    def find_duplicates(self, video_paths, progress_callback=None, should_stop=None):
         """
         여러 비디오 파일 중 중복된 파일을 찾아 그룹화합니다.
         
+        매개변수:
+            progress_callback: 시그니처 추출이 끝난 파일 수를 받는 콜백 (프로세스 풀 사용 시)
+            should_stop: True를 반환하면 시그니처 추출을 중단하는 콜백
+        
         반환값:
             중복 그룹 목록. 각 그룹은 (대표 파일 경로, [(중복 파일 경로, 유사도)])로 구성됩니다.
+            같은 파일을 가리키는 경로(하드링크 등)는 self.same_file_groups에 따로 기록됩니다.
         """
-        # 비디오 시그니처 생성
+        # 하드링크/심볼릭 링크는 쌍 비교 전에 한 번에 묶어서 제외 (별도 '같은 파일' 그룹으로 보고)
+        video_paths, self.same_file_groups = self.same_file_finder.group_same_files(video_paths)
+        self.comparator.reset_counters()
+        
+        # 프로세스 풀 사용 시 시그니처를 병렬로 미리 추출 (멈춘 파일은 제한 시간 후 강제 종료)
+        if self.use_process_pool:
+            self.extract_signatures(video_paths, progress_callback, should_stop)
+        
+        # 비디오 시그니처 생성 (회전/반전 시그니처도 함께 준비)
         signatures = {}
+        variant_signatures = {}
         for path in video_paths:
-            if self.is_video_file(path):
+            if should_stop and should_stop():
+                break
+            if self.is_video_file(path) and path not in self.failed_files:
                 sig = self.get_video_signature(path)
                 if sig is not None:
                     signatures[path] = sig
+                    variant_signatures[path] = self.get_variant_signatures(path)
                     print(f"비디오 시그니처 생성 완료: {os.path.basename(path)}")
         
+        # 오디오가 같은 쌍을 역색인으로 미리 찾아둠 (후보 추가와 경계값 확인에 사용)
+        self.audio_matches = []
+        self.audio_pairs = self._find_audio_pairs(list(signatures), should_stop) if self.audio_matching else {}
+        
         # 중복 그룹 생성
+        self.transforms = {}
+        self.pair_similarities = {}
+        self.trimmed_matches = []
+        self.contained_matches = []
+        self.regroup_similarities = {}
+        self._regroup_block = None
+        if self.signature_format == self.SIGNATURE_HASH:
+            duplicate_groups = self._group_with_hash_index(signatures, variant_signatures)
+        else:
+            duplicate_groups = self._group_all_pairs(signatures, variant_signatures)
+        order = {path: i for i, path in enumerate(self.grouping_order)}
+        self.scan_claims = {}
+        for rep_path, dupes in duplicate_groups:
+            self.scan_claims[rep_path] = order[rep_path]
+            for dupe_path, _ in dupes:
+                self.scan_claims[dupe_path] = order[rep_path]
+        if self.early_exit and self.comparator.frames_compared:
+            total_frames = self.comparator.frames_compared + self.comparator.frames_skipped
+            print(f"조기 종료로 건너뛴 프레임 비교: {self.comparator.frames_skipped}/{total_frames}")
+        
+        # 시간축 정렬로 앞/뒤가 잘린 복사본과 클립 포함 관계 찾기 (한 번의 역색인 투표로 함께 처리)
+        self.temporal_matches = []
+        self.containments = []
+        if self.uses_temporal_signature():
+            temporal_results = self._find_temporal_matches(list(signatures), should_stop)
+            if temporal_results is not None:
+                self.trimmed_matches = temporal_results[TemporalMatcher.MATCH_TRIMMED] if self.temporal_matching else []
+                self.contained_matches = temporal_results[TemporalMatcher.MATCH_CONTAINED] if self.containment_matching else []
+                if self.temporal_matching:
+                    duplicate_groups = self._add_temporal_matches(
+                        duplicate_groups, temporal_results[TemporalMatcher.MATCH_TRIMMED]
+                    )
+                if self.containment_matching:
+                    self.containments = self._dedupe_containments(
+                        duplicate_groups, temporal_results[TemporalMatcher.MATCH_CONTAINED]
+                    )
+        return duplicate_groups
+        
+    def regroup(self, similarity_threshold):
+        """
+        마지막 find_duplicates의 비교 결과로 새 임계값에 맞춰 다시 그룹화합니다.
+        스캔에서 중복으로 인정된 쌍은 기록한 유사도를 쓰고, 스캔 때 이미 그룹에 속한 파일이라 비교하지 않았던 쌍은
+        새로 대표가 될 수 있는 파일에 대해서만 캐시된 시그니처로 비교합니다 (결과는 self.regroup_similarities에 보관).
+        그룹을 만드는 순서와 규칙, 시간축 일치/클립 포함 처리는 find_duplicates와 같으므로,
+        스캔 임계값 이상(더 엄격한 쪽)에서는 같은 임계값으로 스캔한 결과와 같습니다.
+        
+        반환값:
+            find_duplicates와 같은 형식의 중복 그룹 목록 (transforms, audio_matches, temporal_matches, containments도 갱신)
+        """
+        self.similarity_threshold = similarity_threshold
+        self.transforms = {}
+        self.audio_matches = []
+        order = {path: i for i, path in enumerate(self.grouping_order)}
+        partners = {}
+        for pairs in (self.pair_similarities, self.regroup_similarities):
+            for (path1, path2), (similarity, transform) in pairs.items():
+                partners.setdefault(path1, []).append((order[path2], path2, similarity, transform))
+        
         duplicate_groups = []
         processed_files = set()
+        for path1 in self.grouping_order:
+            if path1 in processed_files:
+                continue
+            missing = self._pairs_missing_from_scan(path1, order, processed_files)
+            if missing:
+                for path2, (similarity, transform) in self._measure_pairs(path1, missing).items():
+                    self.regroup_similarities[(path1, path2)] = (similarity, transform)
+                    partners.setdefault(path1, []).append((order[path2], path2, similarity, transform))
+            duplicates = []
+            for _, path2, similarity, transform in sorted(partners.get(path1, ())):
+                if path2 not in processed_files and self._accept_pair(path1, path2, similarity, transform):
+                    duplicates.append((path2, similarity))
+                    processed_files.add(path2)
+            if duplicates:
+                duplicate_groups.append((path1, duplicates))
+                processed_files.add(path1)
+        
+        self.temporal_matches = []
+        self.containments = []
+        if self.trimmed_matches:
+            duplicate_groups = self._add_temporal_matches(duplicate_groups, self.trimmed_matches)
+        if self.contained_matches:
+            self.containments = self._dedupe_containments(duplicate_groups, self.contained_matches)
+        print(f"비디오 재그룹화: 임계값 {similarity_threshold:.1f}%, {len(duplicate_groups)}개 그룹")
+        return duplicate_groups
+        
+    def _pairs_missing_from_scan(self, path1, order, processed_files):
+        """
+        path1을 대표 후보로 볼 때 비교해야 하지만 스캔과 이전 재그룹화에서 비교하지 않은 뒤쪽 파일 목록.
+        스캔은 차례가 된 파일을 그 시점에 그룹에 속하지 않은 뒤쪽 파일(해시 형식이면 해시 후보)과만 비교했으므로,
+        path1이 앞선 대표에 묶였거나 상대가 path1 차례 전에 앞선 대표에 묶였으면 비교하지 않은 쌍입니다.
+        """
+        position = order[path1]
+        path1_compared = self.scan_claims.get(path1, position) >= position
+        if self.hash_index is not None:
+            later_paths = sorted((path2 for path2 in self._hash_candidates(path1)
+                                  if path2 in order and order[path2] > position), key=order.get)
+        else:
+            later_paths = self.grouping_order[position + 1:]
+        return [path2 for path2 in later_paths
+                if path2 not in processed_files
+                and not (path1_compared and self.scan_claims.get(path2, len(order)) >= position)
+                and (path1, path2) not in self.regroup_similarities]
+        
+    def _measure_pairs(self, path1, candidate_paths):
+        """path1과 후보들의 (유사도, 변환)을 조기 종료 없이 계산합니다 (중복 판정/기록 없음, 재그룹화용)."""
+        results = {}
+        if self.batch_comparison and self._regroup_block is None:
+            signatures = {path: self.cache[path] for path in self.grouping_order if path in self.cache}
+            self._regroup_block = self._build_signature_block(signatures, self.variant_cache) or ({}, None, None)
+        block = self._regroup_block
+        if block is not None and path1 in block[0]:
+            batch_paths = [path2 for path2 in candidate_paths if path2 in block[0]]
+            if batch_paths:
+                best, best_transforms = self._batch_similarities(path1, batch_paths, block)
+                results = {path2: (float(best[k]), best_transforms[k]) for k, path2 in enumerate(batch_paths)}
+        sig1 = self.cache.get(path1)
+        for path2 in candidate_paths:
+            if path2 not in results:
+                results[path2] = self.compare_with_variants(sig1, self.cache.get(path2), path1, path2)
+        print(f"비디오 재그룹화 추가 비교: {os.path.basename(path1)} vs {len(candidate_paths)}개 파일")
+        return results
+        
+    def _dedupe_containments(self, duplicate_groups, contained_matches):
+        """
+        클립 포함 관계를 정리합니다. 같은 중복 그룹에 속한 긴 비디오들 모두에 포함된 클립은
+        그룹마다 한 번만(먼저 찾은 긴 비디오 기준으로) 보고합니다.
+        """
+        group_key_by_path = {}
+        for representative_path, members in duplicate_groups:
+            group_key_by_path[representative_path] = representative_path
+            for member_path, _ in members:
+                group_key_by_path[member_path] = representative_path
+        
+        containments = []
+        reported = set()
+        for match in contained_matches:
+            info = match.to_containment_dict()
+            key = (info['clip'], group_key_by_path.get(info['container'], info['container']))
+            if key in reported:
+                continue
+            reported.add(key)
+            containments.append(info)
+        return containments
+        
+    def _find_audio_pairs(self, video_paths, should_stop=None):
+        """오디오 지문을 역색인에 넣고 오디오 유사도가 기준 이상인 쌍을 반환합니다."""
+        index = AudioFingerprintIndex()
+        for path in video_paths:
+            if should_stop and should_stop():
+                return {}
+            fingerprint = self.get_audio_fingerprint(path)
+            if fingerprint is not None:
+                index.add(path, fingerprint)
+        audio_pairs = index.find_pairs(VIDEO_AUDIO_MATCH_THRESHOLD)
+        print(f"오디오 지문: {len(index.fingerprints)}/{len(video_paths)}개 비디오, 오디오가 같은 쌍 {len(audio_pairs)}개")
+        return audio_pairs
+        
+    def _acceptance_threshold(self, path1, path2):
+        """두 비디오를 중복으로 인정할 최소 화면 유사도 (오디오가 같으면 경계 여유만큼 낮아짐)"""
+        if frozenset((path1, path2)) in self.audio_pairs:
+            return self.similarity_threshold - VIDEO_AUDIO_BORDERLINE_MARGIN
+        return self.similarity_threshold
+        
+    def _find_temporal_matches(self, video_paths, should_stop=None):
+        """
+        모든 비디오의 초 단위 프레임 해시를 역색인(해시 대역 -> (비디오, 시점))에 넣고
+        잘린 복사본과 클립 포함 관계를 일치 종류별로 반환합니다. 중단 요청 시 None을 반환합니다.
+        """
+        matcher = TemporalMatcher(interval=self.temporal_interval)
+        for path in video_paths:
+            if should_stop and should_stop():
+                return None
+            temporal = self.get_temporal_signature(path)
+            if temporal is not None:
+                matcher.add(path, *temporal)
+        return matcher.find_all_matches()
+        
+    def _add_temporal_matches(self, duplicate_groups, trimmed_matches):
+        """
+        시간축 정렬로 찾은 앞/뒤가 잘린 복사본을 기존 중복 그룹에 합칩니다.
+        이미 그룹에 속한 파일끼리의 쌍은 건너뛰며, 새로 추가된 쌍은 self.temporal_matches에 기록합니다.
+        """
+        group_index_by_path = {}
+        for group_index, (representative_path, members) in enumerate(duplicate_groups):
+            group_index_by_path[representative_path] = group_index
+            for member_path, _ in members:
+                group_index_by_path[member_path] = group_index
+        
+        for match in trimmed_matches:
+            group1 = group_index_by_path.get(match.path1)
+            group2 = group_index_by_path.get(match.path2)
+            if group1 is not None and group2 is not None:
+                continue
+            if group1 is not None:
+                member_path = match.path2
+                duplicate_groups[group1][1].append((member_path, match.similarity))
+                group_index_by_path[member_path] = group1
+            elif group2 is not None:
+                member_path = match.path1
+                duplicate_groups[group2][1].append((member_path, match.similarity))
+                group_index_by_path[member_path] = group2
+            else:
+                member_path = match.path2
+                duplicate_groups.append((match.path1, [(member_path, match.similarity)]))
+                group_index_by_path[match.path1] = group_index_by_path[member_path] = len(duplicate_groups) - 1
+            # 그룹에 새로 추가된 멤버 경로도 함께 기록 (결과 테이블에서 오프셋 표시용)
+            match_info = match.to_dict()
+            match_info['member'] = member_path
+            # 멤버의 0초가 상대 비디오의 몇 초 지점인지 (멤버 기준 오프셋)
+            match_info['member_offset'] = match.offset if member_path == match.path2 else -match.offset
+            self.temporal_matches.append(match_info)
+            print(f"잘린 복사본 그룹 추가: {os.path.basename(match.path1)} <-> {os.path.basename(match.path2)} (오프셋 {match.offset:+.1f}초)")
+        
+        return duplicate_groups
+        
+    def _is_duplicate_pair(self, path1, sig1, path2, sig2, variants1):
+        """두 비디오를 픽셀 차이로 비교해 (유사도, 중복 여부)를 반환합니다 (회전/반전 포함)"""
+        if self.early_exit:
+            if variants1 is None:
+                variants1 = self.get_variant_signatures(path1) or {}
+            self.comparator.similarity_threshold = self._acceptance_threshold(path1, path2)
+            similarity, transform = self.comparator.compare_with_variants(sig1, sig2, variants1, key1=path1)
+        else:
+            similarity, transform = self.compare_with_variants(
+                sig1, sig2, path1, path2, variants1=variants1
+            )
+        return self._report_pair(path1, path2, similarity, transform)
+        
+    def _report_pair(self, path1, path2, similarity, transform=None):
+        """
+        비교 결과를 출력하고 (유사도, 중복 여부)를 반환합니다.
+        화면 유사도가 임계값보다 조금 낮아도 오디오가 같으면 중복으로 인정하고 self.audio_matches에 기록합니다.
+        회전/반전된 사본으로 중복이 되면 변환을 self.transforms에 기록합니다.
+        """
+        print(f"비디오 유사도: {os.path.basename(path1)} vs {os.path.basename(path2)} = {similarity:.1f}%{f' ({transform})' if transform else ''}")
+        is_duplicate = self._accept_pair(path1, path2, similarity, transform)
+        if is_duplicate:
+            # 더 엄격한 임계값으로 다시 그룹화할 때 쓰도록 기록 (중복이 아닌 쌍은 더 엄격한 임계값에서도 중복이 아님)
+            self.pair_similarities[(path1, path2)] = (similarity, transform)
+        return similarity, is_duplicate
+        
+    def _accept_pair(self, path1, path2, similarity, transform=None):
+        """
+        유사도가 임계값 이상이면(오디오가 같으면 경계 여유만큼 낮은 값 이상) 중복으로 인정합니다.
+        오디오로 인정된 쌍은 self.audio_matches에, 회전/반전된 사본의 변환은 self.transforms에 기록합니다.
+        """
+        if similarity >= self.similarity_threshold:
+            if transform:
+                self.transforms[path2] = transform
+            return True
+        if similarity >= self._acceptance_threshold(path1, path2):
+            if transform:
+                self.transforms[path2] = transform
+            audio_similarity = self.audio_pairs[frozenset((path1, path2))]
+            self.audio_matches.append({
+                'path1': path1,
+                'path2': path2,
+                'member': path2,
+                'similarity': similarity,
+                'audio_similarity': audio_similarity,
+            })
+            print(f"오디오로 중복 확인: {os.path.basename(path1)} vs {os.path.basename(path2)} (오디오 {audio_similarity:.1f}%)")
+            return True
+        return False
+        
+    def _build_signature_block(self, signatures, variant_signatures):
+        """
+        프레임 수와 크기가 같은 시그니처들을 (N, F, H, W) 배열로 묶습니다 (가장 흔한 형태 기준).
+        
+        반환값:
+            (경로 -> 행 번호, 원본 프레임 배열, {변환 이름: 변환 프레임 배열}) 또는 묶을 시그니처가 2개 미만이면 None
+        """
+        shape_counts = {}
+        shapes = {}
+        for path, frames in signatures.items():
+            variants = variant_signatures.get(path)
+            if not frames or not variants or any(frame is None for frame in frames):
+                continue
+            shape = (len(frames),) + frames[0].shape
+            if any(frame.shape != frames[0].shape for frame in frames):
+                continue
+            shapes[path] = shape
+            shape_counts[shape] = shape_counts.get(shape, 0) + 1
+        if not shape_counts:
+            return None
+        block_shape = max(shape_counts, key=shape_counts.get)
+        paths = [path for path in signatures if shapes.get(path) == block_shape]
+        if len(paths) < 2:
+            return None
+        rows = {path: i for i, path in enumerate(paths)}
+        frames = np.stack([np.stack(signatures[path]) for path in paths]).astype(np.uint8, copy=False)
+        # 같은 형태의 시그니처는 변환 목록도 같으므로 첫 비디오의 변환 순서를 사용
+        variants = {
+            name: np.stack([np.stack(variant_signatures[path][name]) for path in paths]).astype(np.uint8, copy=False)
+            for name in variant_signatures[paths[0]]
+        }
+        print(f"일괄 비교용 시그니처 배열: {len(paths)}/{len(signatures)}개 비디오, 형태 {block_shape}, 변환 {len(variants)}개")
+        return rows, frames, variants
+        
+    def _compare_batch(self, path1, candidate_paths, block):
+        """
+        path1을 block에 있는 후보들과 한 번에 비교합니다 (회전/반전 포함).
+        
+        반환값:
+            후보 경로 -> (유사도, 중복 여부). block에 없는 후보는 포함되지 않음
+        """
+        if block is None:
+            return {}
+        rows, frames, variants = block
+        if path1 not in rows:
+            return {}
+        batch_paths = [path2 for path2 in candidate_paths if path2 in rows]
+        if not batch_paths:
+            return {}
+        candidates = frames[[rows[path2] for path2 in batch_paths]]
+        row1 = rows[path1]
+        if self.early_exit:
+            best, best_transforms = self._compare_batch_cascaded(path1, batch_paths, frames[row1], candidates,
+                                                                 {name: block[row1] for name, block in variants.items()})
+            return {path2: self._report_pair(path1, path2, float(best[k]), best_transforms[k])
+                    for k, path2 in enumerate(batch_paths)}
+        best, best_transforms = self._batch_similarities(path1, batch_paths, block)
+        results = {}
+        for k, path2 in enumerate(batch_paths):
+            results[path2] = self._report_pair(path1, path2, float(best[k]), best_transforms[k])
+        return results
+        
+    def _batch_similarities(self, path1, batch_paths, block):
+        """
+        path1과 block에 있는 후보들의 유사도를 조기 종료 없이 한 번에 계산합니다 (회전/반전 포함).
+        
+        반환값:
+            (후보별 유사도 배열, 후보별 변환 이름 목록)
+        """
+        rows, frames, variants = block
+        row1 = rows[path1]
+        candidates = frames[[rows[path2] for path2 in batch_paths]]
+        best = self._mean_frame_similarity(
+            self.video_processor.calculate_batch_frame_similarities(frames[row1], candidates)
+        )
+        best_transforms = [None] * len(batch_paths)
+        for name, variant_frames_block in variants.items():
+            variant_similarity = self._mean_frame_similarity(
+                self.video_processor.calculate_batch_frame_similarities(variant_frames_block[row1], candidates)
+            )
+            # 더 높은 유사도 선택 (동점이면 원본/앞쪽 변환 우선, compare_with_variants와 같은 규칙)
+            improved = variant_similarity > best
+            best = np.where(improved, variant_similarity, best)
+            for k in np.flatnonzero(improved):
+                best_transforms[k] = name
+        return best, best_transforms
+        
+    def _compare_batch_cascaded(self, path1, batch_paths, query, candidates, query_variants):
+        """
+        _compare_batch의 조기 종료 버전: CascadedComparator.compare_with_variants와 같은 규칙을 후보 전체에 일괄 적용합니다.
+        
+        반환값:
+            (후보별 유사도 배열, 후보별 변환 이름 목록) - 중복으로 판정되는 후보는 전체 비교와 값이 같음
+        """
+        comparator = self.comparator
+        batch_similarity = self.video_processor.calculate_batch_frame_similarities
+        order = comparator.frame_order(list(query), path1)
+        thresholds = np.array([self._acceptance_threshold(path1, path2) for path2 in batch_paths], dtype=np.float64)
+        best, best_complete = comparator.cascade_batch(
+            batch_similarity, query, candidates, order, thresholds, np.zeros(len(batch_paths), dtype=bool)
+        )
+        best_transforms = [None] * len(batch_paths)
+        for name, variant_query in query_variants.items():
+            # 이미 중복인 후보는 지금까지의 최고 유사도보다 클 수 있을 때만, 아닌 후보는 임계값에 닿을 수 있을 때만 끝까지 계산
+            already_duplicate = best_complete & (best >= thresholds)
+            similarity, complete = comparator.cascade_batch(
+                batch_similarity, variant_query, candidates, order,
+                np.where(already_duplicate, best, thresholds), already_duplicate
+            )
+            improved = complete & (similarity > best)
+            best = np.where(improved, similarity, best)
+            best_complete |= improved
+            for k in np.flatnonzero(improved):
+                best_transforms[k] = name
+        return best, best_transforms
+        
+    @staticmethod
+    def _mean_frame_similarity(frame_similarities):
+        """(N, F) 프레임별 유사도를 프레임 순서대로 더해 평균을 구합니다 (compare_signatures와 같은 합산 순서)"""
+        total = frame_similarities[:, 0].copy()
+        for f in range(1, frame_similarities.shape[1]):
+            total += frame_similarities[:, f]
+        return total / frame_similarities.shape[1]
+        
+    def _group_all_pairs(self, signatures, variant_signatures):
+        """모든 비디오 쌍을 비교하여 중복 그룹을 만듭니다."""
+        duplicate_groups = []
+        processed_files = set()
+        items = list(signatures.items())
+        self.grouping_order = [path for path, _ in items]
+        self.hash_index = None
+        block = self._build_signature_block(signatures, variant_signatures) if self.batch_comparison else None
         
         # 모든 비디오 쌍을 비교하여 중복 찾기
-        for i, (path1, sig1) in enumerate(signatures.items()):
+        for i, (path1, sig1) in enumerate(items):
             if path1 in processed_files:
                 continue
                 
             # 현재 파일이 다른 파일과 중복인지 확인
             duplicates = []
+            remaining = [(path2, sig2) for path2, sig2 in items[i+1:] if path2 not in processed_files]
+            batch_results = self._compare_batch(path1, [path2 for path2, _ in remaining], block)
             
-            for path2, sig2 in list(signatures.items())[i+1:]:
-                if path2 in processed_files:
-                    continue
-                    
-                # 하드링크인 경우 100% 유사도로 중복 처리
-                if self.is_same_file(path1, path2):
-                    duplicates.append((path2, 100.0))
-                    processed_files.add(path2)
-                    continue
-                    
-                # 유사도 계산 (수평 반전 포함)
-                similarity, is_flipped = self.compare_with_flipped(sig1, sig2, path1, path2)
-                print(f"비디오 유사도: {os.path.basename(path1)} vs {os.path.basename(path2)} = {similarity:.1f}%{' (반전됨)' if is_flipped else ''}")
-                
+            for path2, sig2 in remaining:
                 # 임계값 이상이면 중복으로 간주
-                if similarity >= self.similarity_threshold:
+                if path2 in batch_results:
+                    similarity, is_duplicate = batch_results[path2]
+                else:
+                    similarity, is_duplicate = self._is_duplicate_pair(path1, sig1, path2, sig2, variant_signatures.get(path1))
+                if is_duplicate:
                     duplicates.append((path2, similarity))
                     processed_files.add(path2)
-                # 파일명만 같다고 유사하다고 판단하지 않음 - 이 코드 제거
             
             # 중복이 있으면 그룹 생성
             if duplicates:
                 duplicate_groups.append((path1, duplicates))
                 processed_files.add(path1)
                 print(f"중복 그룹 생성: {os.path.basename(path1)} 외 {len(duplicates)}개 파일")
-            # 같은 이름을 가진 파일들끼리 그룹화하는 코드 제거
         
-        return duplicate_groups 
\ No newline at end of file
+        return duplicate_groups
+        
+    def _group_with_hash_index(self, signatures, variant_signatures):
+        """
+        시퀀스 해시를 해밍 인덱스에 넣고, 해시가 가까운 후보 쌍만 픽셀 차이로 검증하여 중복 그룹을 만듭니다.
+        그룹을 만드는 순서와 규칙은 모든 쌍 비교와 같습니다.
+        """
+        duplicate_groups = []
+        processed_files = set()
+        paths = [path for path in signatures if path in self.hash_cache]
+        order = {path: i for i, path in enumerate(paths)}
+        self.grouping_order = paths
+        
+        block = self._build_signature_block(signatures, variant_signatures) if self.batch_comparison else None
+        self.hash_index = HammingIndex(self.hash_max_distance)
+        for path in paths:
+            self.hash_index.add(path, self.hash_cache[path].sequence_hash)
+        # 오디오가 같은 쌍은 해시가 멀어도 후보로 추가 (레터박스 등으로 화면이 조금 다른 복사본)
+        self.audio_partners = {}
+        for pair in self.audio_pairs:
+            path_a, path_b = tuple(pair)
+            self.audio_partners.setdefault(path_a, set()).add(path_b)
+            self.audio_partners.setdefault(path_b, set()).add(path_a)
+        
+        verified_pairs = 0
+        for path1 in paths:
+            if path1 in processed_files:
+                continue
+            candidates = sorted(
+                (path2 for path2 in self._hash_candidates(path1)
+                 if path2 in order and order[path2] > order[path1] and path2 not in processed_files),
+                key=order.get
+            )
+            
+            duplicates = []
+            batch_results = self._compare_batch(path1, candidates, block)
+            for path2 in candidates:
+                verified_pairs += 1
+                if path2 in batch_results:
+                    similarity, is_duplicate = batch_results[path2]
+                else:
+                    similarity, is_duplicate = self._is_duplicate_pair(
+                        path1, signatures[path1], path2, signatures[path2], variant_signatures.get(path1)
+                    )
+                if is_duplicate:
+                    duplicates.append((path2, similarity))
+                    processed_files.add(path2)
+            
+            if duplicates:
+                duplicate_groups.append((path1, duplicates))
+                processed_files.add(path1)
+                print(f"중복 그룹 생성: {os.path.basename(path1)} 외 {len(duplicates)}개 파일")
+        
+        total_pairs = len(paths) * (len(paths) - 1) // 2
+        print(f"해시 인덱스 후보 검증: {verified_pairs}/{total_pairs} 쌍")
+        return duplicate_groups
+        
+    def _hash_candidates(self, path1):
+        """원본 해시와 모든 변환 해시로 찾은 후보(회전/반전된 복사본 포함)와 오디오가 같은 파일의 경로 집합"""
+        hash_sig1 = self.hash_cache[path1]
+        candidates = self.hash_index.query(hash_sig1.sequence_hash)
+        for variant_hash in hash_sig1.variant_sequence_hashes.values():
+            candidates |= self.hash_index.query(variant_hash)
+        return candidates | self.audio_partners.get(path1, set())
@@ -0,0 +1,112 @@
+import numpy as np
+from typing import Dict, Hashable, List, Optional, Set
+from dihedral import FLIP_HORIZONTAL, transform_frames
+
+# 프레임 해시 비트 수 (8x8 저주파 DCT 계수 -> 64비트)
+HASH_BITS = 64
+_LOW_FREQ_SIZE = 8
+
+_dct_matrix_cache: Dict[int, np.ndarray] = {}
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """n x n DCT-II 변환 행렬을 반환합니다 (크기별로 한 번만 계산)"""
+    matrix = _dct_matrix_cache.get(n)
+    if matrix is None:
+        k = np.arange(n).reshape(-1, 1)
+        i = np.arange(n).reshape(1, -1)
+        matrix = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+        matrix[0, :] = np.sqrt(1.0 / n)
+        _dct_matrix_cache[n] = matrix
+    return matrix
+
+def compute_frame_hash(frame: np.ndarray) -> int:
+    """
+    그레이스케일 프레임의 64비트 DCT 지각 해시(pHash)를 계산합니다.
+    2차원 DCT의 저주파 8x8 계수를 중앙값과 비교해 비트를 만듭니다.
+    """
+    frame = np.asarray(frame, dtype=np.float64)
+    rows, cols = frame.shape[:2]
+    coeffs = _dct_matrix(rows) @ frame @ _dct_matrix(cols).T
+    low = coeffs[:_LOW_FREQ_SIZE, :_LOW_FREQ_SIZE]
+    bits = (low > np.median(low)).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), byteorder='big')
+
+def compute_sequence_hash(frame_hashes: List[int]) -> int:
+    """프레임 해시들의 비트별 다수결로 비디오 전체를 대표하는 시퀀스 해시를 만듭니다."""
+    if not frame_hashes:
+        return 0
+    counts = [0] * HASH_BITS
+    for frame_hash in frame_hashes:
+        for bit in range(HASH_BITS):
+            if (frame_hash >> bit) & 1:
+                counts[bit] += 1
+    majority = len(frame_hashes) / 2
+    sequence_hash = 0
+    for bit, count in enumerate(counts):
+        if count > majority:
+            sequence_hash |= 1 << bit
+    return sequence_hash
+
+def hamming_distance(hash1: int, hash2: int) -> int:
+    """두 64비트 해시의 해밍 거리를 반환합니다."""
+    return bin(hash1 ^ hash2).count('1')
+
+class VideoHashSignature:
+    """해시 형식 비디오 시그니처 (프레임별 64비트 해시 + 시퀀스 해시)"""
+
+    def __init__(self, frame_hashes: List[int], variant_frame_hashes: Dict[str, List[int]]):
+        self.frame_hashes = frame_hashes
+        self.sequence_hash = compute_sequence_hash(frame_hashes)
+        # 회전/반전된 복사본을 찾기 위한 변환 이름 -> 변환 프레임의 시퀀스 해시
+        self.variant_sequence_hashes = {
+            name: compute_sequence_hash(hashes) for name, hashes in variant_frame_hashes.items()
+        }
+
+    @classmethod
+    def from_frames(cls, frames: List[np.ndarray], transforms: Optional[List[str]] = None) -> 'VideoHashSignature':
+        """원본 크기 프레임 목록에서 해시 시그니처를 만듭니다 (transforms가 없으면 수평 반전만)"""
+        valid_frames = [frame for frame in frames if frame is not None]
+        frame_hashes = [compute_frame_hash(frame) for frame in valid_frames]
+        variant_frame_hashes = {
+            name: [compute_frame_hash(frame) for frame in transform_frames(valid_frames, name)]
+            for name in (transforms or [FLIP_HORIZONTAL])
+        }
+        return cls(frame_hashes, variant_frame_hashes)
+
+class HammingIndex:
+    """
+    64비트 해시를 해밍 거리로 검색하는 인덱스.
+    해시를 (max_distance + 1)개의 대역으로 나누면, 거리가 max_distance 이하인 두 해시는
+    비둘기집 원리에 의해 적어도 한 대역이 완전히 같으므로 대역 값으로 후보를 찾은 뒤 실제 거리로 거릅니다.
+    """
+
+    def __init__(self, max_distance: int = 10):
+        self.max_distance = max(0, min(max_distance, HASH_BITS - 1))
+        band_count = self.max_distance + 1
+        # 각 대역의 (시작 비트, 마스크)
+        self.bands = []
+        start = 0
+        for band in range(band_count):
+            width = HASH_BITS // band_count + (1 if band < HASH_BITS % band_count else 0)
+            self.bands.append((start, (1 << width) - 1))
+            start += width
+        self.tables: List[Dict[int, List[Hashable]]] = [{} for _ in self.bands]
+        self.hashes: Dict[Hashable, int] = {}
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def add(self, key: Hashable, hash_value: int):
+        """키와 해시를 인덱스에 추가합니다."""
+        self.hashes[key] = hash_value
+        for table, (start, mask) in zip(self.tables, self.bands):
+            table.setdefault((hash_value >> start) & mask, []).append(key)
+
+    def query(self, hash_value: int, max_distance: Optional[int] = None) -> Set[Hashable]:
+        """해밍 거리가 max_distance 이하인 해시를 가진 키 집합을 반환합니다."""
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        candidates: Set[Hashable] = set()
+        for table, (start, mask) in zip(self.tables, self.bands):
+            candidates.update(table.get((hash_value >> start) & mask, ()))
+        return {key for key in candidates if hamming_distance(self.hashes[key], hash_value) <= max_distance}
@@ -1,127 +1,55 @@
 import os
 import numpy as np
 from PIL import Image
-import av
 import io
 import tempfile
 import time
-try:
-    from numba import njit, prange, cuda
-    NUMBA_AVAILABLE = True
-    # CUDA 지원 확인
-    CUDA_AVAILABLE = cuda.is_available()
-    if CUDA_AVAILABLE:
-        print("CUDA 가속을 사용할 수 있습니다.")
-    else:
-        print("CUDA를 사용할 수 없습니다. CPU로 실행됩니다.")
-except ImportError:
-    NUMBA_AVAILABLE = False
-    CUDA_AVAILABLE = False
-    print("Numba 라이브러리를 찾을 수 없습니다. 최적화 없이 실행됩니다.")
+import threading
+from animation_reader import AnimationReader
+from frame_sampler import FrameSampler
+from crop_detector import CROP_ANALYSIS_SIZE, crop_and_resize
+from supported_formats import FRAME_CHECK_FORMATS
 
-# Numba JIT 컴파일된 최적화 함수
-if NUMBA_AVAILABLE:
-    @njit(parallel=True)
-    def calculate_similarity_numba(frame1, frame2):
-        """Numba로 최적화된 프레임 유사도 계산 함수"""
-        height, width = frame1.shape
-        total_diff = 0.0
-        
-        for i in prange(height):
-            row_diff = 0.0
-            for j in range(width):
-                row_diff += abs(float(frame1[i, j]) - float(frame2[i, j]))
-            total_diff += row_diff
-            
-        avg_diff = total_diff / (height * width)
-        return 100.0 * (1.0 - (avg_diff / 255.0))
+# numba/CUDA 가속 모듈 (처음 사용할 때 불러옴 - 앱 시작 시간 단축)
+_acceleration = None
 
-    @njit
-    def flip_frame_numba(frame):
-        """Numba로 최적화된 프레임 반전 함수"""
-        height, width = frame.shape
-        flipped = np.empty_like(frame)
-        
-        for i in range(height):
-            for j in range(width):
-                flipped[i, j] = frame[i, width - j - 1]
-                
-        return flipped
+def get_acceleration():
+    """
+    video_acceleration 모듈을 처음 호출될 때 불러와 반환합니다.
+    모듈 안에서 numba 임포트와 CUDA 장치 확인이 한 번만 수행됩니다.
+    """
+    global _acceleration
+    if _acceleration is None:
+        import video_acceleration
+        _acceleration = video_acceleration
+    return _acceleration
 
-    # CUDA 최적화 함수들 (GPU 사용 가능한 경우)
-    if CUDA_AVAILABLE:
-        @cuda.jit
-        def calculate_diff_cuda(frame1, frame2, result):
-            """CUDA로 최적화된 프레임 차이 계산 커널"""
-            i, j = cuda.grid(2)
-            if i < frame1.shape[0] and j < frame1.shape[1]:
-                result[i, j] = abs(float(frame1[i, j]) - float(frame2[i, j]))
-                
-        @cuda.jit
-        def flip_frame_cuda(frame, result):
-            """CUDA로 최적화된 프레임 반전 커널"""
-            i, j = cuda.grid(2)
-            if i < frame.shape[0] and j < frame.shape[1]:
-                result[i, j] = frame[i, frame.shape[1] - j - 1]
-        
-        def calculate_similarity_cuda(frame1, frame2):
-            """CUDA를 사용한 프레임 유사도 계산"""
-            height, width = frame1.shape
-            
-            # GPU 메모리 할당
-            d_frame1 = cuda.to_device(frame1)
-            d_frame2 = cuda.to_device(frame2)
-            d_result = cuda.device_array((height, width), dtype=np.float32)
-            
-            # 그리드 및 블록 크기 계산
-            threads_per_block = (16, 16)
-            blocks_per_grid_x = (height + threads_per_block[0] - 1) // threads_per_block[0]
-            blocks_per_grid_y = (width + threads_per_block[1] - 1) // threads_per_block[1]
-            blocks_per_grid = (blocks_per_grid_x, blocks_per_grid_y)
-            
-            # 커널 실행
-            calculate_diff_cuda[blocks_per_grid, threads_per_block](d_frame1, d_frame2, d_result)
-            
-            # 결과를 호스트로 복사
-            result = d_result.copy_to_host()
-            
-            # 평균 계산
-            avg_diff = np.mean(result)
-            similarity = 100.0 * (1.0 - (avg_diff / 255.0))
-            
-            return similarity
-            
-        def flip_frame_cuda_wrapper(frame):
-            """CUDA를 사용한 프레임 반전"""
-            height, width = frame.shape
-            
-            # GPU 메모리 할당
-            d_frame = cuda.to_device(frame)
-            d_result = cuda.device_array((height, width), dtype=frame.dtype)
-            
-            # 그리드 및 블록 크기 계산
-            threads_per_block = (16, 16)
-            blocks_per_grid_x = (height + threads_per_block[0] - 1) // threads_per_block[0]
-            blocks_per_grid_y = (width + threads_per_block[1] - 1) // threads_per_block[1]
-            blocks_per_grid = (blocks_per_grid_x, blocks_per_grid_y)
-            
-            # 커널 실행
-            flip_frame_cuda[blocks_per_grid, threads_per_block](d_frame, d_result)
-            
-            # 결과를 호스트로 복사
-            result = d_result.copy_to_host()
-            
-            return result
+def start_acceleration_warm_up():
+    """numba 임포트와 커널 컴파일을 백그라운드 스레드에서 미리 수행합니다 (스캔 시작 시 호출)."""
+    def warm_up():
+        get_acceleration().warm_up()
+    threading.Thread(target=warm_up, name="acceleration-warm-up", daemon=True).start()
 
 class VideoProcessor:
     """비디오 파일에서 프레임을 추출하고 처리하는 클래스"""
     
     def __init__(self):
         """비디오 프로세서를 초기화합니다"""
-        self.use_hw_acceleration = False
-        if CUDA_AVAILABLE:
-            self.use_hw_acceleration = True
-            print("GPU 가속이 활성화되었습니다.")
+        # None이면 처음 프레임 계산 시 CUDA 사용 가능 여부로 결정 (numba/CUDA 지연 로딩)
+        self._use_hw_acceleration = None
+        
+    @property
+    def use_hw_acceleration(self):
+        """GPU 가속 사용 여부 (처음 접근할 때 CUDA 사용 가능 여부를 확인)"""
+        if self._use_hw_acceleration is None:
+            self._use_hw_acceleration = get_acceleration().CUDA_AVAILABLE
+            if self._use_hw_acceleration:
+                print("GPU 가속이 활성화되었습니다.")
+        return self._use_hw_acceleration
+        
+    @use_hw_acceleration.setter
+    def use_hw_acceleration(self, enabled):
+        self._use_hw_acceleration = enabled
     
     @staticmethod
     def check_av():
@@ -163,73 +91,36 @@ class VideoProcessor:
             return False
             
     def extract_webp_frames(self, webp_path, positions_percent, output_size=(16, 16)):
-        """WebP 애니메이션에서 프레임을 추출합니다"""
-        if not os.path.exists(webp_path) or not self.is_webp_animation(webp_path):
+        """WebP 애니메이션에서 프레임을 추출합니다 (파일은 한 번만 엽니다)"""
+        if not os.path.exists(webp_path):
             return None
-            
+        info = AnimationReader().read(webp_path, positions_percent, output_size)
+        if info is None or not info.is_animated:
+            return None
+        return info.frames
+    
+    @staticmethod
+    def has_video_stream(video_path):
+        """
+        파일에 비디오 스트림이 있는지 확인합니다.
+        
+        반환값:
+            - True: 비디오 스트림 있음 (또는 WebP 애니메이션)
+            - False: 파일은 열리지만 비디오 스트림이 없음
+            - None: 파일을 열 수 없음
+        """
+        if not os.path.exists(video_path):
+            return None
+        if VideoProcessor.is_webp_animation(video_path):
+            return True
         try:
-            frames = []
-            with Image.open(webp_path) as img:
-                # 총 프레임 수 확인
-                try:
-                    frame_count = getattr(img, 'n_frames', 0)
-                    if frame_count <= 0:
-                        # n_frames가 없거나 0이면 수동으로 프레임 수 계산
-                        frame_count = 1
-                        try:
-                            while True:
-                                img.seek(frame_count)
-                                frame_count += 1
-                        except EOFError:
-                            pass  # 마지막 프레임에 도달
-                except Exception as e:
-                    print(f"WebP 프레임 수 확인 오류: {e}")
-                    frame_count = 0
-                    
-                if frame_count <= 0:
-                    return None
-                    
-                print(f"WebP 애니메이션 프레임 수: {frame_count}")
-                
-                # 위치 백분율에 해당하는 프레임 인덱스 계산
-                frame_indices = [min(int(pos * frame_count / 100), frame_count - 1) for pos in positions_percent]
-                
-                # 중복 제거
-                frame_indices = list(set(frame_indices))
-                
-                # 프레임 추출
-                for idx in frame_indices:
-                    try:
-                        img.seek(idx)
-                        frame = img.convert('L').resize(output_size)
-                        frames.append(np.array(frame))
-                    except Exception as e:
-                        print(f"WebP 프레임 {idx} 추출 오류: {e}")
-                        
-                # 최소 3개의 프레임 확보
-                if len(frames) < 3 and frame_count > 0:
-                    additional_indices = list(range(0, frame_count, max(1, frame_count // 5)))[:5]
-                    for idx in additional_indices:
-                        if len(frames) >= 3:
-                            break
-                        if idx not in frame_indices:
-                            try:
-                                img.seek(idx)
-                                frame = img.convert('L').resize(output_size)
-                                frames.append(np.array(frame))
-                            except Exception as e:
-                                print(f"WebP 추가 프레임 {idx} 추출 오류: {e}")
-                                
-                # 여전히 프레임이 부족하면 첫 프레임을 복제
-                while len(frames) < 3 and frames:
-                    frames.append(frames[0].copy())
-                    
-            return frames if frames else None
-                
+            import av  # PyAV는 처음 사용할 때 불러옴 (앱 시작 시간 단축)
+            with av.open(video_path) as container:
+                return any(s.type == 'video' for s in container.streams)
         except Exception as e:
-            print(f"WebP 프레임 추출 중 오류: {e}")
+            print(f"비디오 스트림 확인 오류: {e}")
             return None
-    
+
     @staticmethod        
     def get_video_duration(video_path):
         """비디오 파일의 재생 시간을 초 단위로 반환합니다"""
@@ -246,6 +137,7 @@ class VideoProcessor:
                 pass
             
         try:
+            import av
             with av.open(video_path) as container:
                 # 비디오 스트림 찾기
                 stream = next((s for s in container.streams if s.type == 'video'), None)
@@ -265,6 +157,7 @@ class VideoProcessor:
             return None
             
         try:
+            import av
             with av.open(video_path) as container:
                 # 비디오 스트림 찾기
                 stream = next((s for s in container.streams if s.type == 'video'), None)
@@ -294,6 +187,7 @@ class VideoProcessor:
             
             # 적절한 프레임을 찾지 못한 경우 첫 번째 프레임 반환 시도
             try:
+                import av
                 with av.open(video_path) as container:
                     stream = next((s for s in container.streams if s.type == 'video'), None)
                     if stream is None:
@@ -313,6 +207,68 @@ class VideoProcessor:
             print(f"프레임 추출 오류: {e}")
             return None
             
+    def extract_temporal_fingerprint(self, video_path, interval=1.0, output_size=(16, 16), max_samples=None,
+                                     crop_box=None):
+        """
+        비디오를 처음부터 한 번 디코딩하면서 일정 간격(초)마다 작은 그레이스케일 프레임을 추출합니다.
+        컨테이너는 한 번만 열고, 샘플 시점에 해당하는 프레임만 축소/변환합니다.
+        crop_box가 주어지면 시그니처 추출 때 찾은 실제 영상 영역만 사용합니다 (검은 띠 제외).
+        
+        반환값:
+            프레임 목록 (i번째 프레임은 i * interval초 시점) 또는 실패 시 None
+        """
+        if not os.path.exists(video_path) or interval <= 0:
+            return None
+        # WebP 애니메이션은 PyAV로 열 수 없으므로 제외
+        if os.path.splitext(video_path.lower())[1] == '.webp':
+            return None
+            
+        frames = []
+        try:
+            import av
+            with av.open(video_path) as container:
+                stream = next((s for s in container.streams if s.type == 'video'), None)
+                if stream is None:
+                    return None
+                stream.thread_type = 'AUTO'
+                try:
+                    # 다른 프레임이 참조하지 않는 프레임은 디코딩 생략 (샘플링에는 영향 거의 없음)
+                    stream.codec_context.skip_frame = 'NONREF'
+                except Exception:
+                    pass
+                
+                first_time = None
+                next_time = 0.0
+                for frame in container.decode(stream):
+                    if frame.time is None:
+                        continue
+                    if first_time is None:
+                        first_time = frame.time
+                    frame_time = frame.time - first_time
+                    if frame_time + 1e-6 < next_time:
+                        continue
+                    if crop_box is not None and not crop_box.is_full:
+                        gray = frame.reformat(
+                            width=CROP_ANALYSIS_SIZE[0], height=CROP_ANALYSIS_SIZE[1], format='gray', interpolation='AREA'
+                        ).to_ndarray()
+                        gray = crop_and_resize(gray, crop_box, output_size)
+                    else:
+                        gray = frame.reformat(
+                            width=output_size[0], height=output_size[1], format='gray', interpolation='AREA'
+                        ).to_ndarray()
+                    # 프레임 간격이 샘플 간격보다 긴 경우 건너뛴 시점도 같은 프레임으로 채움
+                    while next_time <= frame_time + 1e-6:
+                        frames.append(gray)
+                        next_time += interval
+                    if max_samples and len(frames) >= max_samples:
+                        frames = frames[:max_samples]
+                        break
+        except Exception as e:
+            print(f"시간축 지문 추출 오류: {os.path.basename(video_path)} - {e}")
+            return None
+            
+        return frames if frames else None
+        
     def extract_frame_at_percent(self, video_path, position_percent, output_size=(16, 16)):
         """비디오의 특정 퍼센트 위치에서 프레임을 추출하고, 그레이스케일로 변환합니다"""
         duration = self.get_video_duration(video_path)
@@ -325,37 +281,34 @@ class VideoProcessor:
     
     def extract_multiple_frames(self, video_path, positions_percent, output_size=(16, 16)):
         """비디오에서 여러 위치의 프레임을 추출합니다"""
-        # WebP 애니메이션인 경우 특수 처리
-        if os.path.splitext(video_path.lower())[1] == '.webp' and self.is_webp_animation(video_path):
-            print(f"WebP 애니메이션 특수 처리: {os.path.basename(video_path)}")
-            return self.extract_webp_frames(video_path, positions_percent, output_size)
+        frames, _ = self.extract_frames_with_crop(video_path, positions_percent, output_size)
+        return frames
         
-        frames = []
-        for pos in positions_percent:
-            frame = self.extract_frame_at_percent(video_path, pos, output_size)
-            if frame is not None:
-                frames.append(frame)
+    def extract_frames_with_crop(self, video_path, positions_percent, output_size=(16, 16), auto_crop=False):
+        """
+        비디오에서 여러 위치의 프레임을 추출합니다.
+        auto_crop이 켜져 있으면 샘플 프레임에서 레터박스/필러박스를 찾아 실제 영상 영역만으로 프레임을 만듭니다.
         
-        # 최소 3개의 프레임 확보 시도 (기존 방식 개선)
-        if len(frames) < 3:
-            # 더 많은 위치에서 시도
-            additional_positions = [5, 15, 25, 35, 45, 55, 65, 75, 85, 95]
-            for pos in additional_positions:
-                if pos not in positions_percent:
-                    frame = self.extract_frame_at_percent(video_path, pos, output_size)
-                    if frame is not None:
-                        # 이미 추출된 프레임과 너무 유사한지 확인 (중복 프레임 방지)
-                        is_duplicate = False
-                        for existing_frame in frames:
-                            similarity = self.calculate_frame_similarity(existing_frame, frame)
-                            if similarity > 95:  # 95% 이상 유사하면 중복으로 간주
-                                is_duplicate = True
-                                break
-                        
-                        if not is_duplicate:
-                            frames.append(frame)
-                            if len(frames) >= 3:  # 최소 3개 확보되면 중단
-                                break
+        반환값:
+            (프레임 목록 또는 실패 시 None, 실제 영상 영역 CropBox 또는 None)
+        """
+        # WebP/GIF/APNG 등 애니메이션은 한 번 열어서 프레임 수 확인과 샘플링을 함께 처리
+        if os.path.splitext(video_path.lower())[1] in FRAME_CHECK_FORMATS:
+            info = AnimationReader().read(video_path, positions_percent, output_size)
+            if info is not None and info.is_animated:
+                print(f"애니메이션 단일 열기 처리: {os.path.basename(video_path)}")
+                return info.frames, None
+        
+        # 컨테이너를 한 번만 열어 모든 위치를 샘플링 (어두운 프레임은 주변 위치에서 대체)
+        # 최소 3개의 프레임이 안 되면 추가 위치에서 시도하되, 95% 이상 유사한 프레임은 중복으로 보고 제외
+        frames, crop_box = FrameSampler().sample(
+            video_path, positions_percent, output_size,
+            additional_positions=[5, 15, 25, 35, 45, 55, 65, 75, 85, 95],
+            min_frames=3,
+            frame_similarity=self.calculate_frame_similarity,
+            auto_crop=auto_crop
+        )
+        frames = frames or []
         
         # 여전히 프레임이 부족한 경우 (최소 3개 필요)
         if frames and len(frames) < 3:
@@ -395,9 +348,9 @@ class VideoProcessor:
         # 프레임이 전혀 없는 경우 (파일 접근 실패 등)
         if not frames:
             print(f"프레임 추출 실패: {os.path.basename(video_path)}")
-            return None
+            return None, crop_box
                 
-        return frames
+        return frames, crop_box
         
     @staticmethod
     def is_frame_too_dark(frame, threshold=20):
@@ -425,36 +378,38 @@ class VideoProcessor:
                 return 0
         
         try:
+            acceleration = get_acceleration()
             # CUDA 가속 사용 (가능하고 활성화된 경우)
-            if self.use_hw_acceleration and CUDA_AVAILABLE:
-                return calculate_similarity_cuda(frame1, frame2)
+            if self.use_hw_acceleration and acceleration.CUDA_AVAILABLE:
+                return acceleration.calculate_similarity_cuda(frame1, frame2)
                 
-            # Numba CPU 최적화 사용 (가능한 경우)
-            elif NUMBA_AVAILABLE:
-                return calculate_similarity_numba(frame1, frame2)
-            
-            # 일반 NumPy 계산 (Numba 사용 불가시)
-            diff = np.abs(frame1.astype(float) - frame2.astype(float)).mean()
-            similarity = 100.0 * (1.0 - (diff / 255.0))
-            
-            return similarity
+            # Numba 커널이 준비되었으면 Numba, 아니면 NumPy (일괄 비교와 같은 워밍업 기준)
+            return acceleration.frame_similarity(frame1, frame2)
         except Exception as e:
             print(f"유사도 계산 오류: {e}")
             return 0
             
+    def calculate_batch_frame_similarities(self, query, candidates):
+        """
+        시그니처 하나(F, H, W)를 여러 시그니처(N, F, H, W)와 한 번에 비교해 (N, F) 프레임별 유사도를 반환합니다.
+        값은 calculate_frame_similarity를 프레임마다 호출한 것과 같습니다.
+        """
+        return get_acceleration().batch_frame_similarities(query, candidates)
+            
     def flip_frame_horizontally(self, frame):
         """프레임을 수평으로 반전합니다"""
         if frame is None:
             return None
             
         try:
+            acceleration = get_acceleration()
             # CUDA 가속 사용 (가능하고 활성화된 경우)
-            if self.use_hw_acceleration and CUDA_AVAILABLE:
-                return flip_frame_cuda_wrapper(frame)
+            if self.use_hw_acceleration and acceleration.CUDA_AVAILABLE:
+                return acceleration.flip_frame_cuda_wrapper(frame)
                 
             # Numba CPU 최적화 사용 (가능한 경우)
-            elif NUMBA_AVAILABLE:
-                return flip_frame_numba(frame)
+            elif acceleration.NUMBA_AVAILABLE:
+                return acceleration.flip_frame_numba(frame)
                 
             # 일반 NumPy 기능 사용 (Numba 사용 불가시)
             return np.fliplr(frame)
@@ -462,21 +417,9 @@ class VideoProcessor:
             print(f"프레임 수평 반전 오류: {e}")
             return frame
             
-    def create_flipped_frames(self, frames):
-        """프레임 목록의 수평 반전 버전을 생성합니다"""
-        if not frames:
-            return None
-            
-        flipped_frames = []
-        for frame in frames:
-            flipped_frame = self.flip_frame_horizontally(frame)
-            flipped_frames.append(flipped_frame)
-            
-        return flipped_frames
-        
     def set_hardware_acceleration(self, enabled):
         """하드웨어 가속 사용 여부를 설정합니다"""
-        if enabled and CUDA_AVAILABLE:
+        if enabled and get_acceleration().CUDA_AVAILABLE:
             self.use_hw_acceleration = True
             print("GPU 가속이 활성화되었습니다.")
         else:
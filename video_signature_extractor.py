@@ -0,0 +1,259 @@
+import os
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+def _extract_worker_main(conn, frame_positions, output_size, temporal_matching, audio_matching, auto_crop):
+    """
+    작업자 프로세스 진입점.
+    부모로부터 (비디오 경로, 분류 단계에서 읽은 애니메이션 헤더 또는 None)을 하나씩 받아 시그니처를 추출하고 (경로, 프레임, 영상 영역, 실패 사유)를 먼저 돌려보낸 뒤,
+    시간축/오디오 지문이 필요하면 이어서 추출해 (경로, 시간축 지문, 오디오 지문)을 따로 돌려보냅니다.
+    부모는 두 단계에 각각 제한 시간을 적용하므로, 지문 추출이 오래 걸려도 이미 받은 시그니처는 유지됩니다.
+    None을 받으면 종료합니다.
+    """
+    # 순환 임포트 방지를 위해 작업자 프로세스 안에서 임포트
+    from video_duplicate_finder import VideoDuplicateFinder
+    finder = VideoDuplicateFinder(frame_positions=frame_positions, output_size=output_size,
+                                  temporal_matching=temporal_matching, auto_crop=auto_crop)
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        video_path, animation_header = task
+        if animation_header is not None:
+            finder.set_animation_header(video_path, animation_header)
+        try:
+            frames, reason = finder.extract_signature(video_path)
+        except Exception as e:
+            print(f"시그니처 추출 중 예외: {video_path} - {e}")
+            frames, reason = None, VideoSignatureExtractor.FAIL_DECODE_ERROR
+        try:
+            conn.send((video_path, frames, finder.crop_boxes.get(video_path), reason))
+        except (EOFError, OSError, BrokenPipeError):
+            break
+        if frames is not None and (temporal_matching or audio_matching):
+            temporal = None
+            audio = None
+            try:
+                if temporal_matching:
+                    temporal = finder.extract_temporal_signature(video_path)
+                if audio_matching:
+                    audio = finder.extract_audio_fingerprint(video_path)
+            except Exception as e:
+                print(f"시간축/오디오 지문 추출 중 예외: {video_path} - {e}")
+            try:
+                conn.send((video_path, temporal, audio))
+            except (EOFError, OSError, BrokenPipeError):
+                break
+        finder.crop_boxes.pop(video_path, None)
+    conn.close()
+
+class _ExtractWorker:
+    """작업자 프로세스 하나와 현재 처리 중인 작업 상태"""
+    def __init__(self, context, frame_positions, output_size, temporal_matching, audio_matching, auto_crop):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_extract_worker_main,
+            args=(child_conn, frame_positions, output_size, temporal_matching, audio_matching, auto_crop),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.current_path: Optional[str] = None
+        self.started_at = 0.0
+        self.awaiting_extras = False  # 시그니처는 받았고 시간축/오디오 지문을 기다리는 중인지 여부
+
+    def assign(self, video_path: str, animation_header=None):
+        self.current_path = video_path
+        self.started_at = time.monotonic()
+        self.awaiting_extras = False
+        self.conn.send((video_path, animation_header))
+
+    def start_extras(self):
+        """시그니처를 받은 뒤 지문 추출 단계를 시작합니다 (제한 시간을 새로 셈)"""
+        self.started_at = time.monotonic()
+        self.awaiting_extras = True
+
+    def kill(self):
+        """작업자 프로세스를 강제 종료합니다 (멈춘 디코더 대응)"""
+        try:
+            self.process.kill()
+            self.process.join(timeout=1.0)
+        except Exception as e:
+            print(f"작업자 프로세스 종료 오류: {e}")
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+    def shutdown(self):
+        """작업자에게 종료를 요청하고, 응답이 없으면 강제 종료합니다."""
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+
+class VideoSignatureExtractor:
+    """
+    여러 작업자 프로세스에서 비디오 시그니처를 병렬로 추출하는 클래스.
+    파일마다 제한 시간을 두고, 시간을 넘기면 해당 작업자 프로세스를 강제 종료한 뒤 새로 띄웁니다.
+    시간축/오디오 지문은 시그니처와 별도의 제한 시간(extras_timeout)을 가지며, 시간을 넘기면 지문만 빠지고 시그니처는 유지됩니다.
+    """
+
+    # 실패 사유
+    FAIL_TIMEOUT = "timeout"
+    FAIL_NO_STREAM = "no stream"
+    FAIL_DECODE_ERROR = "decode error"
+    FAIL_TOO_DARK = "too dark"
+    FAIL_TOO_FEW_FRAMES = "too few frames"
+    FAIL_NOT_VIDEO = "not a video file"
+
+    def __init__(self, max_workers: int = 0, timeout: float = 30.0,
+                 frame_positions=None, output_size=(16, 16), temporal_matching=False, audio_matching=False,
+                 auto_crop=False, extras_timeout: Optional[float] = None):
+        """
+        매개변수:
+            max_workers: 동시에 실행할 작업자 프로세스 수 (0 이하이면 CPU 수에 맞춰 자동 결정)
+            timeout: 파일 하나당 최대 처리 시간(초)
+            frame_positions: 비디오의 위치 백분율 목록
+            output_size: 추출할 프레임의 크기
+            temporal_matching: 시간축 지문(초 단위 프레임 해시)도 함께 추출할지 여부
+            audio_matching: 오디오 지문도 함께 추출할지 여부
+            auto_crop: 검은 띠를 찾아 실제 영상 영역으로 시그니처를 만들지 여부
+            extras_timeout: 시그니처를 받은 뒤 시간축/오디오 지문 추출에 허용할 시간(초) (None이면 timeout과 같음)
+        """
+        if not max_workers or max_workers <= 0:
+            max_workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.extras_timeout = timeout if extras_timeout is None else extras_timeout
+        self.frame_positions = frame_positions
+        self.output_size = output_size
+        self.temporal_matching = temporal_matching
+        self.audio_matching = audio_matching
+        self.auto_crop = auto_crop
+        # Windows/PyInstaller와 동일하게 동작하도록 spawn 방식 사용
+        self.context = multiprocessing.get_context('spawn')
+
+    def extract_all(self, video_paths: List[str],
+                    progress_callback: Optional[Callable[[int], None]] = None,
+                    should_stop: Optional[Callable[[], bool]] = None,
+                    animation_headers: Optional[Dict[str, object]] = None
+                    ) -> Tuple[Dict[str, list], Dict[str, tuple], Dict[str, object], Dict[str, object], Dict[str, str]]:
+        """
+        주어진 비디오들의 시그니처를 추출합니다.
+        animation_headers({경로: AnimationHeader})에 있는 파일은 작업자가 헤더의 프레임 수로 Pillow에서 바로 샘플링합니다.
+
+        반환값:
+            (경로 -> 프레임 목록, 경로 -> 시간축 지문, 경로 -> 오디오 지문, 경로 -> 영상 영역 CropBox, 경로 -> 실패 사유)
+            시간축 지문과 오디오 지문은 해당 옵션이 켜져 있고 추출에 성공한 경우에만 포함됩니다.
+        """
+        signatures: Dict[str, list] = {}
+        temporal_signatures: Dict[str, tuple] = {}
+        audio_fingerprints: Dict[str, object] = {}
+        crop_boxes: Dict[str, object] = {}
+        failures: Dict[str, str] = {}
+        if not video_paths:
+            return signatures, temporal_signatures, audio_fingerprints, crop_boxes, failures
+
+        pending = list(reversed(video_paths))  # pop()으로 입력 순서대로 꺼내기 위해 뒤집음
+        worker_count = min(self.max_workers, len(video_paths))
+        workers: List[_ExtractWorker] = []
+        completed = 0
+
+        def start_worker():
+            return _ExtractWorker(self.context, self.frame_positions, self.output_size,
+                                  self.temporal_matching, self.audio_matching, self.auto_crop)
+
+        def finish(video_path, frames, reason, crop_box=None):
+            nonlocal completed
+            if frames is not None:
+                signatures[video_path] = frames
+                if crop_box is not None:
+                    crop_boxes[video_path] = crop_box
+            else:
+                failures[video_path] = reason or self.FAIL_DECODE_ERROR
+                print(f"비디오 시그니처 추출 실패 ({failures[video_path]}): {os.path.basename(video_path)}")
+            completed += 1
+            if progress_callback:
+                progress_callback(completed)
+
+        try:
+            for _ in range(worker_count):
+                workers.append(start_worker())
+
+            while pending or any(w.current_path for w in workers):
+                if should_stop and should_stop():
+                    print("비디오 시그니처 추출 중단 요청")
+                    break
+
+                # 놀고 있는 작업자에게 작업 배정
+                for worker in workers:
+                    if worker.current_path is None and pending:
+                        video_path = pending.pop()
+                        worker.assign(video_path, (animation_headers or {}).get(video_path))
+
+                busy = [w for w in workers if w.current_path]
+                if not busy:
+                    continue
+
+                # 가장 먼저 제한 시간에 도달하는 작업까지만 대기
+                now = time.monotonic()
+                nearest_deadline = min(w.started_at + (self.extras_timeout if w.awaiting_extras else self.timeout) for w in busy)
+                ready = wait([w.conn for w in busy], timeout=max(0.0, min(nearest_deadline - now, 0.5)))
+
+                for worker in busy:
+                    if worker.conn in ready:
+                        try:
+                            message = worker.conn.recv()
+                        except (EOFError, OSError):
+                            # 디코더 충돌 등으로 작업자 프로세스가 죽은 경우 (지문 단계였다면 시그니처는 이미 받았으므로 유지)
+                            if not worker.awaiting_extras:
+                                finish(worker.current_path, None, self.FAIL_DECODE_ERROR)
+                            worker.kill()
+                            workers[workers.index(worker)] = start_worker()
+                            continue
+                        if worker.awaiting_extras:
+                            video_path, temporal, audio = message
+                            if temporal is not None:
+                                temporal_signatures[video_path] = temporal
+                            if audio is not None:
+                                audio_fingerprints[video_path] = audio
+                            worker.current_path = None
+                            continue
+                        video_path, frames, crop_box, reason = message
+                        finish(video_path, frames, reason, crop_box)
+                        if frames is not None and (self.temporal_matching or self.audio_matching):
+                            worker.start_extras()
+                        else:
+                            worker.current_path = None
+                    elif worker.awaiting_extras and time.monotonic() - worker.started_at > self.extras_timeout:
+                        # 지문 추출 제한 시간 초과: 시그니처는 유지하고 지문 없이 진행 (작업자는 새로 띄움)
+                        print(f"시간축/오디오 지문 추출 제한 시간 초과, 시그니처만 사용: {os.path.basename(worker.current_path)}")
+                        worker.kill()
+                        workers[workers.index(worker)] = start_worker()
+                    elif not worker.awaiting_extras and time.monotonic() - worker.started_at > self.timeout:
+                        # 제한 시간 초과: 멈춘 작업자를 강제 종료하고 새 작업자로 교체
+                        finish(worker.current_path, None, self.FAIL_TIMEOUT)
+                        worker.kill()
+                        workers[workers.index(worker)] = start_worker()
+        finally:
+            for worker in workers:
+                if worker.current_path:
+                    worker.kill()
+                else:
+                    worker.shutdown()
+
+        return signatures, temporal_signatures, audio_fingerprints, crop_boxes, failures